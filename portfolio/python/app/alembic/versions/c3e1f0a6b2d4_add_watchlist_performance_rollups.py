@@ -0,0 +1,44 @@
+"""add_watchlist_performance_rollups
+
+Revision ID: c3e1f0a6b2d4
+Revises: a7147b28ca25
+Create Date: 2026-10-16 21:30:00.000000
+
+"""
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = 'c3e1f0a6b2d4'
+down_revision = 'a7147b28ca25'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'watchlist_performance_rollups',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('watchlist_item_id', sa.Integer(), nullable=False),
+        sa.Column('resolution', sa.String(length=10), nullable=False),
+        sa.Column('bucket_start', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('open', sa.Numeric(precision=10, scale=2), nullable=False),
+        sa.Column('high', sa.Numeric(precision=10, scale=2), nullable=False),
+        sa.Column('low', sa.Numeric(precision=10, scale=2), nullable=False),
+        sa.Column('close', sa.Numeric(precision=10, scale=2), nullable=False),
+        sa.Column('samples', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.ForeignKeyConstraint(['watchlist_item_id'], ['watchlist_items.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint(
+            'watchlist_item_id', 'resolution', 'bucket_start',
+            name='uq_watchlist_rollup_item_resolution_bucket',
+        ),
+    )
+    op.create_index(op.f('ix_watchlist_performance_rollups_id'), 'watchlist_performance_rollups', ['id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_watchlist_performance_rollups_id'), table_name='watchlist_performance_rollups')
+    op.drop_table('watchlist_performance_rollups')
@@ -0,0 +1,43 @@
+"""widen_watchlist_percent_change_columns
+
+Revision ID: d4f2a1b7c9e3
+Revises: c3e1f0a6b2d4
+Create Date: 2026-10-16 22:40:00.000000
+
+"""
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = 'd4f2a1b7c9e3'
+down_revision = 'c3e1f0a6b2d4'
+branch_labels = None
+depends_on = None
+
+COLUMNS = [
+    ('watchlist_items', 'price_change_percent_since_added'),
+    ('watchlist_performance', 'price_change_percent_since_added'),
+]
+
+
+def upgrade() -> None:
+    for table, column in COLUMNS:
+        op.alter_column(
+            table,
+            column,
+            existing_type=sa.Numeric(precision=5, scale=2),
+            type_=sa.Numeric(precision=14, scale=2),
+            existing_nullable=True,
+        )
+
+
+def downgrade() -> None:
+    for table, column in COLUMNS:
+        op.alter_column(
+            table,
+            column,
+            existing_type=sa.Numeric(precision=14, scale=2),
+            type_=sa.Numeric(precision=5, scale=2),
+            existing_nullable=True,
+        )
@@ -13,6 +13,7 @@ from app.core.auth.dependencies import get_current_active_user
 from app.core.database.models import User
 from app.core.schemas.market_data import (
     BulkPricesResponse,
+    CoalescingStatsResponse,
     CurrentPriceResponse,
     MarketStatusResponse,
     StockSearchResponse,
@@ -301,3 +302,11 @@ async def get_supported_intervals(
         intervals=market_data_service.get_supported_intervals(),
         description="Supported interval values for historical data requests",
     )
+
+
+@router.get("/coalescing-stats", response_model=CoalescingStatsResponse)
+async def get_coalescing_stats(
+    _current_user: User = Depends(get_current_active_user),
+):
+    """Get counters for upstream calls saved by request coalescing."""
+    return CoalescingStatsResponse(**market_data_service.get_coalescing_stats())
@@ -13,8 +13,8 @@ from app.core.auth.dependencies import (
     get_client_ip,
     get_current_user,
     get_optional_current_user,
+    rate_limit,
 )
-from app.core.auth.utils import is_rate_limited
 from app.core.logging_config import (
     get_logger,
     log_api_request,
@@ -34,7 +34,11 @@ logger = get_logger(__name__)
 router = APIRouter()
 
 
-@router.get("/symbols", response_model=List[SymbolSearchResult])
+@router.get(
+    "/symbols",
+    response_model=List[SymbolSearchResult],
+    dependencies=[Depends(rate_limit("symbol_search"))],
+)
 async def get_symbols(
         name: str,
         request: Request,
@@ -63,21 +67,6 @@ async def get_symbols(
         f"🔍 Symbol search initiated for '{name}' | User: {user_id} | IP: {client_ip}"
     )
 
-    # Rate limiting for unauthenticated users
-    if not current_user:
-        logger.debug(f"Rate limiting check for unauthenticated user | IP: {client_ip}")
-        if is_rate_limited(
-                client_ip, "symbol_search", max_attempts=10, window_seconds=3600
-        ):
-            logger.warning(
-                f"🚫 Rate limit exceeded for symbol search | IP: {client_ip}"
-            )
-            raise HTTPException(
-                status_code=429,
-                detail="Rate limit exceeded. Please authenticate or try again later.",
-            )
-        logger.debug(f"Rate limit check passed | IP: {client_ip}")
-
     try:
         # Search for symbols
         logger.debug(f"Searching for symbols with yahooquery | Query: '{name}'")
@@ -163,10 +152,13 @@ async def get_symbols(
         )
 
 
-@router.get("/symbol-data", response_model=YFinanceDataResponse)
+@router.get(
+    "/symbol-data",
+    response_model=YFinanceDataResponse,
+    dependencies=[Depends(rate_limit("fresh_data"))],
+)
 async def get_symbol_data_fresh(
         name: str,
-        request: Request,
         period: str = Query(
             default="max",
             description="Data period (1d, 5d, 1mo, 3mo, 6mo, 1y, 2y, 5y, 10y, ytd, max)",
@@ -177,24 +169,12 @@ async def get_symbol_data_fresh(
         ),
         start_date: Optional[str] = Query(None, description="Start date (YYYY-MM-DD)"),
         end_date: Optional[str] = Query(None, description="End date (YYYY-MM-DD)"),
-        current_user=Depends(get_optional_current_user),
 ):
     """
     Get fresh stock data for a specific symbol from yfinance API.
 
     Rate limited for unauthenticated users to prevent abuse.
     """
-    # Rate limiting for unauthenticated users
-    if not current_user:
-        client_ip = get_client_ip(request) if request else "unknown"
-        if is_rate_limited(
-                client_ip, "fresh_data", max_attempts=5, window_seconds=3600
-        ):
-            raise HTTPException(
-                status_code=429,
-                detail="Rate limit exceeded. Please authenticate or try again later.",
-            )
-
     try:
         # Fetch fresh data from yfinance (always max period for comprehensive coverage)
         data = await market_data_service.fetch_ticker_data(
@@ -191,14 +191,6 @@ async def get_multi_period_performance(
     try:
         service = PortfolioCalculationService(db)
 
-        # Get portfolio name
-        portfolio = service._get_portfolio(portfolio_id, current_user.id)
-        if not portfolio:
-            raise HTTPException(status_code=404, detail="Portfolio not found")
-
-        current_value = service._get_current_portfolio_value(portfolio_id)
-
-        period_summaries = []
         period_names = {
             PeriodType.LAST_3_MONTHS: "Last 3 Months",
             PeriodType.LAST_6_MONTHS: "Last 6 Months",
@@ -210,36 +202,33 @@ async def get_multi_period_performance(
             PeriodType.INCEPTION: "Since Inception",
         }
 
-        for period in periods:
-            try:
-                result = await service.calculate_portfolio_performance(
-                    portfolio_id=portfolio_id,
-                    user_id=current_user.id,
-                    period=period,
-                    end_date=end_date,
-                )
-
-                if "error" not in result:
-                    period_summaries.append(
-                        {
-                            "period": period,
-                            "period_name": period_names.get(period, period),
-                            "start_date": result.get("start_date"),
-                            "end_date": result.get("end_date"),
-                            "metrics": result.get("metrics", {}),
-                        }
-                    )
+        # All periods share one transaction query, one set of price downloads
+        # and one daily value series.
+        try:
+            result = await service.calculate_multi_period_performance(
+                portfolio_id=portfolio_id,
+                user_id=current_user.id,
+                periods=periods,
+                end_date=end_date,
+            )
+        except ValueError:
+            raise HTTPException(status_code=404, detail="Portfolio not found")
 
-            except Exception as e:
-                logger.warning(
-                    f"Failed to calculate performance for period {period}: {e}"
-                )
-                continue
+        period_summaries = [
+            {
+                "period": summary["period"],
+                "period_name": period_names.get(summary["period"], summary["period"]),
+                "start_date": summary["start_date"],
+                "end_date": summary["end_date"],
+                "metrics": summary["metrics"],
+            }
+            for summary in result["periods"]
+        ]
 
         return MultiPeriodPerformanceResponse(
             portfolio_id=portfolio_id,
-            portfolio_name=portfolio.name,
-            current_value=current_value,
+            portfolio_name=result["portfolio_name"],
+            current_value=result["current_value"],
             periods=period_summaries,
             calculation_date=datetime.now(),
         )
@@ -0,0 +1,7 @@
+"""
+Strategy screener API endpoints.
+"""
+
+from .router import router
+
+__all__ = ["router"]
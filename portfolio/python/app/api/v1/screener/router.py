@@ -0,0 +1,99 @@
+"""
+Strategy Screener Router
+Runs a trading strategy over a watchlist, a portfolio's holdings or an
+explicit symbol list and streams one JSON line per symbol as results finish.
+"""
+
+import json
+import logging
+from typing import List
+
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
+
+from app.core.auth.dependencies import get_current_user
+from app.core.database.connection import get_db
+from app.core.database.models import User
+from app.core.schemas.screener import ScreenerRequest, ScreenerStrategiesResponse
+from app.core.services.portfolio_service import PortfolioService
+from app.core.services.strategy_screener_service import strategy_screener_service
+from app.core.services.watchlist_service import WatchlistService
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/screener", tags=["screener"])
+
+
+@router.get("/strategies", response_model=ScreenerStrategiesResponse)
+async def get_strategies(_current_user: User = Depends(get_current_user)):
+    """List the strategies that can be screened."""
+    return ScreenerStrategiesResponse(
+        strategies=strategy_screener_service.get_strategies()
+    )
+
+
+@router.post("/run")
+async def run_screener(
+    request: ScreenerRequest,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    """
+    Screen a symbol universe with a strategy.
+
+    The response is newline-delimited JSON (one ScreenerResult per line),
+    written as each batch of symbols finishes.
+    """
+    try:
+        strategy_screener_service.validate(request.strategy, request.parameters)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    symbols = _resolve_universe(request, current_user, db)
+    if not symbols:
+        raise HTTPException(status_code=400, detail="The symbol universe is empty")
+    logger.info(
+        "Screening %d symbols with %s for user %s",
+        len(symbols), request.strategy, current_user.id,
+    )
+
+    async def lines():
+        async for result in strategy_screener_service.screen(
+            symbols, request.strategy, request.parameters
+        ):
+            yield json.dumps(result) + "\n"
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+
+def _resolve_universe(request: ScreenerRequest, user: User, db: Session) -> List[str]:
+    sources = [
+        request.symbols is not None,
+        request.watchlist_id is not None,
+        request.portfolio_id is not None,
+    ]
+    if sum(sources) != 1:
+        raise HTTPException(
+            status_code=400,
+            detail="Provide exactly one of symbols, watchlist_id or portfolio_id",
+        )
+
+    if request.symbols is not None:
+        return [symbol.strip().upper() for symbol in request.symbols if symbol.strip()]
+
+    if request.watchlist_id is not None:
+        watchlist = WatchlistService(db).get_watchlist(request.watchlist_id, user.id)
+        if not watchlist:
+            raise HTTPException(status_code=404, detail="Watchlist not found")
+        return [item.symbol for item in watchlist.items]
+
+    portfolio_service = PortfolioService(db)
+    if not portfolio_service.get_portfolio(request.portfolio_id, user.id):
+        raise HTTPException(status_code=404, detail="Portfolio not found")
+    return [
+        holding.asset.symbol
+        for holding in portfolio_service.get_portfolio_assets(
+            request.portfolio_id, user.id
+        )
+    ]
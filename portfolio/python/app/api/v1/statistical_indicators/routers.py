@@ -5,15 +5,15 @@ Basic API endpoints for user-configurable statistical indicators.
 
 from typing import List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from sqlalchemy.orm import Session
 
 from app.core.auth.dependencies import (
     get_current_user,
     get_optional_current_user,
-    get_client_ip,
+    rate_limit,
+    rate_limit_headers,
 )
-from app.core.auth.utils import is_rate_limited
 from app.core.database.connection import get_db
 from app.core.database.models.user import User
 from app.core.schemas.statistical_indicators import (
@@ -69,29 +69,27 @@ async def get_available_indicators(
         raise HTTPException(status_code=500, detail=f"Error fetching indicators: {str(e)}")
 
 
-@router.post("/calculate", response_model=IndicatorCalculationResponse)
+@router.post(
+    "/calculate",
+    response_model=IndicatorCalculationResponse,
+    dependencies=[Depends(rate_limit("calculate_indicators"))],
+)
 async def calculate_indicators(
         request: IndicatorCalculationRequest,
-        current_user: User = Depends(get_optional_current_user),
-        request_obj: Request = None,
+        http_request: Request,
         db: Session = Depends(get_db)
 ):
     """Calculate indicators for a symbol using configuration or custom indicators."""
-    # Rate limiting for unauthenticated users
-    if not current_user:
-        client_ip = get_client_ip(request_obj) if request_obj else "unknown"
-        if is_rate_limited(
-                client_ip, "calculate_indicators", max_attempts=10, window_seconds=3600
-        ):
-            raise HTTPException(
-                status_code=429,
-                detail="Rate limit exceeded. Please authenticate or try again later.",
-            )
-
     try:
         service = EnhancedStatisticalService(db)
-        result = await service.calculate_indicators(request)
-        return result
+        # Serialized from the result columns; response_model still documents it
+        body = await service.calculate_indicators_json(request)
+        # A returned Response skips the headers dependencies set on the injected one
+        return Response(
+            content=body,
+            media_type="application/json",
+            headers=rate_limit_headers(http_request),
+        )
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
@@ -18,6 +18,7 @@ from app.core.schemas.watchlist import (
     WatchlistBulkAddRequest,
     WatchlistCreate,
     WatchlistItemCreate,
+    WatchlistItemHistoryResponse,
     WatchlistItemResponse,
     WatchlistItemUpdate,
     WatchlistReorderRequest,
@@ -454,6 +455,55 @@ async def update_watchlist_item(
         )
 
 
+@router.get(
+    "/{watchlist_id}/items/{item_id}/history",
+    response_model=WatchlistItemHistoryResponse,
+)
+async def get_watchlist_item_history(
+    watchlist_id: int,
+    item_id: int,
+    days: int = Query(30, ge=1, le=3650, description="Days of history"),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    """Get a watchlist item's price history at the finest stored resolution."""
+    log_api_request(
+        logger,
+        "GET",
+        f"/watchlists/{watchlist_id}/items/{item_id}/history",
+        current_user.id,
+        f"Getting {days} days of history",
+    )
+    start_time = time.time()
+    try:
+        service = WatchlistService(db)
+        history = service.get_item_history(item_id, current_user.id, days)
+
+        if not history:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail="Watchlist item not found"
+            )
+
+        response_time = time.time() - start_time
+        log_api_response(
+            logger,
+            "GET",
+            f"/watchlists/{watchlist_id}/items/{item_id}/history",
+            200,
+            response_time,
+        )
+        return history
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Failed to get history for watchlist item {item_id}: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to retrieve watchlist item history",
+        )
+
+
 @router.delete(
     "/{watchlist_id}/items/{item_id}", response_model=WatchlistItemDeleteResponse
 )
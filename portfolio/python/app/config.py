@@ -66,6 +66,77 @@ class Settings(BaseSettings):
     YAHOO_FINANCE_API_KEY: str = env.str("YAHOO_FINANCE_API_KEY", "")
     ALPHA_VANTAGE_API_KEY: str = ""
 
+    # Market data executor settings
+    MARKET_DATA_MAX_WORKERS: int = env.int("MARKET_DATA_MAX_WORKERS", 16)
+    MARKET_DATA_MAX_CONCURRENCY: int = env.int("MARKET_DATA_MAX_CONCURRENCY", 32)
+    MARKET_DATA_TIMEOUT_SECONDS: float = env.float("MARKET_DATA_TIMEOUT_SECONDS", 30.0)
+    MARKET_DATA_QUOTE_BATCH_SIZE: int = env.int("MARKET_DATA_QUOTE_BATCH_SIZE", 100)
+    MARKET_DATA_HISTORY_BATCH_SIZE: int = env.int("MARKET_DATA_HISTORY_BATCH_SIZE", 50)
+
+    # OHLCV history cache settings
+    OHLCV_CACHE_ENABLED: bool = env.bool("OHLCV_CACHE_ENABLED", True)
+    OHLCV_CACHE_DIR: str = env.str("OHLCV_CACHE_DIR", ".cache/ohlcv")
+    OHLCV_CACHE_REFRESH_SECONDS: int = env.int("OHLCV_CACHE_REFRESH_SECONDS", 900)
+
+    # Shared quote cache settings (Redis)
+    QUOTE_CACHE_MARKET_HOURS_TTL_SECONDS: int = env.int(
+        "QUOTE_CACHE_MARKET_HOURS_TTL_SECONDS", 60
+    )
+    QUOTE_CACHE_CLOSED_TTL_SECONDS: int = env.int("QUOTE_CACHE_CLOSED_TTL_SECONDS", 3600)
+
+    # Background quote ingestion into the quote cache (keep intervals below the TTLs)
+    PRICE_INGESTION_ENABLED: bool = env.bool("PRICE_INGESTION_ENABLED", True)
+    PRICE_INGESTION_BATCH_SIZE: int = env.int("PRICE_INGESTION_BATCH_SIZE", 100)
+    PRICE_INGESTION_MARKET_HOURS_INTERVAL_SECONDS: int = env.int(
+        "PRICE_INGESTION_MARKET_HOURS_INTERVAL_SECONDS", 30
+    )
+    PRICE_INGESTION_CLOSED_INTERVAL_SECONDS: int = env.int(
+        "PRICE_INGESTION_CLOSED_INTERVAL_SECONDS", 900
+    )
+    PRICE_INGESTION_REFRESH_WATCHLISTS: bool = env.bool(
+        "PRICE_INGESTION_REFRESH_WATCHLISTS", True
+    )
+
+    # Anonymous rate limits per action (Redis sliding window, per client IP)
+    RATE_LIMIT_ENABLED: bool = env.bool("RATE_LIMIT_ENABLED", True)
+    RATE_LIMIT_SYMBOL_SEARCH_PER_HOUR: int = env.int("RATE_LIMIT_SYMBOL_SEARCH_PER_HOUR", 10)
+    RATE_LIMIT_FRESH_DATA_PER_HOUR: int = env.int("RATE_LIMIT_FRESH_DATA_PER_HOUR", 5)
+    RATE_LIMIT_CALCULATE_INDICATORS_PER_HOUR: int = env.int(
+        "RATE_LIMIT_CALCULATE_INDICATORS_PER_HOUR", 10
+    )
+
+    # Watchlist history retention: raw ticks, then hourly and daily OHLC buckets
+    WATCHLIST_HISTORY_RAW_RETENTION_HOURS: int = env.int(
+        "WATCHLIST_HISTORY_RAW_RETENTION_HOURS", 48
+    )
+    WATCHLIST_HISTORY_HOURLY_RETENTION_DAYS: int = env.int(
+        "WATCHLIST_HISTORY_HOURLY_RETENTION_DAYS", 30
+    )
+    WATCHLIST_HISTORY_COMPACTION_INTERVAL_SECONDS: int = env.int(
+        "WATCHLIST_HISTORY_COMPACTION_INTERVAL_SECONDS", 3600
+    )
+
+    # Watchlist alert index reload interval (picks up other workers' changes)
+    ALERT_INDEX_REFRESH_SECONDS: int = env.int("ALERT_INDEX_REFRESH_SECONDS", 60)
+
+    # Concurrent analytics refresh (POST /analytics/all)
+    ANALYTICS_REFRESH_MAX_CONCURRENCY: int = env.int("ANALYTICS_REFRESH_MAX_CONCURRENCY", 8)
+
+    # Correlation significance (none, bonferroni, holm or fdr_bh)
+    CORRELATION_SIGNIFICANCE_LEVEL: float = env.float("CORRELATION_SIGNIFICANCE_LEVEL", 0.05)
+    CORRELATION_P_VALUE_ADJUSTMENT: str = env.str("CORRELATION_P_VALUE_ADJUSTMENT", "fdr_bh")
+
+    # Strategy screener process pool (defaults to one worker per CPU)
+    SCREENER_MAX_WORKERS: int = env.int("SCREENER_MAX_WORKERS", 0)
+    SCREENER_BATCH_SIZE: int = env.int("SCREENER_BATCH_SIZE", 50)
+
+    # Backtest parameter sweeps (defaults to one worker per CPU)
+    BACKTEST_MAX_WORKERS: int = env.int("BACKTEST_MAX_WORKERS", 0)
+    BACKTEST_SWEEP_CHUNK_SIZE: int = env.int("BACKTEST_SWEEP_CHUNK_SIZE", 50)
+
+    # Streaming indicator state kept between incremental calculations
+    INDICATOR_STATE_MAX_ENTRIES: int = env.int("INDICATOR_STATE_MAX_ENTRIES", 512)
+
     # Test settings
     TESTING: bool = env.bool("TESTING", False)
     TEST_DATABASE_URL: str = env.str("TEST_DATABASE_URL", "sqlite:///./test.db")
@@ -21,6 +21,7 @@ __all__ = [
     "store_reset_token",
     "validate_reset_token",
     "mark_reset_token_used",
+    "is_rate_limited",
     # Dependencies
     "get_current_user",
     "get_current_active_user",
@@ -28,4 +29,5 @@ __all__ = [
     "get_current_user_profile",
     "require_permission",
     "require_admin",
+    "rate_limit",
 ]
@@ -2,14 +2,16 @@
 Authentication dependencies for FastAPI routes.
 """
 
-from typing import Optional
+import asyncio
+from typing import Dict, Optional
 
-from fastapi import Depends, HTTPException, Request, status
+from fastapi import Depends, HTTPException, Request, Response, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from jose import JWTError, jwt
 from sqlalchemy.orm import Session
 
-from app.core.auth.utils import ALGORITHM, SECRET_KEY, verify_token
+from app.core.auth.rate_limiting import rate_limiter
+from app.core.auth.utils import ALGORITHM, SECRET_KEY, rate_limit_key, verify_token
 from app.core.database.connection import get_db
 from app.core.database.models import User, UserProfile
 from app.core.schemas.auth import TokenData
@@ -146,6 +148,57 @@ def require_admin():
     return admin_checker
 
 
+def rate_limit(action: str, anonymous_only: bool = True):
+    """
+    Rate limit an endpoint per client with the action's configured limit.
+
+    Adds X-RateLimit-Limit / X-RateLimit-Remaining headers and answers 429
+    with Retry-After once the limit is reached. Authenticated users are exempt
+    unless anonymous_only is False, in which case they are limited per user.
+    Routes that return a Response object themselves must add the headers
+    from rate_limit_headers(request).
+    """
+    max_attempts, window_seconds = rate_limiter.limit_for(action)
+
+    async def rate_limit_checker(
+        request: Request,
+        response: Response,
+        current_user: Optional[User] = Depends(get_optional_current_user),
+    ) -> None:
+        if current_user is not None and anonymous_only:
+            return
+
+        identifier = (
+            f"user:{current_user.id}" if current_user else get_client_ip(request)
+        )
+        allowed, remaining, retry_after = await asyncio.to_thread(
+            rate_limiter.hit,
+            rate_limit_key(identifier, action),
+            max_attempts,
+            window_seconds,
+        )
+        headers = {
+            "X-RateLimit-Limit": str(max_attempts),
+            "X-RateLimit-Remaining": str(remaining),
+        }
+        if not allowed:
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Rate limit exceeded. Please authenticate or try again later.",
+                headers={**headers, "Retry-After": str(retry_after)},
+            )
+        response.headers.update(headers)
+        # Routes returning their own Response copy these over
+        request.state.rate_limit_headers = headers
+
+    return rate_limit_checker
+
+
+def rate_limit_headers(request: Request) -> Dict[str, str]:
+    """X-RateLimit-* headers set by rate_limit for this request, if any."""
+    return dict(getattr(request.state, "rate_limit_headers", {}))
+
+
 def get_token_data(token: str) -> TokenData:
     """Extract token data without database dependency."""
     try:
@@ -0,0 +1,100 @@
+"""
+Distributed rate limiting on the shared Redis pool.
+
+Each key is a sliding window of recent hits kept in Redis and updated by one
+atomic Lua script, so every API worker enforces the same limit.
+"""
+
+import math
+import time
+import uuid
+from typing import Dict, Optional, Tuple
+
+from app.config import settings
+from app.core.database.redis_client import RedisClient, get_redis
+from app.core.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# Limits per action: (max hits, window in seconds)
+RATE_LIMITS: Dict[str, Tuple[int, int]] = {
+    "symbol_search": (settings.RATE_LIMIT_SYMBOL_SEARCH_PER_HOUR, 3600),
+    "fresh_data": (settings.RATE_LIMIT_FRESH_DATA_PER_HOUR, 3600),
+    "calculate_indicators": (settings.RATE_LIMIT_CALCULATE_INDICATORS_PER_HOUR, 3600),
+}
+
+
+class RateLimiter:
+    """Sliding-window rate limiter shared by all API workers."""
+
+    def __init__(
+        self,
+        redis_client: Optional[RedisClient] = None,
+        limits: Optional[Dict[str, Tuple[int, int]]] = None,
+        enabled: Optional[bool] = None,
+    ):
+        self._redis = redis_client
+        self.limits = RATE_LIMITS if limits is None else limits
+        self.enabled = settings.RATE_LIMIT_ENABLED if enabled is None else enabled
+
+    @property
+    def redis(self) -> RedisClient:
+        if self._redis is None:
+            self._redis = get_redis()
+        return self._redis
+
+    def limit_for(
+        self,
+        action: str,
+        max_attempts: Optional[int] = None,
+        window_seconds: Optional[int] = None,
+    ) -> Tuple[int, int]:
+        """Configured limit of an action, with explicit values taking precedence."""
+        default_attempts, default_window = self.limits.get(action, (None, None))
+        max_attempts = max_attempts or default_attempts
+        window_seconds = window_seconds or default_window
+        if not max_attempts or not window_seconds:
+            raise ValueError(f"No rate limit configured for action '{action}'")
+        return max_attempts, window_seconds
+
+    def hit(
+        self,
+        key: str,
+        max_attempts: int,
+        window_seconds: int,
+    ) -> Tuple[bool, int, int]:
+        """
+        Count a hit against a key unless its window is full.
+
+        Args:
+            key: Rate limit key (see rate_limit_key)
+            max_attempts: Hits allowed per window
+            window_seconds: Window length in seconds
+
+        Returns:
+            Tuple[bool, int, int]: whether the hit is allowed, hits left in the
+            window and seconds until the next hit is allowed
+        """
+        if not self.enabled:
+            return True, max_attempts, 0
+
+        now_ms = int(time.time() * 1000)
+        try:
+            result = self.redis.hit_sliding_window(
+                key, max_attempts, window_seconds * 1000, now_ms, f"{now_ms}:{uuid.uuid4().hex}"
+            )
+        except Exception as e:
+            logger.error(f"Rate limit check failed for {key}: {e}")
+            result = None
+
+        if result is None:
+            # Fail open: an unavailable Redis must not take the API down with it
+            return True, max_attempts, 0
+
+        allowed, remaining, retry_after_ms = result
+        retry_after = 0 if allowed else max(1, math.ceil(retry_after_ms / 1000))
+        return allowed, remaining, retry_after
+
+
+# Global instance
+rate_limiter = RateLimiter()
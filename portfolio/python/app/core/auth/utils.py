@@ -13,6 +13,7 @@ from passlib.context import CryptContext
 from pytz import utc
 
 from app.config import settings
+from app.core.auth.rate_limiting import rate_limiter
 from app.core.database.redis_client import get_redis
 from app.core.logging_config import get_logger
 
@@ -150,12 +151,30 @@ def rate_limit_key(identifier: str, action: str) -> str:
 
 
 def is_rate_limited(
-    identifier: str, action: str, max_attempts: int, window_seconds: int
+    identifier: str,
+    action: str,
+    max_attempts: Optional[int] = None,
+    window_seconds: Optional[int] = None,
 ) -> bool:
-    """Check if an action is rate limited."""
-    # This would typically integrate with Redis for actual rate limiting
-    # For now, return False (not rate limited)
-    return False
+    """
+    Count an attempt and check if the action is rate limited.
+
+    Args:
+        identifier: Who is acting, e.g. a client IP or user id
+        action: Action name; its configured limit applies unless overridden
+        max_attempts: Attempts allowed per window
+        window_seconds: Window length in seconds
+
+    Returns:
+        bool: True if the attempt exceeds the limit
+    """
+    max_attempts, window_seconds = rate_limiter.limit_for(
+        action, max_attempts, window_seconds
+    )
+    allowed, _, _ = rate_limiter.hit(
+        rate_limit_key(identifier, action), max_attempts, window_seconds
+    )
+    return not allowed
 
 
 def validate_token_expiry(token_exp: Union[int, datetime]) -> bool:
@@ -16,7 +16,13 @@ from .portfolio_analytics import (
 )
 from .transaction import ManualEntry, Transaction, TransactionType
 from .user import User, UserProfile, UserSession
-from .watchlist import Watchlist, WatchlistAlert, WatchlistItem, WatchlistPerformance
+from .watchlist import (
+    Watchlist,
+    WatchlistAlert,
+    WatchlistItem,
+    WatchlistPerformance,
+    WatchlistPerformanceRollup,
+)
 
 __all__ = [
     # Base class
@@ -36,6 +42,7 @@ __all__ = [
     "WatchlistItem",
     "WatchlistAlert",
     "WatchlistPerformance",
+    "WatchlistPerformanceRollup",
     # Portfolio Analytics Models
     "PortfolioPerformanceHistory",
     "AssetPerformanceMetrics",
@@ -80,9 +80,8 @@ class WatchlistItem(Base):
     )
     current_price = Column(Numeric(10, 2), nullable=True)  # Latest known price
     price_change_since_added = Column(Numeric(10, 2), nullable=True)  # Absolute change
-    price_change_percent_since_added = Column(
-        Numeric(5, 2), nullable=True
-    )  # Percentage change
+    # Percentage change; wide enough for any ratio of two Numeric(10, 2) prices
+    price_change_percent_since_added = Column(Numeric(14, 2), nullable=True)
 
     # User notes and preferences
     notes = Column(Text, nullable=True)  # User notes about this stock
@@ -202,7 +201,7 @@ class WatchlistPerformance(Base):
 
     # Calculated metrics
     price_change_since_added = Column(Numeric(10, 2), nullable=True)
-    price_change_percent_since_added = Column(Numeric(5, 2), nullable=True)
+    price_change_percent_since_added = Column(Numeric(14, 2), nullable=True)
     days_since_added = Column(Integer, nullable=True)
 
     # Timestamps
@@ -219,3 +218,43 @@ class WatchlistPerformance(Base):
         Index("idx_watchlist_performance_date", "date"),
         Index("idx_watchlist_performance_price", "price"),
     )
+
+
+class WatchlistPerformanceRollup(Base):
+    """OHLC buckets compacted from raw watchlist performance ticks."""
+
+    __tablename__ = "watchlist_performance_rollups"
+
+    id = Column(Integer, primary_key=True, index=True)
+    watchlist_item_id = Column(
+        Integer, ForeignKey("watchlist_items.id", ondelete="CASCADE"), nullable=False
+    )
+
+    # Bucket: "hour" or "day", starting at bucket_start
+    resolution = Column(String(10), nullable=False)
+    bucket_start = Column(DateTime(timezone=True), nullable=False)
+
+    # OHLC prices and the number of raw ticks behind them
+    open = Column(Numeric(10, 2), nullable=False)
+    high = Column(Numeric(10, 2), nullable=False)
+    low = Column(Numeric(10, 2), nullable=False)
+    close = Column(Numeric(10, 2), nullable=False)
+    samples = Column(Integer, nullable=False)
+
+    # Timestamps
+    created_at = Column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
+
+    # Relationships
+    watchlist_item = relationship("WatchlistItem")
+
+    # Constraints
+    __table_args__ = (
+        UniqueConstraint(
+            "watchlist_item_id",
+            "resolution",
+            "bucket_start",
+            name="uq_watchlist_rollup_item_resolution_bucket",
+        ),
+    )
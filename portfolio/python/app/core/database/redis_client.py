@@ -4,7 +4,7 @@ import logging
 import os
 import pickle
 from functools import wraps
-from typing import List
+from typing import Dict, List, Optional, Tuple
 
 import redis
 from environs import Env
@@ -13,6 +13,38 @@ from app.core.utils.singletonmeta import SingletonMeta
 
 logger = logging.getLogger(__name__)
 
+# Compare-and-set on the lock owner, atomic on the server
+_EXTEND_LOCK_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("expire", KEYS[1], ARGV[2])
+end
+return 0
+"""
+_RELEASE_LOCK_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("del", KEYS[1])
+end
+return 0
+"""
+
+# Sliding-window log: one sorted-set member per allowed hit, scored in
+# milliseconds. Trimming, counting and recording happen in one atomic step, so
+# concurrent workers never admit more than `limit` hits per window.
+_SLIDING_WINDOW_SCRIPT = """
+local now = tonumber(ARGV[1])
+local window = tonumber(ARGV[2])
+local limit = tonumber(ARGV[3])
+redis.call("zremrangebyscore", KEYS[1], "-inf", now - window)
+local count = redis.call("zcard", KEYS[1])
+if count < limit then
+    redis.call("zadd", KEYS[1], now, ARGV[4])
+    redis.call("pexpire", KEYS[1], window)
+    return {1, limit - count - 1, 0}
+end
+local oldest = redis.call("zrange", KEYS[1], 0, 0, "withscores")
+return {0, 0, tonumber(oldest[2]) + window - now}
+"""
+
 
 def ensure_serializable_key(func):
     """A decorator which ensure that redis keys can be properly serialized."""
@@ -236,6 +268,64 @@ class RedisClient(metaclass=SingletonMeta):
                     if values[i] is not None
                 }
 
+    def mset(self, mapping: Dict, ex_seconds=None):
+        """SET several keys in one round trip, all with the same expiry."""
+        ex_seconds = ex_seconds or self.ex_seconds
+        # -1 we use as no expiration
+        if ex_seconds == -1:
+            ex_seconds = None
+        encoded = {json.dumps(key): json.dumps(value) for key, value in mapping.items()}
+        with self.RedisContextManager(self.connection_pool) as client:
+            if client is not None:
+                pipeline = client.pipeline(transaction=False)
+                pipeline.mset(encoded)
+                if ex_seconds:
+                    for key in encoded:
+                        pipeline.expire(key, ex_seconds)
+                return pipeline.execute()[0]
+
+    def acquire_lock(self, name: str, token: str, ex_seconds: int) -> bool:
+        """SET a lock key to `token` unless somebody else holds it."""
+        key = json.dumps(name)
+        with self.RedisContextManager(self.connection_pool) as client:
+            if client is not None:
+                return bool(client.set(key, token, nx=True, ex=ex_seconds))
+        return False
+
+    def extend_lock(self, name: str, token: str, ex_seconds: int) -> bool:
+        """Reset the expiry of a lock, only while it is still held with `token`."""
+        key = json.dumps(name)
+        with self.RedisContextManager(self.connection_pool) as client:
+            if client is not None:
+                return bool(client.eval(_EXTEND_LOCK_SCRIPT, 1, key, token, ex_seconds))
+        return False
+
+    def release_lock(self, name: str, token: str) -> bool:
+        """DELETE a lock, only while it is still held with `token`."""
+        key = json.dumps(name)
+        with self.RedisContextManager(self.connection_pool) as client:
+            if client is not None:
+                return bool(client.eval(_RELEASE_LOCK_SCRIPT, 1, key, token))
+        return False
+
+    def hit_sliding_window(
+        self, name: str, limit: int, window_ms: int, now_ms: int, member: str
+    ) -> Optional[Tuple[bool, int, int]]:
+        """
+        Record a hit in a sliding window unless `limit` hits are already in it.
+
+        Returns (allowed, remaining hits, milliseconds until a hit is allowed),
+        or None without a connection.
+        """
+        key = json.dumps(name)
+        with self.RedisContextManager(self.connection_pool) as client:
+            if client is not None:
+                allowed, remaining, retry_after_ms = client.eval(
+                    _SLIDING_WINDOW_SCRIPT, 1, key, now_ms, window_ms, limit, member
+                )
+                return bool(allowed), int(remaining), int(retry_after_ms)
+        return None
+
     def ping(self):
         """Ping the Redis server."""
         with self.RedisContextManager(self.connection_pool) as client:
@@ -0,0 +1,51 @@
+"""
+Backtest Schemas
+Pydantic schemas for strategy backtest results.
+"""
+
+from typing import Any, Dict, List, Optional
+
+from pydantic import BaseModel, Field
+
+
+class BacktestTrade(BaseModel):
+    """One round trip, entered and exited at the close of the signal day."""
+
+    side: str = Field(..., description="long or short")
+    entry_date: str = Field(..., description="Entry date (ISO)")
+    entry_price: float = Field(..., description="Entry close")
+    exit_date: Optional[str] = Field(None, description="Exit date, None while open")
+    exit_price: float = Field(..., description="Exit close, or the last close while open")
+    return_percent: float = Field(..., description="Return after commission and slippage")
+    is_open: bool = Field(False, description="Still open at the end of the history")
+
+
+class BacktestMetrics(BaseModel):
+    """Performance of a backtest, computed like the portfolio metrics."""
+
+    total_return_percent: float = Field(..., description="Total return")
+    cagr_percent: float = Field(..., description="CAGR (simple return up to one year)")
+    volatility_percent: Optional[float] = Field(None, description="Annualized volatility")
+    sharpe_ratio: Optional[float] = Field(None, description="Sharpe ratio")
+    max_drawdown_percent: float = Field(..., description="Maximum drawdown")
+    trades: int = Field(..., description="Number of trades, including an open one")
+    win_rate_percent: Optional[float] = Field(None, description="Share of profitable trades")
+    exposure_percent: float = Field(..., description="Share of bars with a position")
+
+
+class EquityPoint(BaseModel):
+    """Equity at one bar's close."""
+
+    date: str = Field(..., description="Bar date (ISO)")
+    equity: float = Field(..., description="Account value")
+    position: int = Field(..., description="Position held into the bar: 1, 0 or -1")
+
+
+class BacktestResult(BaseModel):
+    """Backtest of one strategy configuration over one price history."""
+
+    strategy: str = Field(..., description="Strategy name")
+    parameters: Dict[str, Any] = Field(..., description="Strategy parameters used")
+    metrics: BacktestMetrics
+    trades: List[BacktestTrade]
+    equity_curve: List[EquityPoint]
@@ -285,6 +285,26 @@ class SupportedIntervalsResponse(BaseModel):
     description: str = Field(..., description="Description of the response")
 
 
+class CoalescingKindStats(BaseModel):
+    """Request coalescing counters for one kind of upstream call."""
+
+    calls: int = Field(..., description="Calls received")
+    upstream_calls: int = Field(..., description="Upstream calls made")
+    saved_calls: int = Field(..., description="Calls served by an in-flight request")
+
+
+class CoalescingStatsResponse(BaseModel):
+    """Request coalescing statistics response."""
+
+    calls: int = Field(..., description="Calls received")
+    upstream_calls: int = Field(..., description="Upstream calls made")
+    saved_calls: int = Field(..., description="Calls served by an in-flight request")
+    in_flight: int = Field(..., description="Upstream calls currently in flight")
+    by_kind: Dict[str, CoalescingKindStats] = Field(
+        ..., description="Counters per call kind (history, quote, info)"
+    )
+
+
 # Asset search response schemas
 class AssetSearchResultItem(BaseModel):
     """Single asset search result."""
@@ -0,0 +1,42 @@
+"""
+Strategy Screener Schemas
+Pydantic schemas for screening trading strategies across many symbols.
+"""
+
+from typing import Any, Dict, List, Optional
+
+from pydantic import BaseModel, Field
+
+
+class ScreenerRequest(BaseModel):
+    """Strategy and symbol universe to screen; give exactly one universe source."""
+
+    strategy: str = Field(..., description="Strategy name (gfs, macd)")
+    symbols: Optional[List[str]] = Field(
+        None,
+        max_length=1000,
+        description="Explicit universe, e.g. the constituents of an index",
+    )
+    watchlist_id: Optional[int] = Field(None, description="Screen a watchlist's symbols")
+    portfolio_id: Optional[int] = Field(
+        None, description="Screen a portfolio's holdings"
+    )
+    parameters: Dict[str, Any] = Field(
+        default_factory=dict, description="Strategy parameters"
+    )
+
+
+class ScreenerResult(BaseModel):
+    """One line of the streamed screener response; strategy fields are extra keys."""
+
+    model_config = {"extra": "allow"}
+
+    symbol: str = Field(..., description="Stock symbol")
+    strategy: str = Field(..., description="Strategy name")
+    error: Optional[str] = Field(None, description="Why the symbol could not be screened")
+
+
+class ScreenerStrategiesResponse(BaseModel):
+    """Strategies available to the screener."""
+
+    strategies: List[str] = Field(..., description="Strategy names")
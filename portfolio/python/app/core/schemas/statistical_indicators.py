@@ -112,6 +112,10 @@ class IndicatorCalculationRequest(BaseModel):
     indicators: Optional[List[IndicatorConfiguration]] = Field(None, description="Custom indicator configurations")
     start_date: Optional[datetime] = Field(None, description="Start date for data")
     end_date: Optional[datetime] = Field(None, description="End date for data")
+    incremental: bool = Field(
+        default=False,
+        description="Reuse indicator state from earlier requests and only compute new bars",
+    )
 
     @validator('indicators')
     def validate_indicators(cls, v, values):
@@ -202,6 +202,26 @@ class WatchlistPerformanceResponse(BaseModel):
     days_since_added: Optional[int] = None
 
 
+class WatchlistPriceBar(BaseModel):
+    """Schema for one OHLC bucket of a watchlist item's price history."""
+
+    bucket_start: datetime
+    open: Decimal
+    high: Decimal
+    low: Decimal
+    close: Decimal
+    samples: int = Field(..., description="Raw price ticks in the bucket")
+
+
+class WatchlistItemHistoryResponse(BaseModel):
+    """Schema for a watchlist item's price history."""
+
+    item_id: int
+    symbol: str
+    resolution: str = Field(..., description="raw, hour or day")
+    bars: List[WatchlistPriceBar]
+
+
 class WatchlistReorderRequest(BaseModel):
     """Schema for reordering watchlist items."""
 
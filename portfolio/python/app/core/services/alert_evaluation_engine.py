@@ -0,0 +1,218 @@
+"""
+Alert Evaluation Engine
+Set-based evaluation of watchlist price alerts. Active, untriggered alerts are
+kept in memory, indexed per symbol by the price that triggers them, so a whole
+tick of quotes is checked with one bisect per symbol and direction, and every
+trigger is written back with a single UPDATE.
+"""
+
+import logging
+import threading
+import time
+from bisect import bisect_left, bisect_right
+from datetime import datetime, timezone
+from decimal import Decimal
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+
+from sqlalchemy import case, select, update
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.core.database.models.watchlist import WatchlistAlert, WatchlistItem
+
+logger = logging.getLogger(__name__)
+
+# Alerts firing when the price rises above / falls below their trigger price
+ABOVE = "above"
+BELOW = "below"
+
+
+def trigger_price(
+        alert_type: str,
+        condition: str,
+        threshold: Decimal,
+        added_price: Optional[Decimal],
+) -> Optional[Tuple[str, float]]:
+    """
+    Direction and price at which an alert fires, None if it never does.
+
+    Percent-change alerts are relative to the price the item was added at,
+    so they become a plain price threshold as well.
+    """
+    if alert_type == "price_high" and condition == ABOVE:
+        return ABOVE, float(threshold)
+    if alert_type == "price_low" and condition == BELOW:
+        return BELOW, float(threshold)
+    if alert_type == "percent_change" and added_price and condition in (ABOVE, BELOW):
+        return condition, float(added_price) * (1 + float(threshold) / 100)
+    return None
+
+
+class AlertIndex:
+    """Alert ids per (symbol, direction), sorted by trigger price."""
+
+    def __init__(self) -> None:
+        self._prices: Dict[Tuple[str, str], List[float]] = {}
+        self._alert_ids: Dict[Tuple[str, str], List[int]] = {}
+
+    @classmethod
+    def build(cls, alerts: List[Tuple[int, str, str, float]]) -> "AlertIndex":
+        """
+        Build an index in one sort.
+
+        Args:
+            alerts: (alert_id, symbol, direction, trigger price) tuples
+        """
+        index = cls()
+        for alert_id, symbol, direction, price in sorted(alerts, key=lambda alert: alert[3]):
+            key = (symbol.upper(), direction)
+            index._prices.setdefault(key, []).append(price)
+            index._alert_ids.setdefault(key, []).append(alert_id)
+        return index
+
+    def __len__(self) -> int:
+        return sum(len(alert_ids) for alert_ids in self._alert_ids.values())
+
+    def add(self, alert_id: int, symbol: str, direction: str, price: float) -> None:
+        key = (symbol.upper(), direction)
+        prices = self._prices.setdefault(key, [])
+        position = bisect_right(prices, price)
+        prices.insert(position, price)
+        self._alert_ids.setdefault(key, []).insert(position, alert_id)
+
+    def pop_crossed(self, prices: Mapping[str, float]) -> Dict[int, str]:
+        """
+        Remove and return every alert crossed by the given prices.
+
+        Args:
+            prices: Latest price per upper-case symbol
+
+        Returns:
+            Symbol per triggered alert id
+        """
+        triggered: Dict[int, str] = {}
+        for symbol, price in prices.items():
+            key = (symbol, ABOVE)
+            if key in self._prices:
+                # Trigger prices strictly below the price
+                end = bisect_left(self._prices[key], price)
+                triggered.update(dict.fromkeys(self._alert_ids[key][:end], symbol))
+                del self._prices[key][:end], self._alert_ids[key][:end]
+
+            key = (symbol, BELOW)
+            if key in self._prices:
+                # Trigger prices strictly above the price
+                start = bisect_right(self._prices[key], price)
+                triggered.update(dict.fromkeys(self._alert_ids[key][start:], symbol))
+                del self._prices[key][start:], self._alert_ids[key][start:]
+        return triggered
+
+
+class AlertEvaluationEngine:
+    """Evaluates batches of quotes against the in-memory alert index."""
+
+    def __init__(self, refresh_seconds: Optional[int] = None) -> None:
+        # Alerts changed by other workers are picked up on the next reload
+        self.refresh_seconds = refresh_seconds or settings.ALERT_INDEX_REFRESH_SECONDS
+        self._index: Optional[AlertIndex] = None
+        self._loaded_at = 0.0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def load_index(db: Session) -> AlertIndex:
+        """Index every active, untriggered alert of an item with alerts enabled."""
+        rows = (
+            db.query(
+                WatchlistAlert.id,
+                WatchlistAlert.alert_type,
+                WatchlistAlert.condition,
+                WatchlistAlert.threshold_value,
+                WatchlistItem.symbol,
+                WatchlistItem.added_price,
+            )
+            .join(WatchlistItem, WatchlistItem.id == WatchlistAlert.watchlist_item_id)
+            .filter(
+                WatchlistAlert.is_active == True,
+                WatchlistAlert.is_triggered == False,
+                WatchlistItem.alerts_enabled == True,
+            )
+            .all()
+        )
+
+        alerts = []
+        for alert_id, alert_type, condition, threshold, symbol, added_price in rows:
+            trigger = trigger_price(alert_type, condition, threshold, added_price)
+            if trigger is not None:
+                alerts.append((alert_id, symbol, *trigger))
+        return AlertIndex.build(alerts)
+
+    def invalidate(self) -> None:
+        """Reload the index on next use, after alerts or items changed."""
+        with self._lock:
+            self._index = None
+
+    def _current_index(self, db: Session) -> AlertIndex:
+        if self._index is None or time.monotonic() - self._loaded_at > self.refresh_seconds:
+            self._index = self.load_index(db)
+            self._loaded_at = time.monotonic()
+            logger.info("Loaded %d watchlist alerts into the alert index", len(self._index))
+        return self._index
+
+    def evaluate(self, db: Session, quotes: Mapping[str, Any]) -> Dict[int, Decimal]:
+        """
+        Trigger every alert crossed by a batch of quotes.
+
+        The UPDATE joins the caller's transaction; the caller commits.
+
+        Args:
+            db: Database session
+            quotes: Latest price per symbol (None prices are skipped)
+
+        Returns:
+            Triggering price per triggered alert id
+        """
+        prices = {
+            symbol.upper(): float(price)
+            for symbol, price in quotes.items()
+            if price is not None
+        }
+        with self._lock:
+            triggered = self._current_index(db).pop_crossed(prices)
+        if not triggered:
+            return {}
+
+        values = {symbol: Decimal(str(prices[symbol])) for symbol in set(triggered.values())}
+        alert_symbol = (
+            select(WatchlistItem.symbol)
+            .where(WatchlistItem.id == WatchlistAlert.watchlist_item_id)
+            .scalar_subquery()
+        )
+        statement = (
+            update(WatchlistAlert)
+            .where(
+                WatchlistAlert.id.in_(list(triggered)),
+                # Another worker may have triggered it already
+                WatchlistAlert.is_triggered == False,
+            )
+            .values(
+                is_triggered=True,
+                triggered_at=datetime.now(timezone.utc),
+                triggered_value=case(values, value=alert_symbol),
+            )
+            .execution_options(synchronize_session=False)
+        )
+        try:
+            db.execute(statement)
+        except Exception:
+            # The popped alerts are back in the index after the reload
+            self.invalidate()
+            raise
+
+        logger.info(
+            "Triggered %d watchlist alerts for %d symbols", len(triggered), len(values)
+        )
+        return {alert_id: values[symbol] for alert_id, symbol in triggered.items()}
+
+
+# Global instance; shared by every request of this worker
+alert_evaluation_engine = AlertEvaluationEngine()
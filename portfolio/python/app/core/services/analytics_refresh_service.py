@@ -0,0 +1,237 @@
+"""
+Analytics Refresh Service
+Refreshes every analytics artefact of a user as one concurrent job:
+price data for all distinct symbols is loaded once up front, then asset
+metrics, portfolio analytics and correlations fan out over that shared data,
+each computation on its own database session.
+"""
+
+import asyncio
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.config import settings
+from app.core.database.models import Asset, Portfolio, PortfolioAsset
+from app.core.services.portfolio_analytics_service import PortfolioAnalyticsService
+from app.core.services.shared_market_data import SharedMarketData
+
+logger = logging.getLogger(__name__)
+
+# Errors reported per item; anything else fails the whole refresh
+ITEM_ERRORS = (ValueError, RuntimeError)
+
+
+def _float_or_none(value: Any) -> Optional[float]:
+    """Decimal metric as a float; missing or zero values become None."""
+    return float(value) if value else None
+
+
+class AnalyticsRefreshService:
+    """Dependency-aware concurrent refresh of a user's analytics."""
+
+    def __init__(
+            self,
+            session_factory: Callable[[], Session],
+            max_concurrency: Optional[int] = None,
+            market_data: Optional[SharedMarketData] = None,
+    ) -> None:
+        self.session_factory = session_factory
+        self.max_concurrency = max_concurrency or settings.ANALYTICS_REFRESH_MAX_CONCURRENCY
+        self.market_data = market_data or SharedMarketData(
+            max_concurrency=self.max_concurrency
+        )
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    @classmethod
+    def for_session(cls, db: Session, **kwargs) -> "AnalyticsRefreshService":
+        """Build a service whose sessions share the engine of an existing session."""
+        return cls(
+            sessionmaker(autocommit=False, autoflush=False, bind=db.get_bind()),
+            **kwargs,
+        )
+
+    async def refresh_user_analytics(self, user_id: int) -> Dict[str, Any]:
+        """
+        Refresh asset metrics, portfolio analytics and correlations for a user.
+
+        Args:
+            user_id: Owner of the portfolios and assets to refresh
+
+        Returns:
+            Dictionary with per-asset and per-portfolio results and a summary
+        """
+        with self.session_factory() as db:
+            portfolios = [
+                (portfolio.id, portfolio.name)
+                for portfolio in db.query(Portfolio)
+                .filter(Portfolio.user_id == user_id, Portfolio.is_active == True)
+                .all()
+            ]
+            assets = [
+                (asset.id, asset.symbol)
+                for asset in db.query(Asset)
+                .filter(Asset.user_id == user_id, Asset.is_active == True)
+                .all()
+            ]
+            held_symbols = [
+                symbol
+                for (symbol,) in db.query(Asset.symbol)
+                .join(PortfolioAsset, PortfolioAsset.asset_id == Asset.id)
+                .filter(PortfolioAsset.portfolio_id.in_([p[0] for p in portfolios]))
+                .all()
+                if symbol
+            ]
+
+        updated_data = {
+            "user_id": user_id,
+            "update_timestamp": datetime.now(timezone.utc),
+            "portfolios_updated": 0,
+            "assets_updated": 0,
+            "errors": [],
+            "portfolio_summaries": [],
+            "asset_metrics": [],
+        }
+
+        # Stage 1: every distinct symbol's price data, fetched once
+        symbols = {symbol for _, symbol in assets if symbol} | set(held_symbols)
+        await self._prefetch(symbols)
+
+        # Stage 2: independent computations fan out over the shared data
+        symbol_assets = [(asset_id, symbol) for asset_id, symbol in assets if symbol]
+        correlation_jobs = (
+            [self._refresh_correlations([asset_id for asset_id, _ in symbol_assets])]
+            if len(symbol_assets) >= 2
+            else []
+        )
+        asset_results, portfolio_results, correlation_results = await asyncio.gather(
+            self._gather(self._refresh_asset(*asset) for asset in symbol_assets),
+            self._gather(self._refresh_portfolio(*portfolio) for portfolio in portfolios),
+            self._gather(correlation_jobs),
+        )
+
+        for (_, symbol), (result, error) in zip(symbol_assets, asset_results):
+            if error:
+                updated_data["errors"].append(f"Asset {symbol}: {error}")
+            else:
+                updated_data["asset_metrics"].append(result)
+                updated_data["assets_updated"] += 1
+
+        for (_, name), (result, error) in zip(portfolios, portfolio_results):
+            if error:
+                updated_data["errors"].append(f"Portfolio {name}: {error}")
+            else:
+                updated_data["portfolio_summaries"].append(result)
+                updated_data["portfolios_updated"] += 1
+
+        for _, error in correlation_results:
+            if error:
+                updated_data["errors"].append(f"Correlation matrix: {error}")
+
+        updated_data["summary"] = self._summarize(updated_data)
+        return updated_data
+
+    async def _prefetch(self, symbols: set) -> None:
+        now = datetime.now(timezone.utc)
+        await asyncio.gather(
+            self.market_data.prefetch_prices(symbols),
+            # The 1-year daily window used by asset metrics, snapshots and correlations
+            self.market_data.prefetch_history(
+                symbols,
+                start_date=(now - timedelta(days=365)).strftime("%Y-%m-%d"),
+                end_date=now.strftime("%Y-%m-%d"),
+                interval="1d",
+            ),
+        )
+
+    async def _gather(
+            self, jobs
+    ) -> List[Tuple[Optional[Dict[str, Any]], Optional[str]]]:
+        """Run jobs with bounded concurrency; item errors become (None, message)."""
+        outcomes = await asyncio.gather(
+            *(self._bounded(job) for job in jobs), return_exceptions=True
+        )
+        results = []
+        for outcome in outcomes:
+            if isinstance(outcome, ITEM_ERRORS):
+                results.append((None, str(outcome)))
+            elif isinstance(outcome, BaseException):
+                raise outcome
+            else:
+                results.append((outcome, None))
+        return results
+
+    async def _bounded(self, job: Awaitable) -> Any:
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        async with self._semaphore:
+            return await job
+
+    def _analytics(self, db: Session) -> PortfolioAnalyticsService:
+        return PortfolioAnalyticsService(db, market_data=self.market_data)
+
+    async def _refresh_asset(self, asset_id: int, symbol: str) -> Dict[str, Any]:
+        with self.session_factory() as db:
+            asset_metrics = await self._analytics(db).get_or_calculate_asset_metrics(
+                asset_id, force_refresh=True
+            )
+        return {
+            "asset_id": asset_id,
+            "symbol": symbol,
+            "current_price": _float_or_none(asset_metrics.current_price),
+            "price_change_percent": _float_or_none(asset_metrics.price_change_percent),
+            "updated": True,
+        }
+
+    async def _refresh_portfolio(self, portfolio_id: int, name: str) -> Dict[str, Any]:
+        # Snapshot and risk metrics feed the summary, so they run in order
+        with self.session_factory() as db:
+            analytics_service = self._analytics(db)
+            await analytics_service.get_or_create_performance_snapshot(
+                portfolio_id, force_refresh=True
+            )
+            risk_metrics = await analytics_service.get_or_calculate_portfolio_risk_metrics(
+                portfolio_id, force_refresh=True
+            )
+            portfolio_summary = await analytics_service.get_portfolio_analytics_summary(
+                portfolio_id
+            )
+        return {
+            "portfolio_id": portfolio_id,
+            "portfolio_name": name,
+            "total_value": _float_or_none(portfolio_summary["total_value"]) or 0,
+            "total_unrealized_pnl": _float_or_none(portfolio_summary["total_unrealized_pnl"]) or 0,
+            "total_unrealized_pnl_percent": (
+                _float_or_none(portfolio_summary["total_unrealized_pnl_percent"]) or 0
+            ),
+            "risk_level": getattr(risk_metrics, "risk_level", None),
+            "portfolio_volatility": _float_or_none(getattr(risk_metrics, "portfolio_volatility", None)),
+            "updated": True,
+        }
+
+    async def _refresh_correlations(self, asset_ids: List[int]) -> None:
+        # Every pair from one aligned returns array
+        with self.session_factory() as db:
+            await self._analytics(db).calculate_correlation_matrix(asset_ids)
+
+    @staticmethod
+    def _summarize(updated_data: Dict[str, Any]) -> Dict[str, Any]:
+        total_portfolio_value = sum(
+            p["total_value"] for p in updated_data["portfolio_summaries"]
+        )
+        total_unrealized_pnl = sum(
+            p["total_unrealized_pnl"] for p in updated_data["portfolio_summaries"]
+        )
+        cost_basis = total_portfolio_value - total_unrealized_pnl
+        return {
+            "total_portfolio_value": total_portfolio_value,
+            "total_unrealized_pnl": total_unrealized_pnl,
+            "total_unrealized_pnl_percent": (total_unrealized_pnl / cost_basis * 100) if cost_basis > 0 else 0,
+            "assets_with_current_data": len(
+                [a for a in updated_data["asset_metrics"] if a["current_price"] is not None]
+            ),
+            "successful_updates": updated_data["portfolios_updated"] + updated_data["assets_updated"],
+            "total_errors": len(updated_data["errors"]),
+        }
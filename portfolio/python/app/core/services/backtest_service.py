@@ -0,0 +1,335 @@
+"""
+Backtest Service
+Backtests the built-in trading strategies over a price history and sweeps
+their parameters. Performance is measured with the same CAGR, volatility,
+Sharpe and drawdown calculations as portfolios. Sweeps are split into chunks
+of parameter combinations that run on a process pool.
+"""
+
+import asyncio
+import itertools
+import logging
+import multiprocessing
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Any, Dict, List, Optional
+
+import polars as pl
+
+from app.config import settings
+from app.core.schemas.backtest import (
+    BacktestMetrics,
+    BacktestResult,
+    BacktestTrade,
+    EquityPoint,
+)
+from app.core.services.portfolio_calculation_service import (
+    PortfolioCalculationService,
+)
+from utils.trading_strategies import backtest
+
+logger = logging.getLogger(__name__)
+
+
+def _metrics(
+        simulated: pl.DataFrame,
+        trades: pl.DataFrame,
+        initial_capital: float,
+        risk_free_rate: float,
+) -> pl.DataFrame:
+    """Performance metrics per combo, one row each."""
+    trade_stats = trades.group_by("combo").agg(
+        pl.count().alias("trades"),
+        ((pl.col("return") > 0).mean() * 100).alias("win_rate_percent"),
+    )
+
+    rows = []
+    for part in simulated.partition_by("combo", maintain_order=True):
+        equity = part["equity"].to_pandas()
+        dates = part["date"]
+        years = (dates[-1] - dates[0]).days / 365.25
+        cagr = PortfolioCalculationService._annualized_return(
+            initial_capital, equity.iloc[-1], years
+        )
+        volatility = PortfolioCalculationService._annualized_volatility(
+            equity.pct_change()
+        )
+        rows.append(
+            {
+                "combo": part["combo"][0],
+                "total_return_percent": (equity.iloc[-1] / initial_capital - 1) * 100,
+                "cagr_percent": cagr,
+                "volatility_percent": volatility,
+                "sharpe_ratio": PortfolioCalculationService._calculate_sharpe_ratio(
+                    cagr, volatility, risk_free_rate
+                ),
+                "max_drawdown_percent": PortfolioCalculationService._max_drawdown(equity),
+                "exposure_percent": float((part["position"] != 0).mean() * 100),
+            }
+        )
+
+    metrics = pl.DataFrame(
+        rows,
+        schema={
+            "combo": pl.UInt32,
+            "total_return_percent": pl.Float64,
+            "cagr_percent": pl.Float64,
+            "volatility_percent": pl.Float64,
+            "sharpe_ratio": pl.Float64,
+            "max_drawdown_percent": pl.Float64,
+            "exposure_percent": pl.Float64,
+        },
+    )
+    return metrics.join(trade_stats, on="combo", how="left").with_columns(
+        pl.col("trades").fill_null(0).cast(pl.Int64)
+    )
+
+
+def run_backtests(
+        history: pl.DataFrame,
+        strategy: str,
+        combos: List[Dict[str, Any]],
+        commission: float = 0.0,
+        slippage: float = 0.0,
+        initial_capital: float = 10_000.0,
+        allow_short: bool = False,
+        risk_free_rate: float = 2.0,
+) -> pl.DataFrame:
+    """
+    Backtest several complete parameter combinations of a strategy at once.
+
+    Args:
+        history: Daily bars (date, close, ...), oldest first
+        strategy: Name in backtest.STRATEGIES
+        combos: Strategy parameters per combination
+
+    Returns:
+        The parameters and metrics of each combination, in input order
+    """
+    signals_for, _ = backtest.STRATEGIES[strategy]
+    simulated = backtest.simulate(
+        signals_for(history, combos),
+        commission=commission,
+        slippage=slippage,
+        initial_capital=initial_capital,
+        allow_short=allow_short,
+    )
+    trades = backtest.trades(simulated, commission=commission, slippage=slippage)
+    metrics = _metrics(simulated, trades, initial_capital, risk_free_rate)
+
+    parameters = pl.DataFrame(combos).with_row_count("combo")
+    return (
+        parameters.join(metrics, on="combo", how="left")
+        .sort("combo")
+        .drop("combo")
+    )
+
+
+class BacktestService:
+    """Strategy backtests and parallel parameter sweeps."""
+
+    def __init__(
+            self,
+            max_workers: Optional[int] = None,
+            chunk_size: Optional[int] = None,
+            executor: Optional[Executor] = None,
+    ) -> None:
+        self.max_workers = max_workers or settings.BACKTEST_MAX_WORKERS or os.cpu_count()
+        self.chunk_size = chunk_size or settings.BACKTEST_SWEEP_CHUNK_SIZE
+        self._executor = executor
+
+    @property
+    def executor(self) -> Executor:
+        """Lazily create the process pool."""
+        if self._executor is None:
+            # Forking a process that runs Polars and thread pools can deadlock
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return self._executor
+
+    @staticmethod
+    def get_strategies() -> Dict[str, Dict[str, Any]]:
+        """Strategies that can be backtested, with their default parameters."""
+        return {
+            name: dict(defaults)
+            for name, (_, defaults) in backtest.STRATEGIES.items()
+        }
+
+    @staticmethod
+    def _parameters(strategy: str, names: List[str]) -> Dict[str, Any]:
+        """
+        Default parameters of a strategy, after checking the given names.
+
+        Raises:
+            ValueError: If the strategy is unknown or does not take a parameter
+        """
+        if strategy not in backtest.STRATEGIES:
+            raise ValueError(
+                f"Unknown strategy '{strategy}'. Supported strategies: "
+                f"{', '.join(backtest.STRATEGIES)}"
+            )
+        _, defaults = backtest.STRATEGIES[strategy]
+        unknown = sorted(set(names) - set(defaults))
+        if unknown:
+            raise ValueError(
+                f"Unknown parameters for '{strategy}': {', '.join(unknown)}. "
+                f"Supported parameters: {', '.join(defaults)}"
+            )
+        return dict(defaults)
+
+    def backtest(
+            self,
+            history: pl.DataFrame,
+            strategy: str,
+            parameters: Optional[Dict[str, Any]] = None,
+            commission: float = 0.0,
+            slippage: float = 0.0,
+            initial_capital: float = 10_000.0,
+            allow_short: bool = False,
+            risk_free_rate: float = 2.0,
+    ) -> BacktestResult:
+        """
+        Backtest one strategy configuration.
+
+        Args:
+            history: Daily bars (date, close, ...), oldest first
+            strategy: Strategy name (see get_strategies)
+            parameters: Strategy parameters, defaults for the rest
+            commission: Fraction of the traded value paid per trade
+            slippage: Fraction of the traded value lost per trade
+            initial_capital: Starting equity
+            allow_short: Go short on Sell signals instead of flat
+            risk_free_rate: Annual risk-free rate for the Sharpe ratio, in percent
+
+        Returns:
+            Metrics, trade list and equity curve
+
+        Raises:
+            ValueError: If the strategy, its parameters or the history are invalid
+        """
+        parameters = parameters or {}
+        combo = {**self._parameters(strategy, list(parameters)), **parameters}
+        if history.is_empty():
+            raise ValueError("No price data found")
+
+        signals_for, _ = backtest.STRATEGIES[strategy]
+        simulated = backtest.simulate(
+            signals_for(history, [combo]),
+            commission=commission,
+            slippage=slippage,
+            initial_capital=initial_capital,
+            allow_short=allow_short,
+        )
+        trades = backtest.trades(simulated, commission=commission, slippage=slippage)
+        metrics = _metrics(simulated, trades, initial_capital, risk_free_rate).row(
+            0, named=True
+        )
+
+        return BacktestResult(
+            strategy=strategy,
+            parameters=combo,
+            metrics=BacktestMetrics(**metrics),
+            trades=[
+                BacktestTrade(
+                    side="long" if trade["side"] == 1 else "short",
+                    entry_date=trade["entry_date"].strftime("%Y-%m-%d"),
+                    entry_price=trade["entry_price"],
+                    exit_date=(
+                        trade["exit_date"].strftime("%Y-%m-%d")
+                        if trade["exit_date"] is not None
+                        else None
+                    ),
+                    exit_price=trade["exit_price"],
+                    return_percent=trade["return"] * 100,
+                    is_open=trade["is_open"],
+                )
+                for trade in trades.iter_rows(named=True)
+            ],
+            equity_curve=[
+                EquityPoint(date=date.strftime("%Y-%m-%d"), equity=equity, position=position)
+                for date, equity, position in simulated.select(
+                    "date", "equity", "position"
+                ).iter_rows()
+            ],
+        )
+
+    async def sweep(
+            self,
+            history: pl.DataFrame,
+            strategy: str,
+            grid: Dict[str, List[Any]],
+            commission: float = 0.0,
+            slippage: float = 0.0,
+            initial_capital: float = 10_000.0,
+            allow_short: bool = False,
+            risk_free_rate: float = 2.0,
+    ) -> pl.DataFrame:
+        """
+        Backtest every combination of a parameter grid.
+
+        Args:
+            history: Daily bars (date, close, ...), oldest first
+            strategy: Strategy name (see get_strategies)
+            grid: Values to try per parameter, defaults for the rest
+
+        Returns:
+            One row per combination with its parameters and metrics,
+            best Sharpe ratio first
+
+        Raises:
+            ValueError: If the strategy, its parameters or the history are invalid
+        """
+        defaults = self._parameters(strategy, list(grid))
+        if history.is_empty():
+            raise ValueError("No price data found")
+
+        names = list(grid)
+        combos = [
+            {**defaults, **dict(zip(names, values))}
+            for values in itertools.product(*(grid[name] for name in names))
+        ]
+        chunks = [
+            combos[i: i + self.chunk_size]
+            for i in range(0, len(combos), self.chunk_size)
+        ]
+        logger.info(
+            "Sweeping %d %s combinations in %d chunks", len(combos), strategy, len(chunks)
+        )
+
+        loop = asyncio.get_running_loop()
+        futures = [
+            loop.run_in_executor(
+                self.executor,
+                run_backtests,
+                history,
+                strategy,
+                chunk,
+                commission,
+                slippage,
+                initial_capital,
+                allow_short,
+                risk_free_rate,
+            )
+            for chunk in chunks
+        ]
+        try:
+            results = await asyncio.gather(*futures)
+        finally:
+            for future in futures:
+                future.cancel()
+
+        return pl.concat(results).sort(
+            "sharpe_ratio", descending=True, nulls_last=True
+        )
+
+    def shutdown(self, wait: bool = False) -> None:
+        """Shut down the process pool; it is recreated on next use."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait, cancel_futures=True)
+            self._executor = None
+
+
+# Global instance
+backtest_service = BacktestService()
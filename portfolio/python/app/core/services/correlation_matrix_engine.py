@@ -0,0 +1,178 @@
+"""
+Correlation Matrix Engine
+Vectorized pairwise correlations for many assets at once. Daily returns are
+aligned into one (dates x assets) array and every lookback window is turned
+into a full correlation matrix with a handful of matrix products, instead of
+merging and correlating the series one pair at a time.
+"""
+
+import logging
+from decimal import Decimal
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np  # type: ignore
+import pandas as pd  # type: ignore
+
+from app.config import settings
+from app.core.services.correlation_statistics import matrix_significance
+
+logger = logging.getLogger(__name__)
+
+# Trailing windows in trading days; None is the full (1-year) sample.
+# Metrics are only produced for pairs with at least this many joint returns.
+CORRELATION_WINDOWS: Dict[str, Tuple[Optional[int], int]] = {
+    "correlation_1y": (None, 252),
+    "correlation_6m": (126, 126),
+    "correlation_3m": (63, 63),
+    "correlation_1m": (21, 21),
+}
+
+# Latest value of rolling correlations; the whole window must be populated
+ROLLING_WINDOWS: Dict[str, int] = {
+    "rolling_correlation_60d": 60,
+    "rolling_correlation_20d": 20,
+}
+
+# Joint observations required before significance is reported
+MIN_SIGNIFICANCE_OBSERVATIONS = 30
+
+
+class CorrelationMatrixEngine:
+    """Computes correlation metrics for every asset pair from aligned returns."""
+
+    def __init__(
+            self,
+            significance_level: Optional[float] = None,
+            p_value_adjustment: Optional[str] = None,
+    ) -> None:
+        self.significance_level = significance_level or settings.CORRELATION_SIGNIFICANCE_LEVEL
+        self.p_value_adjustment = p_value_adjustment or settings.CORRELATION_P_VALUE_ADJUSTMENT
+
+    def returns_frame(self, closes: Dict[int, pd.Series]) -> pd.DataFrame:
+        """
+        Daily returns per asset aligned on one date index.
+
+        Args:
+            closes: Close prices per asset_id, indexed by date
+
+        Returns:
+            DataFrame (dates x asset_id) sorted by asset_id; NaN where an asset
+            has no return on a date
+        """
+        returns = {}
+        for asset_id, series in closes.items():
+            series = pd.Series(
+                series.to_numpy(dtype=float),
+                index=self._normalize_index(series.index),
+            )
+            series = series[~series.index.duplicated(keep="last")].sort_index()
+            returns[asset_id] = series.pct_change().iloc[1:]
+        frame = pd.DataFrame(returns).sort_index()
+        return frame.reindex(columns=sorted(frame.columns))
+
+    def correlation_matrix(self, returns: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Pairwise-complete Pearson correlation of every column pair.
+
+        Equivalent to np.corrcoef when there are no gaps; a pair only uses the
+        rows where both columns have a value.
+
+        Args:
+            returns: Array (observations x assets) with NaN for missing values
+
+        Returns:
+            (correlations, counts) as (assets x assets) arrays; correlations are
+            NaN where a pair has fewer than two joint observations or no variance
+        """
+        mask = ~np.isnan(returns)
+        values = np.where(mask, returns, 0.0)
+        weights = mask.astype(float)
+
+        counts = weights.T @ weights
+        # sums[i, j]: sum of column i over rows where column j is present too
+        sums = values.T @ weights
+        squares = (values ** 2).T @ weights
+        products = values.T @ values
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            covariance = counts * products - sums * sums.T
+            variance = (counts * squares - sums ** 2) * (counts * squares - sums ** 2).T
+            correlations = covariance / np.sqrt(variance)
+        correlations[(counts < 2) | ~(variance > 0)] = np.nan
+        return np.clip(correlations, -1.0, 1.0), counts
+
+    def pair_metrics(
+            self, returns: pd.DataFrame
+    ) -> Dict[Tuple[int, int], Dict[str, Any]]:
+        """
+        AssetCorrelation metrics for every pair of columns.
+
+        Args:
+            returns: Aligned returns from returns_frame
+
+        Returns:
+            Metrics keyed by (asset1_id, asset2_id) with asset1_id < asset2_id
+        """
+        asset_ids = list(returns.columns)
+        values = returns.to_numpy(dtype=float)
+        full_corr, full_counts = self.correlation_matrix(values)
+
+        matrices: Dict[str, np.ndarray] = {}
+        for column, (window, min_observations) in CORRELATION_WINDOWS.items():
+            if window is None:
+                corr, counts = full_corr, full_counts
+            else:
+                # Gate on the joint observations inside the window itself
+                corr, counts = self.correlation_matrix(values[-window:])
+            matrices[column] = np.where(counts >= min_observations, corr, np.nan)
+
+        for column, window in ROLLING_WINDOWS.items():
+            corr, counts = self.correlation_matrix(values[-window:])
+            matrices[column] = np.where(counts >= window, corr, np.nan)
+
+        significance = self.significance(full_corr, full_counts)
+        p_values = significance["adjusted_p_value"]
+
+        metrics: Dict[Tuple[int, int], Dict[str, Any]] = {}
+        rows, cols = np.triu_indices(len(asset_ids), k=1)
+        for i, j in zip(rows.tolist(), cols.tolist()):
+            pair: Dict[str, Any] = {}
+            for column, matrix in matrices.items():
+                value = matrix[i, j]
+                if not np.isnan(value):
+                    pair[column] = Decimal(str(round(float(value), 6)))
+            p_value = p_values[i, j]
+            if not np.isnan(p_value):
+                pair["p_value"] = Decimal(str(round(float(p_value), 6)))
+                pair["is_significant"] = bool(significance["is_significant"][i, j])
+            metrics[(asset_ids[i], asset_ids[j])] = pair
+        return metrics
+
+    def significance(
+            self, correlations: np.ndarray, counts: np.ndarray
+    ) -> Dict[str, np.ndarray]:
+        """
+        t-test p-values, corrected across all pairs, and Fisher-z intervals.
+
+        Pairs with fewer than MIN_SIGNIFICANCE_OBSERVATIONS joint returns are
+        not tested and do not count towards the correction.
+        """
+        tested_counts = np.where(
+            counts >= MIN_SIGNIFICANCE_OBSERVATIONS, counts, np.nan
+        )
+        return matrix_significance(
+            correlations,
+            tested_counts,
+            alpha=self.significance_level,
+            method=self.p_value_adjustment,
+        )
+
+    @staticmethod
+    def _normalize_index(index: pd.Index) -> pd.DatetimeIndex:
+        """Calendar dates as tz-naive midnight timestamps."""
+        timestamps = index
+        if not isinstance(timestamps, pd.DatetimeIndex):
+            timestamps = pd.DatetimeIndex(pd.to_datetime(index, cache=False))
+        if timestamps.tz is not None:
+            timestamps = timestamps.tz_localize(None)
+        return timestamps.normalize()
@@ -0,0 +1,163 @@
+"""
+Correlation Statistics
+Significance testing for Pearson correlations, vectorized over whole arrays:
+exact t-distribution p-values, Fisher-z confidence intervals and
+multiple-comparison correction across every pair of a correlation matrix.
+"""
+
+import logging
+from typing import Dict, Tuple
+
+import numpy as np  # type: ignore
+from scipy import stats  # type: ignore
+
+logger = logging.getLogger(__name__)
+
+# Multiple-comparison corrections accepted by adjust_p_values
+P_VALUE_ADJUSTMENTS = ("none", "bonferroni", "holm", "fdr_bh")
+
+
+def correlation_p_values(correlations: np.ndarray, counts: np.ndarray) -> np.ndarray:
+    """
+    Two-sided p-values for H0: rho = 0.
+
+    Uses t = r * sqrt((n - 2) / (1 - r^2)) with n - 2 degrees of freedom.
+
+    Args:
+        correlations: Pearson correlations (any shape)
+        counts: Observations behind each correlation (same shape)
+
+    Returns:
+        p-values; NaN where the correlation is NaN or n < 3
+    """
+    r = np.asarray(correlations, dtype=float)
+    n = np.asarray(counts, dtype=float)
+    dof = n - 2
+    with np.errstate(divide="ignore", invalid="ignore"):
+        t_stat = np.abs(r) * np.sqrt(dof / (1 - r ** 2))
+        p_values = 2 * stats.t.sf(t_stat, dof)
+    # |r| == 1 gives an infinite t statistic
+    p_values = np.where(np.isinf(t_stat) & (dof > 0), 0.0, p_values)
+    return np.where(dof > 0, p_values, np.nan)
+
+
+def fisher_confidence_intervals(
+        correlations: np.ndarray, counts: np.ndarray, confidence: float = 0.95
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Confidence intervals from the Fisher z-transform.
+
+    Args:
+        correlations: Pearson correlations (any shape)
+        counts: Observations behind each correlation (same shape)
+        confidence: Two-sided confidence level
+
+    Returns:
+        (lower, upper) bounds; NaN where n < 4
+    """
+    r = np.clip(np.asarray(correlations, dtype=float), -1.0, 1.0)
+    n = np.asarray(counts, dtype=float)
+    critical = stats.norm.ppf(0.5 + confidence / 2)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        z = np.arctanh(r)
+        margin = critical / np.sqrt(n - 3)
+        lower = np.tanh(z - margin)
+        upper = np.tanh(z + margin)
+    valid = n > 3
+    return np.where(valid, lower, np.nan), np.where(valid, upper, np.nan)
+
+
+def adjust_p_values(p_values: np.ndarray, method: str = "fdr_bh") -> np.ndarray:
+    """
+    Correct p-values for testing many hypotheses at once.
+
+    NaN entries are ignored and do not count towards the number of tests.
+
+    Args:
+        p_values: Raw p-values (any shape)
+        method: "none", "bonferroni", "holm" or "fdr_bh" (Benjamini-Hochberg)
+
+    Returns:
+        Adjusted p-values with the input's shape
+    """
+    if method not in P_VALUE_ADJUSTMENTS:
+        raise ValueError(f"Unknown p-value adjustment: {method}")
+
+    p = np.asarray(p_values, dtype=float)
+    adjusted = np.full(p.shape, np.nan)
+    valid = ~np.isnan(p)
+    tested = p[valid]
+    m = tested.size
+    if m == 0 or method == "none":
+        adjusted[valid] = tested
+        return adjusted
+
+    if method == "bonferroni":
+        adjusted[valid] = np.minimum(tested * m, 1.0)
+        return adjusted
+
+    order = np.argsort(tested, kind="mergesort")
+    ranked = tested[order]
+    if method == "holm":
+        # Step-down: p_(i) * (m - i + 1), made monotone non-decreasing
+        scaled = np.maximum.accumulate(ranked * (m - np.arange(m)))
+    else:
+        # Step-up: p_(i) * m / i, made monotone from the largest p down
+        scaled = np.minimum.accumulate((ranked * m / np.arange(1, m + 1))[::-1])[::-1]
+
+    result = np.empty(m)
+    result[order] = np.minimum(scaled, 1.0)
+    adjusted[valid] = result
+    return adjusted
+
+
+def matrix_significance(
+        correlations: np.ndarray,
+        counts: np.ndarray,
+        alpha: float = 0.05,
+        method: str = "fdr_bh",
+        confidence: float = 0.95,
+) -> Dict[str, np.ndarray]:
+    """
+    Significance of every pair in a symmetric correlation matrix.
+
+    The correction runs over the distinct pairs (upper triangle) only, so each
+    pair is counted once and the diagonal is never tested.
+
+    Args:
+        correlations: (assets x assets) correlation matrix
+        counts: Joint observations per pair (same shape)
+        alpha: Significance level for the adjusted p-values
+        method: Multiple-comparison correction, see adjust_p_values
+        confidence: Level of the Fisher-z confidence intervals
+
+    Returns:
+        Dict of (assets x assets) arrays: p_value, adjusted_p_value,
+        is_significant, ci_lower, ci_upper
+    """
+    correlations = np.asarray(correlations, dtype=float)
+    counts = np.asarray(counts, dtype=float)
+    size = correlations.shape[0]
+    rows, cols = np.triu_indices(size, k=1)
+
+    pair_p_values = correlation_p_values(correlations[rows, cols], counts[rows, cols])
+    pair_adjusted = adjust_p_values(pair_p_values, method)
+
+    p_values = np.full((size, size), np.nan)
+    adjusted = np.full((size, size), np.nan)
+    p_values[rows, cols] = p_values[cols, rows] = pair_p_values
+    adjusted[rows, cols] = adjusted[cols, rows] = pair_adjusted
+
+    lower, upper = fisher_confidence_intervals(correlations, counts, confidence)
+    np.fill_diagonal(lower, np.nan)
+    np.fill_diagonal(upper, np.nan)
+
+    with np.errstate(invalid="ignore"):
+        is_significant = adjusted < alpha
+    return {
+        "p_value": p_values,
+        "adjusted_p_value": adjusted,
+        "is_significant": is_significant,
+        "ci_lower": lower,
+        "ci_upper": upper,
+    }
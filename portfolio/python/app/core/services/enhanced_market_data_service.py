@@ -4,23 +4,24 @@ Comprehensive market data service with real-time updates and caching.
 """
 
 import asyncio
-from datetime import datetime, timedelta, timezone
-from typing import Any, Dict, List
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
 
 from sqlalchemy.orm import Session
 
 from app.core.database.models import Asset, PortfolioAsset
 from app.core.services.market_data_service import market_data_service
 from app.core.services.portfolio_analytics_service import PortfolioAnalyticsService
+from app.core.services.quote_cache import QuoteCache, quote_cache
 
 
 class EnhancedMarketDataService:
     """Enhanced market data service with caching and real-time updates."""
 
-    def __init__(self, db: Session):
+    def __init__(self, db: Session, cache: Optional[QuoteCache] = None):
         self.db = db
-        self.cache = {}  # In production, use Redis
-        self.cache_ttl = 300  # 5 minutes
+        # Shared across requests and workers; the service itself is per request
+        self.cache = cache or quote_cache
 
     async def update_all_portfolio_prices(self, portfolio_id: int) -> Dict[str, Any]:
         """Update prices for all assets in a portfolio."""
@@ -34,20 +35,13 @@ class EnhancedMarketDataService:
         if not portfolio_assets:
             return {"updated": 0, "errors": []}
 
-        updated_count = 0
-        errors = []
-
-        # Update prices for each asset
-        for portfolio_asset in portfolio_assets:
-            try:
-                await self.update_asset_price(portfolio_asset.asset_id)
-                updated_count += 1
-            except Exception as e:
-                errors.append({"asset_id": portfolio_asset.asset_id, "error": str(e)})
+        results = await self.bulk_update_prices(
+            [portfolio_asset.asset_id for portfolio_asset in portfolio_assets]
+        )
 
         return {
-            "updated": updated_count,
-            "errors": errors,
+            "updated": results["updated"],
+            "errors": results["errors"],
             "total_assets": len(portfolio_assets),
         }
 
@@ -58,15 +52,18 @@ class EnhancedMarketDataService:
         if not asset:
             raise ValueError(f"Asset {asset_id} not found")
 
-        # Check cache first
-        cache_key = f"price_{asset.symbol}"
-        if cache_key in self.cache:
-            cached_data = self.cache[cache_key]
-            if datetime.now(timezone.utc) - cached_data["timestamp"] < timedelta(
-                seconds=self.cache_ttl
-            ):
-                return cached_data["data"]
+        # Check cache first; Redis calls block, so they run off the event loop
+        cached_data = await asyncio.to_thread(self.cache.get, asset.symbol)
+        if cached_data is not None:
+            return {**cached_data, "asset_id": asset_id}
+
+        result = await self._fetch_quote(asset)
+        await asyncio.to_thread(self.cache.set, asset.symbol, result)
+        return result
 
+    async def _fetch_quote(self, asset: Asset) -> Dict[str, Any]:
+        """Fetch the latest quote for an asset from the market data service."""
+        asset_id = asset.id
         try:
             # Get current price from market data service
             current_price = await market_data_service.get_current_price(asset.symbol)
@@ -87,7 +84,6 @@ class EnhancedMarketDataService:
                     (change / previous_close) * 100 if previous_close > 0 else 0
                 )
 
-            # Cache the result
             result = {
                 "asset_id": asset_id,
                 "symbol": asset.symbol,
@@ -98,8 +94,6 @@ class EnhancedMarketDataService:
                 "updated_at": datetime.now(timezone.utc).isoformat(),
             }
 
-            self.cache[cache_key] = {"data": result, "timestamp": datetime.now(timezone.utc)}
-
             return result
 
         except Exception as e:
@@ -253,49 +247,55 @@ class EnhancedMarketDataService:
         """Bulk update prices for multiple assets."""
         results = {"updated": 0, "errors": [], "total": len(asset_ids)}
 
+        assets = {
+            asset.id: asset
+            for asset in self.db.query(Asset).filter(Asset.id.in_(asset_ids)).all()
+        }
+        for asset_id in asset_ids:
+            if asset_id not in assets:
+                results["errors"].append(
+                    {"asset_id": asset_id, "error": f"Asset {asset_id} not found"}
+                )
+
+        # One MGET for every symbol; only misses go to the market data service
+        cached = await asyncio.to_thread(
+            self.cache.get_many, {asset.symbol for asset in assets.values()}
+        )
+        missing = []
+        for asset in assets.values():
+            if asset.symbol in cached:
+                results["updated"] += 1
+            else:
+                missing.append(asset)
+
         # Process in batches to avoid overwhelming the API
         batch_size = 10
-        for i in range(0, len(asset_ids), batch_size):
-            batch = asset_ids[i : i + batch_size]
+        fetched = {}
+        for i in range(0, len(missing), batch_size):
+            batch = missing[i : i + batch_size]
 
             # Process batch concurrently
-            tasks = [self.update_asset_price(asset_id) for asset_id in batch]
+            tasks = [self._fetch_quote(asset) for asset in batch]
             batch_results = await asyncio.gather(*tasks, return_exceptions=True)
 
-            for j, result in enumerate(batch_results):
+            for asset, result in zip(batch, batch_results):
                 if isinstance(result, Exception):
                     results["errors"].append(
-                        {"asset_id": batch[j], "error": str(result)}
+                        {"asset_id": asset.id, "error": str(result)}
                     )
                 else:
+                    fetched[asset.symbol] = result
                     results["updated"] += 1
 
+        # One MSET for everything fetched
+        await asyncio.to_thread(self.cache.set_many, fetched)
+
         return results
 
     def clear_cache(self, pattern: str = None) -> None:
         """Clear cache entries."""
-        if pattern:
-            keys_to_remove = [k for k in self.cache.keys() if pattern in k]
-            for key in keys_to_remove:
-                del self.cache[key]
-        else:
-            self.cache.clear()
+        self.cache.clear(pattern)
 
     def get_cache_stats(self) -> Dict[str, Any]:
-        """Get cache statistics."""
-        now = datetime.now(timezone.utc)
-        valid_entries = 0
-        expired_entries = 0
-
-        for entry in self.cache.values():
-            if now - entry["timestamp"] < timedelta(seconds=self.cache_ttl):
-                valid_entries += 1
-            else:
-                expired_entries += 1
-
-        return {
-            "total_entries": len(self.cache),
-            "valid_entries": valid_entries,
-            "expired_entries": expired_entries,
-            "cache_ttl_seconds": self.cache_ttl,
-        }
+        """Get cache hit/miss statistics."""
+        return self.cache.stats()
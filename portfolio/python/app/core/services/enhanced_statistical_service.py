@@ -3,8 +3,10 @@ Enhanced Statistical Service
 Service for calculating indicators with user configurations and chart data generation.
 """
 
+import io
+import json
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 import polars as pl
 from sqlalchemy.orm import Session
@@ -35,14 +37,71 @@ class EnhancedStatisticalService:
             self, request: IndicatorCalculationRequest
     ) -> IndicatorCalculationResponse:
         """Calculate indicators based on user configuration."""
+        result_df, indicator_configs, configuration_name, performance_metrics = (
+            await self._calculate(request)
+        )
+        try:
+            fields = self._response_fields(
+                request, result_df, indicator_configs, configuration_name,
+                performance_metrics,
+            )
+            return IndicatorCalculationResponse(
+                **fields,
+                data=self._serializable_frame(result_df).to_dicts(),
+                indicator_series=self._prepare_indicator_series(
+                    result_df, indicator_configs
+                ),
+                volume_data=self._prepare_volume_data(result_df),
+            )
+        except Exception as e:
+            raise ValueError(f"Error calculating indicators: {str(e)}") from e
+
+    async def calculate_indicators_json(
+            self, request: IndicatorCalculationRequest
+    ) -> bytes:
+        """
+        Calculate indicators and serialize the response straight from the columns.
+
+        Produces the IndicatorCalculationResponse payload, but the row arrays
+        are written as JSON by Polars from Arrow memory instead of being
+        materialized as Python dicts and validated model by model.
+        """
+        result_df, indicator_configs, configuration_name, performance_metrics = (
+            await self._calculate(request)
+        )
+        try:
+            fields = self._response_fields(
+                request, result_df, indicator_configs, configuration_name,
+                performance_metrics,
+            )
+            series = self._indicator_series_frames(result_df, indicator_configs)
+            buffer = io.BytesIO()
+            self._write_json_object(
+                buffer,
+                fields,
+                data=self._serializable_frame(result_df),
+                indicator_series=[
+                    (series_fields, {"data": data_points})
+                    for series_fields, data_points in series
+                ],
+                volume_data=self._volume_frame(result_df),
+            )
+            return buffer.getvalue()
+        except Exception as e:
+            raise ValueError(f"Error calculating indicators: {str(e)}") from e
+
+    async def _calculate(
+            self, request: IndicatorCalculationRequest
+    ) -> Tuple[pl.DataFrame, List[IndicatorConfiguration], str, Any]:
+        """Fetch market data and calculate the requested indicators on it."""
 
         try:
-            # Get market data
-            market_data = await self.market_data_service.fetch_ticker_data(
+            # Get market data, oldest first with snake_case columns
+            market_data = await self.market_data_service.fetch_ticker_frame(
                 symbol=request.symbol, period=request.period, interval=request.interval
             )
 
-            if market_data.empty:
+            if market_data.is_empty():
                 raise ValueError(f"No market data found for symbol {request.symbol}")
 
             # Get indicator configurations
@@ -74,33 +133,18 @@ class EnhancedStatisticalService:
                 raise ValueError(f"Validation errors: {error_messages}")
 
             # Calculate indicators
-            result_df, _, performance_metrics = (
-                self.indicator_registry.calculate_indicators(
-                    market_data, indicator_configs
+            if request.incremental:
+                result_df, _, performance_metrics = (
+                    self.indicator_registry.calculate_indicators_incremental(
+                        request.symbol, request.interval, market_data, indicator_configs
+                    )
+                )
+            else:
+                result_df, _, performance_metrics = (
+                    self.indicator_registry.calculate_indicators(
+                        market_data, indicator_configs
+                    )
                 )
-            )
-
-            # Convert to response format
-            data_records = result_df.to_dicts()
-
-            # Extract indicator names that were applied
-            applied_indicators = [
-                config.indicator_name for config in indicator_configs if config.enabled
-            ]
-
-            # Generate enhanced response data
-            indicator_series = self._prepare_indicator_series(
-                result_df, indicator_configs
-            )
-            volume_data = self._prepare_volume_data(result_df)
-            metadata = self._prepare_metadata(
-                request.symbol,
-                request.period,
-                request.interval,
-                result_df,
-                len(applied_indicators),
-                performance_metrics,
-            )
 
             # Increment usage count if using a saved configuration
             if request.configuration_id:
@@ -108,32 +152,95 @@ class EnhancedStatisticalService:
                     request.configuration_id
                 )
 
-            return IndicatorCalculationResponse(
-                symbol=request.symbol,
-                period=request.period,
-                interval=request.interval,
-                start_date=(
-                    market_data["date"].min()
-                    if "date" in market_data.columns
-                    else datetime.now()
-                ),
-                end_date=(
-                    market_data["date"].max()
-                    if "date" in market_data.columns
-                    else datetime.now()
-                ),
-                configuration_name=configuration_name,
-                data=data_records,
-                indicators_applied=applied_indicators,
-                total_records=len(data_records),
-                indicator_series=indicator_series,
-                volume_data=volume_data,
-                metadata=metadata,
-            )
+            return result_df, indicator_configs, configuration_name, performance_metrics
 
         except Exception as e:
             raise ValueError(f"Error calculating indicators: {str(e)}") from e
 
+    def _response_fields(
+            self,
+            request: IndicatorCalculationRequest,
+            df: pl.DataFrame,
+            indicator_configs: List[IndicatorConfiguration],
+            configuration_name: str,
+            performance_metrics: Any,
+    ) -> Dict[str, Any]:
+        """Scalar fields of IndicatorCalculationResponse."""
+        # Extract indicator names that were applied
+        applied_indicators = [
+            config.indicator_name for config in indicator_configs if config.enabled
+        ]
+        has_dates = "date" in df.columns and not df.is_empty()
+        return {
+            "symbol": request.symbol,
+            "period": request.period,
+            "interval": request.interval,
+            "start_date": (
+                df["date"].min().isoformat() if has_dates else datetime.now().isoformat()
+            ),
+            "end_date": (
+                df["date"].max().isoformat() if has_dates else datetime.now().isoformat()
+            ),
+            "configuration_name": configuration_name,
+            "indicators_applied": applied_indicators,
+            "total_records": len(df),
+            "metadata": self._prepare_metadata(
+                request.symbol,
+                request.period,
+                request.interval,
+                df,
+                len(applied_indicators),
+                performance_metrics,
+            ),
+        }
+
+    @classmethod
+    def _write_json_object(
+            cls, buffer: io.BytesIO, fields: Dict[str, Any], **frames: Any
+    ) -> None:
+        """
+        Write a JSON object whose row arrays are serialized by Polars.
+
+        Args:
+            buffer: Output buffer
+            fields: Plain members, serialized with json
+            frames: Array members, each a DataFrame written as an array of
+                row objects or a list of (fields, frames) nested objects
+        """
+        members = [
+            f"{json.dumps(key)}:{json.dumps(value, default=str)}"
+            for key, value in fields.items()
+        ]
+        buffer.write(("{" + ",".join(members)).encode())
+        separator = "," if members else ""
+        for key, value in frames.items():
+            buffer.write(f"{separator}{json.dumps(key)}:".encode())
+            separator = ","
+            if isinstance(value, pl.DataFrame):
+                value.write_json(buffer, row_oriented=True)
+                continue
+            buffer.write(b"[")
+            for position, (nested_fields, nested_frames) in enumerate(value):
+                if position:
+                    buffer.write(b",")
+                cls._write_json_object(buffer, nested_fields, **nested_frames)
+            buffer.write(b"]")
+        buffer.write(b"}")
+
+    @staticmethod
+    def _serializable_frame(df: pl.DataFrame) -> pl.DataFrame:
+        """The frame with dates as ISO 8601 strings, as datetime.isoformat() renders them."""
+        date_strings = []
+        for column, dtype in df.schema.items():
+            if dtype == pl.Datetime:
+                offset = "%:z" if dtype.time_zone else ""
+                date_strings.append(
+                    pl.col(column).dt.strftime(f"%Y-%m-%dT%H:%M:%S%.f{offset}")
+                )
+            elif dtype == pl.Date:
+                date_strings.append(pl.col(column).cast(pl.Utf8))
+        return df.with_columns(date_strings) if date_strings else df
+
     def _prepare_indicator_data(
             self, df: pl.DataFrame, indicator_configs: List[IndicatorConfiguration]
     ) -> List[Dict[str, Any]]:
@@ -154,19 +261,7 @@ class EnhancedStatisticalService:
             # Prepare data for each output column
             for output_col in indicator_def.output_columns:
                 if output_col in df.columns:
-                    data_points = []
-                    for row in df.to_dicts():
-                        if output_col in row and row[output_col] is not None:
-                            data_points.append(
-                                {
-                                    "x": (
-                                        row["date"].isoformat()
-                                        if isinstance(row["date"], datetime)
-                                        else str(row["date"])
-                                    ),
-                                    "y": float(row[output_col]),
-                                }
-                            )
+                    data_points = self._xy_points(df, output_col)
 
                     if data_points:
                         indicator_data.append(
@@ -187,49 +282,55 @@ class EnhancedStatisticalService:
 
         return indicator_data
 
+    def _volume_frame(self, df: pl.DataFrame) -> pl.DataFrame:
+        """Date and volume columns of the bars that have a volume."""
+        if "volume" not in df.columns or "date" not in df.columns:
+            return pl.DataFrame(
+                schema={"date": pl.Utf8, "volume": pl.Float64, "color": pl.Utf8}
+            )
+        return (
+            self._serializable_frame(df.select("date", "volume"))
+            .lazy()
+            .filter(pl.col("volume").is_not_null())
+            .select(
+                pl.col("date"),
+                pl.col("volume").cast(pl.Float64),
+                pl.lit(None, dtype=pl.Utf8).alias("color"),
+            )
+            .collect()
+        )
+
     def _prepare_volume_data(self, df: pl.DataFrame) -> List[VolumeDataPoint]:
         """Prepare volume data for indicator calculation response."""
-        volume_data = []
-
-        for row in df.to_dicts():
-            if "volume" in row and "date" in row and row["volume"] is not None:
-                volume_data.append(
-                    VolumeDataPoint(
-                        date=(
-                            row["date"].isoformat()
-                            if isinstance(row["date"], datetime)
-                            else str(row["date"])
-                        ),
-                        volume=float(row["volume"]),
-                    )
-                )
-
-        return volume_data
+        return [
+            VolumeDataPoint(**point) for point in self._volume_frame(df).to_dicts()
+        ]
 
     def _prepare_volume_data_for_chart(self, df: pl.DataFrame) -> List[Dict[str, Any]]:
         """Prepare volume data for chart response (legacy format)."""
-        volume_data = []
-
-        for row in df.to_dicts():
-            if "volume" in row and "date" in row and row["volume"] is not None:
-                volume_data.append(
-                    {
-                        "x": (
-                            row["date"].isoformat()
-                            if isinstance(row["date"], datetime)
-                            else str(row["date"])
-                        ),
-                        "y": float(row["volume"]),
-                    }
-                )
-
-        return volume_data
+        return self._xy_points(df, "volume")
+
+    def _xy_points(self, df: pl.DataFrame, column: str) -> List[Dict[str, Any]]:
+        """Non-null values of a column as {"x": ISO date, "y": value} points."""
+        if column not in df.columns or "date" not in df.columns:
+            return []
+        return (
+            self._serializable_frame(df.select("date", column))
+            .lazy()
+            .filter(pl.col(column).is_not_null())
+            .select(pl.col("date").alias("x"), pl.col(column).cast(pl.Float64).alias("y"))
+            .collect()
+            .to_dicts()
+        )
 
-    def _prepare_indicator_series(
+    def _indicator_series_frames(
             self, df: pl.DataFrame, indicator_configs: List[IndicatorConfiguration]
-    ) -> List[Dict[str, Any]]:
-        """Prepare indicator series data for charts using efficient, vectorized operations."""  # noqa: E501
-        indicator_series = []
+    ) -> List[Tuple[Dict[str, Any], pl.DataFrame]]:
+        """Series fields and data point frames of every indicator output."""
+        series_frames = []
+        if "date" not in df.columns:
+            return series_frames
+        dates = self._serializable_frame(df.select("date"))["date"]
 
         for config in indicator_configs:
             if not config.enabled or not config.id:
@@ -250,12 +351,11 @@ class EnhancedStatisticalService:
 
                 data_points = (
                     df.lazy()
+                    .with_columns(dates)
                     .filter(pl.col(col_name).is_not_null())
                     .select(
                         [
-                            pl.col("date")
-                            .dt.strftime("%Y-%m-%dT%H:%M:%S%.f")
-                            .alias("date"),
+                            pl.col("date"),
                             pl.col(col_name).cast(pl.Float64).alias("value"),
                             (
                                     pl.col(col_name).cast(pl.Utf8)
@@ -272,32 +372,44 @@ class EnhancedStatisticalService:
                         ]
                     )
                     .collect()
-                    .to_dicts()
                 )
 
-                if data_points:
-                    indicator_series.append(
-                        {
-                            "id": f"{config.id}_{output_col}",
-                            "indicator_name": config.indicator_name,
-                            "display_name": (
-                                f"{config.display_name or config.indicator_name} "
-                                f"({output_col})"
-                            ),
-                            "data": data_points,
-                            "color": config.color or "#000000",
-                            "line_style": config.line_style or "solid",
-                            "line_width": config.line_width or 1,
-                            "y_axis": config.y_axis or "secondary",
-                            "z_index": config.z_index or 0,
-                            "opacity": config.opacity or 1.0,
-                            "show_in_legend": config.show_in_legend,
-                            "group": config.group,
-                            "parameters": config.parameters,
-                        }
+                if not data_points.is_empty():
+                    series_frames.append(
+                        (
+                            {
+                                "id": f"{config.id}_{output_col}",
+                                "indicator_name": config.indicator_name,
+                                "display_name": (
+                                    f"{config.display_name or config.indicator_name} "
+                                    f"({output_col})"
+                                ),
+                                "color": config.color or "#000000",
+                                "line_style": config.line_style or "solid",
+                                "line_width": config.line_width or 1,
+                                "y_axis": config.y_axis or "secondary",
+                                "z_index": config.z_index or 0,
+                                "opacity": config.opacity or 1.0,
+                                "show_in_legend": config.show_in_legend,
+                                "group": config.group,
+                                "parameters": config.parameters,
+                            },
+                            data_points,
+                        )
                     )
 
-        return indicator_series
+        return series_frames
+
+    def _prepare_indicator_series(
+            self, df: pl.DataFrame, indicator_configs: List[IndicatorConfiguration]
+    ) -> List[Dict[str, Any]]:
+        """Prepare indicator series data for charts using efficient, vectorized operations."""  # noqa: E501
+        return [
+            {**series, "data": data_points.to_dicts()}
+            for series, data_points in self._indicator_series_frames(
+                df, indicator_configs
+            )
+        ]
 
     def _prepare_metadata(
             self,
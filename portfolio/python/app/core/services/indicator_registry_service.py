@@ -7,7 +7,7 @@ import inspect
 import json
 import time
 from datetime import datetime
-from typing import Any, Dict, List, Optional, Tuple, Type
+from typing import Any, Callable, Dict, List, Optional, Tuple, Type, Union
 
 import pandas as pd
 import polars as pl
@@ -23,6 +23,11 @@ from app.core.schemas.statistical_indicators import (
     IndicatorPerformanceMetrics,
     IndicatorValidationError,
 )
+from app.core.services.indicator_state_store import (
+    IndicatorStateStore,
+    indicator_state_store,
+)
+from utils.indicators.base import COLUMN_NAME_MAPPING
 from utils.indicators.momentum_indicators import MomentumIndicators
 from utils.indicators.trend_indicators import TrendIndicators
 from utils.indicators.volatility_indicators import VolatilityIndicators
@@ -32,8 +37,9 @@ from utils.indicators.volume_indicators import VolumeIndicators
 class IndicatorRegistryService:
     """Service for managing and executing statistical indicators."""
 
-    def __init__(self, db: Session):
+    def __init__(self, db: Session, state_store: Optional[IndicatorStateStore] = None):
         self.db = db
+        self.state_store = state_store or indicator_state_store
         self._indicator_registry: Dict[str, IndicatorDefinition] = {}
         self._indicator_classes: Dict[str, Type] = {}
         self._initialize_registry()
@@ -334,19 +340,23 @@ class IndicatorRegistryService:
         return errors
 
     def calculate_indicators(
-        self, data: pd.DataFrame, configurations: List[IndicatorConfiguration]
+        self,
+        data: Union[pd.DataFrame, pl.DataFrame],
+        configurations: List[IndicatorConfiguration],
     ) -> Tuple[
         pl.DataFrame, List[IndicatorCalculationError], IndicatorPerformanceMetrics
     ]:
         """
         Calculate indicators based on a list of configurations.
-        Accepts a pandas DataFrame and converts it internally to Polars for processing.
+        Accepts a Polars DataFrame, or a pandas one which is converted to Polars.
+        The expressions of all configurations are combined into one lazy query so
+        Polars can share common subexpressions and materializes the result once.
         """
         start_time = time.time()
         errors = []
 
         try:
-            result_df = pl.from_pandas(data)
+            result_df = self._as_polars(data)
         except Exception as e:
             err = self._create_calculation_error(
                 "DataFrame Conversion",
@@ -360,36 +370,141 @@ class IndicatorRegistryService:
 
         indicators_by_class = self._group_configs_by_class(configurations, errors)
 
-        for class_name, configs in indicators_by_class.items():
-            try:
-                indicator_class = self._indicator_classes[class_name]
-                indicator_instance = indicator_class(result_df)
-
-                for config, indicator_def in configs:
-                    try:
-                        method = getattr(indicator_instance, indicator_def.method_name)
-                        temp_df = method(**config.parameters)
-
-                        rename_mapping = {
-                            col: f"{col}_{config.id}"
-                            for col in indicator_def.output_columns
-                            if col in temp_df.columns and config.id
-                        }
-
-                        result_df = result_df.with_columns(
-                            temp_df.rename(rename_mapping)
+        # One lazy plan for every configuration, materialized once
+        plan = result_df.lazy().with_columns(self._normalized_column_expressions(result_df))
+        available_columns = set(plan.columns)
+        expressions_by_config = []
+        for configs in indicators_by_class.values():
+            for config, indicator_def in configs:
+                try:
+                    missing = set(indicator_def.required_columns) - available_columns
+                    if missing:
+                        raise ValueError(f"Missing required columns: {sorted(missing)}")
+
+                    expression_method = self._expression_method(indicator_def)
+                    outputs = expression_method(**config.parameters)
+                    expressions_by_config.append(
+                        (
+                            config,
+                            [
+                                expr.alias(f"{col}_{config.id}") if config.id else expr
+                                for col, expr in outputs.items()
+                            ],
                         )
+                    )
+                except Exception as e:
+                    errors.append(
+                        self._create_calculation_error(config.indicator_name, e)
+                    )
 
-                    except Exception as e:
-                        errors.append(
-                            self._create_calculation_error(config.indicator_name, e)
+        try:
+            result_df = plan.with_columns(
+                [expr for _, exprs in expressions_by_config for expr in exprs]
+            ).collect()
+        except Exception:
+            # Evaluate configurations one by one to attribute the failure
+            result_df = plan.collect()
+            for config, exprs in expressions_by_config:
+                try:
+                    result_df = result_df.with_columns(exprs)
+                except Exception as e:
+                    errors.append(
+                        self._create_calculation_error(config.indicator_name, e)
+                    )
+
+        end_time = time.time()
+        performance_metrics = self._calculate_performance_metrics(
+            start_time, end_time, result_df, configurations, errors
+        )
+        return result_df, errors, performance_metrics
+
+    def _expression_method(self, indicator_def: IndicatorDefinition) -> Callable:
+        """The `*_expressions` counterpart of an indicator method."""
+        indicator_class = self._indicator_classes[indicator_def.class_name]
+        base_name = indicator_def.method_name[: -len("_indicator")]
+        return getattr(indicator_class, f"{base_name}_expressions")
+
+    @staticmethod
+    def _normalized_column_expressions(df: pl.DataFrame) -> List[pl.Expr]:
+        """Snake_case copies of the OHLCV columns the indicator expressions read."""
+        return [
+            pl.col(original).alias(name)
+            for original, name in COLUMN_NAME_MAPPING.items()
+            if original in df.columns
+        ]
+
+    def calculate_indicators_incremental(
+        self,
+        symbol: str,
+        interval: str,
+        data: Union[pd.DataFrame, pl.DataFrame],
+        configurations: List[IndicatorConfiguration],
+    ) -> Tuple[
+        pl.DataFrame, List[IndicatorCalculationError], IndicatorPerformanceMetrics
+    ]:
+        """
+        Calculate indicators reusing streaming state from earlier calls.
+
+        Same result shape as calculate_indicators, with rows in ascending date
+        order. Bars are kept once per symbol and interval and each
+        configuration only computes the bars it has not seen yet; histories
+        without a date column fall back to the full calculation.
+        """
+        start_time = time.time()
+        errors = []
+
+        try:
+            base_df = self._incremental_base_frame(data)
+        except Exception as e:
+            err = self._create_calculation_error(
+                "DataFrame Conversion",
+                e,
+                f"Failed to convert pandas DataFrame to Polars: {e}",
+            )
+            performance_metrics = self._calculate_performance_metrics(
+                start_time, time.time(), pl.DataFrame(), configurations, [err]
+            )
+            return pl.DataFrame(), [err], performance_metrics
+
+        if "date" not in base_df.columns:
+            return self.calculate_indicators(data, configurations)
+
+        bar_columns = [
+            col
+            for col in ("open", "high", "low", "close", "volume")
+            if col in base_df.columns
+        ]
+        # Columns are shared, not copied; the store only reads the new rows
+        bars = base_df.select(["date", *bar_columns])
+
+        result_df = base_df
+        indicators_by_class = self._group_configs_by_class(configurations, errors)
+        for configs in indicators_by_class.values():
+            for config, indicator_def in configs:
+                try:
+                    missing = set(indicator_def.required_columns) - set(bar_columns)
+                    if missing:
+                        raise ValueError(
+                            f"Missing required columns: {sorted(missing)}"
                         )
 
-            except Exception as e:
-                for config, _ in configs:
-                    msg = f"Failed to initialize class {class_name}: {e}"
+                    temp_df = self.state_store.compute(
+                        symbol,
+                        interval,
+                        indicator_def.method_name,
+                        config.parameters,
+                        bars,
+                    )
+                    rename_mapping = {
+                        col: f"{col}_{config.id}"
+                        for col in indicator_def.output_columns
+                        if col in temp_df.columns and config.id
+                    }
+                    result_df = result_df.with_columns(temp_df.rename(rename_mapping))
+
+                except Exception as e:
                     errors.append(
-                        self._create_calculation_error(config.indicator_name, e, msg)
+                        self._create_calculation_error(config.indicator_name, e)
                     )
 
         end_time = time.time()
@@ -398,6 +513,23 @@ class IndicatorRegistryService:
         )
         return result_df, errors, performance_metrics
 
+    def _incremental_base_frame(
+        self, data: Union[pd.DataFrame, pl.DataFrame]
+    ) -> pl.DataFrame:
+        """Input columns plus their normalized names, one row per date, oldest first."""
+        df = self._as_polars(data)
+        df = df.with_columns(self._normalized_column_expressions(df))
+        if "date" not in df.columns:
+            return df
+        if not df["date"].is_sorted():
+            df = df.sort("date")
+        return df.unique(subset="date", keep="last", maintain_order=True)
+
+    @staticmethod
+    def _as_polars(data: Union[pd.DataFrame, pl.DataFrame]) -> pl.DataFrame:
+        """Polars frames are used as they are; pandas frames are converted."""
+        return data if isinstance(data, pl.DataFrame) else pl.from_pandas(data)
+
     def _group_configs_by_class(
         self,
         configurations: List[IndicatorConfiguration],
@@ -0,0 +1,267 @@
+"""
+Indicator State Store
+Keeps streaming indicator kernels alive between requests so a history that
+only grew by a few bars is extended instead of recomputed from scratch.
+Bars are stored once per symbol and interval and shared by the streams of
+every indicator and parameter set computed over them; series are evicted
+least-recently-used.
+"""
+
+import copy
+import json
+import logging
+import threading
+from collections import OrderedDict
+from functools import partial
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import polars as pl
+
+from app.config import settings
+from utils.indicators.streaming_indicators import (
+    STREAMING_INDICATORS,
+    StreamingIndicator,
+)
+
+logger = logging.getLogger(__name__)
+
+SeriesKey = Tuple[str, str]
+StreamKey = Tuple[str, str]
+
+# Appends add a chunk each; merge them once this many have piled up
+MAX_CHUNKS = 64
+
+
+def _append(frame: Optional[pl.DataFrame], rows: pl.DataFrame) -> pl.DataFrame:
+    """Append rows without copying the existing frame on every call."""
+    if frame is None:
+        return rows
+    frame = frame.vstack(rows)
+    if frame.n_chunks() > MAX_CHUNKS:
+        frame = frame.rechunk()
+    return frame
+
+
+class IndicatorStream:
+    """Outputs of one kernel over the bars of a BarSeries, with its live state."""
+
+    def __init__(self, kernel_factory: Callable[[], StreamingIndicator]) -> None:
+        self.kernel_factory = kernel_factory
+        self.reset()
+
+    def __len__(self) -> int:
+        return 0 if self.frame is None else self.frame.height
+
+    def reset(self) -> None:
+        self.kernel: StreamingIndicator = self.kernel_factory()
+        # Kernel state before the last bar, so a revised last bar can be redone
+        self.checkpoint: Optional[StreamingIndicator] = None
+        self.frame: Optional[pl.DataFrame] = None
+
+    def rewind(self) -> None:
+        """Drop the last bar; without a checkpoint the stream starts over."""
+        if self.checkpoint is None:
+            self.reset()
+            return
+        self.kernel = self.checkpoint
+        self.checkpoint = None
+        self.frame = self.frame.slice(0, self.frame.height - 1)
+
+    def extend(self, bars: pl.DataFrame) -> None:
+        """Feed bars following the ones already computed through the kernel."""
+        rows = bars.rows(named=True)
+        if not rows:
+            return
+
+        schema = self.kernel.output_schema
+        columns: Dict[str, List[Any]] = {column: [] for column in schema}
+        for position, bar in enumerate(rows):
+            if position == len(rows) - 1:
+                self.checkpoint = copy.deepcopy(self.kernel)
+            for column, value in self.kernel.update(bar).items():
+                columns[column].append(value)
+
+        self.frame = _append(
+            self.frame,
+            pl.DataFrame(
+                [pl.Series(column, columns[column], dtype=dtype) for column, dtype in schema.items()]
+            ),
+        )
+
+
+class BarSeries:
+    """Ascending bar history of one symbol and interval and the streams over it."""
+
+    def __init__(self) -> None:
+        self.bars: Optional[pl.DataFrame] = None
+        self.streams: Dict[StreamKey, IndicatorStream] = {}
+        self.lock = threading.Lock()
+
+    def sync(self, bars: pl.DataFrame) -> Tuple[int, int]:
+        """
+        Bring the stored bars up to date with a history.
+
+        Resuming only looks at the stored last bar: when the history has it
+        unchanged, the bars after it are appended; when only that bar was
+        revised (an intraday bar being finalized) it is replaced and the
+        streams rewind one bar. Anything else (an adjusted or earlier-starting
+        history, gaps) rebuilds the series. A history starting later than the
+        stored one (a sliding period) keeps the warm-up of the bars it no
+        longer includes, and one ending earlier is served as a prefix.
+
+        Args:
+            bars: Date and bar columns, dates ascending and unique
+
+        Returns:
+            (position of the first history bar in the stored bars, bars added)
+        """
+        stored = self.bars
+        if stored is None or stored.schema != bars.schema:
+            return self._rebuild(bars)
+
+        dates = bars["date"]
+        stored_dates = stored["date"]
+        offset = self._position(stored_dates, dates.head(1))
+        if offset is None:
+            return self._rebuild(bars)
+
+        last = stored.height - 1
+        if dates[-1] < stored_dates[last]:
+            # Outputs are causal, so a history ending early is just a prefix
+            end = self._position(stored_dates, dates.tail(1))
+            if end is None or end - offset + 1 != bars.height or stored.row(end) != bars.row(-1):
+                return self._rebuild(bars)
+            return offset, 0
+
+        anchor = self._position(dates, stored_dates.tail(1))
+        if anchor is None or anchor != last - offset:
+            return self._rebuild(bars)
+        if bars.row(anchor) == stored.row(last):
+            new_bars = bars.slice(anchor + 1)
+        elif anchor == 0 or bars.row(anchor - 1) == stored.row(last - 1):
+            self._rewind()
+            new_bars = bars.slice(anchor)
+        else:
+            return self._rebuild(bars)
+
+        if not new_bars.is_empty():
+            self.bars = _append(self.bars, new_bars)
+        return offset, new_bars.height
+
+    def outputs(
+            self,
+            key: StreamKey,
+            kernel_factory: Callable[[], StreamingIndicator],
+            offset: int,
+            length: int,
+    ) -> pl.DataFrame:
+        """Outputs of one stream for `length` stored bars from `offset`."""
+        stream = self.streams.get(key)
+        if stream is None:
+            stream = IndicatorStream(kernel_factory)
+            self.streams[key] = stream
+        # Streams only compute what they have not seen yet
+        stream.extend(self.bars.slice(len(stream)))
+        return stream.frame.slice(offset, length)
+
+    @staticmethod
+    def _position(dates: pl.Series, date: pl.Series) -> Optional[int]:
+        """Index of a one-row date series in an ascending date column, or None."""
+        position = dates.search_sorted(date)[0]
+        if position < len(dates) and dates[position] == date[0]:
+            return position
+        return None
+
+    def _rebuild(self, bars: pl.DataFrame) -> Tuple[int, int]:
+        self.bars = bars
+        for stream in self.streams.values():
+            stream.reset()
+        return 0, bars.height
+
+    def _rewind(self) -> None:
+        last = self.bars.height - 1
+        for stream in self.streams.values():
+            if len(stream) > last:
+                stream.rewind()
+        self.bars = self.bars.slice(0, last)
+
+
+class IndicatorStateStore:
+    """LRU cache of bar series and their indicator streams shared across requests."""
+
+    def __init__(self, max_entries: Optional[int] = None) -> None:
+        self.max_entries = max_entries or settings.INDICATOR_STATE_MAX_ENTRIES
+        self._series: "OrderedDict[SeriesKey, BarSeries]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(
+            symbol: str, interval: str, indicator_name: str, parameters: Dict[str, Any]
+    ) -> Tuple[SeriesKey, StreamKey]:
+        return (
+            (symbol.upper(), interval),
+            (indicator_name, json.dumps(parameters, sort_keys=True, default=str)),
+        )
+
+    def compute(
+            self,
+            symbol: str,
+            interval: str,
+            indicator_name: str,
+            parameters: Dict[str, Any],
+            bars: pl.DataFrame,
+    ) -> pl.DataFrame:
+        """
+        Indicator outputs for a bar history, reusing the stored series.
+
+        Args:
+            symbol: Ticker symbol
+            interval: Bar interval of the history
+            indicator_name: Indicator method name, e.g. "rsi_indicator"
+            parameters: Indicator method parameters
+            bars: "date" plus open/high/low/close/volume columns, dates
+                ascending and unique
+
+        Returns:
+            Output columns aligned row by row with bars
+        """
+        kernel_class = STREAMING_INDICATORS.get(indicator_name)
+        if kernel_class is None:
+            raise ValueError(f"Indicator '{indicator_name}' has no streaming kernel.")
+        if bars.is_empty():
+            return pl.DataFrame(schema=kernel_class.output_schema)
+
+        series_key, stream_key = self.key(symbol, interval, indicator_name, parameters)
+        series = self._get_series(series_key)
+        with series.lock:
+            offset, added = series.sync(bars)
+            frame = series.outputs(
+                stream_key, partial(kernel_class, **parameters), offset, bars.height
+            )
+        logger.debug(
+            "%s %s %s: %s new of %s bars",
+            symbol, interval, indicator_name, added, bars.height,
+        )
+        return frame
+
+    def clear(self) -> None:
+        with self._lock:
+            self._series.clear()
+
+    def __len__(self) -> int:
+        return len(self._series)
+
+    def _get_series(self, key: SeriesKey) -> BarSeries:
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = BarSeries()
+                self._series[key] = series
+            self._series.move_to_end(key)
+            while len(self._series) > self.max_entries:
+                self._series.popitem(last=False)
+            return series
+
+
+# Global instance
+indicator_state_store = IndicatorStateStore()
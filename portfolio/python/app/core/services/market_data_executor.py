@@ -0,0 +1,154 @@
+"""
+Market Data Executor
+Runs blocking yfinance calls on a bounded thread pool so they never stall the
+event loop. Every call waits on a concurrency cap, and both the wait and the
+call itself are bounded by a timeout.
+"""
+
+import asyncio
+import logging
+import weakref
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Optional, TypeVar
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class MarketDataTimeoutError(TimeoutError):
+    """Raised when an upstream market data call exceeds its timeout."""
+
+
+class MarketDataExecutor:
+    """Bounded thread pool for synchronous market data calls."""
+
+    def __init__(
+            self,
+            max_workers: Optional[int] = None,
+            timeout: Optional[float] = None,
+            max_concurrency: Optional[int] = None,
+    ) -> None:
+        self.max_workers = max_workers or settings.MARKET_DATA_MAX_WORKERS
+        self.timeout = timeout or settings.MARKET_DATA_TIMEOUT_SECONDS
+        self.max_concurrency = (
+                max_concurrency or settings.MARKET_DATA_MAX_CONCURRENCY
+        )
+        self._executor: Optional[ThreadPoolExecutor] = None
+        # asyncio.Semaphore is bound to the loop it is first used on, so keep
+        # one per loop (uvicorn has one, test clients may create several).
+        self._semaphores: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        """Lazily create the thread pool."""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers, thread_name_prefix="market-data"
+            )
+        return self._executor
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        semaphore = self._semaphores.get(loop)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._semaphores[loop] = semaphore
+        return semaphore
+
+    async def run(
+            self,
+            func: Callable[..., T],
+            *args: Any,
+            timeout: Optional[float] = None,
+            **kwargs: Any,
+    ) -> T:
+        """
+        Run a blocking callable on the pool and await its result.
+
+        Args:
+            func: Synchronous callable to run
+            timeout: Seconds the call may wait to start, and then to finish
+                (defaults to the executor timeout)
+
+        Returns:
+            The callable's return value
+
+        Raises:
+            MarketDataTimeoutError: If the call does not start or finish in time
+        """
+        timeout = timeout or self.timeout
+        loop = asyncio.get_running_loop()
+        semaphore = self._get_semaphore()
+        started = loop.create_future()
+
+        def mark_started() -> None:
+            if not started.done():
+                started.set_result(None)
+
+        def call() -> T:
+            loop.call_soon_threadsafe(mark_started)
+            return func(*args, **kwargs)
+
+        def release() -> None:
+            # A timed-out call keeps its worker thread busy, so the slot is only
+            # given back once the thread is actually done with it.
+            semaphore.release()
+            mark_started()
+
+        def on_done(_: Future) -> None:
+            try:
+                loop.call_soon_threadsafe(release)
+            except RuntimeError:
+                # Loop already closed; nothing is left waiting on the slot
+                pass
+
+        # Slots held by stuck upstream calls must not park request handlers
+        # indefinitely, so the wait to start is bounded too.
+        start_by = loop.time() + timeout
+        try:
+            await asyncio.wait_for(semaphore.acquire(), timeout=timeout)
+        except asyncio.TimeoutError as e:
+            raise self._timed_out(func, timeout, "waiting for a slot") from e
+        try:
+            cf = self.executor.submit(call)
+        except BaseException:
+            semaphore.release()
+            raise
+        cf.add_done_callback(on_done)
+        future = asyncio.wrap_future(cf, loop=loop)
+
+        try:
+            try:
+                await asyncio.wait_for(
+                    asyncio.shield(started), timeout=max(start_by - loop.time(), 0)
+                )
+            except asyncio.TimeoutError as e:
+                raise self._timed_out(func, timeout, "waiting for a worker") from e
+            # Time spent waiting to start does not count against the call's own
+            # timeout; the clock restarts once it is running.
+            try:
+                return await asyncio.wait_for(future, timeout=timeout)
+            except asyncio.TimeoutError as e:
+                raise self._timed_out(func, timeout, "running") from e
+        finally:
+            if not future.done():
+                future.cancel()
+
+    @staticmethod
+    def _timed_out(func: Callable, timeout: float, stage: str) -> MarketDataTimeoutError:
+        name = getattr(func, "__name__", repr(func))
+        logger.warning("Market data call %s timed out after %ss %s", name, timeout, stage)
+        return MarketDataTimeoutError(f"{name} timed out after {timeout}s {stage}")
+
+    def shutdown(self, wait: bool = False) -> None:
+        """Shut down the thread pool; it is recreated on next use."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait, cancel_futures=True)
+            self._executor = None
+
+
+# Global instance
+market_data_executor = MarketDataExecutor()
@@ -6,20 +6,57 @@ Handles fetching real-time market data from yfinance without database storage.
 import asyncio
 import logging
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Union
 
 import pandas as pd  # type: ignore
+import polars as pl
+import yahooquery as yq  # type: ignore
 import yfinance as yf  # type: ignore
 
+from app.config import settings
+
+from app.core.services.market_data_executor import (
+    MarketDataExecutor,
+    market_data_executor,
+)
+from app.core.services.ohlcv_store import OHLCVStore, ohlcv_store
+from app.core.services.quote_cache import QuoteCache, quote_cache
+from app.core.services.single_flight import SingleFlight, market_data_single_flight
+
 logger = logging.getLogger(__name__)
 
+# quoteSummary modules carrying the Ticker.info fundamentals the quote lacks
+FUNDAMENTAL_MODULES = [
+    "assetProfile",
+    "summaryDetail",
+    "defaultKeyStatistics",
+    "financialData",
+]
+
 
 class MarketDataService:
     """Service for managing market data operations using yfinance only."""
 
-    def __init__(self) -> None:
+    def __init__(
+            self,
+            executor: Optional[MarketDataExecutor] = None,
+            store: Optional[OHLCVStore] = None,
+            single_flight: Optional[SingleFlight] = None,
+            cache: Optional[QuoteCache] = None,
+    ) -> None:
         self.max_retries = 3
         self.retry_delay = 5  # seconds
+        # yfinance is synchronous; every upstream call goes through the executor
+        self.executor = executor or market_data_executor
+        self.ohlcv_store = store or ohlcv_store
+        # Concurrent identical requests share one upstream call
+        self.single_flight = single_flight or market_data_single_flight
+        # Latest quotes kept warm by PriceIngestionService
+        self.quote_cache = cache or quote_cache
+        # Symbols per batched quote request
+        self.quote_batch_size = settings.MARKET_DATA_QUOTE_BATCH_SIZE
+        # Symbols per batched history download
+        self.history_batch_size = settings.MARKET_DATA_HISTORY_BATCH_SIZE
 
     def get_major_indices(self) -> Dict[str, str]:
         us_indexes = [
@@ -198,28 +235,27 @@ class MarketDataService:
 
     async def get_current_price(self, symbol: str) -> Optional[float]:
         """Get current price of a ticker from yfinance."""
-        try:
-            ticker = yf.Ticker(symbol)
-            info = ticker.info
-
-            # Try multiple price fields in order of preference
-            price = (
-                    info.get("currentPrice")
-                    or info.get("regularMarketPrice")
-                    or info.get("previousClose")
-                    or info.get("open")
-            )
+        price, _ = await self.single_flight.do(
+            ("quote", symbol.upper()), lambda: self._get_current_price(symbol)
+        )
+        return price
 
-            if price is not None:
-                return float(price)
-
-            # If info doesn't have price, try getting it from history
-            hist = ticker.history(period="1d")
-            if not hist.empty:
-                return float(hist["Close"].iloc[-1])
+    async def get_cached_price(self, symbol: str) -> Optional[float]:
+        """
+        Get current price from the shared quote cache.
 
-            return None
+        Held and watched symbols are ingested in the background, so only
+        symbols that were not ingested yet (or a Redis outage) go upstream.
+        """
+        # Redis round trip; keep it off the event loop
+        price = await asyncio.to_thread(self.quote_cache.get_price, symbol)
+        if price is not None:
+            return price
+        return await self.get_current_price(symbol)
 
+    async def _get_current_price(self, symbol: str) -> Optional[float]:
+        try:
+            return await self.executor.run(self._fetch_current_price, symbol)
         except Exception as e:
             logger.error("Error getting current price for %s: %s", symbol, e)
             return None
@@ -227,47 +263,63 @@ class MarketDataService:
     async def get_multiple_current_prices(
             self, symbols: List[str]
     ) -> Dict[str, Optional[float]]:
-        """Get current prices for multiple symbols efficiently."""
-        try:
-            # Use yfinance Tickers for bulk fetching
-            tickers = yf.Tickers(" ".join(symbols))
-            results = {}
+        """
+        Get current prices for multiple symbols with batched upstream calls.
 
-            for symbol in symbols:
-                try:
-                    ticker = tickers.tickers[symbol]
-                    info = ticker.info
-
-                    price = (
-                            info.get("currentPrice")
-                            or info.get("regularMarketPrice")
-                            or info.get("previousClose")
-                            or info.get("open")
-                    )
+        Prices come from one multi-symbol quote request per chunk of symbols;
+        symbols without a quote price fall back to one batched daily download.
 
-                    if price is not None:
-                        results[symbol] = float(price)
-                    else:
-                        # Fallback to history
-                        hist = ticker.history(period="1d")
-                        if not hist.empty:
-                            results[symbol] = float(hist["Close"].iloc[-1])
-                        else:
-                            results[symbol] = None
+        Returns:
+            Price per requested symbol (None when no price is available)
+        """
+        quotes = await self.get_latest_quotes(symbols)
+        prices = {
+            symbol: self._quote_price(quote) for symbol, quote in quotes.items()
+        }
 
-                except Exception as e:
-                    logger.error("Error getting price for %s: %s", symbol, e)
-                    results[symbol] = None
+        missing = [symbol for symbol, price in prices.items() if price is None]
+        if missing:
+            closes = await self._get_last_closes(missing)
+            for symbol in missing:
+                prices[symbol] = closes.get(symbol.upper())
+        return prices
 
-            return results
+    async def get_latest_quotes(
+            self, symbols: List[str]
+    ) -> Dict[str, Optional[Dict[str, Any]]]:
+        """
+        Latest Yahoo quotes for many symbols in a few chunked upstream calls.
 
-        except Exception as e:
-            logger.error("Error getting multiple prices: %s", e)
-            # Fallback to individual requests
-            results = {}
-            for symbol in symbols:
-                results[symbol] = await self.get_current_price(symbol)
-            return results
+        Args:
+            symbols: Symbols to quote
+
+        Returns:
+            Raw quote per requested symbol (None when Yahoo has no quote)
+        """
+        return await self._gather_chunks(symbols, self._get_quote_chunk)
+
+    async def _gather_chunks(
+            self,
+            symbols: List[str],
+            fetch_chunk: Callable[[List[str]], Awaitable[Dict[str, Dict[str, Any]]]],
+    ) -> Dict[str, Optional[Dict[str, Any]]]:
+        unique = list(dict.fromkeys(symbol.upper() for symbol in symbols))
+        chunks = [
+            unique[i: i + self.quote_batch_size]
+            for i in range(0, len(unique), self.quote_batch_size)
+        ]
+        results = await asyncio.gather(
+            *(fetch_chunk(chunk) for chunk in chunks),
+            return_exceptions=True,
+        )
+
+        merged: Dict[str, Dict[str, Any]] = {}
+        for chunk, result in zip(chunks, results):
+            if isinstance(result, Exception):
+                logger.error("Error getting quotes for %s: %s", chunk, result)
+                continue
+            merged.update(result)
+        return {symbol: merged.get(symbol.upper()) for symbol in symbols}
 
     async def fetch_ticker_data(
             self,
@@ -279,6 +331,7 @@ class MarketDataService:
     ) -> pd.DataFrame:
         """
         Fetch ticker data from yfinance with retry logic.
+        Concurrent calls with the same arguments share one fetch.
 
         Args:
             symbol: Stock symbol
@@ -290,37 +343,203 @@ class MarketDataService:
         Returns:
             DataFrame with market data or None if failed
         """
+        key = ("history", symbol.upper(), period, interval, start_date, end_date)
+        data, shared = await self.single_flight.do(
+            key,
+            lambda: self._fetch_ticker_data(
+                symbol, period, interval, start_date, end_date
+            ),
+        )
+        # Callers mutate the frame they get back, so shared results are copied
+        return data.copy() if shared and data is not None else data
+
+    async def _fetch_ticker_data(
+            self,
+            symbol: str,
+            period: str,
+            interval: str,
+            start_date: Optional[str],
+            end_date: Optional[str],
+    ) -> pd.DataFrame:
+        if self.ohlcv_store.supports(interval) and (
+                period == "max" or (start_date and end_date)
+        ):
+            data = await self._fetch_stored_history(
+                symbol, interval, start_date, end_date
+            )
+            if data is not None:
+                return data
+
+        data = await self._fetch_history_with_retries(
+            symbol, period, interval, start_date, end_date
+        )
+        if data is None:
+            return pd.DataFrame()
+
+        # Reset index to make Date a column
+        data = data.reset_index()
+
+        # Ensure we have the expected columns
+        expected_columns = ["Date", "Open", "High", "Low", "Close", "Volume"]
+        if not all(col in data.columns for col in expected_columns):
+            logger.warning("Missing expected columns in data for %s", symbol)
+            return pd.DataFrame()
+
+        # Sort by date descending (most recent first)
+        return data.sort_values(by="Date", ascending=False)
+
+    async def fetch_ticker_frame(
+            self,
+            symbol: str,
+            period: str = "max",
+            interval: str = "1d",
+            start_date: Optional[str] = None,
+            end_date: Optional[str] = None,
+    ) -> pl.DataFrame:
+        """
+        Fetch ticker data as a Polars DataFrame for columnar consumers.
+
+        Unlike fetch_ticker_data, rows are oldest first and column names are
+        snake_case (date, open, high, low, close, volume, ...). Stored history
+        is read from Parquet straight into Arrow memory and upstream data is
+        handed over from pandas without the reset_index and sort copies.
+
+        Args:
+            symbol: Stock symbol
+            period: Data period (1d, 5d, 1mo, 3mo, 6mo, 1y, 2y, 5y, 10y, ytd, max)
+            interval: Data interval (1m, 2m, 5m, 15m, 30m, 60m, 90m, 1h, 1d, 5d, 1wk, 1mo, 3mo)
+            start_date: Start date (YYYY-MM-DD)
+            end_date: End date (YYYY-MM-DD)
+
+        Returns:
+            DataFrame with market data, empty if failed
+        """
+        key = ("frame", symbol.upper(), period, interval, start_date, end_date)
+        # Polars frames are immutable, so shared results need no copy
+        data, _ = await self.single_flight.do(
+            key,
+            lambda: self._fetch_ticker_frame(
+                symbol, period, interval, start_date, end_date
+            ),
+        )
+        return data
+
+    async def _fetch_ticker_frame(
+            self,
+            symbol: str,
+            period: str,
+            interval: str,
+            start_date: Optional[str],
+            end_date: Optional[str],
+    ) -> pl.DataFrame:
+        if self.ohlcv_store.supports(interval) and (
+                period == "max" or (start_date and end_date)
+        ):
+            data = await self._fetch_stored_frame(
+                symbol, interval, start_date, end_date
+            )
+            if data is not None:
+                return data
+
+        history = await self._fetch_history_with_retries(
+            symbol, period, interval, start_date, end_date
+        )
+        if history is None:
+            return pl.DataFrame()
+
+        data = self._to_frame(history, include_index=True)
+        expected_columns = {"date", "open", "high", "low", "close", "volume"}
+        if not expected_columns <= set(data.columns):
+            logger.warning("Missing expected columns in data for %s", symbol)
+            return pl.DataFrame()
+
+        return data if data["date"].is_sorted() else data.sort("date")
+
+    async def fetch_ticker_frames(
+            self,
+            symbols: List[str],
+            period: str = "1y",
+            interval: str = "1d",
+    ) -> Dict[str, pl.DataFrame]:
+        """
+        Price history for many symbols in a few chunked upstream downloads.
+
+        Frames have the fetch_ticker_frame shape. The OHLCV store is not
+        consulted, a whole chunk of symbols comes back from one request.
+
+        Args:
+            symbols: Stock symbols
+            period: Data period (1d, 5d, 1mo, 3mo, 6mo, 1y, 2y, 5y, 10y, ytd, max)
+            interval: Data interval (1m, 2m, 5m, 15m, 30m, 60m, 90m, 1h, 1d, 5d, 1wk, 1mo, 3mo)
+
+        Returns:
+            DataFrame per requested symbol, empty when nothing came back
+        """
+        unique = list(dict.fromkeys(symbol.upper() for symbol in symbols))
+        chunks = [
+            unique[i: i + self.history_batch_size]
+            for i in range(0, len(unique), self.history_batch_size)
+        ]
+        results = await asyncio.gather(
+            *(self._get_history_chunk(chunk, period, interval) for chunk in chunks),
+            return_exceptions=True,
+        )
+
+        frames: Dict[str, pl.DataFrame] = {}
+        for chunk, result in zip(chunks, results):
+            if isinstance(result, Exception):
+                logger.error("Error getting history for %s: %s", chunk, result)
+                continue
+            frames.update(result)
+        return {
+            symbol: frames.get(symbol.upper(), pl.DataFrame()) for symbol in symbols
+        }
+
+    async def _get_history_chunk(
+            self, symbols: List[str], period: str, interval: str
+    ) -> Dict[str, pl.DataFrame]:
+        async def fetch() -> Dict[str, pl.DataFrame]:
+            histories = await self.executor.run(
+                self._fetch_histories, symbols, period, interval
+            )
+            frames = {}
+            for symbol, history in histories.items():
+                data = self._to_frame(history, include_index=True)
+                frames[symbol] = data if data["date"].is_sorted() else data.sort("date")
+            return frames
+
+        frames, _ = await self.single_flight.do(
+            ("frames", tuple(symbols), period, interval), fetch
+        )
+        return frames
+
+    async def _fetch_history_with_retries(
+            self,
+            symbol: str,
+            period: str,
+            interval: str,
+            start_date: Optional[str],
+            end_date: Optional[str],
+    ) -> Optional[pd.DataFrame]:
+        """Raw upstream history indexed by date, or None when nothing came back."""
         for attempt in range(self.max_retries):
             try:
                 logger.info("Fetching data for %s (attempt %d)", symbol, attempt + 1)
 
-                ticker = yf.Ticker(symbol)
-
-                if start_date and end_date:
-                    data = ticker.history(
-                        start=start_date, end=end_date, interval=interval
-                    )
-                else:
-                    data = ticker.history(period=period, interval=interval)
+                data = await self.executor.run(
+                    self._fetch_history,
+                    symbol,
+                    period=period,
+                    interval=interval,
+                    start_date=start_date,
+                    end_date=end_date,
+                )
 
                 if not isinstance(data, pd.DataFrame) or data.empty:
                     logger.warning("No data returned for %s", symbol)
-                    return pd.DataFrame()
+                    return None
 
                 logger.info("Successfully fetched %d records for %s", len(data), symbol)
-
-                # Reset index to make Date a column
-                data = data.reset_index()
-
-                # Ensure we have the expected columns
-                expected_columns = ["Date", "Open", "High", "Low", "Close", "Volume"]
-                if not all(col in data.columns for col in expected_columns):
-                    logger.warning("Missing expected columns in data for %s", symbol)
-                    return pd.DataFrame()
-
-                # Sort by date descending (most recent first)
-                data = data.sort_values(by="Date", ascending=False)
-
                 return data
 
             except Exception as e:
@@ -329,7 +548,7 @@ class MarketDataService:
                     await asyncio.sleep(self.retry_delay)
                 else:
                     logger.error("All attempts failed for %s", symbol)
-                    return pd.DataFrame()
+                    return None
 
     async def get_ticker_info(self, symbol: str) -> Optional[Dict[str, Any]]:
         """
@@ -342,8 +561,7 @@ class MarketDataService:
             Dictionary with ticker information or None if failed
         """
         try:
-            ticker = yf.Ticker(symbol)
-            info = ticker.info
+            info = await self._get_info(symbol)
 
             if not info or info.get("symbol") is None:
                 logger.warning("No info available for %s", symbol)
@@ -376,20 +594,17 @@ class MarketDataService:
         try:
             if not symbols:
                 return []
-            tickers = yf.Tickers(symbols)
+            # One multi-symbol quote and modules request per chunk instead of
+            # .info per symbol
+            infos = await self._gather_chunks(symbols, self._get_quote_info_chunk)
             results = []
-            for symbol in symbols:
-                try:
-                    ticker = tickers.tickers[symbol]
-                    info = ticker.info
-
-                    if not info or info.get("symbol") is None:
-                        logger.warning("No data available for %s", symbol)
-                        continue
-
-                    stock_data = self._extract_ticker_information(ticker_info=info)
-                    results.append(stock_data)
+            for symbol, info in infos.items():
+                if not info:
+                    logger.warning("No data available for %s", symbol)
+                    continue
 
+                try:
+                    results.append(self._extract_ticker_information(ticker_info=info))
                 except Exception as e:
                     logger.error("Error processing %s: %s", symbol, e)
                     continue
@@ -547,20 +762,398 @@ class MarketDataService:
         return ticker_data
 
     async def get_symbols_info(self, symbols: List[str]) -> Dict[str, Any]:
-
-        tickers = yf.Tickers(symbols)
+        """Get normalized ticker information keyed by symbol."""
+        infos = await asyncio.gather(
+            *(self._get_info(symbol) for symbol in symbols),
+            return_exceptions=True,
+        )
         result = {}
-        for ticker in tickers.tickers.values():
+        for symbol, info in zip(symbols, infos):
+            if isinstance(info, Exception):
+                logger.error("Error processing ticker info: %s. Error: %s", symbol, info)
+                continue
             try:
-                info = ticker.info
                 if info.get('regularMarketPrice') is None:
                     logger.warning("Error getting info for symbol: %s", info.get('symbol'))
                     continue
                 result[info.get('symbol')] = self._extract_ticker_information(ticker_info=info)
             except Exception as e:
-                logger.error("Error processing ticker info: %s. Error: %s", ticker.ticker, e)
+                logger.error("Error processing ticker info: %s. Error: %s", symbol, e)
         return result
 
+    def get_coalescing_stats(self) -> Dict[str, Any]:
+        """Counters for upstream calls saved by request coalescing."""
+        return self.single_flight.stats()
+
+    async def _get_info(self, symbol: str) -> Dict[str, Any]:
+        # The raw info dict is shared between coalesced callers; it is only read
+        info, _ = await self.single_flight.do(
+            ("info", symbol.upper()),
+            lambda: self.executor.run(self._fetch_info, symbol),
+        )
+        return info
+
+    async def _get_quote_chunk(self, symbols: List[str]) -> Dict[str, Dict[str, Any]]:
+        quotes, _ = await self.single_flight.do(
+            ("quotes", tuple(symbols)),
+            lambda: self.executor.run(self._fetch_quotes, symbols),
+        )
+        return quotes
+
+    async def _get_quote_info_chunk(
+            self, symbols: List[str]
+    ) -> Dict[str, Dict[str, Any]]:
+        infos, _ = await self.single_flight.do(
+            ("quote_infos", tuple(symbols)),
+            lambda: self.executor.run(self._fetch_quote_infos, symbols),
+        )
+        return infos
+
+    async def _get_last_closes(self, symbols: List[str]) -> Dict[str, float]:
+        try:
+            return await self.executor.run(self._fetch_last_closes, symbols)
+        except Exception as e:
+            logger.error("Error getting last closes for %s: %s", symbols, e)
+            return {}
+
+    @staticmethod
+    def _quote_price(quote: Optional[Dict[str, Any]]) -> Optional[float]:
+        if not quote:
+            return None
+        price = quote.get("regularMarketPrice") or quote.get(
+            "regularMarketPreviousClose"
+        )
+        return float(price) if price is not None else None
+
+    @staticmethod
+    def _quote_as_info(
+            symbol: str,
+            quote: Dict[str, Any],
+            modules: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Map a multi-symbol quote onto the Ticker.info keys used for extraction.
+
+        Fundamentals come from the quoteSummary modules, whose fields already
+        carry the Ticker.info names; quote fields win where both are present.
+        """
+        info: Dict[str, Any] = {}
+        if isinstance(modules, dict):
+            for name in FUNDAMENTAL_MODULES:
+                module = modules.get(name)
+                if isinstance(module, dict):
+                    info.update(
+                        (key, value) for key, value in module.items()
+                        if value is not None
+                    )
+
+        quote_fields = {
+            "symbol": symbol,
+            "longName": quote.get("longName"),
+            "shortName": quote.get("shortName"),
+            "exchangeDisp": quote.get("fullExchangeName"),
+            "exchange": quote.get("exchange"),
+            "currency": quote.get("currency"),
+            "quoteType": quote.get("quoteType"),
+            "marketCap": quote.get("marketCap"),
+            "currentPrice": quote.get("regularMarketPrice"),
+            "regularMarketPrice": quote.get("regularMarketPrice"),
+            "regularMarketChangePercent": quote.get("regularMarketChangePercent"),
+            "previousClose": quote.get("regularMarketPreviousClose"),
+            "open": quote.get("regularMarketOpen"),
+            "dayLow": quote.get("regularMarketDayLow"),
+            "dayHigh": quote.get("regularMarketDayHigh"),
+            "fiftyTwoWeekLow": quote.get("fiftyTwoWeekLow"),
+            "fiftyTwoWeekHigh": quote.get("fiftyTwoWeekHigh"),
+            "volume": quote.get("regularMarketVolume"),
+            "regularMarketVolume": quote.get("regularMarketVolume"),
+            "averageVolume": quote.get("averageDailyVolume3Month"),
+            "trailingPE": quote.get("trailingPE"),
+            "forwardPE": quote.get("forwardPE"),
+            "dividendYield": quote.get("dividendYield"),
+            "bookValue": quote.get("bookValue"),
+            "priceToBook": quote.get("priceToBook"),
+        }
+        # Absent keys, not None values, so extraction fallbacks still apply
+        info.update(
+            (key, value) for key, value in quote_fields.items() if value is not None
+        )
+        return info
+
+    # Blocking yfinance calls, only ever run through self.executor
+    def _fetch_quotes(self, symbols: List[str]) -> Dict[str, Dict[str, Any]]:
+        return self._parse_quotes(yq.Ticker(symbols).quotes, symbols)
+
+    def _fetch_quote_infos(self, symbols: List[str]) -> Dict[str, Dict[str, Any]]:
+        ticker = yq.Ticker(symbols)
+        quotes = self._parse_quotes(ticker.quotes, symbols)
+        if not quotes:
+            return {}
+
+        # Profile and financial data for the whole chunk in one more request
+        try:
+            modules = ticker.get_modules(FUNDAMENTAL_MODULES)
+        except Exception as e:
+            logger.warning("Error getting fundamentals for %s: %s", symbols, e)
+            modules = {}
+        if not isinstance(modules, dict):
+            logger.warning("No fundamentals returned for %s: %s", symbols, modules)
+            modules = {}
+        modules = {str(symbol).upper(): data for symbol, data in modules.items()}
+
+        return {
+            symbol: self._quote_as_info(symbol, quote, modules.get(symbol))
+            for symbol, quote in quotes.items()
+        }
+
+    @staticmethod
+    def _parse_quotes(data: Any, symbols: List[str]) -> Dict[str, Dict[str, Any]]:
+        if not isinstance(data, dict):
+            # yahooquery returns an error message instead of a dict on failure
+            logger.warning("No quotes returned for %s: %s", symbols, data)
+            return {}
+        return {
+            symbol.upper(): quote
+            for symbol, quote in data.items()
+            if isinstance(quote, dict)
+        }
+
+    def _fetch_last_closes(self, symbols: List[str]) -> Dict[str, float]:
+        frame = yf.download(
+            symbols,
+            period="5d",
+            interval="1d",
+            group_by="column",
+            auto_adjust=False,
+            progress=False,
+            threads=False,
+        )
+        if frame is None or frame.empty or "Close" not in frame:
+            return {}
+        closes = frame["Close"]
+        if isinstance(closes, pd.Series):
+            closes = closes.to_frame(symbols[0])
+        last = closes.ffill().iloc[-1].dropna()
+        return {str(symbol).upper(): float(price) for symbol, price in last.items()}
+
+    def _fetch_histories(
+            self, symbols: List[str], period: str, interval: str
+    ) -> Dict[str, pd.DataFrame]:
+        # Same adjusted bars and action columns as Ticker.history
+        frame = yf.download(
+            symbols,
+            period=period,
+            interval=interval,
+            group_by="ticker",
+            actions=True,
+            auto_adjust=True,
+            progress=False,
+        )
+        if frame is None or frame.empty:
+            return {}
+        if not isinstance(frame.columns, pd.MultiIndex):
+            frame = pd.concat({symbols[0]: frame}, axis=1)
+
+        histories = {}
+        for symbol in frame.columns.get_level_values(0).unique():
+            # Rows are the union of all symbols' dates
+            bars = frame[symbol].dropna(subset=["Close"])
+            if not bars.empty:
+                histories[str(symbol).upper()] = bars
+        return histories
+
+    def _fetch_current_price(self, symbol: str) -> Optional[float]:
+        ticker = yf.Ticker(symbol)
+        info = ticker.info
+
+        # Try multiple price fields in order of preference
+        price = (
+                info.get("currentPrice")
+                or info.get("regularMarketPrice")
+                or info.get("previousClose")
+                or info.get("open")
+        )
+
+        if price is not None:
+            return float(price)
+
+        # If info doesn't have price, try getting it from history
+        hist = ticker.history(period="1d")
+        if not hist.empty:
+            return float(hist["Close"].iloc[-1])
+
+        return None
+
+    def _fetch_history(
+            self,
+            symbol: str,
+            period: str = "max",
+            interval: str = "1d",
+            start_date: Optional[str] = None,
+            end_date: Optional[str] = None,
+    ) -> pd.DataFrame:
+        ticker = yf.Ticker(symbol)
+        if start_date and end_date:
+            return ticker.history(start=start_date, end=end_date, interval=interval)
+        return ticker.history(period=period, interval=interval)
+
+    def _fetch_info(self, symbol: str) -> Dict[str, Any]:
+        return yf.Ticker(symbol).info
+
+    async def _fetch_stored_history(
+            self,
+            symbol: str,
+            interval: str,
+            start_date: Optional[str] = None,
+            end_date: Optional[str] = None,
+    ) -> Optional[pd.DataFrame]:
+        """
+        Serve history from the OHLCV store, topping it up with new bars.
+
+        Returns:
+            DataFrame shaped like fetch_ticker_data output, or None to fall
+            back to a direct upstream fetch
+        """
+        try:
+            data = await self.executor.run(self._sync_stored_history, symbol, interval)
+        except Exception as e:
+            logger.warning("OHLCV store unavailable for %s: %s", symbol, e)
+            return None
+
+        if data is None or data.empty:
+            return None
+
+        if start_date and end_date:
+            dates = data["Date"]
+            start = self._as_bar_timestamp(start_date, dates)
+            end = self._as_bar_timestamp(end_date, dates)
+            data = data[(dates >= start) & (dates < end)]
+
+        return data.sort_values(by="Date", ascending=False)
+
+    def _sync_stored_history(self, symbol: str, interval: str) -> Optional[pd.DataFrame]:
+        store = self.ohlcv_store
+        with store.lock(symbol, interval):
+            stored = store.load(symbol, interval)
+            if stored is not None and not stored.empty:
+                if store.is_fresh(symbol, interval):
+                    return stored
+
+                last_date = stored["Date"].max()
+                new_bars = yf.Ticker(symbol).history(
+                    start=last_date.strftime("%Y-%m-%d"), interval=interval
+                )
+                if not isinstance(new_bars, pd.DataFrame):
+                    return stored
+                new_bars = new_bars.reset_index()
+                if new_bars.empty:
+                    store.touch(symbol, interval)
+                    return stored
+
+                # Auto-adjusted history is rewritten after splits and dividends,
+                # so appending would mix adjusted and unadjusted bars.
+                actions = new_bars[new_bars["Date"] > last_date]
+                if not self._has_corporate_actions(actions):
+                    logger.info(
+                        "Topped up %s %s history with %d bars",
+                        symbol, interval, len(new_bars),
+                    )
+                    return store.append(symbol, interval, stored, new_bars)
+
+                logger.info("Corporate action for %s, reloading full history", symbol)
+
+            data = self._fetch_history(symbol, period="max", interval=interval)
+            if not isinstance(data, pd.DataFrame) or data.empty:
+                return None
+            data = data.reset_index()
+            if "Date" not in data.columns:
+                return None
+            store.save(symbol, interval, data)
+            logger.info("Stored full %s %s history (%d bars)", symbol, interval, len(data))
+            return data
+
+    async def _fetch_stored_frame(
+            self,
+            symbol: str,
+            interval: str,
+            start_date: Optional[str] = None,
+            end_date: Optional[str] = None,
+    ) -> Optional[pl.DataFrame]:
+        """
+        Serve history from the OHLCV store as a Polars DataFrame.
+
+        Returns:
+            DataFrame shaped like fetch_ticker_frame output, or None to fall
+            back to a direct upstream fetch
+        """
+        try:
+            data = await self.executor.run(self._sync_stored_frame, symbol, interval)
+        except Exception as e:
+            logger.warning("OHLCV store unavailable for %s: %s", symbol, e)
+            return None
+
+        if data is None or data.is_empty() or "date" not in data.columns:
+            return None
+
+        if start_date and end_date:
+            tz = data.schema["date"].time_zone
+            start = self._as_bar_bound(start_date, tz).to_pydatetime()
+            end = self._as_bar_bound(end_date, tz).to_pydatetime()
+            data = data.filter((pl.col("date") >= start) & (pl.col("date") < end))
+
+        return data
+
+    def _sync_stored_frame(self, symbol: str, interval: str) -> Optional[pl.DataFrame]:
+        # Saves are atomic renames, so fresh bars can be read without the lock
+        if self.ohlcv_store.is_fresh(symbol, interval):
+            data = self.ohlcv_store.load_frame(symbol, interval)
+            if data is not None and not data.is_empty():
+                return self._to_frame(data)
+
+        data = self._sync_stored_history(symbol, interval)
+        if data is None or data.empty:
+            return None
+        return self._to_frame(data)
+
+    @staticmethod
+    def _to_frame(
+            data: Union[pd.DataFrame, pl.DataFrame], include_index: bool = False
+    ) -> pl.DataFrame:
+        """Polars view of upstream or stored bars with snake_case column names."""
+        if isinstance(data, pd.DataFrame):
+            data = pl.from_pandas(data, include_index=include_index)
+        # Intraday history is indexed by "Datetime" instead of "Date"
+        return data.rename(
+            {
+                column: "date" if column == "Datetime" else column.lower().replace(" ", "_")
+                for column in data.columns
+            }
+        )
+
+    @staticmethod
+    def _has_corporate_actions(bars: pd.DataFrame) -> bool:
+        for column in ("Dividends", "Stock Splits"):
+            if column in bars.columns and (bars[column].fillna(0) != 0).any():
+                return True
+        return False
+
+    @classmethod
+    def _as_bar_timestamp(cls, value: str, dates: pd.Series) -> pd.Timestamp:
+        """Parse a YYYY-MM-DD bound in the timezone of the stored bars."""
+        return cls._as_bar_bound(value, getattr(dates.dt, "tz", None))
+
+    @staticmethod
+    def _as_bar_bound(value: str, tz: Any) -> pd.Timestamp:
+        """Parse a YYYY-MM-DD bound in the given timezone, or naive when None."""
+        timestamp = pd.Timestamp(value)
+        if tz is not None:
+            if timestamp.tzinfo is None:
+                return timestamp.tz_localize(tz)
+            return timestamp.tz_convert(tz)
+        if timestamp.tzinfo is not None:
+            return timestamp.tz_localize(None)
+        return timestamp
+
 
 # Global instance
 market_data_service = MarketDataService()
@@ -0,0 +1,139 @@
+"""
+OHLCV Store
+Local Parquet cache of price history keyed by (symbol, interval), so full
+histories are downloaded once and then only topped up with new bars.
+"""
+
+import logging
+import os
+import threading
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Optional
+
+import pandas as pd  # type: ignore
+import polars as pl
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class OHLCVStore:
+    """Parquet-backed OHLCV history store."""
+
+    # Intraday bars are only served for short windows upstream, so only
+    # daily-and-longer intervals are worth persisting.
+    CACHEABLE_INTERVALS = ("1d", "5d", "1wk", "1mo", "3mo")
+
+    def __init__(
+            self,
+            root: Optional[str] = None,
+            refresh_seconds: Optional[int] = None,
+            enabled: Optional[bool] = None,
+    ) -> None:
+        self.root = Path(root or settings.OHLCV_CACHE_DIR)
+        self.refresh_seconds = (
+            refresh_seconds
+            if refresh_seconds is not None
+            else settings.OHLCV_CACHE_REFRESH_SECONDS
+        )
+        self.enabled = settings.OHLCV_CACHE_ENABLED if enabled is None else enabled
+        self._locks = defaultdict(threading.Lock)
+
+    def supports(self, interval: str) -> bool:
+        """Whether history for this interval is persisted."""
+        return self.enabled and interval in self.CACHEABLE_INTERVALS
+
+    def lock(self, symbol: str, interval: str) -> threading.Lock:
+        """Lock guarding read-modify-write of one (symbol, interval) file."""
+        return self._locks[(symbol.upper(), interval)]
+
+    def path_for(self, symbol: str, interval: str) -> Path:
+        safe_symbol = symbol.upper().replace(os.sep, "_")
+        return self.root / interval / f"{safe_symbol}.parquet"
+
+    def load(self, symbol: str, interval: str) -> Optional[pd.DataFrame]:
+        """
+        Load stored bars sorted by Date ascending.
+
+        Returns:
+            DataFrame with a Date column, or None when nothing is stored
+        """
+        path = self.path_for(symbol, interval)
+        if not path.exists():
+            return None
+        try:
+            return pd.read_parquet(path)
+        except Exception as e:
+            logger.warning("Discarding unreadable OHLCV cache %s: %s", path, e)
+            return None
+
+    def load_frame(self, symbol: str, interval: str) -> Optional[pl.DataFrame]:
+        """
+        Load stored bars into Arrow memory without going through pandas.
+
+        Returns:
+            Polars DataFrame with the stored column names, sorted by Date
+            ascending, or None when nothing is stored
+        """
+        path = self.path_for(symbol, interval)
+        if not path.exists():
+            return None
+        try:
+            return pl.read_parquet(path)
+        except Exception as e:
+            logger.warning("Discarding unreadable OHLCV cache %s: %s", path, e)
+            return None
+
+    def save(self, symbol: str, interval: str, data: pd.DataFrame) -> None:
+        """Replace stored bars; the write is atomic."""
+        path = self.path_for(symbol, interval)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        data = data.sort_values("Date").reset_index(drop=True)
+        tmp_path = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            data.to_parquet(tmp_path, engine="pyarrow", index=False)
+            os.replace(tmp_path, path)
+        finally:
+            if tmp_path.exists():
+                tmp_path.unlink()
+
+    def append(
+            self, symbol: str, interval: str, stored: pd.DataFrame, new_bars: pd.DataFrame
+    ) -> pd.DataFrame:
+        """
+        Merge new bars into stored ones and persist the result.
+
+        Bars in `new_bars` win over stored bars with the same Date, so a
+        partial bar for the current session gets replaced once it closes.
+        """
+        if new_bars.empty:
+            self.touch(symbol, interval)
+            return stored
+        merged = pd.concat(
+            [stored[stored["Date"] < new_bars["Date"].min()], new_bars],
+            ignore_index=True,
+        )
+        merged = merged.drop_duplicates(subset=["Date"], keep="last")
+        self.save(symbol, interval, merged)
+        return merged.sort_values("Date").reset_index(drop=True)
+
+    def touch(self, symbol: str, interval: str) -> None:
+        """Mark stored bars as freshly checked against upstream."""
+        path = self.path_for(symbol, interval)
+        if path.exists():
+            os.utime(path, None)
+
+    def is_fresh(self, symbol: str, interval: str) -> bool:
+        """Whether stored bars were checked upstream within refresh_seconds."""
+        path = self.path_for(symbol, interval)
+        try:
+            return time.time() - path.stat().st_mtime < self.refresh_seconds
+        except FileNotFoundError:
+            return False
+
+
+# Global instance
+ohlcv_store = OHLCVStore()
@@ -3,6 +3,7 @@ Portfolio Analytics Service
 Comprehensive service for portfolio analysis, risk management, and performance tracking.
 """
 
+import asyncio
 import logging
 import math
 from datetime import datetime, timedelta, timezone
@@ -11,6 +12,9 @@ from typing import Any, Dict, List, Optional
 
 import numpy as np
 import pandas as pd
+from sqlalchemy import delete, insert, select
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.orm import Session
 
 from app.core.database.models import Asset, Portfolio, PortfolioAsset
@@ -31,16 +35,49 @@ from app.core.schemas.portfolio_analytics import (
     PortfolioAllocationCreate,
     RiskCalculationResponse,
 )
+from app.core.services.correlation_matrix_engine import CorrelationMatrixEngine
+from app.core.services.correlation_statistics import correlation_p_values
 from app.core.services.market_data_service import market_data_service
+from app.core.services.portfolio_valuation_engine import PortfolioValuationEngine
 
 logger = logging.getLogger(__name__)
 
+# Dialect inserts supporting ON CONFLICT DO UPDATE
+UPSERT_INSERTS = {
+    "postgresql": postgresql_insert,
+    "sqlite": sqlite_insert,
+}
+
+# PortfolioPerformanceHistory columns written by a historical backfill
+SNAPSHOT_VALUE_COLUMNS = (
+    "total_value",
+    "total_cost_basis",
+    "total_unrealized_pnl",
+    "total_unrealized_pnl_percent",
+)
+
+# AssetCorrelation columns written by the correlation matrix
+CORRELATION_METRIC_COLUMNS = (
+    "correlation_1m",
+    "correlation_3m",
+    "correlation_6m",
+    "correlation_1y",
+    "rolling_correlation_20d",
+    "rolling_correlation_60d",
+    "p_value",
+    "is_significant",
+)
+
 
 class PortfolioAnalyticsService:
     """Service for comprehensive portfolio analytics and risk management."""
 
-    def __init__(self, db: Session):
+    def __init__(self, db: Session, market_data: Optional[Any] = None):
         self.db = db
+        # MarketDataService, or a job-scoped SharedMarketData over it
+        self.market_data = market_data or market_data_service
+        self.valuation_engine = PortfolioValuationEngine()
+        self.correlation_engine = CorrelationMatrixEngine()
         # Data freshness thresholds
         self.asset_metrics_freshness_hours = 24  # Refresh asset metrics daily
         self.portfolio_performance_freshness_hours = (
@@ -120,7 +157,7 @@ class PortfolioAnalyticsService:
         # Get current prices for all assets
         for asset in portfolio_assets:
             if asset.asset and asset.asset.symbol:
-                current_price = await market_data_service.get_current_price(
+                current_price = await self.market_data.get_current_price(
                     asset.asset.symbol
                 )
                 if current_price:
@@ -249,7 +286,7 @@ class PortfolioAnalyticsService:
                     end_date_str = end_date.strftime("%Y-%m-%d")
                     start_date_str = start_date.strftime("%Y-%m-%d")
                     
-                    price_data = await market_data_service.fetch_ticker_data(
+                    price_data = await self.market_data.fetch_ticker_data(
                         symbol=asset.asset.symbol,
                         start_date=start_date_str,
                         end_date=end_date_str,
@@ -394,7 +431,7 @@ class PortfolioAnalyticsService:
         end_date_str = calculation_date.strftime("%Y-%m-%d")
         start_date_str = (calculation_date - timedelta(days=365)).strftime("%Y-%m-%d")
 
-        price_data = await market_data_service.fetch_ticker_data(
+        price_data = await self.market_data.fetch_ticker_data(
             symbol=asset.symbol,
             start_date=start_date_str,
             end_date=end_date_str,
@@ -405,7 +442,7 @@ class PortfolioAnalyticsService:
             raise ValueError("Insufficient price data for calculations")
 
         # Get current price and calculate basic metrics
-        current_price = await market_data_service.get_current_price(asset.symbol)
+        current_price = await self.market_data.get_current_price(asset.symbol)
         if not current_price:
             current_price = float(price_data["Close"].iloc[-1])
 
@@ -647,7 +684,7 @@ class PortfolioAnalyticsService:
 
         for asset in portfolio_assets:
             if asset.asset and asset.asset.symbol:
-                current_price = await market_data_service.get_current_price(
+                current_price = await self.market_data.get_current_price(
                     asset.asset.symbol
                 )
                 if current_price:
@@ -1016,7 +1053,7 @@ class PortfolioAnalyticsService:
             # Get current prices for all assets
             for asset in portfolio_assets:
                 if asset.asset and asset.asset.symbol:
-                    current_price = await market_data_service.get_current_price(
+                    current_price = await self.market_data.get_current_price(
                         asset.asset.symbol
                     )
                     if current_price:
@@ -1301,14 +1338,14 @@ class PortfolioAnalyticsService:
         start_date_str = (calculation_date - timedelta(days=365)).strftime("%Y-%m-%d")
 
         # Fetch price data for both assets
-        price_data1 = await market_data_service.fetch_ticker_data(
+        price_data1 = await self.market_data.fetch_ticker_data(
             symbol=asset1.symbol,
             start_date=start_date_str,
             end_date=end_date_str,
             interval="1d",
         )
 
-        price_data2 = await market_data_service.fetch_ticker_data(
+        price_data2 = await self.market_data.fetch_ticker_data(
             symbol=asset2.symbol,
             start_date=start_date_str,
             end_date=end_date_str,
@@ -1340,6 +1377,152 @@ class PortfolioAnalyticsService:
 
         return correlation
 
+    async def calculate_correlation_matrix(
+        self,
+        asset_ids: List[int],
+        calculation_date: Optional[datetime] = None,
+    ) -> List[AssetCorrelation]:
+        """
+        Calculate correlations for every pair of the given assets at once.
+
+        Each history is fetched once and all pairs are computed from one
+        aligned returns array, then upserted in a single statement.
+
+        Args:
+            asset_ids: Assets to correlate
+            calculation_date: As-of date (defaults to now)
+
+        Returns:
+            One AssetCorrelation per pair, with asset1_id < asset2_id
+        """
+        if calculation_date is None:
+            calculation_date = datetime.now(timezone.utc)
+
+        assets = [
+            asset
+            for asset in self.db.query(Asset).filter(Asset.id.in_(asset_ids)).all()
+            if asset.symbol
+        ]
+
+        # Get historical data for all assets (1 year lookback)
+        end_date_str = calculation_date.strftime("%Y-%m-%d")
+        start_date_str = (calculation_date - timedelta(days=365)).strftime("%Y-%m-%d")
+
+        async def fetch_history(asset: Asset) -> Optional[pd.DataFrame]:
+            try:
+                return await self.market_data.fetch_ticker_data(
+                    symbol=asset.symbol,
+                    start_date=start_date_str,
+                    end_date=end_date_str,
+                    interval="1d",
+                )
+            except Exception as e:
+                logger.warning(f"Failed to get historical data for {asset.symbol}: {e}")
+                return None
+
+        histories = await asyncio.gather(*(fetch_history(asset) for asset in assets))
+
+        closes: Dict[int, pd.Series] = {}
+        for asset, price_data in zip(assets, histories):
+            if price_data is None or len(price_data) < 30:
+                logger.warning(f"Insufficient price data for {asset.symbol}, skipping from correlation matrix")
+                continue
+            closes[asset.id] = pd.Series(
+                price_data["Close"].to_numpy(dtype=float),
+                index=pd.to_datetime(price_data["Date"]),
+            )
+
+        if len(closes) < 2:
+            raise ValueError("Insufficient price data for correlation calculations")
+
+        returns = self.correlation_engine.returns_frame(closes)
+        pair_metrics = self.correlation_engine.pair_metrics(returns)
+        rows = [
+            {
+                "asset1_id": asset1_id,
+                "asset2_id": asset2_id,
+                "calculation_date": calculation_date,
+                **{column: metrics.get(column) for column in CORRELATION_METRIC_COLUMNS},
+            }
+            for (asset1_id, asset2_id), metrics in pair_metrics.items()
+        ]
+        logger.info(f"Calculated correlation matrix for {len(closes)} assets ({len(rows)} pairs)")
+        return self._upsert_correlations(rows)
+
+    def _upsert_snapshots(self, rows: List[Dict[str, Any]]) -> List[PortfolioPerformanceHistory]:
+        """
+        Insert backfilled snapshots in one statement. A snapshot already stored
+        at the same time only has its value columns updated, keeping the return
+        and risk columns written by create_performance_snapshot.
+        """
+        dialect_insert = UPSERT_INSERTS.get(self.db.get_bind().dialect.name)
+        if dialect_insert is None:
+            # No native upsert: leave existing snapshots alone
+            existing = set(
+                self.db.scalars(
+                    select(PortfolioPerformanceHistory.snapshot_date).where(
+                        PortfolioPerformanceHistory.portfolio_id == rows[0]["portfolio_id"],
+                        PortfolioPerformanceHistory.snapshot_date.in_(
+                            [row["snapshot_date"] for row in rows]
+                        ),
+                    )
+                )
+            )
+            rows = [row for row in rows if row["snapshot_date"] not in existing]
+            statement = insert(PortfolioPerformanceHistory)
+        else:
+            statement = dialect_insert(PortfolioPerformanceHistory)
+            statement = statement.on_conflict_do_update(
+                index_elements=["portfolio_id", "snapshot_date"],
+                set_={column: statement.excluded[column] for column in SNAPSHOT_VALUE_COLUMNS},
+            )
+
+        # Bulk INSERT ... RETURNING; rows come back populated, so no refresh
+        snapshots = (
+            list(
+                self.db.scalars(
+                    statement.returning(PortfolioPerformanceHistory),
+                    rows,
+                    execution_options={"populate_existing": True},
+                )
+            )
+            if rows
+            else []
+        )
+        self.db.commit()
+        return snapshots
+
+    def _upsert_correlations(self, rows: List[Dict[str, Any]]) -> List[AssetCorrelation]:
+        """Insert correlation rows, replacing any with the same pair and date."""
+        dialect_insert = UPSERT_INSERTS.get(self.db.get_bind().dialect.name)
+        if dialect_insert is None:
+            # No native upsert: clear conflicting rows, then plain bulk insert
+            for row in rows:
+                self.db.execute(
+                    delete(AssetCorrelation).where(
+                        AssetCorrelation.asset1_id == row["asset1_id"],
+                        AssetCorrelation.asset2_id == row["asset2_id"],
+                        AssetCorrelation.calculation_date == row["calculation_date"],
+                    )
+                )
+            statement = insert(AssetCorrelation)
+        else:
+            statement = dialect_insert(AssetCorrelation)
+            statement = statement.on_conflict_do_update(
+                index_elements=["asset1_id", "asset2_id", "calculation_date"],
+                set_={column: statement.excluded[column] for column in CORRELATION_METRIC_COLUMNS},
+            )
+
+        correlations = list(
+            self.db.scalars(
+                statement.returning(AssetCorrelation),
+                rows,
+                execution_options={"populate_existing": True},
+            )
+        )
+        self.db.commit()
+        return correlations
+
     def _calculate_correlations(
         self, price_data1: pd.DataFrame, price_data2: pd.DataFrame
     ) -> Dict[str, Any]:
@@ -1363,10 +1546,10 @@ class PortfolioAnalyticsService:
             returns1 = merged_data["asset1_close"].pct_change().dropna()
             returns2 = merged_data["asset2_close"].pct_change().dropna()
 
-            # Overall correlation
+            # Overall correlation, reused for the significance test
+            correlation = returns1.corr(returns2)
             if len(returns1) >= 252:  # 1 year
-                correlation_1y = returns1.corr(returns2)
-                metrics["correlation_1y"] = Decimal(str(correlation_1y))
+                metrics["correlation_1y"] = Decimal(str(correlation))
 
             # 6-month correlation
             if len(returns1) >= 126:
@@ -1385,32 +1568,19 @@ class PortfolioAnalyticsService:
 
             # Rolling correlations
             if len(returns1) >= 60:
-                rolling_60d = (
-                    returns1.rolling(window=60)
-                    .corr(returns2.rolling(window=60))
-                    .iloc[-1]
-                )
+                rolling_60d = returns1.rolling(window=60).corr(returns2).iloc[-1]
                 metrics["rolling_correlation_60d"] = Decimal(str(rolling_60d))
 
             if len(returns1) >= 20:
-                rolling_20d = (
-                    returns1.rolling(window=20)
-                    .corr(returns2.rolling(window=20))
-                    .iloc[-1]
-                )
+                rolling_20d = returns1.rolling(window=20).corr(returns2).iloc[-1]
                 metrics["rolling_correlation_20d"] = Decimal(str(rolling_20d))
 
-            # Statistical significance (simplified)
+            # Statistical significance: two-sided t-test on the overall correlation
             if len(returns1) >= 30:
-                correlation = returns1.corr(returns2)
-                # Simple p-value approximation (for proper stats, use scipy.stats)
-                t_stat = correlation * math.sqrt(
-                    (len(returns1) - 2) / (1 - correlation**2)
-                )
-                # Simplified p-value calculation
-                p_value = 2 * (1 - abs(t_stat) / 2)  # Rough approximation
-                metrics["p_value"] = Decimal(str(max(0, min(1, p_value))))
-                metrics["is_significant"] = p_value < 0.05
+                p_value = float(correlation_p_values(correlation, len(returns1)))
+                if not math.isnan(p_value):
+                    metrics["p_value"] = Decimal(str(round(p_value, 6)))
+                    metrics["is_significant"] = p_value < self.correlation_engine.significance_level
 
         except Exception as e:
             logger.error(f"Error calculating correlations: {e}")
@@ -1670,7 +1840,7 @@ class PortfolioAnalyticsService:
                 raise ValueError("No symbols found for assets")
 
             # Bulk fetch current prices
-            current_prices = await market_data_service.get_multiple_current_prices(symbols)
+            current_prices = await self.market_data.get_multiple_current_prices(symbols)
 
             updated_data = {
                 "update_timestamp": datetime.now(timezone.utc),
@@ -1709,7 +1879,13 @@ class PortfolioAnalyticsService:
     async def generate_historical_performance_snapshots(
         self, portfolio_id: int, start_date: datetime, end_date: datetime
     ) -> List[PortfolioPerformanceHistory]:
-        """Generate historical performance snapshots for a portfolio using yfinance data."""
+        """
+        Generate daily historical performance snapshots for a portfolio using yfinance data.
+
+        Values every day of the range at once from a forward-filled
+        (dates x assets) close matrix and writes all snapshots with one bulk
+        upsert; snapshots already stored only get their value columns updated.
+        """
         try:
             logger.info(f"Generating historical snapshots for portfolio {portfolio_id} from {start_date} to {end_date}")
             
@@ -1724,106 +1900,96 @@ class PortfolioAnalyticsService:
                 raise ValueError("Portfolio has no assets")
 
             # Get historical data for all assets
-            asset_historical_data = {}
-            for portfolio_asset in portfolio_assets:
-                if portfolio_asset.asset and portfolio_asset.asset.symbol:
-                    try:
-                        end_date_str = end_date.strftime("%Y-%m-%d")
-                        start_date_str = start_date.strftime("%Y-%m-%d")
-                        
-                        price_data = await market_data_service.fetch_ticker_data(
-                            symbol=portfolio_asset.asset.symbol,
-                            start_date=start_date_str,
-                            end_date=end_date_str,
-                            interval="1d",
-                        )
-                        
-                        if price_data is not None and len(price_data) > 0:
-                            asset_historical_data[portfolio_asset.asset.id] = {
-                                'data': price_data,
-                                'quantity': float(portfolio_asset.quantity),
-                                'cost_basis': float(portfolio_asset.cost_basis_total)
-                            }
-                        else:
-                            logger.warning(f"No historical data for {portfolio_asset.asset.symbol}")
-                            
-                    except Exception as e:
-                        logger.warning(f"Failed to get historical data for {portfolio_asset.asset.symbol}: {e}")
+            held_assets = [
+                portfolio_asset
+                for portfolio_asset in portfolio_assets
+                if portfolio_asset.asset and portfolio_asset.asset.symbol
+            ]
+            end_date_str = end_date.strftime("%Y-%m-%d")
+            start_date_str = start_date.strftime("%Y-%m-%d")
+
+            async def fetch_history(portfolio_asset: PortfolioAsset) -> Optional[pd.DataFrame]:
+                try:
+                    return await self.market_data.fetch_ticker_data(
+                        symbol=portfolio_asset.asset.symbol,
+                        start_date=start_date_str,
+                        end_date=end_date_str,
+                        interval="1d",
+                    )
+                except Exception as e:
+                    logger.warning(f"Failed to get historical data for {portfolio_asset.asset.symbol}: {e}")
+                    return None
+
+            histories = await asyncio.gather(
+                *(fetch_history(portfolio_asset) for portfolio_asset in held_assets)
+            )
+
+            asset_ids: List[int] = []
+            asset_prices: Dict[int, pd.Series] = {}
+            quantities: List[float] = []
+            cost_bases: List[float] = []
+            for portfolio_asset, price_data in zip(held_assets, histories):
+                if price_data is None or len(price_data) == 0:
+                    logger.warning(f"No historical data for {portfolio_asset.asset.symbol}")
+                    continue
+                asset_id = portfolio_asset.asset.id
+                asset_ids.append(asset_id)
+                asset_prices[asset_id] = pd.Series(
+                    price_data["Close"].to_numpy(dtype=float),
+                    index=pd.to_datetime(price_data["Date"]),
+                )
+                quantities.append(float(portfolio_asset.quantity))
+                cost_bases.append(float(portfolio_asset.cost_basis_total))
 
-            if not asset_historical_data:
+            if not asset_prices:
                 # Create a single snapshot with current data if no historical data
                 snapshot = await self.create_performance_snapshot(portfolio_id, end_date)
                 return [snapshot]
 
-            # Generate daily snapshots
-            snapshots = []
-            current_date = start_date
-            
-            while current_date <= end_date:
-                try:
-                    # Calculate portfolio value for this date
-                    total_value = 0
-                    total_cost_basis = 0
-                    
-                    for asset_id, asset_data in asset_historical_data.items():
-                        price_data = asset_data['data']
-                        quantity = asset_data['quantity']
-                        cost_basis = asset_data['cost_basis']
-                        
-                        # Find price for this date
-                        date_str = current_date.strftime("%Y-%m-%d")
-                        matching_rows = price_data[price_data['Date'].dt.strftime("%Y-%m-%d") == date_str]
-                        
-                        if not matching_rows.empty:
-                            close_price = float(matching_rows.iloc[0]['Close'])
-                            asset_value = close_price * quantity
-                        else:
-                            # Use previous available price or cost basis
-                            prev_rows = price_data[price_data['Date'] <= current_date]
-                            if not prev_rows.empty:
-                                close_price = float(prev_rows.iloc[-1]['Close'])
-                                asset_value = close_price * quantity
-                            else:
-                                asset_value = cost_basis
-                        
-                        total_value += asset_value
-                        total_cost_basis += cost_basis
-
-                    # Calculate metrics
-                    total_unrealized_pnl = total_value - total_cost_basis
-                    total_unrealized_pnl_percent = (
-                        (total_unrealized_pnl / total_cost_basis * 100)
-                        if total_cost_basis > 0
-                        else 0
-                    )
+            # One row per day from start_date, keeping its time of day
+            snapshot_dates = pd.date_range(start_date, end_date, freq="D")
+            if snapshot_dates.empty:
+                return []
+            calendar_days = self.valuation_engine.daily_dates(
+                start_date.date(), snapshot_dates[-1].date()
+            )
 
-                    # Create snapshot for this date
-                    snapshot = PortfolioPerformanceHistory(
-                        portfolio_id=portfolio_id,
-                        snapshot_date=current_date,
-                        total_value=Decimal(str(total_value)),
-                        total_cost_basis=Decimal(str(total_cost_basis)),
-                        total_unrealized_pnl=Decimal(str(total_unrealized_pnl)),
-                        total_unrealized_pnl_percent=Decimal(str(total_unrealized_pnl_percent)),
-                    )
+            # Last close on or before each day; before an asset's first close
+            # it is carried at cost basis.
+            closes = self.valuation_engine.price_matrix(asset_prices, calendar_days)
+            closes = closes.reindex(columns=asset_ids).to_numpy(dtype=float)
+            cost_basis_row = np.array(cost_bases)
+            asset_values = np.where(
+                np.isnan(closes), cost_basis_row, closes * np.array(quantities)
+            )
 
-                    self.db.add(snapshot)
-                    snapshots.append(snapshot)
+            total_values = asset_values.sum(axis=1)
+            total_cost_basis = float(cost_basis_row.sum())
+            total_unrealized_pnl = total_values - total_cost_basis
+            if total_cost_basis > 0:
+                total_unrealized_pnl_percent = total_unrealized_pnl / total_cost_basis * 100
+            else:
+                total_unrealized_pnl_percent = np.zeros_like(total_values)
 
-                    current_date += timedelta(days=1)
-                    
-                except Exception as e:
-                    logger.warning(f"Failed to create snapshot for {current_date}: {e}")
-                    current_date += timedelta(days=1)
-                    continue
+            rows = [
+                {
+                    "portfolio_id": portfolio_id,
+                    "snapshot_date": snapshot_date,
+                    "total_value": value,
+                    "total_cost_basis": total_cost_basis,
+                    "total_unrealized_pnl": pnl,
+                    "total_unrealized_pnl_percent": pnl_percent,
+                }
+                for snapshot_date, value, pnl, pnl_percent in zip(
+                    snapshot_dates.to_pydatetime(),
+                    total_values.tolist(),
+                    total_unrealized_pnl.tolist(),
+                    total_unrealized_pnl_percent.tolist(),
+                )
+            ]
+
+            snapshots = self._upsert_snapshots(rows)
 
-            # Commit all snapshots
-            self.db.commit()
-            
-            # Refresh all snapshots
-            for snapshot in snapshots:
-                self.db.refresh(snapshot)
-            
             logger.info(f"Generated {len(snapshots)} historical snapshots for portfolio {portfolio_id}")
             return snapshots
 
@@ -0,0 +1,37 @@
+"""
+Portfolio Calculation Context
+Per-request memo shared by every metric of a portfolio performance
+calculation, so transactions, price history and the daily value series are
+loaded and built once instead of once per metric.
+"""
+
+from collections import Counter
+from datetime import datetime
+from typing import Dict, List, Optional
+
+import pandas as pd  # type: ignore
+
+from app.core.database.models import Transaction
+
+
+class PortfolioCalculationContext:
+    """Memoized inputs and intermediate results for one portfolio and end date."""
+
+    def __init__(self, portfolio_id: int, end_date: datetime) -> None:
+        self.portfolio_id = portfolio_id
+        self.end_date = end_date
+        self.transactions: Optional[List[Transaction]] = None
+        # Close prices per asset_id, indexed by date
+        self.asset_prices: Optional[Dict[int, pd.Series]] = None
+        # Inception-to-end_date daily values; periods are slices of it
+        self.daily_values: Optional[pd.DataFrame] = None
+        self.initial_market_values: Dict[Optional[datetime], float] = {}
+        # How many times each pipeline stage actually ran
+        self.stage_counts: Counter = Counter()
+
+    def covers(self, portfolio_id: int, end_date: datetime) -> bool:
+        """Whether memoized data applies to this portfolio and end date."""
+        return portfolio_id == self.portfolio_id and end_date == self.end_date
+
+    def record(self, stage: str, count: int = 1) -> None:
+        self.stage_counts[stage] += count
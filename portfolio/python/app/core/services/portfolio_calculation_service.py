@@ -7,6 +7,7 @@ Comprehensive service for calculating portfolio performance metrics including:
 - MWR (Money-Weighted Return)
 Supports period-based calculations and benchmark comparisons.
 """
+import asyncio
 import logging
 from datetime import datetime, timedelta, timezone
 from typing import Any, Dict, List, Optional, Tuple
@@ -24,6 +25,10 @@ from app.core.database.models import (
     TransactionType,
 )
 from app.core.services.market_data_service import MarketDataService
+from app.core.services.portfolio_calculation_context import (
+    PortfolioCalculationContext,
+)
+from app.core.services.portfolio_valuation_engine import PortfolioValuationEngine
 
 logger = logging.getLogger(__name__)
 
@@ -74,6 +79,7 @@ class PortfolioCalculationService:
     def __init__(self, db: Session):
         self.db = db
         self.market_data_service = MarketDataService()
+        self.valuation_engine = PortfolioValuationEngine()
 
     async def calculate_portfolio_performance(
             self,
@@ -81,6 +87,7 @@ class PortfolioCalculationService:
             user_id: int,
             period: str = PeriodType.INCEPTION,
             end_date: Optional[datetime] = None,
+            context: Optional[PortfolioCalculationContext] = None,
     ) -> Dict[str, Any]:
         """
         Calculate comprehensive portfolio performance metrics.
@@ -89,6 +96,8 @@ class PortfolioCalculationService:
             user_id: User ID for ownership verification
             period: Period for calculation
             end_date: End date for calculation (defaults to now)
+            context: Calculation context to reuse; one is created if missing
+                or if it was built for another portfolio or end date
         Returns:
             Dictionary containing all performance metrics
         """
@@ -107,7 +116,11 @@ class PortfolioCalculationService:
         # However, for XIRR, we only want transactions *within* the period + the initial state.
         # For simplicity in this structure, we get transactions relevant to the period.
         # Let's get ALL transactions and let calculators filter.
-        all_transactions = self._get_transactions(portfolio_id, None, end_date)
+        # Every metric shares one context, so transactions, prices and the
+        # daily value series are loaded once per request.
+        if context is None or not context.covers(portfolio_id, end_date):
+            context = PortfolioCalculationContext(portfolio_id, end_date)
+        all_transactions = self._get_context_transactions(context)
 
         # Filter transactions that fall *within* the specified period for calculations
         if start_date:
@@ -127,49 +140,95 @@ class PortfolioCalculationService:
         # Get current portfolio value
         current_value = self._get_current_portfolio_value(portfolio_id)
 
-        # Calculate different return metrics
-        cagr = await self._calculate_cagr(
-            portfolio_id, all_transactions, current_value, start_date, end_date
+        metrics = await self._calculate_period_metrics(
+            portfolio_id, all_transactions, current_value, start_date, end_date, context
         )
-
-        # XIRR calculation should use transactions relevant to the period,
-        # plus the market value at the start of the period as the initial outflow.
-        xirr_value = await self._calculate_period_xirr(
-            portfolio_id, all_transactions, current_value, start_date, end_date
+        logger.debug(
+            "Portfolio %s performance (%s) stage counts: %s",
+            portfolio_id,
+            period,
+            dict(context.stage_counts),
         )
 
-        twr = await self._calculate_twr(
-            portfolio_id, all_transactions, current_value, start_date, end_date
-        )
+        return {
+            "portfolio_id": portfolio_id,
+            "portfolio_name": portfolio.name,
+            "period": period,
+            "start_date": start_date,
+            "end_date": end_date,
+            "current_value": current_value,
+            "metrics": metrics,
+            "calculation_date": datetime.now(timezone.utc).isoformat(),
+        }
 
-        # MWR is just XIRR.
-        mwr = xirr_value
+    async def calculate_multi_period_performance(
+            self,
+            portfolio_id: int,
+            user_id: int,
+            periods: List[str],
+            end_date: Optional[datetime] = None,
+    ) -> Dict[str, Any]:
+        """
+        Calculate portfolio performance metrics for several periods in one pass.
+        Transactions, price history and the inception-to-date daily value series
+        are loaded once; every period is computed from slices of that series.
+        Args:
+            portfolio_id: Portfolio ID
+            user_id: User ID for ownership verification
+            periods: Periods to calculate; unknown periods are skipped
+            end_date: End date shared by all periods (defaults to now)
+        Returns:
+            Dictionary with portfolio details and one entry per calculated period
+        """
+        if end_date is None:
+            end_date = datetime.now(timezone.utc)
 
-        # Calculate additional metrics
-        volatility = await self._calculate_volatility(
-            portfolio_id, start_date, end_date
-        )
-        sharpe_ratio = self._calculate_sharpe_ratio(twr, volatility)
-        max_drawdown = await self._calculate_max_drawdown(
-            portfolio_id, start_date, end_date
+        portfolio = self._get_portfolio(portfolio_id, user_id)
+        if not portfolio:
+            raise ValueError(f"Portfolio {portfolio_id} not found or not accessible")
+
+        context = PortfolioCalculationContext(portfolio_id, end_date)
+        all_transactions = self._get_context_transactions(context)
+        current_value = self._get_current_portfolio_value(portfolio_id)
+
+        period_results = []
+        if all_transactions:
+            for period in periods:
+                try:
+                    start_date = PeriodType.get_start_date(period, end_date)
+                    metrics = await self._calculate_period_metrics(
+                        portfolio_id,
+                        all_transactions,
+                        current_value,
+                        start_date,
+                        end_date,
+                        context,
+                    )
+                except Exception as e:
+                    logger.warning(
+                        "Failed to calculate performance for period %s: %s", period, e
+                    )
+                    continue
+                period_results.append(
+                    {
+                        "period": period,
+                        "start_date": start_date,
+                        "end_date": end_date,
+                        "metrics": metrics,
+                    }
+                )
+        logger.debug(
+            "Portfolio %s multi-period performance (%d periods) stage counts: %s",
+            portfolio_id,
+            len(periods),
+            dict(context.stage_counts),
         )
 
         return {
             "portfolio_id": portfolio_id,
             "portfolio_name": portfolio.name,
-            "period": period,
-            "start_date": start_date,
-            "end_date": end_date,
             "current_value": current_value,
-            "metrics": {
-                "cagr": cagr,
-                "xirr": xirr_value,
-                "twr": twr,
-                "mwr": mwr,
-                "volatility": volatility,
-                "sharpe_ratio": sharpe_ratio,
-                "max_drawdown": max_drawdown,
-            },
+            "periods": period_results,
             "calculation_date": datetime.now(timezone.utc).isoformat(),
         }
 
@@ -442,18 +501,92 @@ class PortfolioCalculationService:
         return comparison
 
     # Helper methods for calculations
+    async def _calculate_period_metrics(
+            self,
+            portfolio_id: int,
+            all_transactions: List[Transaction],
+            current_value: float,
+            start_date: Optional[datetime],
+            end_date: datetime,
+            context: PortfolioCalculationContext,
+    ) -> Dict[str, Optional[float]]:
+        """Return and risk metrics for one period from a shared context."""
+        # Calculate different return metrics
+        cagr = await self._calculate_cagr(
+            portfolio_id,
+            all_transactions,
+            current_value,
+            start_date,
+            end_date,
+            context=context,
+        )
+
+        # XIRR calculation should use transactions relevant to the period,
+        # plus the market value at the start of the period as the initial outflow.
+        xirr_value = await self._calculate_period_xirr(
+            portfolio_id,
+            all_transactions,
+            current_value,
+            start_date,
+            end_date,
+            context=context,
+        )
+
+        twr = await self._calculate_twr(
+            portfolio_id,
+            all_transactions,
+            current_value,
+            start_date,
+            end_date,
+            context=context,
+        )
+
+        # MWR is just XIRR.
+        mwr = xirr_value
+
+        # Calculate additional metrics
+        volatility = await self._calculate_volatility(
+            portfolio_id, start_date, end_date, context=context
+        )
+        sharpe_ratio = self._calculate_sharpe_ratio(twr, volatility)
+        max_drawdown = await self._calculate_max_drawdown(
+            portfolio_id, start_date, end_date, context=context
+        )
+
+        return {
+            "cagr": cagr,
+            "xirr": xirr_value,
+            "twr": twr,
+            "mwr": mwr,
+            "volatility": volatility,
+            "sharpe_ratio": sharpe_ratio,
+            "max_drawdown": max_drawdown,
+        }
+
     async def _calculate_daily_portfolio_values(
             self,
             portfolio_id: int,
             start_date: Optional[datetime],
             end_date: datetime,
+            context: Optional[PortfolioCalculationContext] = None,
     ) -> pd.DataFrame:
         """
         Calculate daily portfolio values using historical price data.
+        With a matching context, the inception series is built once and each
+        period is a slice of it.
         Returns:
             DataFrame with columns: Date, PortfolioValue, DailyReturn
         """
         try:
+            if context is not None and context.covers(portfolio_id, end_date):
+                daily_values = await self._get_context_daily_values(context)
+                if start_date is None or daily_values.empty:
+                    return daily_values.copy()
+                period_start = pd.Timestamp(start_date.date())
+                return daily_values[daily_values["Date"] >= period_start].reset_index(
+                    drop=True
+                )
+
             # Get all transactions for the portfolio
             all_transactions = self._get_transactions(portfolio_id, None, end_date)
             if not all_transactions:
@@ -466,107 +599,99 @@ class PortfolioCalculationService:
                 # We need data from just before the period start to get the initial value
                 calc_start_date = min(start_date - timedelta(days=7), first_transaction_date)
 
-            calc_start_date_d = calc_start_date.date()
-            end_date_d = end_date.date()
-
-            # Get all unique assets in the portfolio
-            asset_ids = list(set(t.asset_id for t in all_transactions))
-            assets = {}
-            for asset_id in asset_ids:
-                asset = self.db.query(Asset).filter(Asset.id == asset_id).first()
-                if asset:
-                    assets[asset_id] = asset
-
-            # Get historical price data for all assets
-            asset_prices = {}
-            for asset_id, asset in assets.items():
-                try:
-                    price_data = await self.market_data_service.fetch_ticker_data(
-                        symbol=asset.symbol, period="max", interval="1d"
-                    )
-                    if not price_data.empty:
-                        # Convert to proper format and index by date
-                        price_data["Date"] = pd.to_datetime(price_data["Date"]).dt.date
-                        # *** FIX: ADDED .sort_index() TO PREVENT PANDAS asof ERROR ***
-                        price_data = price_data.set_index("Date").sort_index()
-                        asset_prices[asset_id] = price_data
-                except Exception as e:
-                    logger.warning(
-                        "Could not fetch price data for asset %s: %s", asset.symbol, e
-                    )
-                    continue
-
+            asset_prices = await self._fetch_asset_prices(all_transactions)
             if not asset_prices:
                 logger.error("No price data available for any assets")
                 return pd.DataFrame()
 
-            # Create date range
-            date_range = pd.date_range(start=calc_start_date_d, end=end_date_d, freq="D")
-            portfolio_values = []
-            for current_date in date_range:
-                current_date = current_date.date()
-                # Calculate holdings as of this date
-                holdings = self._calculate_holdings_as_of_date(
-                    all_transactions, current_date
-                )
-
-                if not holdings:
-                    # If no holdings, portfolio value is 0 (unless we track cash)
-                    if portfolio_values:  # Only add if we already started tracking
-                        portfolio_values.append(
-                            {"Date": current_date, "PortfolioValue": 0.0}
-                        )
-                    continue
-
-                # Calculate portfolio value for this date
-                portfolio_value = 0.0
-                valid_price_found = False
-                for asset_id, quantity in holdings.items():
-                    if asset_id in asset_prices and quantity > 0:
-                        # Get the price for this date (or closest available)
-                        price = self._get_price_for_date(
-                            asset_prices[asset_id], current_date
-                        )
-                        if price is not None:
-                            portfolio_value += quantity * price
-                            valid_price_found = True
-
-                if portfolio_value > 0 or valid_price_found:
-                    portfolio_values.append(
-                        {"Date": current_date, "PortfolioValue": portfolio_value}
-                    )
-
-            if not portfolio_values:
-                return pd.DataFrame()
-
-            # Create DataFrame and calculate daily returns
-            df = pd.DataFrame(portfolio_values).drop_duplicates(subset=["Date"])
-            df = df.sort_values("Date").set_index("Date")
-
-            # Calculate daily returns, handling cash flows
-            # To calculate pure daily return, we need to account for cash flows on transaction days.
-            # (Value_End - Value_Start - CashFlow) / (Value_Start + CashFlow_In)
-            # This complex logic is simplified here by using pct_change,
-            # which assumes no intra-day cash flows (close-to-close).
-            # This is standard for most retail volatility/drawdown calcs.
-            df["DailyReturn"] = df["PortfolioValue"].pct_change()
+            # Value every day at once: holdings (dates x assets) * forward-filled
+            # prices (dates x assets), summed per row.
+            return self.valuation_engine.value_portfolio(
+                all_transactions,
+                asset_prices,
+                calc_start_date.date(),
+                end_date.date(),
+                start_date,
+            )
+        except Exception as e:
+            logger.error("Error calculating daily portfolio values: %s", e)
+            return pd.DataFrame()
 
-            # Re-index to ensure all calendar days are present, then ffill values for weekends/holidays
-            df = df.reindex(pd.date_range(start=df.index.min(), end=df.index.max(), freq='D'))
-            df['PortfolioValue'] = df['PortfolioValue'].ffill()
+    async def _get_context_daily_values(
+            self, context: PortfolioCalculationContext
+    ) -> pd.DataFrame:
+        """Inception-to-end daily values for the context, built on first use."""
+        if context.daily_values is not None:
+            context.record("daily_values_reuse")
+            return context.daily_values
+
+        transactions = self._get_context_transactions(context)
+        if context.asset_prices is None:
+            context.asset_prices = await self._fetch_asset_prices(transactions)
+            context.record("price_fetch")
+
+        if not transactions or not context.asset_prices:
+            if transactions:
+                logger.error("No price data available for any assets")
+            context.daily_values = pd.DataFrame()
+        else:
+            first_transaction_date = min(t.transaction_date for t in transactions)
+            context.daily_values = self.valuation_engine.value_portfolio(
+                transactions,
+                context.asset_prices,
+                first_transaction_date.date(),
+                context.end_date.date(),
+            )
+        context.record("daily_values_build")
+        return context.daily_values
 
-            # Recalculate returns based on filled data, then drop NaNs
-            df["DailyReturn"] = df["PortfolioValue"].pct_change().fillna(0)
+    def _get_context_transactions(
+            self, context: PortfolioCalculationContext
+    ) -> List[Transaction]:
+        """All transactions up to the context end date, queried on first use."""
+        if context.transactions is None:
+            context.transactions = self._get_transactions(
+                context.portfolio_id, None, context.end_date
+            )
+            context.record("transactions_query")
+        return context.transactions
 
-            # Now, filter the DF to ONLY the user-requested period
-            if start_date:
-                df = df[df.index >= start_date.date()]
+    async def _fetch_asset_prices(
+            self, transactions: List[Transaction]
+    ) -> Dict[int, pd.Series]:
+        """
+        Full daily close history for every asset in the transactions.
+        Returns:
+            Close prices per asset_id, indexed by date; assets without data are omitted
+        """
+        asset_ids = list(set(t.asset_id for t in transactions))
+        if not asset_ids:
+            return {}
+        assets = self.db.query(Asset).filter(Asset.id.in_(asset_ids)).all()
+
+        async def fetch(asset: Asset) -> Optional[pd.Series]:
+            try:
+                price_data = await self.market_data_service.fetch_ticker_data(
+                    symbol=asset.symbol, period="max", interval="1d"
+                )
+            except Exception as e:
+                logger.warning(
+                    "Could not fetch price data for asset %s: %s", asset.symbol, e
+                )
+                return None
+            if price_data.empty:
+                return None
+            return pd.Series(
+                price_data["Close"].to_numpy(),
+                index=pd.to_datetime(price_data["Date"]),
+            )
 
-            df = df.dropna(subset=["PortfolioValue"])
-            return df.reset_index().rename(columns={"index": "Date"})
-        except Exception as e:
-            logger.error("Error calculating daily portfolio values: %s", e)
-            return pd.DataFrame()
+        closes = await asyncio.gather(*(fetch(asset) for asset in assets))
+        return {
+            asset.id: series
+            for asset, series in zip(assets, closes)
+            if series is not None
+        }
 
     def _calculate_holdings_as_of_date(
             self,
@@ -648,6 +773,7 @@ class PortfolioCalculationService:
             current_value: float,
             start_date: Optional[datetime],
             end_date: datetime,
+            context: Optional[PortfolioCalculationContext] = None,
     ) -> Optional[float]:
         """
         Calculate Compound Annual Growth Rate (CAGR) or Simple Return.
@@ -657,7 +783,7 @@ class PortfolioCalculationService:
         try:
             # Get initial market value at period start
             initial_value = await self._calculate_initial_market_value(
-                portfolio_id, transactions, start_date
+                portfolio_id, transactions, start_date, context=context
             )
 
             if initial_value <= 0 or current_value < 0:
@@ -681,33 +807,44 @@ class PortfolioCalculationService:
                 calc_start_date = first_transaction.transaction_date
                 years = (end_date - calc_start_date).days / 365.25
 
-            # Calculate simple total return first
-            total_return = (current_value / initial_value) - 1
-
-            if years <= 0:
-                # If no time passed or invalid period, just return the simple change
-                return float(total_return * 100)
-
-            # *** FIX: Only annualize if period is > 1 year ***
-            if years > 1:
-                # Actual CAGR formula for multi-year periods
-                annualized_return = ((1 + total_return) ** (1 / years)) - 1
-            else:
-                # For periods <= 1 year (like YTD), return the simple total return
-                annualized_return = total_return
-
-            return float(annualized_return * 100)  # Return as percentage
+            return self._annualized_return(initial_value, current_value, years)
         except Exception as e:
             logger.error("Error calculating CAGR: %s", e)
             return None
 
+    @staticmethod
+    def _annualized_return(
+            initial_value: float, final_value: float, years: float
+    ) -> float:
+        """
+        CAGR between two values as a percentage.
+        Periods of up to one year return the simple total return.
+        """
+        # Calculate simple total return first
+        total_return = (final_value / initial_value) - 1
+
+        if years <= 0:
+            # If no time passed or invalid period, just return the simple change
+            return float(total_return * 100)
+
+        # *** FIX: Only annualize if period is > 1 year ***
+        if years > 1:
+            # Actual CAGR formula for multi-year periods
+            annualized_return = ((1 + total_return) ** (1 / years)) - 1
+        else:
+            # For periods <= 1 year (like YTD), return the simple total return
+            annualized_return = total_return
+
+        return float(annualized_return * 100)  # Return as percentage
+
     async def _calculate_period_xirr(
             self,
             portfolio_id: int,
             all_transactions: List[Transaction],
             current_value: float,
             start_date: Optional[datetime],
-            end_date: datetime
+            end_date: datetime,
+            context: Optional[PortfolioCalculationContext] = None,
     ) -> Optional[float]:
         """Calculate XIRR for a specific period (not just inception)."""
         try:
@@ -717,7 +854,7 @@ class PortfolioCalculationService:
             if start_date:
                 # 1. Get Market Value at start_date. This is the initial "outflow"
                 initial_value = await self._calculate_initial_market_value(
-                    portfolio_id, all_transactions, start_date
+                    portfolio_id, all_transactions, start_date, context=context
                 )
 
                 if initial_value > 0:
@@ -780,6 +917,7 @@ class PortfolioCalculationService:
             current_value: float,
             start_date: Optional[datetime],
             end_date: datetime,
+            context: Optional[PortfolioCalculationContext] = None,
     ) -> Optional[float]:
         """
         Calculate Time-Weighted Return using daily portfolio values.
@@ -787,7 +925,7 @@ class PortfolioCalculationService:
         try:
             # Get daily portfolio values *for the specified period*
             daily_values_df = await self._calculate_daily_portfolio_values(
-                portfolio_id, start_date, end_date
+                portfolio_id, start_date, end_date, context=context
             )
 
             if daily_values_df.empty or len(daily_values_df) < 2:
@@ -795,7 +933,12 @@ class PortfolioCalculationService:
                     "Insufficient daily data for TWR calculation, using simple method"
                 )
                 return await self._calculate_simple_twr(
-                    portfolio_id, transactions, current_value, start_date, end_date
+                    portfolio_id,
+                    transactions,
+                    current_value,
+                    start_date,
+                    end_date,
+                    context=context,
                 )
 
             # The daily_values_df "DailyReturn" column already approximates TWR component returns.
@@ -833,7 +976,12 @@ class PortfolioCalculationService:
         except Exception as e:
             logger.error("Error calculating TWR: %s", e)
             return await self._calculate_simple_twr(
-                portfolio_id, transactions, current_value, start_date, end_date
+                portfolio_id,
+                transactions,
+                current_value,
+                start_date,
+                end_date,
+                context=context,
             )
 
     async def _calculate_simple_twr(
@@ -843,6 +991,7 @@ class PortfolioCalculationService:
             current_value: float,
             start_date: Optional[datetime],
             end_date: datetime,
+            context: Optional[PortfolioCalculationContext] = None,
     ) -> Optional[float]:
         """
         Fallback simple TWR (using Market Values).
@@ -853,7 +1002,7 @@ class PortfolioCalculationService:
         try:
             # Use actual market value at period start, not cost basis
             initial_value = await self._calculate_initial_market_value(
-                portfolio_id, transactions, start_date
+                portfolio_id, transactions, start_date, context=context
             )
 
             if initial_value <= 0 or current_value < 0:
@@ -934,6 +1083,7 @@ class PortfolioCalculationService:
             portfolio_id: int,
             start_date: Optional[datetime],
             end_date: datetime,
+            context: Optional[PortfolioCalculationContext] = None,
     ) -> Optional[float]:
         """
         Calculate portfolio volatility using daily returns from historical data.
@@ -942,33 +1092,37 @@ class PortfolioCalculationService:
         try:
             # Get daily portfolio values *for the specified period*
             daily_values = await self._calculate_daily_portfolio_values(
-                portfolio_id, start_date, end_date
+                portfolio_id, start_date, end_date, context=context
             )
 
             if daily_values.empty or len(daily_values) < 2:
                 logger.warning("Insufficient data for volatility calculation")
                 return None
 
-            # Calculate daily returns
-            daily_returns = daily_values["DailyReturn"].dropna()
+            return self._annualized_volatility(daily_values["DailyReturn"])
+        except Exception as e:
+            logger.error("Error calculating volatility: %s", e)
+            return None
 
-            if len(daily_returns) < 2:
-                return None
+    @staticmethod
+    def _annualized_volatility(daily_returns: pd.Series) -> Optional[float]:
+        """Annualized volatility of daily returns as a percentage."""
+        daily_returns = daily_returns.dropna()
 
-            # Calculate standard deviation of daily returns
-            daily_volatility = daily_returns.std()
+        if len(daily_returns) < 2:
+            return None
 
-            # Annualize volatility (assuming 252 trading days per year)
-            annualized_volatility = daily_volatility * np.sqrt(252)
+        # Calculate standard deviation of daily returns
+        daily_volatility = daily_returns.std()
 
-            # Convert to percentage
-            return float(annualized_volatility * 100)
-        except Exception as e:
-            logger.error("Error calculating volatility: %s", e)
-            return None
+        # Annualize volatility (assuming 252 trading days per year)
+        annualized_volatility = daily_volatility * np.sqrt(252)
+
+        # Convert to percentage
+        return float(annualized_volatility * 100)
 
+    @staticmethod
     def _calculate_sharpe_ratio(
-            self,
             annual_return: Optional[float],
             volatility: Optional[float],
             risk_free_rate: float = 2.0,
@@ -991,6 +1145,7 @@ class PortfolioCalculationService:
             portfolio_id: int,
             start_date: Optional[datetime],
             end_date: datetime,
+            context: Optional[PortfolioCalculationContext] = None,
     ) -> Optional[float]:
         """
         Calculate maximum drawdown using daily portfolio values.
@@ -1000,33 +1155,35 @@ class PortfolioCalculationService:
         try:
             # Get daily portfolio values for the period
             daily_values = await self._calculate_daily_portfolio_values(
-                portfolio_id, start_date, end_date
+                portfolio_id, start_date, end_date, context=context
             )
 
             if daily_values.empty or len(daily_values) < 2:
                 logger.warning("Insufficient data for max drawdown calculation")
                 return None
 
-            portfolio_values = daily_values["PortfolioValue"]
+            return self._max_drawdown(daily_values["PortfolioValue"])
+        except Exception as e:
+            logger.error("Error calculating max drawdown: %s", e)
+            return None
 
-            # Calculate running maximum (peak values)
-            running_max = portfolio_values.expanding().max()
+    @staticmethod
+    def _max_drawdown(values: pd.Series) -> float:
+        """Largest peak-to-trough decline of a value series as a positive percentage."""
+        # Calculate running maximum (peak values)
+        running_max = values.expanding().max()
 
-            # Calculate drawdown at each point
-            drawdowns = (portfolio_values - running_max) / running_max
+        # Calculate drawdown at each point
+        drawdowns = (values - running_max) / running_max
 
-            # Handle cases where running_max is 0 (replace inf with 0 or NaN)
-            drawdowns.replace([np.inf, -np.inf], np.nan, inplace=True)
-            drawdowns.fillna(0, inplace=True)
+        # Handle cases where running_max is 0 (replace inf with 0 or NaN)
+        drawdowns = drawdowns.replace([np.inf, -np.inf], np.nan).fillna(0)
 
-            # Find maximum drawdown (most negative value)
-            max_drawdown = drawdowns.min()
+        # Find maximum drawdown (most negative value)
+        max_drawdown = drawdowns.min()
 
-            # Convert to positive percentage
-            return float(abs(max_drawdown) * 100)
-        except Exception as e:
-            logger.error("Error calculating max drawdown: %s", e)
-            return None
+        # Convert to positive percentage
+        return float(abs(max_drawdown) * 100)
 
     # Asset-specific calculation methods
     async def _calculate_asset_cagr(
@@ -1576,8 +1733,27 @@ class PortfolioCalculationService:
             portfolio_id: int,
             transactions: List[Transaction],  # ALL transactions up to end_date
             start_date: Optional[datetime],
+            context: Optional[PortfolioCalculationContext] = None,
     ) -> float:
         """Calculate actual market value of portfolio at period start date."""
+        if context is not None and start_date in context.initial_market_values:
+            return context.initial_market_values[start_date]
+        initial_value = await self._compute_initial_market_value(
+            portfolio_id, transactions, start_date, context
+        )
+        if context is not None:
+            context.initial_market_values[start_date] = initial_value
+            context.record("initial_market_value")
+        return initial_value
+
+    async def _compute_initial_market_value(
+            self,
+            portfolio_id: int,
+            transactions: List[Transaction],
+            start_date: Optional[datetime],
+            context: Optional[PortfolioCalculationContext],
+    ) -> float:
+        """Market value at start_date, without the context memo lookup."""
         try:
             if start_date is None:
                 # For INCEPTION period, the initial value is the cost of the first transaction.
@@ -1593,9 +1769,16 @@ class PortfolioCalculationService:
 
             # Get daily portfolio values up to the start_date to find the value.
             # We fetch data up to the start_date, and look for the value on the last available day.
-            daily_values = await self._calculate_daily_portfolio_values(
-                portfolio_id, None, start_date
-            )
+            # A context already holds the inception series through end_date,
+            # which covers start_date.
+            if context is not None and context.portfolio_id == portfolio_id:
+                daily_values = await self._calculate_daily_portfolio_values(
+                    portfolio_id, None, context.end_date, context=context
+                )
+            else:
+                daily_values = await self._calculate_daily_portfolio_values(
+                    portfolio_id, None, start_date
+                )
 
             if daily_values.empty:
                 # Fallback to cost basis calculation if no daily data available
@@ -174,8 +174,8 @@ class PortfolioService:
             if not asset:
                 return portfolio_asset
 
-            # Get current price from yfinance
-            current_price = await self.market_data_service.get_current_price(
+            # Get current price from the ingested quote cache
+            current_price = await self.market_data_service.get_cached_price(
                 asset.symbol
             )
 
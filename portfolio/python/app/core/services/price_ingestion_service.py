@@ -0,0 +1,250 @@
+"""
+Price Ingestion Service
+Background job keeping the shared quote cache warm for every symbol held in a
+portfolio or watched in a watchlist. Quotes are fetched in batches, more often
+while the US market is open, so request paths read prices from the cache
+instead of calling Yahoo themselves. Every API worker runs the loop, but a
+Redis lock lets only one of them ingest at a time. Each tick's prices are also
+written to every watchlist item in one bulk refresh, and the performance
+history those refreshes append to is compacted periodically.
+"""
+
+import asyncio
+import logging
+import math
+import uuid
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional
+
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.core.database.connection import SessionLocal
+from app.core.database.models import Asset, PortfolioAsset, WatchlistItem
+from app.core.database.redis_client import RedisClient, get_redis
+from app.core.services.market_data_service import (
+    MarketDataService,
+    market_data_service,
+)
+from app.core.services.quote_cache import (
+    QuoteCache,
+    is_market_open,
+    quote_cache,
+    seconds_until_session_change,
+)
+from app.core.services.watchlist_history_service import (
+    WatchlistHistoryService,
+    watchlist_history_service,
+)
+from app.core.services.watchlist_service import WatchlistService
+
+logger = logging.getLogger(__name__)
+
+
+class PriceIngestionService:
+    """Scheduled quote ingestion into the shared quote cache."""
+
+    LOCK_NAME = "price_ingestion:lock"
+
+    def __init__(
+            self,
+            session_factory: Optional[Callable[[], Session]] = None,
+            market_data: Optional[MarketDataService] = None,
+            cache: Optional[QuoteCache] = None,
+            redis_client: Optional[RedisClient] = None,
+            batch_size: Optional[int] = None,
+            market_hours_interval: Optional[int] = None,
+            closed_interval: Optional[int] = None,
+            watchlist_refresh: Optional[bool] = None,
+            history: Optional[WatchlistHistoryService] = None,
+    ) -> None:
+        self.session_factory = session_factory or SessionLocal
+        self.market_data = market_data or market_data_service
+        self.cache = cache or quote_cache
+        self._redis = redis_client
+        self.batch_size = batch_size or settings.PRICE_INGESTION_BATCH_SIZE
+        self.market_hours_interval = (
+            market_hours_interval or settings.PRICE_INGESTION_MARKET_HOURS_INTERVAL_SECONDS
+        )
+        self.closed_interval = (
+            closed_interval or settings.PRICE_INGESTION_CLOSED_INTERVAL_SECONDS
+        )
+        self.watchlist_refresh = (
+            settings.PRICE_INGESTION_REFRESH_WATCHLISTS
+            if watchlist_refresh is None
+            else watchlist_refresh
+        )
+        self.history = history or watchlist_history_service
+        # Identifies this worker as the lock owner
+        self.token = uuid.uuid4().hex
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def redis(self) -> RedisClient:
+        if self._redis is None:
+            self._redis = get_redis()
+        return self._redis
+
+    def interval(self, now: Optional[datetime] = None) -> int:
+        """Seconds until the next tick."""
+        return self.market_hours_interval if is_market_open(now) else self.closed_interval
+
+    def sleep_seconds(self, now: Optional[datetime] = None) -> float:
+        """Time to the next tick, cut short so the first tick of a session is on time."""
+        return min(
+            self.interval(now), max(1, math.ceil(seconds_until_session_change(now)))
+        )
+
+    def collect_symbols(self) -> List[str]:
+        """Distinct symbols across portfolio holdings and watchlist items."""
+        db = self.session_factory()
+        try:
+            held = (
+                db.query(Asset.symbol)
+                .join(PortfolioAsset, PortfolioAsset.asset_id == Asset.id)
+                .distinct()
+                .all()
+            )
+            watched = db.query(WatchlistItem.symbol).distinct().all()
+        finally:
+            db.close()
+        return sorted({symbol.upper() for (symbol,) in held + watched if symbol})
+
+    def _hold_lock(self, now: Optional[datetime] = None) -> bool:
+        """
+        Take or renew the ingestion lock.
+
+        The lock outlives two ticks, so a worker that stops renewing it hands
+        ingestion over to another worker shortly after.
+        """
+        ex_seconds = 2 * self.interval(now)
+        return self.redis.extend_lock(
+            self.LOCK_NAME, self.token, ex_seconds
+        ) or self.redis.acquire_lock(self.LOCK_NAME, self.token, ex_seconds)
+
+    @staticmethod
+    def _cached_quote(symbol: str, quote: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Quote cache entry (see EnhancedMarketDataService) from a Yahoo quote."""
+        price = MarketDataService._quote_price(quote)
+        if price is None:
+            return None
+        previous_close = quote.get("regularMarketPreviousClose")
+        change = quote.get("regularMarketChange")
+        if change is None:
+            change = price - previous_close if previous_close else 0
+        change_percent = quote.get("regularMarketChangePercent")
+        if change_percent is None:
+            change_percent = (change / previous_close) * 100 if previous_close else 0
+        return {
+            "symbol": symbol,
+            "price": price,
+            "change": float(change),
+            "change_percent": float(change_percent),
+            "volume": quote.get("regularMarketVolume") or 0,
+            "updated_at": datetime.now(timezone.utc).isoformat(),
+        }
+
+    def refresh_watchlists(self, prices: Dict[str, float]) -> int:
+        """Write a tick's prices to every watchlist item, returning how many changed."""
+        db = self.session_factory()
+        try:
+            return WatchlistService(db).bulk_update_prices(prices)["items"]
+        finally:
+            db.close()
+
+    def compact_history(self) -> Dict[str, int]:
+        """Compact watchlist performance history in its own session."""
+        db = self.session_factory()
+        try:
+            return self.history.compact(db)
+        finally:
+            db.close()
+
+    async def ingest_once(self, now: Optional[datetime] = None) -> Dict[str, Any]:
+        """
+        Run one ingestion tick if this worker holds the lock.
+
+        Returns:
+            Summary with the number of symbols, cached quotes and refreshed
+            watchlist items, or `skipped` when another worker holds the lock
+        """
+        # Redis calls block, so they run off the event loop like the DB work
+        if not await asyncio.to_thread(self._hold_lock, now):
+            return {"skipped": True}
+
+        symbols = await asyncio.to_thread(self.collect_symbols)
+        prices: Dict[str, float] = {}
+        missing: List[str] = []
+        for i in range(0, len(symbols), self.batch_size):
+            batch = symbols[i: i + self.batch_size]
+            quotes = await self.market_data.get_latest_quotes(batch)
+            entries = {}
+            for symbol, quote in quotes.items():
+                entry = self._cached_quote(symbol, quote) if quote else None
+                if entry is None:
+                    missing.append(symbol)
+                else:
+                    entries[symbol] = entry
+            # One MSET per batch, expiring with the market session
+            await asyncio.to_thread(self.cache.set_many, entries, now=now)
+            prices.update((symbol, entry["price"]) for symbol, entry in entries.items())
+
+        refreshed = 0
+        if self.watchlist_refresh and prices:
+            # One UPDATE, one INSERT and one commit for the whole tick
+            refreshed = await asyncio.to_thread(self.refresh_watchlists, prices)
+
+        if self.watchlist_refresh and self.history.compaction_due():
+            # Only the lock holder compacts, so runs never overlap
+            try:
+                await asyncio.to_thread(self.compact_history)
+            except Exception as e:
+                logger.error("Watchlist history compaction failed: %s", e)
+
+        if missing:
+            logger.warning("No quotes for %d symbols: %s", len(missing), missing)
+        logger.info(
+            "Ingested %d of %d quotes, refreshed %d watchlist items",
+            len(prices), len(symbols), refreshed,
+        )
+        return {
+            "skipped": False,
+            "symbols": len(symbols),
+            "cached": len(prices),
+            "missing": missing,
+            "watchlist_items": refreshed,
+        }
+
+    async def run(self) -> None:
+        """Ingest forever on a market-hours-aware cadence."""
+        while True:
+            try:
+                await self.ingest_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error("Price ingestion failed: %s", e)
+            await asyncio.sleep(self.sleep_seconds())
+
+    def start(self) -> None:
+        """Start the ingestion loop on the running event loop."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self.run())
+
+    async def stop(self) -> None:
+        """Stop the loop and hand the lock to another worker."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        try:
+            await asyncio.to_thread(self.redis.release_lock, self.LOCK_NAME, self.token)
+        except Exception as e:
+            logger.warning("Could not release the price ingestion lock: %s", e)
+
+
+# Global instance
+price_ingestion_service = PriceIngestionService()
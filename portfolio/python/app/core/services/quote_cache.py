@@ -0,0 +1,160 @@
+"""
+Quote Cache
+Latest-quote cache shared by every worker through Redis. Entries expire
+quickly while the US market is open and live longer while it is closed,
+and lookups and writes are batched into single MGET/MSET round trips.
+"""
+
+import logging
+from datetime import datetime, time, timedelta
+from typing import Any, Dict, Iterable, Optional
+
+import pytz  # type: ignore
+import redis
+
+from app.config import settings
+from app.core.database.redis_client import RedisClient, get_redis
+
+logger = logging.getLogger(__name__)
+
+MARKET_TIMEZONE = pytz.timezone("US/Eastern")
+
+
+def is_market_open(now: Optional[datetime] = None) -> bool:
+    """Regular US session: 9:30 AM - 4:00 PM Eastern, Monday-Friday."""
+    now_et = (now or datetime.now(pytz.utc)).astimezone(MARKET_TIMEZONE)
+    if now_et.weekday() >= 5:
+        return False
+    market_open_time = now_et.replace(hour=9, minute=30, second=0, microsecond=0)
+    market_close_time = now_et.replace(hour=16, minute=0, second=0, microsecond=0)
+    return market_open_time <= now_et <= market_close_time
+
+
+def seconds_until_session_change(now: Optional[datetime] = None) -> float:
+    """Seconds until the regular US session next opens or closes."""
+    now_et = (now or datetime.now(pytz.utc)).astimezone(MARKET_TIMEZONE)
+    if is_market_open(now_et):
+        boundary = MARKET_TIMEZONE.localize(datetime.combine(now_et.date(), time(16, 0)))
+    else:
+        day = now_et.date()
+        if now_et.weekday() >= 5 or now_et.time() >= time(9, 30):
+            day += timedelta(days=1)
+        while day.weekday() >= 5:
+            day += timedelta(days=1)
+        boundary = MARKET_TIMEZONE.localize(datetime.combine(day, time(9, 30)))
+    return (boundary - now_et).total_seconds()
+
+
+class QuoteCache:
+    """Redis-backed cache of latest quotes keyed by symbol."""
+
+    def __init__(
+            self,
+            redis_client: Optional[RedisClient] = None,
+            market_hours_ttl: Optional[int] = None,
+            closed_ttl: Optional[int] = None,
+            prefix: str = "quote",
+    ) -> None:
+        self._redis = redis_client
+        self.market_hours_ttl = (
+            market_hours_ttl or settings.QUOTE_CACHE_MARKET_HOURS_TTL_SECONDS
+        )
+        self.closed_ttl = closed_ttl or settings.QUOTE_CACHE_CLOSED_TTL_SECONDS
+        self.prefix = prefix
+        self._hits = 0
+        self._misses = 0
+        self._errors = 0
+
+    @property
+    def redis(self) -> RedisClient:
+        if self._redis is None:
+            self._redis = get_redis()
+        return self._redis
+
+    def key(self, symbol: str) -> str:
+        return f"{self.prefix}:{symbol.upper()}"
+
+    def ttl(self, now: Optional[datetime] = None) -> int:
+        """Expiry for entries written now, in seconds."""
+        return self.market_hours_ttl if is_market_open(now) else self.closed_ttl
+
+    def get_many(self, symbols: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Look up several quotes with one MGET.
+
+        Returns:
+            Cached quotes keyed by the requested symbol; misses are omitted
+        """
+        keys = {self.key(symbol): symbol for symbol in symbols}
+        if not keys:
+            return {}
+        try:
+            found = self.redis.mget(list(keys)) or {}
+        except redis.RedisError as e:
+            logger.warning("Quote cache lookup failed: %s", e)
+            self._errors += 1
+            found = {}
+
+        quotes = {keys[key]: value for key, value in found.items()}
+        self._hits += len(quotes)
+        self._misses += len(keys) - len(quotes)
+        return quotes
+
+    def get(self, symbol: str) -> Optional[Dict[str, Any]]:
+        return self.get_many([symbol]).get(symbol)
+
+    def get_price(self, symbol: str) -> Optional[float]:
+        """Cached price of a symbol, None on a miss."""
+        quote = self.get(symbol)
+        if not quote or quote.get("price") is None:
+            return None
+        return float(quote["price"])
+
+    def set_many(
+            self, quotes: Dict[str, Dict[str, Any]], now: Optional[datetime] = None
+    ) -> None:
+        """Store several quotes with one MSET, expiring per market session."""
+        if not quotes:
+            return
+        mapping = {self.key(symbol): quote for symbol, quote in quotes.items()}
+        try:
+            self.redis.mset(mapping, ex_seconds=self.ttl(now))
+        except redis.RedisError as e:
+            logger.warning("Quote cache write failed: %s", e)
+            self._errors += 1
+
+    def set(self, symbol: str, quote: Dict[str, Any]) -> None:
+        self.set_many({symbol: quote})
+
+    def clear(self, pattern: Optional[str] = None) -> None:
+        """Drop cached quotes, optionally only symbols containing `pattern`."""
+        try:
+            self.redis.clear_on_pattern(
+                f"{self.prefix}:{pattern.upper()}" if pattern else f"{self.prefix}:"
+            )
+        except redis.RedisError as e:
+            logger.warning("Quote cache clear failed: %s", e)
+            self._errors += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit and miss counts for lookups made by this process."""
+        lookups = self._hits + self._misses
+        return {
+            "hits": self._hits,
+            "misses": self._misses,
+            "hit_rate": self._hits / lookups if lookups else 0.0,
+            "errors": self._errors,
+            "market_open": is_market_open(),
+            "ttl_seconds": self.ttl(),
+            "market_hours_ttl_seconds": self.market_hours_ttl,
+            "closed_ttl_seconds": self.closed_ttl,
+        }
+
+    def reset_stats(self) -> None:
+        self._hits = 0
+        self._misses = 0
+        self._errors = 0
+
+
+# Global instance; the Redis connection is created on first use
+quote_cache = QuoteCache()
@@ -0,0 +1,113 @@
+"""
+Shared Market Data
+Job-scoped memo in front of MarketDataService. Every distinct history or
+price request made during one job goes upstream once, with bounded
+parallelism, and all computations of the job read from the same results.
+"""
+
+import asyncio
+import logging
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import pandas as pd  # type: ignore
+
+from app.core.services.market_data_service import (
+    MarketDataService,
+    market_data_service,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class SharedMarketData:
+    """Memoizing MarketDataService facade for one batch job."""
+
+    def __init__(
+            self,
+            service: Optional[MarketDataService] = None,
+            max_concurrency: int = 8,
+    ) -> None:
+        self.service = service or market_data_service
+        self.max_concurrency = max_concurrency
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._history: Dict[Tuple, asyncio.Future] = {}
+        self._prices: Dict[str, asyncio.Future] = {}
+
+    async def fetch_ticker_data(
+            self,
+            symbol: str,
+            period: str = "max",
+            interval: str = "1d",
+            start_date: Optional[str] = None,
+            end_date: Optional[str] = None,
+    ) -> Optional[pd.DataFrame]:
+        """Same contract as MarketDataService.fetch_ticker_data; callers get a copy."""
+        key = (symbol.upper(), period, interval, start_date, end_date)
+        future = self._history.get(key)
+        if future is None:
+            future = asyncio.ensure_future(
+                self._bounded(
+                    self.service.fetch_ticker_data(
+                        symbol=symbol,
+                        period=period,
+                        interval=interval,
+                        start_date=start_date,
+                        end_date=end_date,
+                    )
+                )
+            )
+            self._history[key] = future
+        data = await asyncio.shield(future)
+        return data.copy() if data is not None else None
+
+    async def get_current_price(self, symbol: str) -> Optional[float]:
+        key = symbol.upper()
+        future = self._prices.get(key)
+        if future is None:
+            future = asyncio.ensure_future(
+                self._bounded(self.service.get_current_price(symbol))
+            )
+            self._prices[key] = future
+        return await asyncio.shield(future)
+
+    async def get_multiple_current_prices(
+            self, symbols: List[str]
+    ) -> Dict[str, Optional[float]]:
+        await self.prefetch_prices(symbols)
+        prices = await asyncio.gather(
+            *(self.get_current_price(symbol) for symbol in symbols)
+        )
+        return dict(zip(symbols, prices))
+
+    async def prefetch_prices(self, symbols: Iterable[str]) -> None:
+        """Load current prices for every symbol not seen yet with one batched call."""
+        missing = list(
+            dict.fromkeys(
+                symbol.upper() for symbol in symbols if symbol.upper() not in self._prices
+            )
+        )
+        if not missing:
+            return
+        loop = asyncio.get_running_loop()
+        futures = {symbol: loop.create_future() for symbol in missing}
+        self._prices.update(futures)
+        try:
+            prices = await self.service.get_multiple_current_prices(missing)
+        except Exception as e:
+            logger.warning("Batched price fetch failed for %s: %s", missing, e)
+            prices = {}
+        for symbol, future in futures.items():
+            future.set_result(prices.get(symbol))
+
+    async def prefetch_history(self, symbols: Iterable[str], **kwargs) -> None:
+        """Load history for every symbol concurrently; failures surface on use."""
+        await asyncio.gather(
+            *(self.fetch_ticker_data(symbol, **kwargs) for symbol in set(symbols)),
+            return_exceptions=True,
+        )
+
+    async def _bounded(self, awaitable):
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        async with self._semaphore:
+            return await awaitable
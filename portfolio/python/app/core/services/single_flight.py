@@ -0,0 +1,89 @@
+"""
+Single Flight
+Coalesces concurrent identical async calls so that callers asking for the
+same key at the same time share one in-flight upstream call.
+"""
+
+import asyncio
+import logging
+import weakref
+from collections import Counter
+from typing import Any, Awaitable, Callable, Dict, Hashable, Tuple, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """Per-key de-duplication of concurrent async calls."""
+
+    def __init__(self) -> None:
+        # Tasks belong to one event loop, so in-flight calls are tracked per loop
+        self._in_flight: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+        self._calls: Counter = Counter()
+        self._upstream_calls: Counter = Counter()
+
+    async def do(
+            self, key: Tuple[Hashable, ...], func: Callable[[], Awaitable[T]]
+    ) -> Tuple[T, bool]:
+        """
+        Run `func` unless a call for `key` is already in flight, then await it.
+
+        Args:
+            key: Call identity; the first element is used as the stats kind
+            func: Zero-argument coroutine factory doing the upstream call
+
+        Returns:
+            Tuple of (result, shared). `shared` is True when the result is also
+            handed to other callers, so mutable results must be copied.
+        """
+        kind = key[0]
+        in_flight: Dict[Tuple[Hashable, ...], list] = self._in_flight.setdefault(
+            asyncio.get_running_loop(), {}
+        )
+        self._calls[kind] += 1
+
+        entry = in_flight.get(key)
+        if entry is None:
+            self._upstream_calls[kind] += 1
+            task = asyncio.ensure_future(func())
+            # [task, number of callers awaiting it]
+            entry = [task, 1]
+            in_flight[key] = entry
+            task.add_done_callback(lambda _: in_flight.pop(key, None))
+        else:
+            entry[1] += 1
+
+        # Shield so one cancelled caller does not cancel the shared call
+        result = await asyncio.shield(entry[0])
+        return result, entry[1] > 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Calls received, upstream calls made and calls saved, per kind."""
+        kinds = sorted(self._calls)
+        by_kind = {
+            kind: {
+                "calls": self._calls[kind],
+                "upstream_calls": self._upstream_calls[kind],
+                "saved_calls": self._calls[kind] - self._upstream_calls[kind],
+            }
+            for kind in kinds
+        }
+        total_calls = sum(self._calls.values())
+        total_upstream = sum(self._upstream_calls.values())
+        return {
+            "calls": total_calls,
+            "upstream_calls": total_upstream,
+            "saved_calls": total_calls - total_upstream,
+            "in_flight": sum(len(calls) for calls in self._in_flight.values()),
+            "by_kind": by_kind,
+        }
+
+    def reset_stats(self) -> None:
+        self._calls.clear()
+        self._upstream_calls.clear()
+
+
+# Global instance shared by every MarketDataService
+market_data_single_flight = SingleFlight()
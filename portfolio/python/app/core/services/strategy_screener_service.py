@@ -0,0 +1,167 @@
+"""
+Strategy Screener Service
+Runs a trading strategy over a universe of symbols. History is downloaded in
+batches, the strategy work for each batch runs on a process pool, and results
+are handed back batch by batch as soon as they are ready.
+"""
+
+import asyncio
+import inspect
+import logging
+import multiprocessing
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+from app.config import settings
+from app.core.services.market_data_service import (
+    MarketDataService,
+    market_data_service,
+)
+from utils.trading_strategies import screener
+
+logger = logging.getLogger(__name__)
+
+
+class StrategyScreenerService:
+    """Batch strategy screening with process-pool fan-out."""
+
+    def __init__(
+            self,
+            market_data: Optional[MarketDataService] = None,
+            max_workers: Optional[int] = None,
+            batch_size: Optional[int] = None,
+            executor: Optional[Executor] = None,
+    ) -> None:
+        self.market_data = market_data or market_data_service
+        self.max_workers = max_workers or settings.SCREENER_MAX_WORKERS or os.cpu_count()
+        self.batch_size = batch_size or settings.SCREENER_BATCH_SIZE
+        self._executor = executor
+
+    @property
+    def executor(self) -> Executor:
+        """Lazily create the process pool."""
+        if self._executor is None:
+            # Forking a process that runs Polars and thread pools can deadlock
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return self._executor
+
+    @staticmethod
+    def get_strategies() -> List[str]:
+        """Names of the strategies that can be screened."""
+        return list(screener.STRATEGIES)
+
+    def validate(
+            self, strategy: str, parameters: Optional[Dict[str, Any]] = None
+    ) -> None:
+        """
+        Check a strategy name and its parameters before screening starts.
+
+        Raises:
+            ValueError: If the strategy is unknown or does not take a parameter
+        """
+        if strategy not in screener.STRATEGIES:
+            raise ValueError(
+                f"Unknown strategy '{strategy}'. Supported strategies: "
+                f"{', '.join(self.get_strategies())}"
+            )
+        _, function = screener.STRATEGIES[strategy]
+        accepted = list(inspect.signature(function).parameters)[1:]
+        unknown = sorted(set(parameters or {}) - set(accepted))
+        if unknown:
+            raise ValueError(
+                f"Unknown parameters for '{strategy}': {', '.join(unknown)}. "
+                f"Supported parameters: {', '.join(accepted) or 'none'}"
+            )
+
+    async def screen(
+            self,
+            symbols: List[str],
+            strategy: str,
+            parameters: Optional[Dict[str, Any]] = None,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Screen symbols with a strategy.
+
+        Args:
+            symbols: Symbol universe
+            strategy: Strategy name (see get_strategies)
+            parameters: Keyword arguments of the strategy
+
+        Yields:
+            One result per symbol, in completion order. Each has `symbol` and
+            `strategy`, and `error` when the symbol could not be screened.
+
+        Raises:
+            ValueError: If the strategy or its parameters are invalid
+        """
+        self.validate(strategy, parameters)
+
+        unique = list(dict.fromkeys(symbol.upper() for symbol in symbols))
+        batches = [
+            unique[i: i + self.batch_size]
+            for i in range(0, len(unique), self.batch_size)
+        ]
+        tasks = [
+            asyncio.ensure_future(self._screen_batch(batch, strategy, parameters))
+            for batch in batches
+        ]
+        try:
+            for task in asyncio.as_completed(tasks):
+                for result in await task:
+                    yield {"strategy": strategy, **result}
+        finally:
+            # The client went away or a batch failed unexpectedly
+            for task in tasks:
+                task.cancel()
+
+    async def _screen_batch(
+            self,
+            symbols: List[str],
+            strategy: str,
+            parameters: Optional[Dict[str, Any]],
+    ) -> List[Dict[str, Any]]:
+        period, _ = screener.STRATEGIES[strategy]
+        histories = await self.market_data.fetch_ticker_frames(
+            symbols, period=period, interval="1d"
+        )
+
+        results = [
+            {"symbol": symbol, "error": "No price data found"}
+            for symbol, history in histories.items()
+            if history.is_empty()
+        ]
+        histories = {
+            symbol: history
+            for symbol, history in histories.items()
+            if not history.is_empty()
+        }
+        if not histories:
+            return results
+
+        loop = asyncio.get_running_loop()
+        try:
+            results.extend(
+                await loop.run_in_executor(
+                    self.executor, screener.screen, strategy, histories, parameters
+                )
+            )
+        except Exception as e:
+            logger.error("Error screening %s with %s: %s", list(histories), strategy, e)
+            results.extend(
+                {"symbol": symbol, "error": str(e)} for symbol in histories
+            )
+        return results
+
+    def shutdown(self, wait: bool = False) -> None:
+        """Shut down the process pool; it is recreated on next use."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait, cancel_futures=True)
+            self._executor = None
+
+
+# Global instance
+strategy_screener_service = StrategyScreenerService()
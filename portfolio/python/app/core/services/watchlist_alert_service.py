@@ -1,10 +1,14 @@
-from typing import List
+from typing import List, Optional
 
-from sqlalchemy import and_, func
+from sqlalchemy import and_, desc, func
 from sqlalchemy.orm import Session
 
 from app.core.database.models.watchlist import WatchlistAlert
 from app.core.logging_config import get_logger
+from app.core.services.alert_evaluation_engine import (
+    AlertEvaluationEngine,
+    alert_evaluation_engine,
+)
 
 logger = get_logger(__name__)
 
@@ -12,8 +16,9 @@ logger = get_logger(__name__)
 class WatchlistAlertService:
     """Service for managing watchlist alerts and notifications."""
 
-    def __init__(self, db: Session):
+    def __init__(self, db: Session, alert_engine: Optional[AlertEvaluationEngine] = None):
         self.db = db
+        self.alert_engine = alert_engine or alert_evaluation_engine
 
     def get_user_alerts(
         self, user_id: int, active_only: bool = True
@@ -76,6 +81,8 @@ class WatchlistAlertService:
             alert.triggered_value = None
 
             self.db.commit()
+            # The alert can trigger again, so it goes back into the index
+            self.alert_engine.invalidate()
 
             logger.info(f"Reset alert {alert_id} for user {user_id}")
             return True
@@ -0,0 +1,305 @@
+"""
+Watchlist History Service
+Retention and rollup for watchlist performance history. Raw price ticks are
+kept for a short window, then compacted per item into hourly OHLC buckets, and
+hourly buckets into daily ones. Reads pick the resolution from the requested
+range, so storage and chart queries stay bounded however long an item has been
+watched.
+"""
+
+import logging
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import delete, func, literal, literal_column, select
+from sqlalchemy.dialects.postgresql import aggregate_order_by, insert
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import Select
+
+from app.config import settings
+from app.core.database.models.watchlist import (
+    WatchlistPerformance,
+    WatchlistPerformanceRollup,
+)
+
+logger = logging.getLogger(__name__)
+
+# Resolutions, finest first
+RAW = "raw"
+HOUR = "hour"
+DAY = "day"
+
+# Columns shared by every bucket select and the rollup upsert
+BUCKET_COLUMNS = [
+    "watchlist_item_id",
+    "resolution",
+    "bucket_start",
+    "open",
+    "high",
+    "low",
+    "close",
+    "samples",
+]
+
+
+def bucket_floor(moment: datetime, resolution: str) -> datetime:
+    """Start of the bucket containing a moment."""
+    if resolution == HOUR:
+        return moment.replace(minute=0, second=0, microsecond=0)
+    if resolution == DAY:
+        return moment.replace(hour=0, minute=0, second=0, microsecond=0)
+    return moment
+
+
+def _truncate(resolution: str, column):
+    # UTC buckets, matching bucket_floor; literals so GROUP BY repeats the
+    # exact select expression
+    return func.date_trunc(
+        literal_column(f"'{resolution}'"), column, literal_column("'UTC'")
+    )
+
+
+def _first(value, order_by):
+    return func.array_agg(aggregate_order_by(value, order_by))[1]
+
+
+def _last(value, order_by):
+    return func.array_agg(aggregate_order_by(value, order_by.desc()))[1]
+
+
+def raw_buckets(resolution: str, *criteria) -> Select:
+    """OHLC buckets aggregated from raw performance ticks."""
+    tick = WatchlistPerformance
+    bucket = _truncate(resolution, tick.date)
+    return (
+        select(
+            tick.watchlist_item_id,
+            literal(resolution).label("resolution"),
+            bucket.label("bucket_start"),
+            _first(tick.price, tick.date).label("open"),
+            func.max(tick.price).label("high"),
+            func.min(tick.price).label("low"),
+            _last(tick.price, tick.date).label("close"),
+            func.count().label("samples"),
+        )
+        .where(*criteria)
+        .group_by(tick.watchlist_item_id, bucket)
+    )
+
+
+def rollup_buckets(source: str, resolution: str, *criteria) -> Select:
+    """OHLC buckets aggregated from finer rollup buckets."""
+    rollup = WatchlistPerformanceRollup
+    bucket = _truncate(resolution, rollup.bucket_start)
+    return (
+        select(
+            rollup.watchlist_item_id,
+            literal(resolution).label("resolution"),
+            bucket.label("bucket_start"),
+            _first(rollup.open, rollup.bucket_start).label("open"),
+            func.max(rollup.high).label("high"),
+            func.min(rollup.low).label("low"),
+            _last(rollup.close, rollup.bucket_start).label("close"),
+            func.sum(rollup.samples).label("samples"),
+        )
+        .where(rollup.resolution == source, *criteria)
+        .group_by(rollup.watchlist_item_id, bucket)
+    )
+
+
+def merge_buckets(sources: Sequence[Sequence[Tuple]]) -> List[Dict[str, Any]]:
+    """
+    Merge bucket rows of several sources into one series.
+
+    A bucket may span the compaction cutoff and come partly from each source.
+
+    Args:
+        sources: Bucket rows per source, oldest data first
+
+    Returns:
+        Buckets sorted by start
+    """
+    buckets: Dict[datetime, Dict[str, Any]] = {}
+    for rows in sources:
+        for _, _, bucket_start, open_, high, low, close, samples in rows:
+            bucket = buckets.get(bucket_start)
+            if bucket is None:
+                buckets[bucket_start] = {
+                    "bucket_start": bucket_start,
+                    "open": open_,
+                    "high": high,
+                    "low": low,
+                    "close": close,
+                    "samples": int(samples),
+                }
+            else:
+                bucket["high"] = max(bucket["high"], high)
+                bucket["low"] = min(bucket["low"], low)
+                bucket["close"] = close
+                bucket["samples"] += int(samples)
+    return [buckets[bucket_start] for bucket_start in sorted(buckets)]
+
+
+class WatchlistHistoryService:
+    """Compaction and resolution-aware reads of watchlist price history."""
+
+    def __init__(
+            self,
+            raw_retention_hours: Optional[int] = None,
+            hourly_retention_days: Optional[int] = None,
+            compaction_interval: Optional[int] = None,
+    ) -> None:
+        self.raw_retention_hours = (
+            raw_retention_hours or settings.WATCHLIST_HISTORY_RAW_RETENTION_HOURS
+        )
+        self.hourly_retention_days = (
+            hourly_retention_days or settings.WATCHLIST_HISTORY_HOURLY_RETENTION_DAYS
+        )
+        self.compaction_interval = (
+            compaction_interval or settings.WATCHLIST_HISTORY_COMPACTION_INTERVAL_SECONDS
+        )
+        self._compacted_at: Optional[float] = None
+
+    def cutoffs(self, now: datetime) -> Tuple[datetime, datetime]:
+        """
+        Oldest raw tick and oldest hourly bucket kept.
+
+        Both fall on bucket boundaries, so only complete buckets are compacted.
+        """
+        raw_cutoff = bucket_floor(now - timedelta(hours=self.raw_retention_hours), HOUR)
+        hourly_cutoff = bucket_floor(now - timedelta(days=self.hourly_retention_days), DAY)
+        return raw_cutoff, hourly_cutoff
+
+    def resolution_for(self, start: datetime, now: datetime) -> str:
+        """Finest resolution still stored for everything since start."""
+        raw_cutoff, hourly_cutoff = self.cutoffs(now)
+        if start >= raw_cutoff:
+            return RAW
+        if start >= hourly_cutoff:
+            return HOUR
+        return DAY
+
+    @staticmethod
+    def _upsert(buckets: Select):
+        """Insert buckets, merging into buckets compacted by an earlier run."""
+        rollup = WatchlistPerformanceRollup
+        statement = insert(rollup).from_select(BUCKET_COLUMNS, buckets)
+        return statement.on_conflict_do_update(
+            constraint="uq_watchlist_rollup_item_resolution_bucket",
+            set_={
+                "high": func.greatest(rollup.high, statement.excluded.high),
+                "low": func.least(rollup.low, statement.excluded.low),
+                "close": statement.excluded.close,
+                "samples": rollup.samples + statement.excluded.samples,
+            },
+        )
+
+    def compaction_due(self) -> bool:
+        return (
+            self._compacted_at is None
+            or time.monotonic() - self._compacted_at >= self.compaction_interval
+        )
+
+    def compact(self, db: Session, now: Optional[datetime] = None) -> Dict[str, int]:
+        """
+        Roll expired raw ticks into hourly buckets and expired hourly buckets
+        into daily ones, deleting what was rolled up, in one transaction.
+
+        Returns:
+            Number of hourly and daily buckets written and rows deleted
+        """
+        now = now or datetime.now(timezone.utc)
+        raw_cutoff, hourly_cutoff = self.cutoffs(now)
+        tick = WatchlistPerformance
+        rollup = WatchlistPerformanceRollup
+        expired = rollup.bucket_start < hourly_cutoff
+
+        try:
+            hours = db.execute(self._upsert(raw_buckets(HOUR, tick.date < raw_cutoff)))
+            ticks = db.execute(delete(tick).where(tick.date < raw_cutoff))
+            days = db.execute(self._upsert(rollup_buckets(HOUR, DAY, expired)))
+            hours_deleted = db.execute(delete(rollup).where(rollup.resolution == HOUR, expired))
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+
+        self._compacted_at = time.monotonic()
+        result = {
+            "hourly_buckets": hours.rowcount,
+            "daily_buckets": days.rowcount,
+            "ticks_deleted": ticks.rowcount,
+            "hourly_buckets_deleted": hours_deleted.rowcount,
+        }
+        logger.info("Compacted watchlist history: %s", result)
+        return result
+
+    def history(
+            self,
+            db: Session,
+            item_id: int,
+            start: datetime,
+            end: Optional[datetime] = None,
+            now: Optional[datetime] = None,
+    ) -> Tuple[str, List[Dict[str, Any]]]:
+        """
+        Price history of an item at the finest resolution covering the range.
+
+        Recent data not compacted yet is bucketed on the fly, so each bucket
+        is complete whichever tables it is stored in.
+
+        Args:
+            db: Database session
+            item_id: Watchlist item id
+            start: Start of the range
+            end: End of the range (defaults to now)
+            now: Current time (defaults to now)
+
+        Returns:
+            Resolution and OHLC buckets sorted by start
+        """
+        now = now or datetime.now(timezone.utc)
+        end = end or now
+        resolution = self.resolution_for(start, now)
+        tick = WatchlistPerformance
+        rollup = WatchlistPerformanceRollup
+
+        if resolution == RAW:
+            rows = db.execute(
+                select(tick.date, tick.price)
+                .where(tick.watchlist_item_id == item_id, tick.date >= start, tick.date <= end)
+                .order_by(tick.date)
+            ).all()
+            return RAW, [
+                {
+                    "bucket_start": date,
+                    "open": price,
+                    "high": price,
+                    "low": price,
+                    "close": price,
+                    "samples": 1,
+                }
+                for date, price in rows
+            ]
+
+        # Whole buckets from the one containing start
+        start = bucket_floor(start, resolution)
+        in_range = (
+            rollup.watchlist_item_id == item_id,
+            rollup.bucket_start >= start,
+            rollup.bucket_start <= end,
+        )
+        sources = [rollup_buckets(HOUR, resolution, *in_range)]
+        if resolution == DAY:
+            sources.insert(0, rollup_buckets(DAY, DAY, *in_range))
+        sources.append(
+            raw_buckets(
+                resolution, tick.watchlist_item_id == item_id, tick.date >= start, tick.date <= end
+            )
+        )
+        return resolution, merge_buckets([db.execute(source).all() for source in sources])
+
+
+# Global instance
+watchlist_history_service = WatchlistHistoryService()
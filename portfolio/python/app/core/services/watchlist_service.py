@@ -1,8 +1,19 @@
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 from decimal import Decimal
-from typing import Any, Dict, List, Optional
-
-from sqlalchemy import and_, desc, func
+from typing import Any, Dict, List, Mapping, Optional
+
+from sqlalchemy import (
+    Numeric,
+    String,
+    and_,
+    case,
+    column,
+    desc,
+    func,
+    insert,
+    update,
+    values,
+)
 from sqlalchemy.orm import Session, joinedload
 
 from app.core.database.models.watchlist import (
@@ -19,17 +30,36 @@ from app.core.schemas.watchlist import (
     WatchlistItemUpdate,
     WatchlistUpdate,
 )
+from app.core.services.alert_evaluation_engine import (
+    AlertEvaluationEngine,
+    alert_evaluation_engine,
+)
 from app.core.services.market_data_service import MarketDataService
+from app.core.services.watchlist_history_service import (
+    WatchlistHistoryService,
+    watchlist_history_service,
+)
 
 logger = get_logger(__name__)
 
+# Watchlist prices are stored as Numeric(10, 2)
+PRICE_QUANTUM = Decimal("0.01")
+
 
 class WatchlistService:
     """Enhanced service for watchlist operations with performance tracking and alerts."""
 
-    def __init__(self, db: Session):
+    def __init__(
+        self,
+        db: Session,
+        alert_engine: Optional[AlertEvaluationEngine] = None,
+        history: Optional[WatchlistHistoryService] = None,
+    ):
         self.db = db
         self.market_data_service = MarketDataService()
+        # In-memory alert index shared by the requests of this worker
+        self.alert_engine = alert_engine or alert_evaluation_engine
+        self.history = history or watchlist_history_service
 
     def create_watchlist(
         self, user_id: int, watchlist_data: WatchlistCreate
@@ -210,7 +240,7 @@ class WatchlistService:
             # Try to get current market price
             current_price = None
             try:
-                price_info = await self.market_data_service.get_current_price(
+                price_info = await self.market_data_service.get_cached_price(
                     symbol=item_data.symbol.upper()
                 )
                 if price_info:
@@ -275,6 +305,8 @@ class WatchlistService:
             item.updated_at = datetime.now(timezone.utc)
             self.db.commit()
             self.db.refresh(item)
+            # alerts_enabled and added_price feed the alert index
+            self.alert_engine.invalidate()
 
             logger.info(f"Updated watchlist item {item.symbol} for user {user_id}")
             return item
@@ -360,123 +392,169 @@ class WatchlistService:
     async def update_watchlist_item_prices(self, symbol: str) -> bool:
         """Update current prices for all watchlist items with a given symbol."""
         try:
-            # Get all watchlist items with this symbol
-            items = (
+            # Check if any watchlist items have this symbol
+            item_count = (
                 self.db.query(WatchlistItem)
                 .filter(WatchlistItem.symbol == symbol.upper())
-                .all()
+                .count()
             )
 
-            if not items:
+            if not item_count:
                 return False
 
             # Get current market price
             try:
-                price = await self.market_data_service.get_current_price(
+                price = await self.market_data_service.get_cached_price(
                     symbol=symbol.upper()
                 )
                 if not price:
                     return False
-
-                current_price = Decimal(str(price))
-
-                # Update all items with this symbol
-                for item in items:
-                    if item.current_price != current_price:
-                        old_price = item.current_price
-                        item.current_price = current_price
-
-                        # Calculate performance metrics
-                        if item.added_price:
-                            item.price_change_since_added = (
-                                current_price - item.added_price
-                            )
-                            item.price_change_percent_since_added = (
-                                item.price_change_since_added / item.added_price
-                            ) * 100
-
-                        # Create performance record
-                        self._create_performance_record(item.id, current_price)
-
-                        # Check alerts
-                        self._check_price_alerts(item, old_price, current_price)
-
-                self.db.commit()
-                logger.info(
-                    f"Updated prices for {len(items)} watchlist items with symbol {symbol}"
-                )
-                return True
-
             except Exception as e:
                 logger.error(f"Failed to get market data for {symbol}: {e}")
                 return False
 
+            self.bulk_update_prices({symbol: price})
+            return True
+
         except Exception as e:
-            self.db.rollback()
             logger.error(f"Failed to update prices for symbol {symbol}: {e}")
             raise
 
-    def _create_performance_record(self, item_id: int, price: Decimal) -> None:
-        """Create a performance record for a watchlist item."""
-        try:
-            performance = WatchlistPerformance(
-                watchlist_item_id=item_id, date=datetime.now(timezone.utc), price=price
+    def bulk_update_prices(self, quotes: Mapping[str, Any]) -> Dict[str, int]:
+        """
+        Refresh every watchlist item from a map of latest prices in one transaction.
+
+        Items are updated with one UPDATE ... FROM (VALUES ...), their
+        performance rows are written with one multi-row INSERT, crossed alerts
+        are triggered in bulk, and the whole refresh is committed once.
+
+        Args:
+            quotes: Latest price per symbol (None prices are skipped)
+
+        Returns:
+            Number of priced symbols, updated items and triggered alerts
+        """
+        prices = {
+            symbol.upper(): Decimal(str(price)).quantize(PRICE_QUANTUM)
+            for symbol, price in quotes.items()
+            if price is not None
+        }
+        if not prices:
+            return {"symbols": 0, "items": 0, "alerts": 0}
+
+        now = datetime.now(timezone.utc)
+        quote_rows = values(
+            column("symbol", String),
+            column("price", Numeric(10, 2)),
+            name="quotes",
+        ).data(list(prices.items()))
+
+        added_price = WatchlistItem.added_price
+        has_added_price = and_(added_price.isnot(None), added_price != 0)
+        price_change = quote_rows.c.price - added_price
+        statement = (
+            update(WatchlistItem)
+            .where(
+                WatchlistItem.symbol == quote_rows.c.symbol,
+                # Unchanged prices get neither an update nor a performance row
+                WatchlistItem.current_price.is_distinct_from(quote_rows.c.price),
             )
-            self.db.add(performance)
-        except Exception as e:
-            logger.error(f"Failed to create performance record: {e}")
+            .values(
+                current_price=quote_rows.c.price,
+                price_change_since_added=case(
+                    (has_added_price, price_change),
+                    else_=WatchlistItem.price_change_since_added,
+                ),
+                price_change_percent_since_added=case(
+                    (has_added_price, price_change / added_price * 100),
+                    else_=WatchlistItem.price_change_percent_since_added,
+                ),
+                updated_at=now,
+            )
+            .returning(
+                WatchlistItem.id,
+                WatchlistItem.current_price,
+                WatchlistItem.price_change_since_added,
+                WatchlistItem.price_change_percent_since_added,
+            )
+            .execution_options(synchronize_session=False)
+        )
 
-    def _check_price_alerts(
-        self, item: WatchlistItem, old_price: Optional[Decimal], new_price: Decimal
-    ) -> None:
-        """Check if any price alerts should be triggered."""
         try:
-            if not item.alerts_enabled:
-                return
-
-            # Get active alerts for this item
-            alerts = (
-                self.db.query(WatchlistAlert)
-                .filter(
-                    and_(
-                        WatchlistAlert.watchlist_item_id == item.id,
-                        WatchlistAlert.is_active == True,
-                        WatchlistAlert.is_triggered == False,
+            updated = self.db.execute(statement).all()
+
+            if updated:
+                self.db.execute(
+                    insert(WatchlistPerformance).values(
+                        [
+                            {
+                                "watchlist_item_id": item_id,
+                                "date": now,
+                                "price": price,
+                                "price_change_since_added": change,
+                                "price_change_percent_since_added": change_percent,
+                            }
+                            for item_id, price, change, change_percent in updated
+                        ]
                     )
                 )
-                .all()
+
+            # Every alert on the refreshed symbols is checked in one pass
+            triggered = self.alert_engine.evaluate(self.db, prices)
+
+            self.db.commit()
+        except Exception as e:
+            self.db.rollback()
+            # Alerts popped from the index by evaluate() were never triggered
+            self.alert_engine.invalidate()
+            logger.error(f"Failed to refresh prices for {len(prices)} symbols: {e}")
+            raise
+
+        logger.info(
+            f"Refreshed {len(updated)} watchlist items for {len(prices)} symbols"
+        )
+        return {"symbols": len(prices), "items": len(updated), "alerts": len(triggered)}
+
+    def get_item_history(
+        self, item_id: int, user_id: int, days: int
+    ) -> Optional[Dict[str, Any]]:
+        """Price history of a watchlist item over the last days, as OHLC bars."""
+        try:
+            # Verify item ownership through watchlist
+            item = (
+                self.db.query(WatchlistItem)
+                .join(Watchlist)
+                .filter(and_(WatchlistItem.id == item_id, Watchlist.user_id == user_id))
+                .first()
             )
 
-            for alert in alerts:
-                should_trigger = False
+            if not item:
+                return None
 
-                if alert.alert_type == "price_high" and alert.condition == "above":
-                    should_trigger = new_price > alert.threshold_value
-                elif alert.alert_type == "price_low" and alert.condition == "below":
-                    should_trigger = new_price < alert.threshold_value
-                elif alert.alert_type == "percent_change" and item.added_price:
-                    change_percent = (
-                        (new_price - item.added_price) / item.added_price
-                    ) * 100
-                    if alert.condition == "above":
-                        should_trigger = change_percent > alert.threshold_value
-                    elif alert.condition == "below":
-                        should_trigger = change_percent < alert.threshold_value
-
-                if should_trigger:
-                    # Trigger the alert
-                    alert.is_triggered = True
-                    alert.triggered_at = datetime.now(timezone.utc)
-                    alert.triggered_value = new_price
-
-                    # Log the alert (in production, this would send notifications)
-                    logger.info(
-                        f"Price alert triggered for {item.symbol}: "
-                        f"{alert.alert_type} {alert.condition} {alert.threshold_value}"
-                    )
+            # The history service picks raw ticks, hourly or daily buckets
+            start = datetime.now(timezone.utc) - timedelta(days=days)
+            resolution, bars = self.history.history(self.db, item.id, start)
+
+            return {
+                "item_id": item.id,
+                "symbol": item.symbol,
+                "resolution": resolution,
+                "bars": bars,
+            }
+
+        except Exception as e:
+            logger.error(f"Failed to get history for watchlist item {item_id}: {e}")
+            raise
 
+    def _create_performance_record(self, item_id: int, price: Decimal) -> None:
+        """Create a performance record for a watchlist item."""
+        try:
+            performance = WatchlistPerformance(
+                watchlist_item_id=item_id, date=datetime.now(timezone.utc), price=price
+            )
+            self.db.add(performance)
         except Exception as e:
-            logger.error(f"Failed to check price alerts: {e}")
+            logger.error(f"Failed to create performance record: {e}")
 
     def create_price_alert(
         self, item_id: int, user_id: int, alert_data: WatchlistAlertCreate
@@ -509,6 +587,7 @@ class WatchlistService:
             self.db.add(alert)
             self.db.commit()
             self.db.refresh(alert)
+            self.alert_engine.invalidate()
 
             logger.info(f"Created {alert.alert_type} alert for {item.symbol}")
             return alert
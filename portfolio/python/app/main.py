@@ -9,6 +9,10 @@ from app.config import settings
 from app.core.database.connection import create_tables, init_db
 from app.core.database.init_db import init_database
 from app.core.logging_config import get_logger, setup_logging
+from app.core.services.backtest_service import backtest_service
+from app.core.services.market_data_executor import market_data_executor
+from app.core.services.price_ingestion_service import price_ingestion_service
+from app.core.services.strategy_screener_service import strategy_screener_service
 from app.health_check import router as health_router
 
 # Setup comprehensive logging
@@ -75,12 +79,26 @@ async def lifespan(app: FastAPI):
         logger.warning("⚠️ Application starting with degraded database functionality")
         logger.warning(f"Startup time so far: {time.time() - startup_time:.3f}s")
 
+    # Keep held and watched quotes warm; one worker ingests at a time
+    if settings.PRICE_INGESTION_ENABLED:
+        price_ingestion_service.start()
+        logger.info("📡 Background price ingestion started")
+
     yield
 
     # Shutdown
     shutdown_start_time = time.time()
     logger.info("🛑 Shutting down Portfolia API...")
 
+    # Stop price ingestion before its executor goes away
+    await price_ingestion_service.stop()
+    # Release market data worker threads
+    market_data_executor.shutdown(wait=False)
+    # Stop strategy screener worker processes
+    strategy_screener_service.shutdown(wait=False)
+    # Stop backtest sweep worker processes
+    backtest_service.shutdown(wait=False)
+
     # Log final statistics
     total_uptime = time.time() - startup_time
     logger.info(f"📈 Total application uptime: {total_uptime:.3f}s")
@@ -159,6 +177,15 @@ try:
 except ImportError as e:
     logger.warning(f"Could not import statistical indicators router: {e}")
 
+# Include strategy screener router
+try:
+    from api.v1.screener.router import router as screener_router
+
+    app.include_router(screener_router, prefix="/api/v1", tags=["screener"])
+    logger.info("Strategy screener router included successfully")
+except ImportError as e:
+    logger.warning(f"Could not import strategy screener router: {e}")
+
 # Include portfolio router
 try:
     from api.v1.portfolio.router import router as portfolio_router
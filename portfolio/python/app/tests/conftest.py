@@ -1,6 +1,7 @@
 import asyncio
 import os
 import sys
+from bisect import bisect_right
 from typing import AsyncGenerator, Generator
 
 import pytest
@@ -30,6 +31,9 @@ os.environ["JWT_SECRET_KEY"] = "test-jwt-secret-key-for-testing-only"
 # Force SQLite for testing
 os.environ["FORCE_SQLITE"] = "true"
 
+# Keep tests from persisting price history to disk
+os.environ["OHLCV_CACHE_ENABLED"] = "false"
+
 # Import after setting environment variables to ensure test config is used
 from app.core.database.connection import Base, get_db
 from app.main import app
@@ -161,6 +165,67 @@ def cleanup_test_database(test_db_engine):
     print("\n🧹 Test database cleaned up successfully!")
 
 
+class FakeRedisClient:
+    """In-memory stand-in for RedisClient: batched reads/writes, locks and rate-limit windows."""
+
+    def __init__(self):
+        self.store = {}
+        self.ttls = {}
+        self.locks = {}
+        self.windows = {}
+        self.mget_calls = 0
+        self.mset_calls = 0
+        self.window_calls = 0
+
+    def mget(self, keys):
+        self.mget_calls += 1
+        return {key: self.store[key] for key in keys if key in self.store}
+
+    def mset(self, mapping, ex_seconds=None):
+        self.mset_calls += 1
+        for key, value in mapping.items():
+            self.store[key] = value
+            self.ttls[key] = ex_seconds
+        return True
+
+    def clear_on_pattern(self, pattern):
+        for key in [key for key in self.store if pattern in key]:
+            del self.store[key]
+
+    def acquire_lock(self, name, token, ex_seconds):
+        if name in self.locks:
+            return False
+        self.locks[name] = (token, ex_seconds)
+        return True
+
+    def extend_lock(self, name, token, ex_seconds):
+        if self.locks.get(name, (None,))[0] != token:
+            return False
+        self.locks[name] = (token, ex_seconds)
+        return True
+
+    def release_lock(self, name, token):
+        if self.locks.get(name, (None,))[0] != token:
+            return False
+        del self.locks[name]
+        return True
+
+    def hit_sliding_window(self, name, limit, window_ms, now_ms, member):
+        self.window_calls += 1
+        hits = self.windows.setdefault(name, [])
+        del hits[: bisect_right(hits, now_ms - window_ms)]
+        if len(hits) < limit:
+            hits.append(now_ms)
+            return True, limit - len(hits), 0
+        return False, 0, hits[0] + window_ms - now_ms
+
+
+@pytest.fixture
+def fake_redis():
+    """Fresh in-memory RedisClient stand-in."""
+    return FakeRedisClient()
+
+
 # Test data fixtures
 @pytest.fixture
 def sample_user_data():
@@ -0,0 +1,258 @@
+"""
+Integration tests for watchlist history compaction on PostgreSQL.
+
+Compaction and bucketed reads use PostgreSQL-only SQL (ordered array_agg,
+three-argument date_trunc, ON CONFLICT upserts), so they run against a real
+server: point TEST_DATABASE_URL at a postgresql:// database to enable them.
+Tables are created in a throwaway schema, on a session whose time zone is
+America/New_York so a DST change falls inside the data.
+
+Tests cover:
+- Hourly buckets taking open/close from the earliest/latest tick, whatever
+  the insert order
+- A second compaction merging into buckets written by the first
+- Daily buckets on UTC days across the 2024-03-10 spring-forward change
+- history() merging rollups and uncompacted ticks at each resolution
+"""
+
+import uuid
+from datetime import datetime, timezone
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import create_engine, select, text
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import sessionmaker
+
+from app.config import settings
+from app.core.database.connection import Base
+from app.core.database.models import User
+from app.core.database.models.watchlist import (
+    Watchlist,
+    WatchlistItem,
+    WatchlistPerformance,
+    WatchlistPerformanceRollup,
+)
+from app.core.services.watchlist_history_service import (
+    DAY,
+    HOUR,
+    WatchlistHistoryService,
+)
+
+pytestmark = pytest.mark.integration
+
+TABLES = [
+    User.__table__,
+    Watchlist.__table__,
+    WatchlistItem.__table__,
+    WatchlistPerformance.__table__,
+    WatchlistPerformanceRollup.__table__,
+]
+
+
+def utc(*args):
+    return datetime(*args, tzinfo=timezone.utc)
+
+
+# US clocks spring forward at 2024-03-10 07:00 UTC (02:00 EST -> 03:00 EDT)
+FIRST_RUN = utc(2024, 3, 10, 9, 30)
+SECOND_RUN = utc(2024, 3, 12, 0, 30)
+
+
+@pytest.fixture(scope="module")
+def engine():
+    url = settings.TEST_DATABASE_URL
+    if make_url(url).get_backend_name() != "postgresql":
+        pytest.skip("TEST_DATABASE_URL is not a PostgreSQL database")
+
+    schema = f"watchlist_history_{uuid.uuid4().hex[:8]}"
+    admin = create_engine(url)
+    try:
+        with admin.begin() as connection:
+            connection.execute(text(f'CREATE SCHEMA "{schema}"'))
+    except OperationalError as exc:
+        admin.dispose()
+        pytest.skip(f"PostgreSQL unavailable: {exc}")
+
+    engine = create_engine(
+        url,
+        connect_args={"options": f"-csearch_path={schema} -ctimezone=America/New_York"},
+    )
+    Base.metadata.create_all(engine, tables=TABLES)
+    yield engine
+    engine.dispose()
+    with admin.begin() as connection:
+        connection.execute(text(f'DROP SCHEMA "{schema}" CASCADE'))
+    admin.dispose()
+
+
+@pytest.fixture
+def db(engine):
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.rollback()
+    for table in reversed(TABLES):
+        session.execute(table.delete())
+    session.commit()
+    session.close()
+
+
+@pytest.fixture
+def item_id(db):
+    user = User(email="history@example.com", username="history", password_hash="x")
+    db.add(user)
+    db.flush()
+    watchlist = Watchlist(user_id=user.id, name="History")
+    db.add(watchlist)
+    db.flush()
+    item = WatchlistItem(watchlist_id=watchlist.id, symbol="AAPL")
+    db.add(item)
+    db.commit()
+    return item.id
+
+
+@pytest.fixture
+def service():
+    return WatchlistHistoryService(raw_retention_hours=1, hourly_retention_days=1)
+
+
+def add_ticks(db, item_id, ticks):
+    db.add_all(
+        WatchlistPerformance(watchlist_item_id=item_id, date=date, price=Decimal(str(price)))
+        for date, price in ticks
+    )
+    db.commit()
+
+
+def rollups(db, resolution):
+    rollup = WatchlistPerformanceRollup
+    rows = db.execute(
+        select(
+            rollup.bucket_start, rollup.open, rollup.high, rollup.low, rollup.close, rollup.samples
+        )
+        .where(rollup.resolution == resolution)
+        .order_by(rollup.bucket_start)
+    ).all()
+    return [
+        (start, float(open_), float(high), float(low), float(close), samples)
+        for start, open_, high, low, close, samples in rows
+    ]
+
+
+def ohlc(buckets):
+    return [
+        (
+            bucket["bucket_start"],
+            float(bucket["open"]),
+            float(bucket["high"]),
+            float(bucket["low"]),
+            float(bucket["close"]),
+            bucket["samples"],
+        )
+        for bucket in buckets
+    ]
+
+
+def remaining_ticks(db):
+    return db.execute(
+        select(WatchlistPerformance.date).order_by(WatchlistPerformance.date)
+    ).scalars().all()
+
+
+class TestWatchlistHistoryCompaction:
+    """WatchlistHistoryService.compact and history on PostgreSQL."""
+
+    def test_compaction_across_dst(self, db, item_id, service):
+        # Inserted out of order: open/close must follow tick time, not ids
+        add_ticks(
+            db,
+            item_id,
+            [
+                (utc(2024, 3, 10, 6, 50), 104),
+                (utc(2024, 3, 10, 6, 10), 100),
+                (utc(2024, 3, 10, 6, 30), 90),
+                (utc(2024, 3, 10, 7, 55), 108),
+                (utc(2024, 3, 10, 7, 5), 110),
+                (utc(2024, 3, 10, 7, 20), 115),
+                # After the raw cutoff of the first run
+                (utc(2024, 3, 10, 8, 45), 109),
+            ],
+        )
+
+        result = service.compact(db, now=FIRST_RUN)
+
+        assert result["ticks_deleted"] == 6
+        assert remaining_ticks(db) == [utc(2024, 3, 10, 8, 45)]
+        assert rollups(db, HOUR) == [
+            (utc(2024, 3, 10, 6), 100.0, 104.0, 90.0, 104.0, 3),
+            (utc(2024, 3, 10, 7), 110.0, 115.0, 108.0, 108.0, 3),
+        ]
+
+        # A late tick in an already compacted hour is merged, then deleted
+        add_ticks(db, item_id, [(utc(2024, 3, 10, 7, 58), 120)])
+        service.compact(db, now=FIRST_RUN)
+
+        assert remaining_ticks(db) == [utc(2024, 3, 10, 8, 45)]
+        assert rollups(db, HOUR) == [
+            (utc(2024, 3, 10, 6), 100.0, 104.0, 90.0, 104.0, 3),
+            (utc(2024, 3, 10, 7), 110.0, 120.0, 108.0, 120.0, 4),
+        ]
+
+        # 03:30 UTC on the 11th is still the 10th in New York
+        add_ticks(
+            db,
+            item_id,
+            [
+                (utc(2024, 3, 11, 4, 30), 125),
+                (utc(2024, 3, 11, 3, 30), 121),
+                (utc(2024, 3, 11, 23, 30), 130),
+            ],
+        )
+        result = service.compact(db, now=SECOND_RUN)
+
+        assert result["ticks_deleted"] == 3
+        assert result["hourly_buckets_deleted"] == 3
+        assert remaining_ticks(db) == [utc(2024, 3, 11, 23, 30)]
+        assert rollups(db, DAY) == [
+            (utc(2024, 3, 10), 100.0, 120.0, 90.0, 109.0, 8),
+        ]
+        assert rollups(db, HOUR) == [
+            (utc(2024, 3, 11, 3), 121.0, 121.0, 121.0, 121.0, 1),
+            (utc(2024, 3, 11, 4), 125.0, 125.0, 125.0, 125.0, 1),
+        ]
+
+        resolution, buckets = service.history(
+            db, item_id, start=utc(2024, 3, 10), now=SECOND_RUN
+        )
+        assert resolution == DAY
+        assert ohlc(buckets) == [
+            (utc(2024, 3, 10), 100.0, 120.0, 90.0, 109.0, 8),
+            (utc(2024, 3, 11), 121.0, 130.0, 121.0, 130.0, 3),
+        ]
+
+        resolution, buckets = service.history(
+            db, item_id, start=utc(2024, 3, 11, 2, 15), now=SECOND_RUN
+        )
+        assert resolution == HOUR
+        assert ohlc(buckets) == [
+            (utc(2024, 3, 11, 3), 121.0, 121.0, 121.0, 121.0, 1),
+            (utc(2024, 3, 11, 4), 125.0, 125.0, 125.0, 125.0, 1),
+            (utc(2024, 3, 11, 23), 130.0, 130.0, 130.0, 130.0, 1),
+        ]
+
+    def test_compaction_rolls_back_as_a_whole(self, db, item_id, service, monkeypatch):
+        add_ticks(db, item_id, [(utc(2024, 3, 10, 6, 10), 100)])
+
+        def fail(*args, **kwargs):
+            raise RuntimeError("day rollup failed")
+
+        monkeypatch.setattr(
+            "app.core.services.watchlist_history_service.rollup_buckets", fail
+        )
+        with pytest.raises(RuntimeError):
+            service.compact(db, now=FIRST_RUN)
+
+        # The hourly upsert and tick delete ran, and were rolled back
+        assert remaining_ticks(db) == [utc(2024, 3, 10, 6, 10)]
+        assert rollups(db, HOUR) == []
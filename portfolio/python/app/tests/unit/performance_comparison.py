@@ -4,9 +4,12 @@ Performance comparison script for technical indicators.
 """
 
 import os
+import random
 import sys
 import time
 import unittest
+from decimal import Decimal
+from unittest.mock import Mock
 
 import numpy as np
 import polars as pl
@@ -14,8 +17,13 @@ import polars as pl
 # Add the parent directory to the path so we can import our modules
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from app.core.services.alert_evaluation_engine import AlertEvaluationEngine
 from utils.indicators.momentum_indicators import calculate_rsi
-from utils.indicators.trend_indicators import calculate_ema, calculate_sma
+from utils.indicators.trend_indicators import (
+    TrendIndicators,
+    calculate_ema,
+    calculate_sma,
+)
 from utils.indicators.volatility_indicators import calculate_bollinger_bands
 
 
@@ -90,6 +98,54 @@ class TestPerformanceComparison(unittest.TestCase):
         except Exception as e:
             print(f"EMA calculation failed: {e}")
 
+    def test_psar_throughput(self):
+        """Test Parabolic SAR throughput on one million bars."""
+        print("\n=== Parabolic SAR Throughput ===")
+
+        data = TrendIndicators(generate_test_data(1_000_000)).df
+        start_time = time.time()
+        result = TrendIndicators(data).psar_indicator()
+        psar_time = time.time() - start_time
+        print(
+            f"PSAR (1,000,000 bars): {psar_time:.4f} seconds, "
+            f"{len(data) / psar_time:,.0f} bars/second"
+        )
+        self.assertEqual(result["psar"].null_count(), 0)
+
+    def test_alert_engine_tick(self):
+        """Test alert evaluation of 100,000 alerts against a 2,000-symbol tick."""
+        print("\n=== Alert Evaluation Performance ===")
+
+        rng = random.Random(1)
+        symbols = [f"S{i}" for i in range(2_000)]
+        kinds = [("price_high", "above"), ("price_low", "below"), ("percent_change", "above")]
+        rows = []
+        for alert_id in range(100_000):
+            alert_type, condition = rng.choice(kinds)
+            threshold = Decimal(rng.randint(5000, 15000)) / 100
+            if alert_type == "percent_change":
+                threshold = Decimal(rng.randint(-3000, 3000)) / 100
+            rows.append(
+                (alert_id, alert_type, condition, threshold, rng.choice(symbols), Decimal(100))
+            )
+        db = Mock()
+        db.query.return_value.join.return_value.filter.return_value.all.return_value = rows
+        engine = AlertEvaluationEngine(refresh_seconds=3600)
+        engine.evaluate(db, {})
+
+        tick = {symbol: rng.uniform(95, 105) for symbol in symbols}
+        start_time = time.time()
+        triggered = engine.evaluate(db, tick)
+        crossing_time = time.time() - start_time
+        print(f"Tick triggering {len(triggered):,} alerts: {crossing_time:.4f} seconds")
+
+        tick = {symbol: price * rng.uniform(0.999, 1.001) for symbol, price in tick.items()}
+        start_time = time.time()
+        triggered = engine.evaluate(db, tick)
+        typical_time = time.time() - start_time
+        print(f"Tick triggering {len(triggered):,} alerts: {typical_time:.4f} seconds")
+        self.assertLess(typical_time, crossing_time)
+
     def test_volatility_indicators_performance(self):
         """Test volatility indicators performance."""
         print("\n=== Volatility Indicators Performance ===")
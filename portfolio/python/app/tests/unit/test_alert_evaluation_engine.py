@@ -0,0 +1,212 @@
+"""
+Unit tests for the set-based watchlist alert engine.
+
+Tests cover:
+- Trigger prices for price_high, price_low and percent_change alerts
+- Crossed alerts found by bisect and removed from the index
+- Parity with checking every alert one at a time
+- One bulk UPDATE per batch of quotes, guarded against double triggers
+- Index reloads after invalidation and after the refresh interval
+- 100k alerts evaluated against a 2,000-symbol tick (timed in
+  performance_comparison.py)
+"""
+
+import random
+from decimal import Decimal
+from unittest.mock import Mock
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.core.services.alert_evaluation_engine import (
+    ABOVE,
+    BELOW,
+    AlertEvaluationEngine,
+    AlertIndex,
+    trigger_price,
+)
+
+
+def _should_trigger(alert_type, condition, threshold, added_price, price):
+    """The per-alert check the engine replaces."""
+    if alert_type == "price_high" and condition == "above":
+        return price > threshold
+    if alert_type == "price_low" and condition == "below":
+        return price < threshold
+    if alert_type == "percent_change" and added_price:
+        change_percent = ((price - added_price) / added_price) * 100
+        if condition == "above":
+            return change_percent > threshold
+        if condition == "below":
+            return change_percent < threshold
+    return False
+
+
+def _rows(count, symbols, seed=0):
+    """Alert rows as selected by load_index."""
+    rng = random.Random(seed)
+    kinds = [
+        ("price_high", "above"),
+        ("price_low", "below"),
+        ("percent_change", "above"),
+        ("percent_change", "below"),
+        ("price_high", "below"),
+        ("percent_change", "equals"),
+    ]
+    rows = []
+    for alert_id in range(count):
+        alert_type, condition = rng.choice(kinds)
+        if alert_type == "percent_change":
+            threshold = Decimal(rng.randint(-3000, 3000)) / 100
+        else:
+            threshold = Decimal(rng.randint(5000, 15000)) / 100
+        added_price = rng.choice([None, Decimal(rng.randint(5000, 15000)) / 100])
+        rows.append(
+            (alert_id, alert_type, condition, threshold, rng.choice(symbols), added_price)
+        )
+    return rows
+
+
+def _session(rows):
+    db = Mock()
+    db.query.return_value.join.return_value.filter.return_value.all.return_value = rows
+    return db
+
+
+class TestAlertIndex:
+    """Trigger prices and the per-symbol index."""
+
+    def test_trigger_prices(self):
+        assert trigger_price("price_high", "above", Decimal("150"), None) == (ABOVE, 150.0)
+        assert trigger_price("price_low", "below", Decimal("90"), None) == (BELOW, 90.0)
+        direction, price = trigger_price(
+            "percent_change", "below", Decimal("-10"), Decimal("200")
+        )
+        assert direction == BELOW and price == pytest.approx(180.0)
+        # Combinations the per-alert check never triggers
+        assert trigger_price("price_high", "below", Decimal("1"), None) is None
+        assert trigger_price("percent_change", "above", Decimal("5"), None) is None
+        assert trigger_price("percent_change", "equals", Decimal("5"), Decimal("1")) is None
+
+    def test_crossed_alerts_are_popped(self):
+        index = AlertIndex.build(
+            [
+                (1, "aapl", ABOVE, 150.0),
+                (2, "AAPL", ABOVE, 160.0),
+                (3, "AAPL", BELOW, 140.0),
+                (4, "AAPL", BELOW, 120.0),
+                (5, "MSFT", ABOVE, 100.0),
+            ]
+        )
+        index.add(6, "AAPL", ABOVE, 155.0)
+
+        assert index.pop_crossed({"AAPL": 150.0}) == {}
+        assert index.pop_crossed({"AAPL": 157.0, "TSLA": 1.0}) == {1: "AAPL", 6: "AAPL"}
+        assert index.pop_crossed({"AAPL": 130.0}) == {3: "AAPL"}
+        assert len(index) == 3
+        # Already triggered alerts stay out
+        assert index.pop_crossed({"AAPL": 157.0}) == {}
+
+
+class TestAlertEvaluationEngine:
+    """AlertEvaluationEngine.evaluate."""
+
+    def test_matches_per_alert_checks(self):
+        symbols = [f"S{i}" for i in range(20)]
+        rows = _rows(2_000, symbols)
+        prices = {symbol: Decimal(random.Random(i).randint(5000, 15000)) / 100
+                  for i, symbol in enumerate(symbols)}
+        engine = AlertEvaluationEngine(refresh_seconds=3600)
+
+        triggered = engine.evaluate(_session(rows), prices)
+
+        expected = {
+            alert_id
+            for alert_id, alert_type, condition, threshold, symbol, added_price in rows
+            if _should_trigger(alert_type, condition, threshold, added_price, prices[symbol])
+        }
+        assert set(triggered) == expected
+        assert expected
+        assert all(triggered[alert_id] == prices[rows[alert_id][4]] for alert_id in expected)
+
+    def test_one_bulk_update_per_batch(self):
+        rows = [
+            (1, "price_high", "above", Decimal("150"), "AAPL", None),
+            (2, "price_low", "below", Decimal("300"), "MSFT", None),
+            (3, "price_high", "above", Decimal("500"), "MSFT", None),
+        ]
+        db = _session(rows)
+        engine = AlertEvaluationEngine(refresh_seconds=3600)
+
+        triggered = engine.evaluate(db, {"aapl": 151.5, "MSFT": Decimal("299"), "TSLA": None})
+
+        assert triggered == {1: Decimal("151.5"), 2: Decimal("299")}
+        db.execute.assert_called_once()
+        sql = str(db.execute.call_args.args[0].compile(dialect=postgresql.dialect()))
+        assert sql.startswith("UPDATE watchlist_alerts")
+        assert "CASE" in sql and "is_triggered = false" in sql
+        db.commit.assert_not_called()
+
+        # Nothing left to trigger until the index is reloaded
+        assert engine.evaluate(db, {"AAPL": 200}) == {}
+        db.execute.assert_called_once()
+        db.query.assert_called_once()
+
+    def test_reloads_after_invalidate_and_interval(self):
+        rows = [(1, "price_high", "above", Decimal("150"), "AAPL", None)]
+        db = _session(rows)
+        engine = AlertEvaluationEngine(refresh_seconds=3600)
+
+        engine.evaluate(db, {"AAPL": 100})
+        engine.evaluate(db, {"AAPL": 100})
+        assert db.query.call_count == 1
+
+        engine.invalidate()
+        engine.evaluate(db, {"AAPL": 100})
+        assert db.query.call_count == 2
+
+        engine.refresh_seconds = -1
+        engine.evaluate(db, {"AAPL": 100})
+        assert db.query.call_count == 3
+
+    def test_failed_update_reloads_the_index(self):
+        rows = [(1, "price_high", "above", Decimal("150"), "AAPL", None)]
+        db = _session(rows)
+        db.execute.side_effect = RuntimeError("database down")
+        engine = AlertEvaluationEngine(refresh_seconds=3600)
+
+        with pytest.raises(RuntimeError):
+            engine.evaluate(db, {"AAPL": 200})
+
+        db.execute.side_effect = None
+        assert engine.evaluate(db, {"AAPL": 200}) == {1: Decimal("200.0")}
+
+    def test_hundred_thousand_alerts_against_a_tick(self):
+        symbols = [f"S{i}" for i in range(2_000)]
+        rows = _rows(100_000, symbols, seed=1)
+        rng = random.Random(2)
+        engine = AlertEvaluationEngine(refresh_seconds=3600)
+        engine.evaluate(_session(rows), {})
+        db = Mock()
+
+        def crossed(tick, alerts):
+            return {
+                alert_id
+                for alert_id, alert_type, condition, threshold, symbol, added_price in alerts
+                if _should_trigger(
+                    alert_type, condition, threshold, added_price, Decimal(str(tick[symbol]))
+                )
+            }
+
+        # A quarter of the alerts trigger at once, in one UPDATE
+        tick = {symbol: rng.uniform(95, 105) for symbol in symbols}
+        triggered = engine.evaluate(db, tick)
+
+        assert len(triggered) > 20_000
+        assert set(triggered) == crossed(tick, rows)
+        db.execute.assert_called_once()
+
+        # A typical tick triggers a handful of the alerts still armed
+        armed = [row for row in rows if row[0] not in triggered]
+        tick = {symbol: price * rng.uniform(0.999, 1.001) for symbol, price in tick.items()}
+        assert set(engine.evaluate(db, tick)) == crossed(tick, armed)
@@ -0,0 +1,184 @@
+"""
+Unit tests for the concurrent analytics refresh behind POST /analytics/all.
+
+Tests cover:
+- Each symbol's history and price fetched once per refresh
+- Asset, portfolio and correlation computations running concurrently
+- All asset correlations refreshed as one matrix
+- One database session per computation
+- Per-item errors reported without failing the refresh
+"""
+
+import asyncio
+import gc
+import time
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, Mock, patch
+
+import pandas as pd
+import pytest
+
+from app.core.database.models import Asset, Portfolio
+from app.core.services.analytics_refresh_service import AnalyticsRefreshService
+from app.core.services.shared_market_data import SharedMarketData
+
+ASSETS = [SimpleNamespace(id=i, symbol=s) for i, s in enumerate(["AAPL", "MSFT", "NVDA"], 1)]
+PORTFOLIOS = [SimpleNamespace(id=10, name="Growth"), SimpleNamespace(id=11, name="Income")]
+HELD_SYMBOLS = [("AAPL",), ("TSLA",)]
+
+
+class FakeSession:
+    """Context-managed session answering the refresh's listing queries."""
+
+    def __init__(self, registry):
+        self.closed = False
+        registry.append(self)
+
+    def query(self, entity):
+        query = Mock()
+        if entity is Portfolio:
+            query.filter.return_value.all.return_value = PORTFOLIOS
+        elif entity is Asset:
+            query.filter.return_value.all.return_value = ASSETS
+        else:
+            query.join.return_value.filter.return_value.all.return_value = HELD_SYMBOLS
+        return query
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.closed = True
+
+
+class FakeAnalyticsService:
+    """PortfolioAnalyticsService stand-in reading 1y history like the real one."""
+
+    delay = 0.1
+    failing_portfolios = set()
+    correlation_calls = []
+
+    def __init__(self, db, market_data=None):
+        self.db = db
+        self.market_data = market_data
+
+    async def _history(self, symbol):
+        now = pd.Timestamp.now(tz="UTC")
+        await self.market_data.fetch_ticker_data(
+            symbol,
+            start_date=(now - pd.Timedelta(days=365)).strftime("%Y-%m-%d"),
+            end_date=now.strftime("%Y-%m-%d"),
+            interval="1d",
+        )
+
+    async def get_or_calculate_asset_metrics(self, asset_id, force_refresh=False):
+        symbol = next(a.symbol for a in ASSETS if a.id == asset_id)
+        await self._history(symbol)
+        price = await self.market_data.get_current_price(symbol)
+        await asyncio.sleep(self.delay)
+        return SimpleNamespace(current_price=price, price_change_percent=1.0)
+
+    async def get_or_create_performance_snapshot(self, portfolio_id, force_refresh=False):
+        if portfolio_id in self.failing_portfolios:
+            raise ValueError("no holdings")
+        await self._history("TSLA")
+        await asyncio.sleep(self.delay)
+
+    async def get_or_calculate_portfolio_risk_metrics(self, portfolio_id, force_refresh=False):
+        return SimpleNamespace(risk_level="moderate", portfolio_volatility=0.2)
+
+    async def get_portfolio_analytics_summary(self, portfolio_id):
+        return {
+            "total_value": 1100.0,
+            "total_unrealized_pnl": 100.0,
+            "total_unrealized_pnl_percent": 10.0,
+        }
+
+    async def calculate_correlation_matrix(self, asset_ids):
+        self.correlation_calls.append(list(asset_ids))
+        for asset_id in asset_ids:
+            await self._history(next(a.symbol for a in ASSETS if a.id == asset_id))
+        await asyncio.sleep(self.delay)
+
+
+class TestAnalyticsRefreshService:
+    """Test suite for AnalyticsRefreshService."""
+
+    @pytest.fixture
+    def market_data(self):
+        service = Mock()
+        service.fetch_ticker_data = AsyncMock(
+            return_value=pd.DataFrame({"Close": [1.0, 2.0]})
+        )
+        service.get_multiple_current_prices = AsyncMock(
+            side_effect=lambda symbols: {symbol: 100.0 for symbol in symbols}
+        )
+        service.get_current_price = AsyncMock(return_value=100.0)
+        return service
+
+    @pytest.fixture
+    def sessions(self):
+        return []
+
+    @pytest.fixture
+    def refresh_service(self, market_data, sessions):
+        FakeAnalyticsService.failing_portfolios = set()
+        FakeAnalyticsService.correlation_calls = []
+        with patch(
+            "app.core.services.analytics_refresh_service.PortfolioAnalyticsService",
+            FakeAnalyticsService,
+        ):
+            yield AnalyticsRefreshService(
+                lambda: FakeSession(sessions),
+                max_concurrency=8,
+                market_data=SharedMarketData(market_data),
+            )
+
+    @pytest.mark.asyncio
+    async def test_each_symbol_fetched_once(self, refresh_service, market_data):
+        data = await refresh_service.refresh_user_analytics(user_id=1)
+
+        fetched = sorted(call.kwargs["symbol"] for call in market_data.fetch_ticker_data.call_args_list)
+        assert fetched == ["AAPL", "MSFT", "NVDA", "TSLA"]
+        market_data.get_multiple_current_prices.assert_awaited_once()
+        market_data.get_current_price.assert_not_called()
+        assert data["assets_updated"] == 3
+        assert data["portfolios_updated"] == 2
+        assert data["errors"] == []
+
+    @pytest.mark.asyncio
+    async def test_computations_run_concurrently(self, refresh_service):
+        # Keep a collection of earlier tests' garbage out of the timing
+        gc.collect()
+        started = time.perf_counter()
+        await refresh_service.refresh_user_analytics(user_id=1)
+        elapsed = time.perf_counter() - started
+
+        # 3 assets + 2 portfolios + the correlation matrix would take 0.6s serially
+        assert elapsed < 0.3
+
+    @pytest.mark.asyncio
+    async def test_one_session_per_computation(self, refresh_service, sessions):
+        await refresh_service.refresh_user_analytics(user_id=1)
+
+        # Listing session + 3 assets + 2 portfolios + the correlation matrix
+        assert len(sessions) == 7
+        assert all(session.closed for session in sessions)
+
+    @pytest.mark.asyncio
+    async def test_item_errors_are_reported(self, refresh_service):
+        FakeAnalyticsService.failing_portfolios = {11}
+
+        data = await refresh_service.refresh_user_analytics(user_id=1)
+
+        assert data["errors"] == ["Portfolio Income: no holdings"]
+        assert [p["portfolio_name"] for p in data["portfolio_summaries"]] == ["Growth"]
+        assert data["summary"]["total_portfolio_value"] == 1100.0
+        assert data["summary"]["total_unrealized_pnl_percent"] == pytest.approx(10.0)
+        assert data["summary"]["successful_updates"] == 4
+
+    @pytest.mark.asyncio
+    async def test_correlations_computed_as_one_matrix(self, refresh_service):
+        await refresh_service.refresh_user_analytics(user_id=1)
+
+        assert FakeAnalyticsService.correlation_calls == [[1, 2, 3]]
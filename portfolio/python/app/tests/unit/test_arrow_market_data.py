@@ -0,0 +1,262 @@
+"""
+Unit tests for the Arrow-native market data path and columnar responses.
+
+Tests cover:
+- fetch_ticker_frame column normalization and date order
+- Fresh stored history read from Parquet without pandas, stale history synced
+- Date-range slicing of stored frames
+- IndicatorRegistryService accepting Polars frames as they are
+- calculate_indicators_json matching calculate_indicators without per-row dicts
+- Lower peak memory of the columnar response
+"""
+
+import json
+import tracemalloc
+from unittest.mock import AsyncMock, Mock, patch
+
+import numpy as np
+import pandas as pd
+import polars as pl
+import pytest
+
+from app.core.schemas.statistical_indicators import (
+    IndicatorCalculationRequest,
+    IndicatorCalculationResponse,
+    IndicatorConfiguration,
+)
+from app.core.services.enhanced_statistical_service import EnhancedStatisticalService
+from app.core.services.indicator_registry_service import IndicatorRegistryService
+from app.core.services.indicator_state_store import IndicatorStateStore
+from app.core.services.market_data_executor import MarketDataExecutor
+from app.core.services.market_data_service import MarketDataService
+from app.core.services.ohlcv_store import OHLCVStore
+
+
+def _bars(start, periods, index_name="Date", seed=0):
+    """yfinance-shaped history with a tz-aware date index."""
+    rng = np.random.default_rng(seed)
+    close = 100 * np.cumprod(1 + rng.normal(0, 0.01, periods))
+    index = pd.date_range(
+        start, periods=periods, freq="D", tz="America/New_York", name=index_name
+    )
+    return pd.DataFrame(
+        {
+            "Open": close,
+            "High": close * 1.01,
+            "Low": close * 0.99,
+            "Close": close,
+            "Volume": rng.integers(1_000, 100_000, periods),
+            "Dividends": 0.0,
+            "Stock Splits": 0.0,
+        },
+        index=index,
+    )
+
+
+class TestFetchTickerFrame:
+    """MarketDataService.fetch_ticker_frame."""
+
+    @pytest.fixture
+    def executor(self):
+        executor = MarketDataExecutor(max_workers=2, timeout=5, max_concurrency=2)
+        yield executor
+        executor.shutdown()
+
+    @pytest.fixture
+    def store(self, tmp_path):
+        return OHLCVStore(root=str(tmp_path), refresh_seconds=900, enabled=True)
+
+    @pytest.fixture
+    def service(self, executor, store):
+        return MarketDataService(executor=executor, store=store)
+
+    @pytest.mark.asyncio
+    async def test_upstream_history_is_normalized_once(self, service):
+        ticker = Mock()
+        ticker.history.return_value = _bars("2024-01-01", 10)
+
+        with patch(
+            "app.core.services.market_data_service.yf.Ticker", return_value=ticker
+        ):
+            data = await service.fetch_ticker_frame("AAPL", period="1mo")
+
+        assert isinstance(data, pl.DataFrame)
+        assert data.columns == [
+            "date", "open", "high", "low", "close", "volume", "dividends", "stock_splits",
+        ]
+        assert data["date"].dtype.time_zone == "America/New_York"
+        # Oldest first, unlike fetch_ticker_data
+        assert data["date"].is_sorted()
+        assert len(data) == 10
+
+    @pytest.mark.asyncio
+    async def test_intraday_datetime_index_becomes_date(self, service):
+        ticker = Mock()
+        ticker.history.return_value = _bars("2024-01-01", 5, index_name="Datetime")
+
+        with patch(
+            "app.core.services.market_data_service.yf.Ticker", return_value=ticker
+        ):
+            data = await service.fetch_ticker_frame("AAPL", period="5d", interval="1h")
+
+        assert data.columns[0] == "date"
+        assert len(data) == 5
+
+    @pytest.mark.asyncio
+    async def test_missing_data_returns_empty_frame(self, service):
+        ticker = Mock()
+        ticker.history.return_value = pd.DataFrame()
+
+        with patch(
+            "app.core.services.market_data_service.yf.Ticker", return_value=ticker
+        ):
+            data = await service.fetch_ticker_frame("NONE", period="1mo")
+
+        assert isinstance(data, pl.DataFrame)
+        assert data.is_empty()
+
+    @pytest.mark.asyncio
+    async def test_fresh_store_is_read_without_pandas(self, service, store):
+        store.save("AAPL", "1d", _bars("2024-01-01", 20).reset_index())
+
+        with patch(
+            "app.core.services.market_data_service.yf.Ticker"
+        ) as ticker_cls, patch.object(store, "load") as pandas_load:
+            data = await service.fetch_ticker_frame("AAPL", period="max")
+
+        ticker_cls.assert_not_called()
+        pandas_load.assert_not_called()
+        assert len(data) == 20
+        assert "close" in data.columns and "Close" not in data.columns
+        assert data["date"].is_sorted()
+
+    @pytest.mark.asyncio
+    async def test_stale_store_is_topped_up(self, service, store):
+        store.save("AAPL", "1d", _bars("2024-01-01", 10).reset_index())
+        store.refresh_seconds = 0
+        ticker = Mock()
+        ticker.history.return_value = _bars("2024-01-10", 3, seed=1)
+
+        with patch(
+            "app.core.services.market_data_service.yf.Ticker", return_value=ticker
+        ):
+            data = await service.fetch_ticker_frame("AAPL", period="max")
+
+        ticker.history.assert_called_once_with(start="2024-01-10", interval="1d")
+        assert len(data) == 12
+        assert data["date"].is_sorted()
+
+    @pytest.mark.asyncio
+    async def test_date_range_is_sliced_from_store(self, service, store):
+        store.save("AAPL", "1d", _bars("2024-01-01", 31).reset_index())
+
+        data = await service.fetch_ticker_frame(
+            "AAPL", start_date="2024-01-10", end_date="2024-01-20"
+        )
+
+        assert len(data) == 10
+        assert data["date"].min().strftime("%Y-%m-%d") == "2024-01-10"
+        assert data["date"].max().strftime("%Y-%m-%d") == "2024-01-19"
+
+
+class TestRegistryPolarsInput:
+    """IndicatorRegistryService with frames from fetch_ticker_frame."""
+
+    def test_polars_input_matches_pandas_input(self):
+        registry = IndicatorRegistryService(Mock(), state_store=IndicatorStateStore())
+        history = _bars("2024-01-01", 120)
+        frame = MarketDataService._to_frame(history, include_index=True)
+        configs = [
+            IndicatorConfiguration(id="rsi", indicator_name="rsi_indicator", parameters={}),
+            IndicatorConfiguration(id="obv", indicator_name="obv_indicator", parameters={}),
+        ]
+
+        with patch.object(pl, "from_pandas") as from_pandas:
+            result, errors, _ = registry.calculate_indicators(frame, configs)
+        expected, _, _ = registry.calculate_indicators(history.reset_index(), configs)
+
+        from_pandas.assert_not_called()
+        assert errors == []
+        # Already snake_case, so no duplicate OHLCV columns are added
+        assert result.columns[:len(frame.columns)] == frame.columns
+        assert len(result.columns) == len(frame.columns) + 2
+        for column in ("rsi_rsi", "obv_obv"):
+            assert result[column].equals(expected[column], null_equal=True)
+
+
+class TestColumnarResponse:
+    """EnhancedStatisticalService.calculate_indicators_json."""
+
+    @staticmethod
+    def _service(n_bars=300):
+        service = EnhancedStatisticalService(Mock())
+        frame = MarketDataService._to_frame(_bars("2020-01-01", n_bars), include_index=True)
+        service.market_data_service = Mock(
+            fetch_ticker_frame=AsyncMock(return_value=frame)
+        )
+        return service
+
+    @staticmethod
+    def _request():
+        return IndicatorCalculationRequest(
+            symbol="AAPL",
+            period="1y",
+            interval="1d",
+            indicators=[
+                IndicatorConfiguration(id="rsi", indicator_name="rsi_indicator", parameters={}),
+                IndicatorConfiguration(id="bb", indicator_name="bollinger_bands_indicator", parameters={}),
+                IndicatorConfiguration(id="macd", indicator_name="macd_indicator", parameters={}),
+            ],
+        )
+
+    @pytest.mark.asyncio
+    async def test_matches_model_response(self):
+        service = self._service()
+
+        body = json.loads(await service.calculate_indicators_json(self._request()))
+        model = json.loads(
+            (await service.calculate_indicators(self._request())).model_dump_json()
+        )
+
+        IndicatorCalculationResponse(**body)
+        for payload in (body, model):
+            payload["metadata"].pop("last_updated")
+            payload["metadata"].pop("calculation_time_ms")
+        assert body == model
+
+    @pytest.mark.asyncio
+    async def test_rows_are_serialized_without_dicts(self):
+        service = self._service()
+
+        with patch.object(pl.DataFrame, "to_dicts", side_effect=AssertionError), \
+                patch.object(pl.DataFrame, "rows", side_effect=AssertionError):
+            body = json.loads(await service.calculate_indicators_json(self._request()))
+
+        assert body["total_records"] == len(body["data"]) == 300
+        assert body["data"][0]["date"] == "2020-01-01T00:00:00-05:00"
+        assert body["start_date"] == body["data"][0]["date"]
+        assert body["data"][0]["rsi_rsi"] is None
+        assert body["data"][-1]["rsi_rsi"] is not None
+        assert len(body["indicator_series"]) == sum(
+            len(service.indicator_registry.get_indicator_definition(c.indicator_name).output_columns)
+            for c in self._request().indicators
+        )
+        assert body["volume_data"][0]["color"] is None
+
+    @pytest.mark.asyncio
+    async def test_lower_peak_memory_than_model_response(self):
+        service = self._service(n_bars=3_000)
+
+        async def peak(calculate):
+            tracemalloc.start()
+            try:
+                await calculate(self._request())
+                return tracemalloc.get_traced_memory()[1]
+            finally:
+                tracemalloc.stop()
+
+        async def model_json(request):
+            response = await service.calculate_indicators(request)
+            return response.model_dump_json().encode()
+
+        assert await peak(service.calculate_indicators_json) * 2 < await peak(model_json)
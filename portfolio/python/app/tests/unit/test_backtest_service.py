@@ -0,0 +1,191 @@
+"""
+Unit tests for the strategy backtest engine.
+
+Tests cover:
+- Positions and equity from signals, with and without trading costs
+- Long and short trade lists, including a trade still open at the end
+- Metrics computed with the PortfolioCalculationService helpers
+- GFS signals only using weekly and monthly bars that have closed
+- Sweeps matching single backtests and sorted by Sharpe ratio
+- A 1,000-combination MACD sweep on the process pool
+- Strategy, parameter and history validation
+"""
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+import polars as pl
+import pytest
+
+from app.core.services.backtest_service import BacktestService
+from app.core.services.market_data_service import MarketDataService
+from app.core.services.portfolio_calculation_service import (
+    PortfolioCalculationService,
+)
+from utils.trading_strategies.backtest import gfs_signals, simulate, trades
+
+
+def _frame(seed=0, periods=1260):
+    """Daily bars as returned by the market data service."""
+    index = pd.bdate_range(end="2024-06-28", periods=periods, name="Date")
+    close = 100 * np.cumprod(1 + np.random.default_rng(seed).normal(0, 0.02, periods))
+    bars = pd.DataFrame(
+        {"Open": close, "High": close, "Low": close, "Close": close, "Volume": 1_000.0},
+        index=index,
+    )
+    return MarketDataService._to_frame(bars, include_index=True)
+
+
+def _signals(closes, signals):
+    return pl.LazyFrame(
+        {
+            "combo": pl.Series([0] * len(closes), dtype=pl.UInt32),
+            "date": pd.bdate_range("2024-01-01", periods=len(closes)),
+            "close": closes,
+            "signal": pl.Series(signals, dtype=pl.Int64),
+        }
+    )
+
+
+CLOSES = [100.0, 110.0, 121.0, 110.0, 100.0]
+SIGNALS = [1, None, -1, None, None]
+
+
+class TestSimulate:
+    """Signal to position, equity and trade conversion."""
+
+    def test_positions_and_equity(self):
+        simulated = simulate(_signals(CLOSES, SIGNALS))
+
+        assert simulated["target"].to_list() == [1, 1, 0, 0, 0]
+        # Decided at the close, held from the next bar
+        assert simulated["position"].to_list() == [0, 1, 1, 0, 0]
+        assert simulated["equity"].to_list() == pytest.approx(
+            [10_000, 11_000, 12_100, 12_100, 12_100]
+        )
+
+    def test_costs_are_paid_per_trade(self):
+        simulated = simulate(
+            _signals(CLOSES, SIGNALS), commission=0.006, slippage=0.004
+        )
+        closed = trades(simulated, commission=0.006, slippage=0.004)
+
+        assert simulated["equity"][-1] == pytest.approx(10_000 * 0.99 * 1.21 * 0.99)
+        assert closed["return"].to_list() == pytest.approx([0.99 ** 2 * 1.21 - 1])
+
+    def test_long_and_open_short_trades(self):
+        simulated = simulate(_signals(CLOSES, SIGNALS), allow_short=True)
+        result = trades(simulated)
+
+        assert simulated["position"].to_list() == [0, 1, 1, -1, -1]
+        # The short is rebalanced daily
+        assert simulated["equity"][-1] == pytest.approx(
+            12_100 * (1 + 11 / 121) * (1 + 10 / 110)
+        )
+        assert result.select("side", "entry_price", "exit_price", "is_open").rows() == [
+            (1, 100.0, 121.0, False),
+            (-1, 121.0, 100.0, True),
+        ]
+        assert result["return"].to_list() == pytest.approx([0.21, 21 / 121])
+        assert result["exit_date"][1] is None
+
+    def test_gfs_signals_do_not_look_ahead(self):
+        history = _frame(seed=3)
+        combos = [{"window": 6, "oversold": 45, "overbought": 55}]
+
+        full = gfs_signals(history, combos).collect()
+        cut = gfs_signals(history.head(900), combos).collect()
+
+        assert full["signal"].drop_nulls().len() > 0
+        assert cut["signal"].to_list() == full["signal"].head(900).to_list()
+
+
+class TestBacktestService:
+    """BacktestService.backtest and sweep."""
+
+    @pytest.fixture
+    def service(self):
+        pool = ThreadPoolExecutor(max_workers=2)
+        yield BacktestService(chunk_size=3, executor=pool)
+        pool.shutdown()
+
+    def test_metrics_use_portfolio_calculations(self, service):
+        history = _frame()
+
+        result = service.backtest(
+            history, "macd", {"condition_days": 3}, commission=0.001
+        )
+
+        equity = pd.Series([point.equity for point in result.equity_curve])
+        years = (history["date"][-1] - history["date"][0]).days / 365.25
+        cagr = PortfolioCalculationService._annualized_return(10_000, equity.iloc[-1], years)
+        volatility = PortfolioCalculationService._annualized_volatility(equity.pct_change())
+        metrics = result.metrics
+        assert result.parameters["condition_days"] == 3
+        assert result.parameters["window_slow"] == 26
+        assert metrics.cagr_percent == pytest.approx(cagr)
+        assert metrics.volatility_percent == pytest.approx(volatility)
+        assert metrics.sharpe_ratio == pytest.approx((cagr - 2.0) / volatility)
+        assert metrics.max_drawdown_percent == pytest.approx(
+            PortfolioCalculationService._max_drawdown(equity)
+        )
+        assert metrics.trades == len(result.trades) > 0
+        assert len(result.equity_curve) == len(history)
+
+    @pytest.mark.asyncio
+    async def test_sweep_matches_single_backtests(self, service):
+        history = _frame(seed=1)
+        grid = {"window_fast": [8, 12], "window_slow": [26, 30], "condition_days": [3, 5]}
+
+        swept = await service.sweep(history, "macd", grid, commission=0.001)
+
+        assert len(swept) == 8
+        sharpe = swept["sharpe_ratio"].drop_nulls().to_list()
+        assert sharpe == sorted(sharpe, reverse=True)
+        for row in swept.iter_rows(named=True):
+            parameters = {name: row[name] for name in grid}
+            single = service.backtest(history, "macd", parameters, commission=0.001)
+            assert row["window_sign"] == 9
+            assert row["cagr_percent"] == pytest.approx(single.metrics.cagr_percent)
+            assert row["trades"] == single.metrics.trades
+
+    @pytest.mark.asyncio
+    async def test_thousand_combinations_on_process_pool(self):
+        service = BacktestService(max_workers=2)
+        grid = {
+            "window_fast": list(range(6, 16)),
+            "window_slow": list(range(20, 40, 2)),
+            "window_sign": [5, 7, 9, 11, 13],
+            "condition_days": [5, 10],
+        }
+
+        try:
+            start = time.perf_counter()
+            swept = await service.sweep(_frame(), "macd", grid)
+            elapsed = time.perf_counter() - start
+        finally:
+            service.shutdown(wait=True)
+
+        assert len(swept) == 1000
+        assert swept.select(list(grid)).unique().height == 1000
+        # Includes starting the worker processes
+        assert elapsed < 60
+
+    @pytest.mark.parametrize(
+        "strategy, parameters, message",
+        [
+            ("rsi", {}, "Unknown strategy"),
+            ("macd", {"window": 3}, "Unknown parameters for 'macd': window"),
+            ("gfs", {"condition_days": 3}, "Supported parameters: window, oversold"),
+        ],
+    )
+    def test_validation(self, service, strategy, parameters, message):
+        with pytest.raises(ValueError, match=message):
+            service.backtest(_frame(), strategy, parameters)
+
+    @pytest.mark.asyncio
+    async def test_empty_history(self, service):
+        with pytest.raises(ValueError, match="No price data found"):
+            await service.sweep(pl.DataFrame(), "gfs", {"window": [7, 14]})
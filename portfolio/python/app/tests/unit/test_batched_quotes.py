@@ -0,0 +1,178 @@
+"""
+Unit tests for batched multi-symbol quote fetching in MarketDataService.
+
+Tests cover:
+- Chunked multi-symbol quote requests with a dense result map
+- Batched last-close fallback for symbols without a quote price
+- get_stock_latest_data built from batched quotes and fundamentals modules
+"""
+
+from unittest.mock import Mock, patch
+
+import pandas as pd
+import pytest
+
+from app.core.services.market_data_executor import MarketDataExecutor
+from app.core.services.market_data_service import MarketDataService
+from app.core.services.ohlcv_store import OHLCVStore
+from app.core.services.single_flight import SingleFlight
+
+
+def _quote(symbol, price):
+    return {
+        "symbol": symbol,
+        "shortName": f"{symbol} Inc.",
+        "longName": f"{symbol} Incorporated",
+        "regularMarketPrice": price,
+        "regularMarketPreviousClose": price - 1,
+        "regularMarketChangePercent": 1.5,
+        "fullExchangeName": "NasdaqGS",
+        "currency": "USD",
+        "marketCap": 1000,
+    }
+
+
+def _modules(symbol):
+    return {
+        "assetProfile": {
+            "sector": "Technology",
+            "industry": "Software",
+            "country": "United States",
+            "website": f"https://{symbol.lower()}.example.com",
+        },
+        "summaryDetail": {"beta": 1.2, "payoutRatio": 0.15, "open": 1.0},
+        "defaultKeyStatistics": {"bookValue": 4.5},
+        "financialData": {
+            "revenueGrowth": 0.08,
+            "freeCashflow": 1000000,
+            "currentPrice": 1.0,
+        },
+    }
+
+
+def _quotes_ticker(prices):
+    """yahooquery.Ticker replacement answering from a symbol -> price map."""
+
+    def make(symbols):
+        ticker = Mock()
+        ticker.quotes = {
+            symbol: _quote(symbol, prices[symbol])
+            for symbol in symbols
+            if symbol in prices
+        }
+        ticker.get_modules.return_value = {
+            symbol: _modules(symbol) for symbol in symbols if symbol in prices
+        }
+        return ticker
+
+    return Mock(side_effect=make)
+
+
+class TestBatchedQuotes:
+    """Test suite for batched quote fetching."""
+
+    @pytest.fixture
+    def service(self):
+        executor = MarketDataExecutor(max_workers=4, timeout=5, max_concurrency=4)
+        service = MarketDataService(
+            executor=executor,
+            store=OHLCVStore(enabled=False),
+            single_flight=SingleFlight(),
+        )
+        service.quote_batch_size = 50
+        yield service
+        executor.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_200_symbols_use_a_handful_of_calls(self, service):
+        symbols = [f"S{i:03d}" for i in range(200)]
+        ticker = _quotes_ticker({symbol: 10.0 for symbol in symbols})
+
+        with patch("app.core.services.market_data_service.yq.Ticker", ticker), patch(
+            "app.core.services.market_data_service.yf.Ticker"
+        ) as single_ticker:
+            prices = await service.get_multiple_current_prices(symbols)
+
+        assert ticker.call_count == 4
+        assert all(len(call.args[0]) == 50 for call in ticker.call_args_list)
+        single_ticker.assert_not_called()
+        assert prices == {symbol: 10.0 for symbol in symbols}
+
+    @pytest.mark.asyncio
+    async def test_missing_quotes_fall_back_to_one_download(self, service):
+        ticker = _quotes_ticker({"AAPL": 190.0})
+        index = pd.date_range("2024-01-01", periods=3, freq="D")
+        closes = pd.DataFrame(
+            {
+                ("Close", "MSFT"): [400.0, 410.0, float("nan")],
+                ("Close", "NOPE"): [float("nan")] * 3,
+            },
+            index=index,
+        )
+
+        with patch("app.core.services.market_data_service.yq.Ticker", ticker), patch(
+            "app.core.services.market_data_service.yf.download", return_value=closes
+        ) as download:
+            prices = await service.get_multiple_current_prices(["AAPL", "MSFT", "NOPE"])
+
+        download.assert_called_once()
+        assert download.call_args.args[0] == ["MSFT", "NOPE"]
+        # Dense: every requested symbol is present
+        assert prices == {"AAPL": 190.0, "MSFT": 410.0, "NOPE": None}
+
+    @pytest.mark.asyncio
+    async def test_failed_chunk_yields_none_entries(self, service):
+        ticker = Mock()
+        ticker.return_value.quotes = "No data found"
+
+        with patch("app.core.services.market_data_service.yq.Ticker", ticker):
+            quotes = await service.get_latest_quotes(["AAPL", "MSFT"])
+
+        assert quotes == {"AAPL": None, "MSFT": None}
+
+    @pytest.mark.asyncio
+    async def test_stock_latest_data_from_batched_quotes(self, service):
+        ticker = _quotes_ticker({"AAPL": 190.0, "MSFT": 410.0})
+
+        with patch("app.core.services.market_data_service.yq.Ticker", ticker):
+            data = await service.get_stock_latest_data(["aapl", "MSFT", "GONE"])
+
+        assert ticker.call_count == 1
+        assert [item["symbol"] for item in data] == ["AAPL", "MSFT"]
+        assert data[0]["current_price"] == 190.0
+        assert data[0]["short_name"] == "AAPL Inc."
+        assert data[0]["previous_close"] == 189.0
+        assert data[0]["exchange"] == "NasdaqGS"
+
+    @pytest.mark.asyncio
+    async def test_stock_latest_data_keeps_fundamentals(self, service):
+        ticker = _quotes_ticker({"AAPL": 190.0})
+
+        with patch("app.core.services.market_data_service.yq.Ticker", ticker):
+            data = await service.get_stock_latest_data(["AAPL"])
+
+        # Quotes and modules come from the same batched Ticker
+        assert ticker.call_count == 1
+        item = data[0]
+        assert item["sector"] == "Technology"
+        assert item["industry"] == "Software"
+        assert item["country"] == "United States"
+        assert item["website"] == "https://aapl.example.com"
+        assert item["beta"] == 1.2
+        assert item["payout_ratio"] == 0.15
+        assert item["revenue_growth"] == 0.08
+        assert item["free_cashflow"] == 1000000
+        # Quote prices win over the module copies
+        assert item["current_price"] == 190.0
+
+    @pytest.mark.asyncio
+    async def test_stock_latest_data_without_fundamentals(self, service):
+        ticker = Mock()
+        ticker.return_value.quotes = {"AAPL": _quote("AAPL", 190.0)}
+        ticker.return_value.get_modules.return_value = "No fundamentals found"
+
+        with patch("app.core.services.market_data_service.yq.Ticker", ticker):
+            data = await service.get_stock_latest_data(["AAPL"])
+
+        assert data[0]["current_price"] == 190.0
+        assert data[0]["sector"] is None
@@ -0,0 +1,189 @@
+"""
+Unit tests for the correlation matrix engine and its bulk upsert.
+
+Tests cover:
+- Matrix correlations matching np.corrcoef and per-pair pandas correlations
+- Pairwise-complete handling of gaps in the aligned returns
+- Window thresholds for 1m/3m/6m/1y and rolling metrics
+- One history fetch per asset and one upserted row per pair
+"""
+
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+
+import numpy as np
+import pandas as pd
+import pytest
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from sqlalchemy.schema import CreateTable
+
+from app.core.database.models.portfolio_analytics import AssetCorrelation
+from app.core.services.correlation_matrix_engine import CorrelationMatrixEngine
+from app.core.services.portfolio_analytics_service import PortfolioAnalyticsService
+
+CALCULATION_DATE = datetime(2024, 12, 31, 16, tzinfo=timezone.utc)
+
+
+def _closes(n_assets, n_days, seed=7):
+    rng = np.random.default_rng(seed)
+    dates = pd.bdate_range(end="2024-12-31", periods=n_days)
+    market = rng.normal(0, 0.01, n_days)
+    return {
+        asset_id: pd.Series(
+            100 * np.cumprod(1 + 0.6 * market + rng.normal(0, 0.01, n_days)),
+            index=dates,
+        )
+        for asset_id in range(1, n_assets + 1)
+    }
+
+
+def _history(series):
+    # Same shape as MarketDataService.fetch_ticker_data: newest first, Date column
+    return pd.DataFrame(
+        {"Date": series.index.tz_localize("America/New_York"), "Close": series.to_numpy()}
+    ).iloc[::-1].reset_index(drop=True)
+
+
+@pytest.fixture
+def session():
+    engine = create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+
+    # SQLite has no now(); swap the server default for its equivalent
+    ddl = str(CreateTable(AssetCorrelation.__table__).compile(engine))
+    with engine.begin() as connection:
+        connection.exec_driver_sql(
+            ddl.replace("DEFAULT now()", "DEFAULT CURRENT_TIMESTAMP")
+        )
+    db = sessionmaker(bind=engine)()
+    yield db
+    db.close()
+
+
+class TestCorrelationMatrixEngine:
+    """Test suite for CorrelationMatrixEngine."""
+
+    @pytest.fixture
+    def engine(self):
+        return CorrelationMatrixEngine()
+
+    def test_matches_corrcoef_without_gaps(self, engine):
+        returns = engine.returns_frame(_closes(5, 120))
+
+        corr, counts = engine.correlation_matrix(returns.to_numpy())
+
+        np.testing.assert_allclose(corr, np.corrcoef(returns.to_numpy().T), atol=1e-10)
+        assert (counts == 119).all()
+
+    def test_gaps_use_pairwise_complete_rows(self, engine):
+        returns = engine.returns_frame(_closes(4, 80))
+        returns.iloc[:10, 0] = np.nan
+        returns.iloc[30:35, 2] = np.nan
+
+        corr, counts = engine.correlation_matrix(returns.to_numpy())
+
+        np.testing.assert_allclose(corr, returns.corr().to_numpy(), atol=1e-10)
+        assert counts[0, 2] == 79 - 15
+
+    def test_pair_metrics_match_per_pair_correlations(self, engine):
+        returns = engine.returns_frame(_closes(3, 300))
+
+        metrics = engine.pair_metrics(returns)
+
+        assert sorted(metrics) == [(1, 2), (1, 3), (2, 3)]
+        r1, r2 = returns[1], returns[2]
+        expected = {
+            "correlation_1y": r1.corr(r2),
+            "correlation_6m": r1.tail(126).corr(r2.tail(126)),
+            "correlation_3m": r1.tail(63).corr(r2.tail(63)),
+            "correlation_1m": r1.tail(21).corr(r2.tail(21)),
+            "rolling_correlation_60d": r1.rolling(60).corr(r2).iloc[-1],
+            "rolling_correlation_20d": r1.rolling(20).corr(r2).iloc[-1],
+        }
+        for column, value in expected.items():
+            assert float(metrics[(1, 2)][column]) == pytest.approx(value, abs=1e-6)
+        assert metrics[(1, 2)]["is_significant"] is True
+
+    def test_short_history_skips_long_windows(self, engine):
+        returns = engine.returns_frame(_closes(2, 70))
+
+        metrics = engine.pair_metrics(returns)[(1, 2)]
+
+        assert {"correlation_3m", "correlation_1m", "rolling_correlation_60d"} <= set(metrics)
+        assert "correlation_6m" not in metrics
+        assert "correlation_1y" not in metrics
+
+    def test_gaps_inside_window_skip_that_window(self, engine):
+        returns = engine.returns_frame(_closes(2, 300))
+        # Plenty of joint history overall, but a gap in the most recent returns
+        returns.iloc[-5:, 0] = np.nan
+
+        metrics = engine.pair_metrics(returns)[(1, 2)]
+
+        assert "correlation_1y" in metrics
+        assert not {"correlation_6m", "correlation_3m", "correlation_1m"} & set(metrics)
+
+
+class TestCorrelationMatrixService:
+    """PortfolioAnalyticsService.calculate_correlation_matrix end to end."""
+
+    @pytest.fixture(autouse=True)
+    def _stop_patches(self):
+        yield
+        patch.stopall()
+
+    def _service(self, session, closes):
+        assets = [SimpleNamespace(id=asset_id, symbol=f"SYM{asset_id}") for asset_id in closes]
+        histories = {f"SYM{asset_id}": _history(series) for asset_id, series in closes.items()}
+        query = patch.object(session, "query").start()
+        query.return_value.filter.return_value.all.return_value = assets
+        fetch = AsyncMock(side_effect=lambda symbol, **kwargs: histories[symbol].copy())
+        return PortfolioAnalyticsService(session, market_data=SimpleNamespace(fetch_ticker_data=fetch)), fetch
+
+    @pytest.mark.asyncio
+    async def test_fifty_assets_one_fetch_each_one_row_per_pair(self, session):
+        service, fetch = self._service(session, _closes(50, 260))
+
+        correlations = await service.calculate_correlation_matrix(
+            list(range(1, 51)), CALCULATION_DATE
+        )
+
+        assert fetch.await_count == 50
+        assert len(correlations) == 50 * 49 // 2
+        assert all(c.asset1_id < c.asset2_id for c in correlations)
+        assert all(c.correlation_6m is not None for c in correlations)
+        stored = session.execute(select(func.count()).select_from(AssetCorrelation)).scalar()
+        assert stored == 1225
+
+    @pytest.mark.asyncio
+    async def test_recalculation_upserts_existing_pairs(self, session):
+        closes = _closes(3, 100)
+        service, _ = self._service(session, closes)
+        await service.calculate_correlation_matrix([1, 2, 3], CALCULATION_DATE)
+
+        closes[3] = closes[3].iloc[::-1].set_axis(closes[3].index)
+        service, _ = self._service(session, closes)
+        correlations = await service.calculate_correlation_matrix([1, 2, 3], CALCULATION_DATE)
+
+        stored = session.execute(select(func.count()).select_from(AssetCorrelation)).scalar()
+        assert stored == 3
+        expected = CorrelationMatrixEngine().pair_metrics(
+            CorrelationMatrixEngine().returns_frame(closes)
+        )
+        by_pair = {(c.asset1_id, c.asset2_id): c for c in correlations}
+        assert float(by_pair[(1, 3)].correlation_1m) == pytest.approx(
+            float(expected[(1, 3)]["correlation_1m"]), abs=1e-6
+        )
+
+    @pytest.mark.asyncio
+    async def test_needs_two_assets_with_history(self, session):
+        closes = _closes(2, 100)
+        closes[2] = closes[2].tail(10)
+        service, _ = self._service(session, closes)
+
+        with pytest.raises(ValueError, match="Insufficient price data"):
+            await service.calculate_correlation_matrix([1, 2], CALCULATION_DATE)
@@ -0,0 +1,114 @@
+"""
+Unit tests for vectorized correlation significance testing.
+
+Tests cover:
+- Exact t-distribution p-values matching scipy.stats.pearsonr
+- Fisher-z confidence intervals
+- Bonferroni, Holm and Benjamini-Hochberg corrections
+- Matrix-wide significance over distinct pairs only
+- Pairwise _calculate_correlations using the exact test
+"""
+
+from unittest.mock import Mock
+
+import numpy as np
+import pandas as pd
+import pytest
+from scipy import stats
+
+from app.core.services.correlation_statistics import (
+    adjust_p_values,
+    correlation_p_values,
+    fisher_confidence_intervals,
+    matrix_significance,
+)
+from app.core.services.portfolio_analytics_service import PortfolioAnalyticsService
+
+
+@pytest.fixture
+def samples():
+    rng = np.random.default_rng(11)
+    base = rng.normal(size=60)
+    return np.column_stack(
+        [base, 0.3 * base + rng.normal(size=60), rng.normal(size=60), -base + 0.2 * rng.normal(size=60)]
+    )
+
+
+class TestCorrelationStatistics:
+    """Test suite for correlation significance helpers."""
+
+    def test_p_values_match_pearsonr(self, samples):
+        corr = np.corrcoef(samples.T)
+        counts = np.full(corr.shape, len(samples))
+
+        p_values = correlation_p_values(corr, counts)
+
+        for i, j in [(0, 1), (0, 2), (1, 3)]:
+            expected = stats.pearsonr(samples[:, i], samples[:, j])[1]
+            assert p_values[i, j] == pytest.approx(expected, rel=1e-8)
+
+    def test_p_value_edge_cases(self):
+        p_values = correlation_p_values(np.array([1.0, -1.0, 0.0, 0.5, np.nan]), np.array([10, 10, 10, 2, 10]))
+
+        assert p_values[0] == 0.0
+        assert p_values[1] == 0.0
+        assert p_values[2] == pytest.approx(1.0)
+        assert np.isnan(p_values[3])
+        assert np.isnan(p_values[4])
+
+    def test_fisher_confidence_intervals(self):
+        lower, upper = fisher_confidence_intervals(np.array([0.5, 0.0]), np.array([103, 3]))
+
+        margin = stats.norm.ppf(0.975) / 10
+        assert lower[0] == pytest.approx(np.tanh(np.arctanh(0.5) - margin))
+        assert upper[0] == pytest.approx(np.tanh(np.arctanh(0.5) + margin))
+        assert np.isnan(lower[1]) and np.isnan(upper[1])
+
+    def test_adjustments(self):
+        p = np.array([0.01, 0.04, 0.03, 0.005, np.nan])
+
+        np.testing.assert_allclose(adjust_p_values(p, "bonferroni")[:4], [0.04, 0.16, 0.12, 0.02])
+        np.testing.assert_allclose(adjust_p_values(p, "holm")[:4], [0.03, 0.06, 0.06, 0.02])
+        np.testing.assert_allclose(adjust_p_values(p, "fdr_bh")[:4], [0.02, 0.04, 0.04, 0.02])
+        np.testing.assert_allclose(adjust_p_values(p, "none")[:4], p[:4])
+        assert np.isnan(adjust_p_values(p)[4])
+
+    def test_unknown_adjustment(self):
+        with pytest.raises(ValueError, match="Unknown p-value adjustment"):
+            adjust_p_values(np.array([0.1]), "sidak")
+
+    def test_matrix_correction_counts_each_pair_once(self, samples):
+        corr = np.corrcoef(samples.T)
+        counts = np.full(corr.shape, len(samples))
+
+        result = matrix_significance(corr, counts, method="bonferroni")
+
+        raw = correlation_p_values(corr, counts)
+        # 4 assets -> 6 distinct pairs
+        assert result["adjusted_p_value"][0, 2] == pytest.approx(min(raw[0, 2] * 6, 1.0))
+        np.testing.assert_array_equal(result["p_value"], result["p_value"].T)
+        assert np.isnan(np.diag(result["p_value"])).all()
+        assert np.isnan(np.diag(result["ci_lower"])).all()
+        assert result["is_significant"][0, 3]
+        assert not result["is_significant"][0, 2]
+
+
+class TestPairwiseCorrelations:
+    """PortfolioAnalyticsService._calculate_correlations significance."""
+
+    def test_exact_p_value_and_rolling_metrics(self):
+        rng = np.random.default_rng(3)
+        closes1 = 100 * np.cumprod(1 + rng.normal(0, 0.01, 130))
+        closes2 = 100 * np.cumprod(1 + rng.normal(0, 0.01, 130))
+        frame1 = pd.DataFrame({"Close": closes1})
+        frame2 = pd.DataFrame({"Close": closes2})
+
+        metrics = PortfolioAnalyticsService(Mock())._calculate_correlations(frame1, frame2)
+
+        returns1 = frame1["Close"].pct_change().dropna()
+        returns2 = frame2["Close"].pct_change().dropna()
+        expected = stats.pearsonr(returns1, returns2)[1]
+        assert float(metrics["p_value"]) == pytest.approx(expected, abs=1e-6)
+        assert metrics["is_significant"] == (expected < 0.05)
+        assert "rolling_correlation_60d" in metrics
+        assert "rolling_correlation_20d" in metrics
@@ -0,0 +1,103 @@
+"""
+Unit tests for the GFS strategy horizons derived from one download.
+
+Tests cover:
+- from_market_data fetching daily bars once through the market data service
+- Grandfather, father and son RSI from monthly, weekly and daily resamples
+- Only the latest RSI value computed per horizon
+- The synchronous path downloading once for all three horizons
+- Missing price history
+"""
+
+from unittest.mock import AsyncMock, Mock, patch
+
+import numpy as np
+import pandas as pd
+import polars as pl
+import pytest
+
+from app.core.services.market_data_service import MarketDataService
+from utils.trading_strategies.gfs_strategy import GfsStrategy
+
+
+def _history(end="2024-06-28", years=5, seed=0):
+    """yfinance-shaped daily history."""
+    index = pd.bdate_range(
+        end=end, periods=years * 252, tz="America/New_York", name="Date"
+    )
+    close = 100 * np.cumprod(1 + np.random.default_rng(seed).normal(0, 0.01, len(index)))
+    return pd.DataFrame(
+        {"Open": close, "High": close, "Low": close, "Close": close, "Volume": 1_000},
+        index=index,
+    )
+
+
+def _frame(**kwargs):
+    return MarketDataService._to_frame(_history(**kwargs), include_index=True)
+
+
+def _last_rsi(closes):
+    return GfsStrategy("X").calculater_rsi(pl.DataFrame({"close": closes}))["rsi"][-1]
+
+
+class TestGfsHorizons:
+    """GfsStrategy horizons over a single daily history."""
+
+    @pytest.mark.asyncio
+    async def test_from_market_data_fetches_once(self):
+        market_data = Mock(fetch_ticker_frame=AsyncMock(return_value=_frame()))
+
+        with patch("yfinance.Ticker") as ticker:
+            strategy = await GfsStrategy.from_market_data("AAPL", market_data=market_data)
+            result = strategy.calculate_gfs()
+
+        ticker.assert_not_called()
+        market_data.fetch_ticker_frame.assert_awaited_once()
+        args, kwargs = market_data.fetch_ticker_frame.call_args
+        assert args == ("AAPL",)
+        assert kwargs["interval"] == "1d"
+        # A date range, so stored history can serve it
+        assert kwargs["start_date"] < kwargs["end_date"]
+        assert set(result) == {"grandfather", "father", "son", "recommendation"}
+
+    def test_horizons_are_resampled(self):
+        history = _history()
+        strategy = GfsStrategy("AAPL", history=_frame())
+
+        monthly = history["Close"].resample("MS").last()
+        weekly = history["Close"].loc[history.index > history.index[-1] - pd.DateOffset(years=1)]
+        weekly = weekly.resample("W-MON", label="left", closed="left").last()
+        daily = history["Close"].loc[history.index > history.index[-1] - pd.DateOffset(months=1)]
+
+        assert strategy.grandfather_rsi()["rsi"].item() == pytest.approx(
+            _last_rsi(monthly.tolist())
+        )
+        assert strategy.father_rsi()["rsi"].item() == pytest.approx(
+            _last_rsi(weekly.tolist())
+        )
+        assert strategy.son_rsi()["rsi"].item() == pytest.approx(_last_rsi(daily.tolist()))
+
+    def test_only_latest_value_is_returned(self):
+        strategy = GfsStrategy("AAPL", history=_frame())
+
+        for horizon in (strategy.grandfather_rsi, strategy.father_rsi, strategy.son_rsi):
+            result = horizon()
+            assert result.shape == (1, 1)
+            assert 0 <= result["rsi"].item() <= 100
+
+    def test_sync_path_downloads_once(self):
+        ticker = Mock()
+        ticker.history.return_value = _history()
+
+        with patch("yfinance.Ticker", return_value=ticker) as ticker_cls:
+            result = GfsStrategy("AAPL").calculate_gfs()
+
+        ticker_cls.assert_called_once_with("AAPL")
+        ticker.history.assert_called_once_with(period="5y", interval="1d")
+        assert all(0 <= result[key] <= 100 for key in ("grandfather", "father", "son"))
+
+    def test_missing_history(self):
+        strategy = GfsStrategy("NONE", history=pl.DataFrame())
+
+        with pytest.raises(ValueError, match="No price data found"):
+            strategy.calculate_gfs()
@@ -0,0 +1,208 @@
+"""
+Unit tests for PortfolioAnalyticsService.generate_historical_performance_snapshots.
+
+Tests cover:
+- Forward-filled daily values and cost-basis fallback before the first close
+- One bulk INSERT for the whole range, without per-row refresh
+- Regenerating a range updates stored values, keeping risk columns and
+  snapshots the backfill does not write
+- Runtime of a five-year backfill for a 50-asset portfolio
+"""
+
+import time
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+
+import numpy as np
+import pandas as pd
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from sqlalchemy.schema import CreateTable
+
+from app.core.database.models.portfolio_analytics import PortfolioPerformanceHistory
+from app.core.services.portfolio_analytics_service import PortfolioAnalyticsService
+
+START_DATE = datetime(2024, 1, 1, 16, tzinfo=timezone.utc)
+
+
+def _portfolio_asset(asset_id, quantity, cost_basis):
+    return SimpleNamespace(
+        asset=SimpleNamespace(id=asset_id, symbol=f"SYM{asset_id}"),
+        quantity=Decimal(str(quantity)),
+        cost_basis_total=Decimal(str(cost_basis)),
+    )
+
+
+def _history(dates, closes):
+    return pd.DataFrame(
+        {"Date": pd.DatetimeIndex(dates, tz="America/New_York"), "Close": closes}
+    )
+
+
+@pytest.fixture
+def session():
+    engine = create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+
+    # SQLite has no now(); swap the server default for its equivalent
+    ddl = str(CreateTable(PortfolioPerformanceHistory.__table__).compile(engine))
+    with engine.begin() as connection:
+        connection.exec_driver_sql(
+            ddl.replace("DEFAULT now()", "DEFAULT CURRENT_TIMESTAMP")
+        )
+    db = sessionmaker(bind=engine)()
+    yield db
+    db.close()
+
+
+def _service(session, portfolio_assets, histories):
+    service = PortfolioAnalyticsService(session)
+    query = patch.object(session, "query").start()
+    query.return_value.filter.return_value.all.return_value = portfolio_assets
+    fetch = AsyncMock(
+        side_effect=lambda symbol, **kwargs: histories[symbol].copy()
+    )
+    patch(
+        "app.core.services.portfolio_analytics_service.market_data_service.fetch_ticker_data",
+        fetch,
+    ).start()
+    return service
+
+
+class TestHistoricalPerformanceSnapshots:
+    """Test suite for historical snapshot generation."""
+
+    @pytest.fixture(autouse=True)
+    def _stop_patches(self):
+        yield
+        patch.stopall()
+
+    @pytest.mark.asyncio
+    async def test_values_forward_fill_and_fall_back_to_cost_basis(self, session):
+        assets = [_portfolio_asset(1, 10, 900.0), _portfolio_asset(2, 5, 400.0)]
+        histories = {
+            # Friday and Monday closes; the weekend carries Friday's close
+            "SYM1": _history(["2024-01-05", "2024-01-08"], [100.0, 110.0]),
+            # No close until Jan 3: carried at cost basis before that
+            "SYM2": _history(["2024-01-03"], [90.0]),
+        }
+        service = _service(session, assets, histories)
+
+        snapshots = await service.generate_historical_performance_snapshots(
+            1, START_DATE, START_DATE + timedelta(days=7)
+        )
+
+        values = [float(s.total_value) for s in snapshots]
+        # Jan 1-4: SYM1 has no close yet -> cost basis 900
+        assert values == [
+            900 + 400,
+            900 + 400,
+            900 + 450,
+            900 + 450,
+            1000 + 450,
+            1000 + 450,
+            1000 + 450,
+            1100 + 450,
+        ]
+        assert all(s.id is not None for s in snapshots)
+        assert snapshots[0].snapshot_date.replace(tzinfo=None) == START_DATE.replace(
+            tzinfo=None
+        )
+        assert float(snapshots[-1].total_unrealized_pnl) == pytest.approx(250.0)
+        assert float(snapshots[-1].total_unrealized_pnl_percent) == pytest.approx(
+            250.0 / 1300 * 100, abs=1e-4
+        )
+        stored = session.execute(PortfolioPerformanceHistory.__table__.select()).all()
+        assert len(stored) == 8
+
+    @pytest.mark.asyncio
+    async def test_snapshots_are_written_with_one_insert(self, session):
+        assets = [_portfolio_asset(1, 1, 100.0)]
+        histories = {"SYM1": _history(pd.bdate_range("2024-01-01", "2024-03-01"), 1.0)}
+        service = _service(session, assets, histories)
+        statements = []
+        event.listen(
+            session.get_bind(),
+            "before_cursor_execute",
+            lambda *args: statements.append(args[2]),
+        )
+
+        with patch.object(session, "refresh") as refresh:
+            snapshots = await service.generate_historical_performance_snapshots(
+                1, START_DATE, START_DATE + timedelta(days=59)
+            )
+
+        assert len(snapshots) == 60
+        inserts = [s for s in statements if s.lstrip().upper().startswith("INSERT")]
+        assert len(inserts) == 1
+        refresh.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_regenerating_keeps_risk_columns_and_other_snapshots(self, session):
+        assets = [_portfolio_asset(1, 1, 100.0)]
+        histories = {"SYM1": _history(["2024-01-01"], 1.0)}
+        service = _service(session, assets, histories)
+        end_date = START_DATE + timedelta(days=9)
+
+        await service.generate_historical_performance_snapshots(1, START_DATE, end_date)
+        # Snapshots from create_performance_snapshot, one at a backfilled time
+        stored = session.get(PortfolioPerformanceHistory, 1)
+        stored.sharpe_ratio = Decimal("1.5")
+        intraday = START_DATE + timedelta(hours=3)
+        session.add(
+            PortfolioPerformanceHistory(
+                portfolio_id=1,
+                snapshot_date=intraday,
+                total_value=5,
+                total_cost_basis=100,
+                total_unrealized_pnl=-95,
+                total_unrealized_pnl_percent=-95,
+                volatility=Decimal("0.2"),
+            )
+        )
+        session.commit()
+
+        histories["SYM1"] = _history(["2024-01-01"], 2.0)
+        snapshots = await service.generate_historical_performance_snapshots(
+            1, START_DATE, end_date
+        )
+
+        assert len(snapshots) == 10
+        rows = session.execute(
+            PortfolioPerformanceHistory.__table__.select().order_by(
+                PortfolioPerformanceHistory.snapshot_date
+            )
+        ).all()
+        assert len(rows) == 11
+        assert float(rows[0].total_value) == 2.0
+        assert float(rows[0].sharpe_ratio) == 1.5
+        assert float(rows[1].total_value) == 5.0
+        assert float(rows[1].volatility) == 0.2
+        assert {float(row.total_value) for row in rows[2:]} == {2.0}
+
+    @pytest.mark.asyncio
+    async def test_five_year_backfill_for_fifty_assets(self, session):
+        rng = np.random.default_rng(3)
+        dates = pd.bdate_range("2019-01-01", "2024-01-01")
+        assets = [_portfolio_asset(i, 10, 1000.0) for i in range(1, 51)]
+        histories = {
+            f"SYM{i}": _history(dates, 100 + rng.normal(0, 1, len(dates)).cumsum())
+            for i in range(1, 51)
+        }
+        service = _service(session, assets, histories)
+
+        started = time.process_time()
+        snapshots = await service.generate_historical_performance_snapshots(
+            1,
+            datetime(2019, 1, 1, tzinfo=timezone.utc),
+            datetime(2024, 1, 1, tzinfo=timezone.utc),
+        )
+        elapsed = time.process_time() - started
+
+        assert len(snapshots) == 1827
+        assert elapsed < 1.0
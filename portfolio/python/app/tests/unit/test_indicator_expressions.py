@@ -0,0 +1,118 @@
+"""
+Unit tests for the expression-based indicator API and the single lazy plan.
+
+Tests cover:
+- Every registered indicator having a `*_expressions` counterpart
+- Expressions evaluated lazily matching the eager indicator methods
+- calculate_indicators materializing one plan across all indicator classes
+- Per-configuration errors for missing columns and bad parameters
+"""
+
+from unittest.mock import Mock, patch
+
+import numpy as np
+import pandas as pd
+import polars as pl
+import pytest
+
+from app.core.schemas.statistical_indicators import IndicatorConfiguration
+from app.core.services.indicator_registry_service import IndicatorRegistryService
+from app.core.services.indicator_state_store import IndicatorStateStore
+
+REGISTRY = IndicatorRegistryService(Mock(), state_store=IndicatorStateStore())
+INDICATOR_NAMES = sorted(d.name for d in REGISTRY.get_available_indicators())
+
+
+def _history(n_bars=300, seed=3):
+    # Same shape as MarketDataService.fetch_ticker_data, in date order
+    rng = np.random.default_rng(seed)
+    close = 100 * np.cumprod(1 + rng.normal(0, 0.02, n_bars))
+    return pd.DataFrame(
+        {
+            "Date": pd.date_range("2015-01-01", periods=n_bars, freq="D"),
+            "Open": close * (1 + rng.normal(0, 0.005, n_bars)),
+            "High": close * (1 + rng.uniform(0, 0.02, n_bars)),
+            "Low": close * (1 - rng.uniform(0, 0.02, n_bars)),
+            "Close": close,
+            "Volume": rng.integers(1_000, 100_000, n_bars),
+        }
+    )
+
+
+class TestIndicatorExpressions:
+    """`*_expressions` against the eager `*_indicator` methods."""
+
+    @pytest.mark.parametrize("fillna", [False, True])
+    @pytest.mark.parametrize("indicator_name", INDICATOR_NAMES)
+    def test_lazy_matches_eager(self, indicator_name, fillna):
+        indicator_def = REGISTRY.get_indicator_definition(indicator_name)
+        indicator_class = REGISTRY._indicator_classes[indicator_def.class_name]
+        df = indicator_class(_history()).df
+
+        eager = getattr(indicator_class(df.clone()), indicator_name)(fillna=fillna)
+        outputs = REGISTRY._expression_method(indicator_def)(fillna=fillna)
+        lazy = df.lazy().with_columns(list(outputs.values())).collect()
+
+        assert sorted(outputs) == sorted(indicator_def.output_columns)
+        for column in outputs:
+            assert lazy[column].dtype == eager[column].dtype
+            assert lazy[column].equals(eager[column], null_equal=True)
+
+
+class TestSinglePlan:
+    """IndicatorRegistryService.calculate_indicators."""
+
+    @staticmethod
+    def _configs():
+        return [
+            IndicatorConfiguration(id=f"c{i}", indicator_name=name, parameters={})
+            for i, name in enumerate(INDICATOR_NAMES)
+        ]
+
+    def test_all_classes_in_one_materialization(self):
+        collect = pl.LazyFrame.collect
+        with patch.object(
+            pl.LazyFrame, "collect", autospec=True, side_effect=collect
+        ) as collect_calls:
+            result, errors, metrics = REGISTRY.calculate_indicators(
+                _history(), self._configs()
+            )
+
+        assert errors == []
+        assert collect_calls.call_count == 1
+        assert metrics.success_rate == 1.0
+        for config in self._configs():
+            indicator_def = REGISTRY.get_indicator_definition(config.indicator_name)
+            for column in indicator_def.output_columns:
+                assert f"{column}_{config.id}" in result.columns
+        assert {"Close", "close", "date"} <= set(result.columns)
+
+    def test_matches_eager_method(self):
+        config = IndicatorConfiguration(
+            id="macd", indicator_name="macd_indicator", parameters={"window_fast": 5}
+        )
+
+        result, _, _ = REGISTRY.calculate_indicators(_history(), [config])
+
+        eager = REGISTRY._indicator_classes["TrendIndicators"](_history()).macd_indicator(
+            window_fast=5
+        )
+        assert result["signal_macd"].alias("signal").equals(eager["signal"], null_equal=True)
+
+    def test_errors_are_reported_per_configuration(self):
+        history = _history().drop(columns=["Volume"])
+        configs = [
+            IndicatorConfiguration(id="rsi", indicator_name="rsi_indicator", parameters={}),
+            IndicatorConfiguration(id="obv", indicator_name="obv_indicator", parameters={}),
+            IndicatorConfiguration(
+                id="roc", indicator_name="roc_indicator", parameters={"span": 3}
+            ),
+        ]
+
+        result, errors, _ = REGISTRY.calculate_indicators(history, configs)
+
+        by_indicator = {e.indicator_name: e for e in errors}
+        assert sorted(by_indicator) == ["obv_indicator", "roc_indicator"]
+        assert "Missing required columns" in by_indicator["obv_indicator"].error_message
+        assert "rsi_rsi" in result.columns
+        assert not any(col.endswith(("_obv", "_roc")) for col in result.columns)
@@ -0,0 +1,145 @@
+"""
+Unit tests for the columnar MACD strategy signals.
+
+Tests cover:
+- Buy/Sell calls and price differences matching the original row-by-row loop
+- Python-style (half to even) rounding of the intersection check
+- Signals computed without a pandas round trip
+- Stacked symbols handled independently with `by`
+- Scanning a 500-symbol, 10-year daily universe
+"""
+
+import time
+from unittest.mock import patch
+
+import numpy as np
+import polars as pl
+import pytest
+
+from utils.trading_strategies.macd_strategy import MACDStrategy
+
+SIGNAL_COLUMNS = ["MACD_EMA", "MACD_buy_or_sell", "MACD_price_difference"]
+
+
+def _prices(n_bars=2520, seed=3, symbol=None):
+    rng = np.random.default_rng(seed)
+    close = 100 * np.cumprod(1 + rng.normal(0, 0.02, n_bars))
+    frame = pl.DataFrame({"Close": close}).with_columns(
+        (pl.col("Close").ewm_mean(span=12) - pl.col("Close").ewm_mean(span=26)).alias("MACD")
+    ).with_columns(
+        pl.col("MACD").ewm_mean(span=9).alias("Signal"),
+    ).with_columns(
+        (pl.col("MACD") - pl.col("Signal")).alias("Histogram"),
+    )
+    if symbol is not None:
+        frame = frame.select(pl.lit(symbol).alias("symbol"), pl.all())
+    return frame
+
+
+def _reference(close, macd, signal, ema, condition_days=10):
+    """Row-by-row port of the original pandas implementation."""
+    calls = [int(round(m) == round(s)) for m, s in zip(macd, signal)]
+    for i in range(len(calls)):
+        if i > 26 and calls[i] == 1:
+            states = []
+            for m, s in zip(macd[i - condition_days:i], signal[i - condition_days:i]):
+                if m < s and m < 0 and s < 0:
+                    states.append(True)
+                elif m > s and m > 0 and s > 0:
+                    states.append(False)
+            c = all(state is True for state in states) or all(
+                state is False for state in states
+            )
+            if len(states) == condition_days:
+                if c and macd[i] <= signal[i] < 0 and close[i] >= ema[i]:
+                    continue
+                elif c and macd[i] >= signal[i] > 0 and close[i] <= ema[i]:
+                    calls[i] = -1
+            else:
+                calls[i] = 0
+
+    differences = [None] * len(calls)
+    ith_row = None
+    for i, call in enumerate(calls):
+        if call == 1:
+            if not ith_row:
+                ith_row = i
+            else:
+                differences[i] = close[i] - close[ith_row]
+                ith_row = i
+
+    buy_or_sell = [abs(call) * m or None for call, m in zip(calls, macd)]
+    return buy_or_sell, differences
+
+
+def _assert_close(actual, expected):
+    assert [value is None for value in actual] == [value is None for value in expected]
+    assert [value for value in actual if value is not None] == pytest.approx(
+        [value for value in expected if value is not None]
+    )
+
+
+class TestMACDStrategySignals:
+    """MACDStrategy.buy_sell_strategy."""
+
+    @pytest.mark.parametrize("condition_days", [0, 3, 10])
+    def test_matches_row_by_row_loop(self, condition_days):
+        df = _prices()
+
+        result = MACDStrategy(df).buy_sell_strategy(condition_days=condition_days)
+
+        expected_calls, expected_differences = _reference(
+            df["Close"].to_list(), df["MACD"].to_list(), df["Signal"].to_list(),
+            result["MACD_EMA"].to_list(), condition_days=condition_days,
+        )
+        assert result.columns == df.columns + SIGNAL_COLUMNS
+        _assert_close(result["MACD_buy_or_sell"].to_list(), expected_calls)
+        _assert_close(result["MACD_price_difference"].to_list(), expected_differences)
+        assert result["MACD_buy_or_sell"].null_count() < len(df)
+
+    def test_intersection_rounds_half_to_even(self):
+        df = pl.DataFrame(
+            {
+                "MACD": [0.5, 1.5, 2.5, -0.5, None],
+                "Signal": [0.0, 2.0, 3.0, 0.0, 0.0],
+            }
+        )
+
+        result = df.select(
+            MACDStrategy._find_intersection(pl.col("MACD"), pl.col("Signal"))
+        ).to_series()
+
+        assert result.to_list() == [1, 1, 0, 1, 0]
+
+    def test_no_pandas_round_trip(self):
+        df = _prices(n_bars=300)
+
+        with patch.object(pl.DataFrame, "to_pandas", side_effect=AssertionError), \
+                patch.object(pl, "from_pandas", side_effect=AssertionError):
+            result = MACDStrategy(df).buy_sell_strategy()
+
+        assert len(result) == 300
+
+    def test_stacked_symbols_match_single_runs(self):
+        frames = [_prices(n_bars=600, seed=seed, symbol=f"S{seed}") for seed in range(3)]
+
+        stacked = MACDStrategy(pl.concat(frames)).buy_sell_strategy(by="symbol")
+
+        for frame in frames:
+            single = MACDStrategy(frame).buy_sell_strategy()
+            symbol = frame["symbol"][0]
+            part = stacked.filter(pl.col("symbol") == symbol)
+            for column in SIGNAL_COLUMNS:
+                assert part[column].equals(single[column], null_equal=True), column
+
+    def test_universe_scan_is_fast(self):
+        universe = pl.concat(
+            [_prices(seed=seed, symbol=f"S{seed}") for seed in range(500)]
+        )
+
+        start = time.process_time()
+        result = MACDStrategy(universe).buy_sell_strategy(by="symbol")
+        elapsed = time.process_time() - start
+
+        assert len(result) == 500 * 2520
+        assert elapsed < 5
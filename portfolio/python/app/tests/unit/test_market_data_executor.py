@@ -0,0 +1,217 @@
+"""
+Unit tests for MarketDataExecutor and the non-blocking MarketDataService.
+
+Tests cover:
+- Timeouts and the concurrency cap of the executor, including the wait to start
+- MarketDataService running yfinance calls off the event loop
+- Event loop latency of unrelated endpoints while history fetches are in flight
+"""
+
+import asyncio
+import threading
+import time
+from unittest.mock import Mock, patch
+
+import numpy as np
+import pandas as pd
+import pytest
+from httpx import ASGITransport, AsyncClient
+
+from app.core.services.market_data_executor import (
+    MarketDataExecutor,
+    MarketDataTimeoutError,
+)
+from app.core.services.market_data_service import MarketDataService
+
+
+def _slow_ticker(delay: float) -> Mock:
+    """Build a yf.Ticker replacement whose history() blocks for `delay` seconds."""
+
+    def history(*args, **kwargs):
+        time.sleep(delay)
+        index = pd.date_range("2024-01-01", periods=5, freq="D", name="Date")
+        return pd.DataFrame(
+            {
+                "Open": 1.0,
+                "High": 1.0,
+                "Low": 1.0,
+                "Close": 1.0,
+                "Volume": 100,
+            },
+            index=index,
+        )
+
+    ticker = Mock()
+    ticker.history.side_effect = history
+    return ticker
+
+
+class TestMarketDataExecutor:
+    """Test suite for MarketDataExecutor."""
+
+    @pytest.mark.asyncio
+    async def test_run_returns_result(self):
+        executor = MarketDataExecutor(max_workers=2, timeout=1, max_concurrency=2)
+        try:
+            assert await executor.run(lambda a, b: a + b, 1, b=2) == 3
+        finally:
+            executor.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_run_raises_on_timeout(self):
+        executor = MarketDataExecutor(max_workers=1, timeout=0.05, max_concurrency=1)
+        try:
+            with pytest.raises(MarketDataTimeoutError):
+                await executor.run(time.sleep, 0.5)
+        finally:
+            executor.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_concurrency_cap(self):
+        executor = MarketDataExecutor(max_workers=8, timeout=5, max_concurrency=3)
+        lock = threading.Lock()
+        state = {"running": 0, "peak": 0}
+
+        def work():
+            with lock:
+                state["running"] += 1
+                state["peak"] = max(state["peak"], state["running"])
+            time.sleep(0.02)
+            with lock:
+                state["running"] -= 1
+
+        try:
+            await asyncio.gather(*(executor.run(work) for _ in range(12)))
+        finally:
+            executor.shutdown()
+
+        assert state["peak"] == 3
+
+    @pytest.mark.asyncio
+    async def test_timed_out_call_keeps_its_slot(self):
+        executor = MarketDataExecutor(max_workers=4, timeout=0.05, max_concurrency=1)
+        lock = threading.Lock()
+        state = {"running": 0, "peak": 0}
+
+        def work(delay):
+            with lock:
+                state["running"] += 1
+                state["peak"] = max(state["peak"], state["running"])
+            time.sleep(delay)
+            with lock:
+                state["running"] -= 1
+
+        try:
+            with pytest.raises(MarketDataTimeoutError):
+                await executor.run(work, 0.5)
+            # The timed-out thread is still busy, so this call has to wait for it
+            await executor.run(work, 0.01, timeout=1)
+        finally:
+            executor.shutdown()
+
+        assert state["peak"] == 1
+
+    @pytest.mark.asyncio
+    async def test_queue_wait_does_not_count_against_timeout(self):
+        executor = MarketDataExecutor(max_workers=1, timeout=0.3, max_concurrency=2)
+        try:
+            # The second call queues for ~0.2s behind the first, then runs 0.2s
+            await asyncio.gather(
+                executor.run(time.sleep, 0.2), executor.run(time.sleep, 0.2)
+            )
+        finally:
+            executor.shutdown()
+
+
+    @pytest.mark.asyncio
+    async def test_waiting_for_a_slot_times_out(self):
+        executor = MarketDataExecutor(max_workers=2, timeout=0.1, max_concurrency=1)
+        try:
+            with pytest.raises(MarketDataTimeoutError):
+                await executor.run(time.sleep, 0.5)
+            started = time.perf_counter()
+            # The only slot is held by the timed-out call for another ~0.4s
+            with pytest.raises(MarketDataTimeoutError, match="waiting for a slot"):
+                await executor.run(time.sleep, 0)
+            assert time.perf_counter() - started < 0.3
+        finally:
+            executor.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_waiting_for_a_worker_times_out(self):
+        executor = MarketDataExecutor(max_workers=1, timeout=0.1, max_concurrency=2)
+        ran = []
+        try:
+            first = asyncio.create_task(executor.run(time.sleep, 0.5))
+            await asyncio.sleep(0.01)
+            with pytest.raises(MarketDataTimeoutError, match="waiting for a worker"):
+                await executor.run(ran.append, "queued")
+            with pytest.raises(MarketDataTimeoutError):
+                await first
+            # The queued call was withdrawn and its slot freed
+            assert await executor.run(lambda: "free", timeout=1) == "free"
+            assert ran == []
+        finally:
+            executor.shutdown()
+
+
+class TestNonBlockingMarketDataService:
+    """MarketDataService must not block the event loop on yfinance calls."""
+
+    @pytest.fixture
+    def service(self):
+        executor = MarketDataExecutor(max_workers=50, timeout=10, max_concurrency=50)
+        yield MarketDataService(executor=executor)
+        executor.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_fetch_ticker_data_runs_off_loop(self, service):
+        with patch(
+            "app.core.services.market_data_service.yf.Ticker",
+            return_value=_slow_ticker(0.2),
+        ):
+            started = time.perf_counter()
+            results = await asyncio.gather(
+                *(service.fetch_ticker_data(f"SYM{i}") for i in range(10))
+            )
+            elapsed = time.perf_counter() - started
+
+        assert all(len(df) == 5 for df in results)
+        # Ten 0.2s fetches in parallel, not 2s in sequence
+        assert elapsed < 1.0
+
+    @pytest.mark.slow
+    @pytest.mark.asyncio
+    async def test_health_p99_flat_under_history_load(self, service):
+        """p99 of /api/v1/health stays flat while 50 history fetches are in flight."""
+        from app.main import app
+
+        async def p99_latency(client: AsyncClient, samples: int = 50) -> float:
+            latencies = []
+            for _ in range(samples):
+                started = time.perf_counter()
+                response = await client.get("/api/v1/health")
+                latencies.append(time.perf_counter() - started)
+                assert response.status_code == 200
+            return float(np.percentile(latencies, 99))
+
+        transport = ASGITransport(app=app)
+        async with AsyncClient(transport=transport, base_url="http://test") as client:
+            idle_p99 = await p99_latency(client)
+
+            with patch(
+                "app.core.services.market_data_service.yf.Ticker",
+                return_value=_slow_ticker(0.5),
+            ):
+                fetches = [
+                    asyncio.create_task(service.fetch_ticker_data(f"SYM{i}"))
+                    for i in range(50)
+                ]
+                await asyncio.sleep(0.01)
+                loaded_p99 = await p99_latency(client)
+                in_flight = sum(not task.done() for task in fetches)
+                await asyncio.gather(*fetches)
+
+        assert in_flight > 0
+        # A blocking fetch would hold the loop for 0.5s per call
+        assert loaded_p99 < max(idle_p99 * 5, 0.05)
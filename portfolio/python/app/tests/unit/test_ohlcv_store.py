@@ -0,0 +1,175 @@
+"""
+Unit tests for the OHLCV store and cached MarketDataService history.
+
+Tests cover:
+- Parquet round trips and merging of appended bars
+- Full download on a cold cache, no upstream call on a fresh one
+- Incremental top-up of stale history
+- Full reload after corporate actions
+- Date-range slicing from stored history
+"""
+
+from unittest.mock import Mock, patch
+
+import pandas as pd
+import pytest
+
+from app.core.services.market_data_executor import MarketDataExecutor
+from app.core.services.market_data_service import MarketDataService
+from app.core.services.ohlcv_store import OHLCVStore
+
+
+def _bars(start: str, periods: int, close: float = 100.0, **extra) -> pd.DataFrame:
+    """yfinance-shaped history with a tz-aware Date index."""
+    index = pd.date_range(
+        start, periods=periods, freq="D", tz="America/New_York", name="Date"
+    )
+    data = pd.DataFrame(
+        {
+            "Open": close,
+            "High": close,
+            "Low": close,
+            "Close": [close + i for i in range(periods)],
+            "Volume": 1000,
+            "Dividends": 0.0,
+            "Stock Splits": 0.0,
+        },
+        index=index,
+    )
+    for column, value in extra.items():
+        data[column] = value
+    return data
+
+
+class TestOHLCVStore:
+    """Test suite for OHLCVStore."""
+
+    @pytest.fixture
+    def store(self, tmp_path):
+        return OHLCVStore(root=str(tmp_path), refresh_seconds=900, enabled=True)
+
+    def test_save_and_load_round_trip(self, store):
+        data = _bars("2024-01-01", 5).reset_index()
+        store.save("AAPL", "1d", data)
+
+        loaded = store.load("aapl", "1d")
+
+        assert loaded is not None
+        pd.testing.assert_frame_equal(loaded, data)
+
+    def test_load_missing_returns_none(self, store):
+        assert store.load("MSFT", "1d") is None
+
+    def test_append_replaces_overlapping_bars(self, store):
+        stored = _bars("2024-01-01", 5).reset_index()
+        new_bars = _bars("2024-01-05", 3, close=200.0).reset_index()
+
+        merged = store.append("AAPL", "1d", stored, new_bars)
+
+        assert len(merged) == 7
+        assert merged["Close"].iloc[4] == 200.0
+        assert merged["Date"].is_monotonic_increasing
+        assert len(store.load("AAPL", "1d")) == 7
+
+    def test_supports_only_daily_and_longer(self, store):
+        assert store.supports("1d")
+        assert store.supports("1wk")
+        assert not store.supports("1m")
+        assert not OHLCVStore(enabled=False).supports("1d")
+
+
+class TestCachedFetchTickerData:
+    """fetch_ticker_data served from the OHLCV store."""
+
+    @pytest.fixture
+    def executor(self):
+        executor = MarketDataExecutor(max_workers=2, timeout=5, max_concurrency=2)
+        yield executor
+        executor.shutdown()
+
+    @pytest.fixture
+    def store(self, tmp_path):
+        return OHLCVStore(root=str(tmp_path), refresh_seconds=900, enabled=True)
+
+    @pytest.fixture
+    def service(self, executor, store):
+        return MarketDataService(executor=executor, store=store)
+
+    @pytest.mark.asyncio
+    async def test_cold_cache_downloads_full_history_once(self, service):
+        ticker = Mock()
+        ticker.history.return_value = _bars("2024-01-01", 10)
+
+        with patch(
+            "app.core.services.market_data_service.yf.Ticker", return_value=ticker
+        ):
+            first = await service.fetch_ticker_data("AAPL", period="max")
+            second = await service.fetch_ticker_data("AAPL", period="max")
+
+        assert ticker.history.call_count == 1
+        ticker.history.assert_called_with(period="max", interval="1d")
+        assert len(first) == len(second) == 10
+        # Most recent first, as before
+        assert first["Date"].iloc[0] > first["Date"].iloc[-1]
+
+    @pytest.mark.asyncio
+    async def test_stale_cache_only_fetches_new_bars(self, service, store):
+        store.save("AAPL", "1d", _bars("2024-01-01", 10).reset_index())
+        store.refresh_seconds = 0
+        ticker = Mock()
+        ticker.history.return_value = _bars("2024-01-10", 3, close=300.0)
+
+        with patch(
+            "app.core.services.market_data_service.yf.Ticker", return_value=ticker
+        ):
+            data = await service.fetch_ticker_data("AAPL", period="max")
+
+        ticker.history.assert_called_once_with(start="2024-01-10", interval="1d")
+        assert len(data) == 12
+        assert len(store.load("AAPL", "1d")) == 12
+
+    @pytest.mark.asyncio
+    async def test_corporate_action_reloads_full_history(self, service, store):
+        store.save("AAPL", "1d", _bars("2024-01-01", 10).reset_index())
+        store.refresh_seconds = 0
+        ticker = Mock()
+        ticker.history.side_effect = [
+            _bars("2024-01-10", 3, **{"Stock Splits": 2.0}),
+            _bars("2024-01-01", 12, close=50.0),
+        ]
+
+        with patch(
+            "app.core.services.market_data_service.yf.Ticker", return_value=ticker
+        ):
+            data = await service.fetch_ticker_data("AAPL", period="max")
+
+        assert ticker.history.call_count == 2
+        assert ticker.history.call_args.kwargs == {"period": "max", "interval": "1d"}
+        assert len(data) == 12
+        assert data["Close"].min() == 50.0
+
+    @pytest.mark.asyncio
+    async def test_date_range_is_sliced_from_store(self, service, store):
+        store.save("AAPL", "1d", _bars("2024-01-01", 31).reset_index())
+
+        with patch("app.core.services.market_data_service.yf.Ticker") as ticker_cls:
+            data = await service.fetch_ticker_data(
+                "AAPL", start_date="2024-01-10", end_date="2024-01-20"
+            )
+
+        ticker_cls.assert_not_called()
+        assert len(data) == 10
+        assert data["Date"].min().strftime("%Y-%m-%d") == "2024-01-10"
+        assert data["Date"].max().strftime("%Y-%m-%d") == "2024-01-19"
+
+    @pytest.mark.asyncio
+    async def test_intraday_bypasses_store(self, service, store):
+        ticker = Mock()
+        ticker.history.return_value = _bars("2024-01-01", 3)
+
+        with patch(
+            "app.core.services.market_data_service.yf.Ticker", return_value=ticker
+        ):
+            await service.fetch_ticker_data("AAPL", period="5d", interval="1m")
+
+        assert store.load("AAPL", "1m") is None
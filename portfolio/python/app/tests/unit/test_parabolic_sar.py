@@ -0,0 +1,204 @@
+"""
+Unit tests for the Parabolic SAR indicator.
+
+Tests cover:
+- psar_indicator matching a direct port of the reference recursion
+- Trend-start flags and seed bars
+- Bars with missing prices being skipped
+- The recursion running once for all five outputs of a lazy plan
+- PSAR configurations through the indicator registry
+"""
+
+from unittest.mock import Mock, patch
+
+import numpy as np
+import polars as pl
+import pytest
+
+from app.core.schemas.statistical_indicators import IndicatorConfiguration
+from app.core.services.indicator_registry_service import IndicatorRegistryService
+from app.core.services.indicator_state_store import IndicatorStateStore
+from utils.indicators import parabolic_sar
+from utils.indicators.trend_indicators import TrendIndicators
+
+OUTPUTS = ["psar", "psar_down", "psar_down_indicator", "psar_up", "psar_up_indicator"]
+
+
+def _ohlc(n_bars=500, seed=7):
+    rng = np.random.default_rng(seed)
+    close = 100 * np.cumprod(1 + rng.normal(0, 0.02, n_bars))
+    return pl.DataFrame(
+        {
+            "high": close * (1 + rng.uniform(0, 0.02, n_bars)),
+            "low": close * (1 - rng.uniform(0, 0.02, n_bars)),
+            "close": close,
+        }
+    )
+
+
+def _reference(high, low, close, step=0.02, max_step=0.2):
+    """Line-by-line port of the ta package's PSARIndicator loop."""
+    up_trend = True
+    acceleration_factor = step
+    up_trend_high = high[0]
+    down_trend_low = low[0]
+    psar = list(close)
+    psar_up = [None] * len(close)
+    psar_down = [None] * len(close)
+
+    for i in range(2, len(close)):
+        reversal = False
+        max_high = high[i]
+        min_low = low[i]
+        if up_trend:
+            psar[i] = psar[i - 1] + acceleration_factor * (up_trend_high - psar[i - 1])
+            if min_low < psar[i]:
+                reversal = True
+                psar[i] = up_trend_high
+                down_trend_low = min_low
+                acceleration_factor = step
+            else:
+                if max_high > up_trend_high:
+                    up_trend_high = max_high
+                    acceleration_factor = min(acceleration_factor + step, max_step)
+                if low[i - 2] < psar[i]:
+                    psar[i] = low[i - 2]
+                elif low[i - 1] < psar[i]:
+                    psar[i] = low[i - 1]
+        else:
+            psar[i] = psar[i - 1] - acceleration_factor * (psar[i - 1] - down_trend_low)
+            if max_high > psar[i]:
+                reversal = True
+                psar[i] = down_trend_low
+                up_trend_high = max_high
+                acceleration_factor = step
+            else:
+                if min_low < down_trend_low:
+                    down_trend_low = min_low
+                    acceleration_factor = min(acceleration_factor + step, max_step)
+                if high[i - 2] > psar[i]:
+                    psar[i] = high[i - 2]
+                elif high[i - 1] > psar[i]:
+                    psar[i] = high[i - 1]
+
+        up_trend = up_trend != reversal
+        if up_trend:
+            psar_up[i] = psar[i]
+        else:
+            psar_down[i] = psar[i]
+
+    def starts(values):
+        return [
+            int(value is not None and (i == 0 or values[i - 1] is None))
+            for i, value in enumerate(values)
+        ]
+
+    return {
+        "psar": psar,
+        "psar_down": psar_down,
+        "psar_down_indicator": starts(psar_down),
+        "psar_up": psar_up,
+        "psar_up_indicator": starts(psar_up),
+    }
+
+
+class TestPSARIndicator:
+    """TrendIndicators.psar_indicator."""
+
+    @pytest.mark.parametrize("step, max_step", [(0.02, 0.2), (0.01, 0.1), (0.05, 0.5)])
+    def test_matches_reference(self, step, max_step):
+        df = _ohlc()
+
+        result = TrendIndicators(df).psar_indicator(step=step, max_step=max_step)
+
+        expected = _reference(
+            df["high"].to_list(), df["low"].to_list(), df["close"].to_list(),
+            step=step, max_step=max_step,
+        )
+        for column in OUTPUTS:
+            assert result[column].to_list() == pytest.approx(expected[column]), column
+        # Both directions occur in a random walk of this length
+        assert result["psar_up_indicator"].sum() > 1
+        assert result["psar_down_indicator"].sum() > 1
+
+    def test_seed_bars(self):
+        high = [10.0, 11.0, 12.0, 13.0, 14.0]
+        df = pl.DataFrame(
+            {
+                "high": high,
+                "low": [value - 1 for value in high],
+                "close": [value - 0.5 for value in high],
+            }
+        )
+
+        result = TrendIndicators(df).psar_indicator()
+
+        assert result["psar"].to_list()[:2] == [9.5, 10.5]
+        assert result["psar_up"].to_list()[:3] == [None, None, 9.0]
+        assert result["psar_up_indicator"].to_list() == [0, 0, 1, 0, 0]
+        assert result["psar_down"].null_count() == 5
+
+    def test_missing_prices_are_skipped(self):
+        df = _ohlc(n_bars=200)
+        gapped = df.with_columns(
+            pl.when(pl.int_range(0, pl.count()) == 100)
+            .then(None)
+            .otherwise(pl.col("low"))
+            .alias("low")
+        )
+
+        full = TrendIndicators(df.filter(pl.int_range(0, pl.count()) != 100)).psar_indicator()
+        result = TrendIndicators(gapped).psar_indicator()
+
+        assert result.row(100, named=True)["psar"] is None
+        assert result["psar_up_indicator"][100] is None
+        without_gap = result.filter(pl.int_range(0, pl.count()) != 100)
+        for column in OUTPUTS:
+            assert without_gap[column].equals(full[column], null_equal=True), column
+
+    def test_fillna_forward_fills(self):
+        df = _ohlc(n_bars=200)
+
+        result = TrendIndicators(df).psar_indicator(fillna=True)
+
+        for column in ("psar_up", "psar_down"):
+            values = result[column]
+            first = values.is_not_null().arg_max()
+            assert first >= 2
+            assert values.slice(first).null_count() == 0
+
+    def test_recursion_runs_once_per_plan(self):
+        df = _ohlc()
+        outputs = TrendIndicators.psar_expressions()
+
+        with patch.object(
+            parabolic_sar, "parabolic_sar", wraps=parabolic_sar.parabolic_sar
+        ) as kernel:
+            df.lazy().with_columns(list(outputs.values())).collect()
+
+        assert kernel.call_count == 1
+
+
+class TestPSARRegistry:
+    """PSAR through IndicatorRegistryService."""
+
+    @pytest.fixture
+    def registry(self):
+        return IndicatorRegistryService(Mock(), state_store=IndicatorStateStore())
+
+    def test_configuration_is_valid_and_calculated(self, registry):
+        config = IndicatorConfiguration(
+            id="sar", indicator_name="psar_indicator",
+            parameters={"step": 0.02, "max_step": 0.2},
+        )
+
+        assert registry.validate_indicator_configuration(config) == []
+        result, errors, _ = registry.calculate_indicators(
+            _ohlc().to_pandas().rename(columns=str.title), [config]
+        )
+
+        assert errors == []
+        assert result["psar_sar"].null_count() == 0
+        assert result["psar_up_sar"].null_count() + result["psar_down_sar"].null_count() == (
+            len(result) + 2
+        )
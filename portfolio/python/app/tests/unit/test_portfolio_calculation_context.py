@@ -0,0 +1,187 @@
+"""
+Unit tests for PortfolioCalculationContext.
+
+Tests cover:
+- One transaction query, price fetch and daily-values build per performance call
+- Period daily values sliced from the shared inception series
+- Memoized initial market value
+- Stage counts recorded on the context
+- Multi-period performance computed from one shared series
+"""
+
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, Mock
+
+import pandas as pd
+import pytest
+
+from app.core.database.models import TransactionType
+from app.core.services.portfolio_calculation_context import (
+    PortfolioCalculationContext,
+)
+from app.core.services.portfolio_calculation_service import (
+    PeriodType,
+    PortfolioCalculationService,
+)
+
+END_DATE = datetime(2024, 6, 30, tzinfo=timezone.utc)
+
+
+def _transaction(asset_id, when, quantity, price, kind=TransactionType.BUY):
+    return SimpleNamespace(
+        asset_id=asset_id,
+        transaction_date=when,
+        transaction_type=kind,
+        quantity=Decimal(str(quantity)),
+        total_amount=Decimal(str(quantity * price)),
+    )
+
+
+def _price_history(start, periods, step):
+    dates = pd.date_range(start, periods=periods, freq="D")
+    closes = [100.0 + step * i for i in range(periods)]
+    return pd.DataFrame({"Date": dates, "Close": closes})
+
+
+class TestPortfolioCalculationContext:
+    """Test suite for PortfolioCalculationContext."""
+
+    @pytest.fixture
+    def transactions(self):
+        start = datetime(2023, 1, 3, 15, tzinfo=timezone.utc)
+        return [
+            _transaction(1, start, 10, 100.0),
+            _transaction(2, start + timedelta(days=40), 5, 100.0),
+            _transaction(1, start + timedelta(days=200), 4, 120.0, TransactionType.SELL),
+        ]
+
+    @pytest.fixture
+    def service(self, transactions):
+        db = Mock()
+        db.query.return_value.filter.return_value.all.return_value = [
+            SimpleNamespace(id=1, symbol="AAA"),
+            SimpleNamespace(id=2, symbol="BBB"),
+        ]
+        service = PortfolioCalculationService(db)
+        histories = {
+            "AAA": _price_history("2022-12-01", 600, 0.1),
+            "BBB": _price_history("2022-12-01", 600, -0.05),
+        }
+        service.market_data_service = Mock()
+        service.market_data_service.fetch_ticker_data = AsyncMock(
+            side_effect=lambda symbol, **kwargs: histories[symbol].copy()
+        )
+        service._get_portfolio = Mock(return_value=SimpleNamespace(name="Test"))
+        service._get_transactions = Mock(return_value=transactions)
+        service._get_current_portfolio_value = Mock(return_value=2000.0)
+        return service
+
+    @pytest.mark.asyncio
+    async def test_performance_runs_each_stage_once(self, service):
+        context = PortfolioCalculationContext(1, END_DATE)
+
+        result = await service.calculate_portfolio_performance(
+            1, 1, PeriodType.LAST_1_YEAR, END_DATE, context=context
+        )
+
+        assert result["metrics"]["twr"] is not None
+        assert result["metrics"]["volatility"] is not None
+        assert result["metrics"]["max_drawdown"] is not None
+        assert service._get_transactions.call_count == 1
+        # One history download per asset
+        assert service.market_data_service.fetch_ticker_data.await_count == 2
+        assert context.stage_counts["transactions_query"] == 1
+        assert context.stage_counts["price_fetch"] == 1
+        assert context.stage_counts["daily_values_build"] == 1
+        assert context.stage_counts["initial_market_value"] == 1
+        # TWR, volatility, max drawdown and the initial value all reuse the series
+        assert context.stage_counts["daily_values_reuse"] >= 3
+
+    @pytest.mark.asyncio
+    async def test_context_slice_matches_standalone_period(self, service):
+        start_date = END_DATE - timedelta(days=90)
+        context = PortfolioCalculationContext(1, END_DATE)
+
+        shared = await service._calculate_daily_portfolio_values(
+            1, start_date, END_DATE, context=context
+        )
+        standalone = await service._calculate_daily_portfolio_values(
+            1, start_date, END_DATE
+        )
+
+        pd.testing.assert_frame_equal(shared, standalone)
+
+    @pytest.mark.asyncio
+    async def test_initial_market_value_is_memoized(self, service, transactions):
+        start_date = END_DATE - timedelta(days=180)
+        context = PortfolioCalculationContext(1, END_DATE)
+
+        first = await service._calculate_initial_market_value(
+            1, transactions, start_date, context=context
+        )
+        second = await service._calculate_initial_market_value(
+            1, transactions, start_date, context=context
+        )
+        standalone = await service._calculate_initial_market_value(
+            1, transactions, start_date
+        )
+
+        assert first == second == pytest.approx(standalone)
+        assert context.stage_counts["initial_market_value"] == 1
+
+    @pytest.mark.asyncio
+    async def test_mismatched_context_is_replaced(self, service):
+        stale = PortfolioCalculationContext(1, END_DATE - timedelta(days=1))
+
+        await service.calculate_portfolio_performance(
+            1, 1, PeriodType.INCEPTION, END_DATE, context=stale
+        )
+
+        assert not stale.stage_counts
+        assert service.market_data_service.fetch_ticker_data.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_multi_period_matches_single_period_results(self, service):
+        periods = [
+            PeriodType.LAST_3_MONTHS,
+            PeriodType.LAST_6_MONTHS,
+            PeriodType.LAST_1_YEAR,
+            PeriodType.YTD,
+            PeriodType.INCEPTION,
+        ]
+
+        batch = await service.calculate_multi_period_performance(
+            1, 1, periods, END_DATE
+        )
+        batch_fetches = service.market_data_service.fetch_ticker_data.await_count
+
+        assert [summary["period"] for summary in batch["periods"]] == periods
+        # One history download per asset for all five periods
+        assert batch_fetches == 2
+        assert service._get_transactions.call_count == 1
+        for summary in batch["periods"]:
+            single = await service.calculate_portfolio_performance(
+                1, 1, summary["period"], END_DATE
+            )
+            assert summary["start_date"] == single["start_date"]
+            assert summary["metrics"] == pytest.approx(single["metrics"])
+
+    @pytest.mark.asyncio
+    async def test_multi_period_skips_unknown_periods(self, service):
+        result = await service.calculate_multi_period_performance(
+            1, 1, [PeriodType.LAST_1_YEAR, "10y"], END_DATE
+        )
+
+        assert [summary["period"] for summary in result["periods"]] == ["1y"]
+        assert result["portfolio_name"] == "Test"
+
+    @pytest.mark.asyncio
+    async def test_multi_period_unknown_portfolio(self, service):
+        service._get_portfolio.return_value = None
+
+        with pytest.raises(ValueError):
+            await service.calculate_multi_period_performance(
+                1, 1, [PeriodType.INCEPTION], END_DATE
+            )
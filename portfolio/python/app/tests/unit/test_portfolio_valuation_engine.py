@@ -0,0 +1,195 @@
+"""
+Unit tests for PortfolioValuationEngine.
+
+Tests cover:
+- Holdings and price matrices
+- Agreement with the per-day holdings/price lookup it replaces
+- Period trimming and closed positions
+- Runtime on a large portfolio
+"""
+
+import time
+from datetime import date, datetime, timedelta, timezone
+from types import SimpleNamespace
+from unittest.mock import Mock
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.core.database.models import TransactionType
+from app.core.services.portfolio_calculation_service import PortfolioCalculationService
+from app.core.services.portfolio_valuation_engine import PortfolioValuationEngine
+
+
+def _transaction(asset_id, day, quantity, transaction_type=TransactionType.BUY):
+    return SimpleNamespace(
+        asset_id=asset_id,
+        transaction_date=datetime.combine(day, datetime.min.time(), timezone.utc)
+        + timedelta(hours=15),
+        quantity=quantity,
+        transaction_type=transaction_type,
+    )
+
+
+def _business_day_closes(start, periods, seed, tz="America/New_York"):
+    rng = np.random.default_rng(seed)
+    index = pd.bdate_range(start, periods=periods, tz=tz)
+    return pd.Series(100 + rng.normal(0, 1, periods).cumsum(), index=index)
+
+
+def _random_portfolio(n_assets, n_transactions, years, seed=0):
+    rng = np.random.default_rng(seed)
+    start = date(2015, 1, 1)
+    days = years * 365
+    transactions = []
+    held = dict.fromkeys(range(1, n_assets + 1), 0.0)
+    offsets = np.sort(rng.integers(0, days, n_transactions))
+    for offset in offsets:
+        asset_id = int(rng.integers(1, n_assets + 1))
+        quantity = float(rng.integers(1, 50))
+        if held[asset_id] >= quantity and rng.random() < 0.3:
+            held[asset_id] -= quantity
+            kind = TransactionType.SELL
+        else:
+            held[asset_id] += quantity
+            kind = TransactionType.BUY
+        transactions.append(
+            _transaction(asset_id, start + timedelta(days=int(offset)), quantity, kind)
+        )
+    prices = {
+        asset_id: _business_day_closes("2014-12-01", years * 262 + 40, asset_id)
+        for asset_id in range(1, n_assets + 1)
+    }
+    return transactions, prices, start, start + timedelta(days=days)
+
+
+def _reference_values(transactions, prices, calc_start, end):
+    """The per-day loop the engine replaces."""
+    service = PortfolioCalculationService(Mock())
+    indexed = {
+        asset_id: pd.DataFrame(
+            {"Close": closes.to_numpy()},
+            index=pd.Index(closes.index.tz_localize(None).date),
+        ).sort_index()
+        for asset_id, closes in prices.items()
+    }
+    values = {}
+    for current in pd.date_range(calc_start, end, freq="D"):
+        current = current.date()
+        holdings = service._calculate_holdings_as_of_date(transactions, current)
+        if not holdings:
+            if values:
+                values[current] = 0.0
+            continue
+        value, found = 0.0, False
+        for asset_id, quantity in holdings.items():
+            if asset_id in indexed and quantity > 0:
+                price = service._get_price_for_date(indexed[asset_id], current)
+                if price is not None and not np.isnan(price):
+                    value += quantity * price
+                    found = True
+        if value > 0 or found:
+            values[current] = value
+    return pd.Series(values, dtype=float)
+
+
+class TestPortfolioValuationEngine:
+    """Test suite for PortfolioValuationEngine."""
+
+    @pytest.fixture
+    def engine(self):
+        return PortfolioValuationEngine()
+
+    def test_holdings_matrix_cumulates_signed_quantities(self, engine):
+        transactions = [
+            _transaction(1, date(2024, 1, 2), 100),
+            _transaction(1, date(2024, 1, 4), 40, TransactionType.SELL),
+            _transaction(2, date(2024, 1, 3), 10),
+            _transaction(2, date(2024, 1, 5), 10, TransactionType.SELL),
+        ]
+        dates = engine.daily_dates(date(2024, 1, 1), date(2024, 1, 6))
+
+        holdings = engine.holdings_matrix(transactions, dates)
+
+        assert holdings[1].tolist() == [0, 100, 100, 60, 60, 60]
+        assert holdings[2].tolist() == [0, 0, 10, 10, 0, 0]
+
+    def test_holdings_matrix_counts_flows_before_first_date(self, engine):
+        transactions = [_transaction(1, date(2023, 6, 1), 5)]
+        dates = engine.daily_dates(date(2024, 1, 1), date(2024, 1, 2))
+
+        holdings = engine.holdings_matrix(transactions, dates)
+
+        assert holdings[1].tolist() == [5, 5]
+
+    def test_price_matrix_forward_fills_weekends(self, engine):
+        closes = pd.Series(
+            [10.0, 11.0],
+            index=pd.DatetimeIndex(["2024-01-05", "2024-01-08"], tz="America/New_York"),
+        )
+        dates = engine.daily_dates(date(2024, 1, 4), date(2024, 1, 8))
+
+        prices = engine.price_matrix({1: closes}, dates)
+
+        assert np.isnan(prices[1].iloc[0])
+        assert prices[1].iloc[1:].tolist() == [10.0, 10.0, 10.0, 11.0]
+
+    def test_matches_per_day_lookup(self, engine):
+        transactions, prices, start, end = _random_portfolio(5, 120, 2, seed=7)
+        # One held asset without any price history
+        transactions.append(_transaction(99, start + timedelta(days=30), 10))
+
+        result = engine.value_portfolio(transactions, prices, start, end)
+        expected = _reference_values(transactions, prices, start, end)
+
+        actual = pd.Series(
+            result["PortfolioValue"].to_numpy(), index=result["Date"].dt.date
+        )
+        expected = expected.reindex(actual.index).ffill()
+        np.testing.assert_allclose(actual.to_numpy(), expected.to_numpy())
+        assert result["DailyReturn"].iloc[0] == 0
+
+    def test_trims_to_period_start(self, engine):
+        transactions = [_transaction(1, date(2024, 1, 2), 10)]
+        closes = pd.Series(
+            1.0, index=pd.date_range("2024-01-01", "2024-03-01", freq="D")
+        )
+
+        result = engine.value_portfolio(
+            transactions,
+            {1: closes},
+            date(2024, 1, 1),
+            date(2024, 3, 1),
+            start_date=datetime(2024, 2, 1, tzinfo=timezone.utc),
+        )
+
+        assert result["Date"].min() == pd.Timestamp("2024-02-01")
+        assert result["Date"].max() == pd.Timestamp("2024-03-01")
+        assert (result["PortfolioValue"] == 10.0).all()
+
+    def test_closed_portfolio_values_zero(self, engine):
+        transactions = [
+            _transaction(1, date(2024, 1, 2), 10),
+            _transaction(1, date(2024, 1, 4), 10, TransactionType.SELL),
+        ]
+        closes = pd.Series(
+            2.0, index=pd.date_range("2024-01-01", "2024-01-10", freq="D")
+        )
+
+        result = engine.value_portfolio(
+            transactions, {1: closes}, date(2024, 1, 1), date(2024, 1, 6)
+        )
+
+        assert result["PortfolioValue"].tolist() == [20.0, 20.0, 0.0, 0.0, 0.0]
+
+    def test_large_portfolio_runtime(self, engine):
+        """10 years, 30 assets, 2,000 transactions in well under a second."""
+        transactions, prices, start, end = _random_portfolio(30, 2000, 10, seed=1)
+
+        started = time.perf_counter()
+        result = engine.value_portfolio(transactions, prices, start, end)
+        elapsed = time.perf_counter() - started
+
+        assert len(result) > 3500
+        assert elapsed < 0.5
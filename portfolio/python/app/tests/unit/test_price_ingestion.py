@@ -0,0 +1,185 @@
+"""
+Unit tests for background price ingestion.
+
+Tests cover:
+- Distinct symbols collected from portfolio holdings and watchlist items
+- Quotes fetched and cached in batches, with session-aware expiry
+- Market-hours-aware tick interval, cut short at session boundaries
+- Only the worker holding the Redis lock ingesting
+- Request paths reading prices from the quote cache
+"""
+
+import asyncio
+from datetime import datetime
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+import pytz
+
+from app.core.database.models import Asset
+from app.core.services.market_data_service import MarketDataService
+from app.core.services.price_ingestion_service import PriceIngestionService
+from app.core.services.quote_cache import QuoteCache, seconds_until_session_change
+
+EASTERN = pytz.timezone("US/Eastern")
+OPEN = EASTERN.localize(datetime(2024, 3, 5, 11, 0))
+CLOSED = EASTERN.localize(datetime(2024, 3, 5, 20, 0))
+
+
+def _quote(price):
+    return {
+        "regularMarketPrice": price,
+        "regularMarketPreviousClose": price - 1,
+        "regularMarketVolume": 1_000,
+    }
+
+
+class FakeQuery:
+    """Query chain ending in all()."""
+
+    def __init__(self, rows):
+        self.rows = rows
+
+    def join(self, *args):
+        return self
+
+    def distinct(self):
+        return self
+
+    def all(self):
+        return self.rows
+
+
+class FakeSession:
+    """Session answering the holdings and watchlist symbol queries."""
+
+    held = [("AAPL",), ("MSFT",)]
+    watched = [("msft",), ("NVDA",), ("AMD",), (None,)]
+
+    def __init__(self):
+        self.closed = False
+
+    def query(self, column):
+        return FakeQuery(self.held if column is Asset.symbol else self.watched)
+
+    def close(self):
+        self.closed = True
+
+
+@pytest.fixture
+def session_factory():
+    return FakeSession
+
+
+class TestPriceIngestionService:
+    """PriceIngestionService ticks."""
+
+    @pytest.fixture
+    def market_data(self):
+        async def quotes(symbols):
+            return {symbol: None if symbol == "AMD" else _quote(100.0) for symbol in symbols}
+
+        return Mock(get_latest_quotes=AsyncMock(side_effect=quotes))
+
+    @pytest.fixture
+    def service(self, session_factory, market_data, fake_redis):
+        return PriceIngestionService(
+            session_factory=session_factory,
+            market_data=market_data,
+            cache=QuoteCache(fake_redis, market_hours_ttl=60, closed_ttl=3600),
+            redis_client=fake_redis,
+            batch_size=2,
+            market_hours_interval=30,
+            closed_interval=900,
+            watchlist_refresh=False,
+        )
+
+    def test_collects_held_and_watched_symbols(self, service):
+        assert service.collect_symbols() == ["AAPL", "AMD", "MSFT", "NVDA"]
+
+    @pytest.mark.asyncio
+    async def test_quotes_are_cached_in_batches(self, service, market_data, fake_redis):
+        result = await service.ingest_once(now=OPEN)
+
+        assert result == {
+            "skipped": False,
+            "symbols": 4,
+            "cached": 3,
+            "missing": ["AMD"],
+            "watchlist_items": 0,
+        }
+        assert [call.args[0] for call in market_data.get_latest_quotes.call_args_list] == [
+            ["AAPL", "AMD"], ["MSFT", "NVDA"],
+        ]
+        assert fake_redis.mset_calls == 2
+        quote = fake_redis.store["quote:NVDA"]
+        assert quote["price"] == 100.0
+        assert quote["change"] == pytest.approx(1.0)
+        assert quote["change_percent"] == pytest.approx(100 / 99)
+        assert fake_redis.ttls["quote:NVDA"] == 60
+
+    def test_interval_follows_market_hours(self, service):
+        assert service.interval(OPEN) == 30
+        assert service.interval(CLOSED) == 900
+
+    def test_sleep_ends_at_the_session_boundary(self, service):
+        before_open = EASTERN.localize(datetime(2024, 3, 5, 9, 25))
+        before_close = EASTERN.localize(datetime(2024, 3, 5, 15, 59, 50))
+        friday_night = EASTERN.localize(datetime(2024, 3, 8, 20, 0))
+
+        assert service.sleep_seconds(before_open) == 300
+        assert service.sleep_seconds(before_close) == 10
+        assert service.sleep_seconds(CLOSED) == 900
+        assert service.sleep_seconds(OPEN) == 30
+        # Over a weekend (and into EDT) the next boundary is Monday's open
+        assert seconds_until_session_change(friday_night) == (
+            EASTERN.localize(datetime(2024, 3, 11, 9, 30)) - friday_night
+        ).total_seconds()
+
+    @pytest.mark.asyncio
+    async def test_only_lock_holder_ingests(self, service, session_factory, fake_redis):
+        other = PriceIngestionService(
+            session_factory=session_factory,
+            market_data=Mock(get_latest_quotes=AsyncMock(return_value={})),
+            cache=service.cache,
+            redis_client=fake_redis,
+        )
+
+        assert (await service.ingest_once(now=CLOSED))["skipped"] is False
+        assert (await other.ingest_once(now=CLOSED)) == {"skipped": True}
+        other.market_data.get_latest_quotes.assert_not_called()
+        # The holder keeps renewing it for two ticks
+        assert fake_redis.locks[service.LOCK_NAME] == (service.token, 1800)
+        assert (await service.ingest_once(now=CLOSED))["skipped"] is False
+
+        await service.stop()
+        assert (await other.ingest_once(now=CLOSED))["skipped"] is False
+
+    @pytest.mark.asyncio
+    async def test_loop_survives_failed_ticks(self, service, market_data):
+        market_data.get_latest_quotes.side_effect = RuntimeError("upstream down")
+        service.market_hours_interval = service.closed_interval = 0.01
+
+        service.start()
+        await asyncio.sleep(0.1)
+        await service.stop()
+
+        assert market_data.get_latest_quotes.call_count > 1
+
+
+class TestCachedPrices:
+    """MarketDataService.get_cached_price."""
+
+    @pytest.mark.asyncio
+    async def test_cache_hit_skips_upstream(self, fake_redis):
+        cache = QuoteCache(fake_redis)
+        cache.set("AAPL", {"price": 190.5})
+        service = MarketDataService(cache=cache)
+        service.get_current_price = AsyncMock(return_value=1.0)
+
+        assert await service.get_cached_price("aapl") == 190.5
+        service.get_current_price.assert_not_called()
+
+        # Not ingested yet
+        assert await service.get_cached_price("NEW") == 1.0
+        service.get_current_price.assert_awaited_once_with("NEW")
@@ -0,0 +1,140 @@
+"""
+Unit tests for the Redis-backed QuoteCache.
+
+Tests cover:
+- Market-hours and closed-market TTLs
+- Batched MGET/MSET and hit/miss metrics
+- Redis failures treated as misses
+- EnhancedMarketDataService sharing quotes across instances
+"""
+
+from datetime import datetime
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+import pytz
+import redis
+
+from app.core.services.enhanced_market_data_service import EnhancedMarketDataService
+from app.core.services.quote_cache import QuoteCache, is_market_open
+
+EASTERN = pytz.timezone("US/Eastern")
+
+
+class TestQuoteCache:
+    """Test suite for QuoteCache."""
+
+    @pytest.fixture
+    def cache(self, fake_redis):
+        return QuoteCache(fake_redis, market_hours_ttl=60, closed_ttl=3600)
+
+    def test_market_hours(self):
+        assert is_market_open(EASTERN.localize(datetime(2024, 3, 5, 10, 0)))
+        assert not is_market_open(EASTERN.localize(datetime(2024, 3, 5, 8, 0)))
+        assert not is_market_open(EASTERN.localize(datetime(2024, 3, 5, 16, 30)))
+        # Saturday
+        assert not is_market_open(EASTERN.localize(datetime(2024, 3, 9, 12, 0)))
+
+    def test_ttl_depends_on_session(self, cache, fake_redis):
+        open_time = EASTERN.localize(datetime(2024, 3, 5, 11, 0))
+        closed_time = EASTERN.localize(datetime(2024, 3, 5, 20, 0))
+
+        assert cache.ttl(open_time) == 60
+        assert cache.ttl(closed_time) == 3600
+
+        cache.set_many({"AAPL": {"price": 1.0}}, now=closed_time)
+        assert fake_redis.ttls["quote:AAPL"] == 3600
+
+    def test_batched_lookup_counts_hits_and_misses(self, cache, fake_redis):
+        cache.set_many({"AAPL": {"price": 190.0}, "MSFT": {"price": 410.0}})
+
+        found = cache.get_many(["AAPL", "MSFT", "TSLA"])
+
+        assert found == {"AAPL": {"price": 190.0}, "MSFT": {"price": 410.0}}
+        assert fake_redis.mset_calls == 1
+        assert fake_redis.mget_calls == 1
+        stats = cache.stats()
+        assert stats["hits"] == 2
+        assert stats["misses"] == 1
+        assert stats["hit_rate"] == pytest.approx(2 / 3)
+
+    def test_symbols_are_case_insensitive(self, cache):
+        cache.set("aapl", {"price": 1.0})
+
+        assert cache.get("AAPL") == {"price": 1.0}
+
+    def test_redis_errors_are_misses(self):
+        broken = Mock()
+        broken.mget.side_effect = redis.ConnectionError("down")
+        broken.mset.side_effect = redis.ConnectionError("down")
+        cache = QuoteCache(broken)
+
+        cache.set("AAPL", {"price": 1.0})
+        assert cache.get("AAPL") is None
+        assert cache.stats()["errors"] == 2
+        assert cache.stats()["misses"] == 1
+
+    def test_clear_by_pattern(self, cache):
+        cache.set_many({"AAPL": {"price": 1.0}, "MSFT": {"price": 2.0}})
+
+        cache.clear("aapl")
+
+        assert cache.get_many(["AAPL", "MSFT"]) == {"MSFT": {"price": 2.0}}
+
+
+class TestEnhancedMarketDataServiceCache:
+    """EnhancedMarketDataService reads and writes the shared quote cache."""
+
+    @pytest.fixture
+    def cache(self, fake_redis):
+        return QuoteCache(fake_redis, market_hours_ttl=60, closed_ttl=3600)
+
+    @pytest.fixture
+    def db(self):
+        assets = [
+            SimpleNamespace(id=1, symbol="AAPL"),
+            SimpleNamespace(id=2, symbol="MSFT"),
+        ]
+        db = Mock()
+        db.query.return_value.filter.return_value.all.return_value = assets
+        db.query.return_value.filter.return_value.first.return_value = assets[0]
+        return db
+
+    @pytest.mark.asyncio
+    async def test_quotes_survive_across_service_instances(self, db, cache):
+        with patch(
+            "app.core.services.enhanced_market_data_service.market_data_service"
+        ) as market_data:
+            market_data.get_current_price = AsyncMock(return_value=100.0)
+            market_data.get_ticker_info = AsyncMock(
+                return_value={"previousClose": 95.0, "volume": 10}
+            )
+
+            first = await EnhancedMarketDataService(db, cache).update_asset_price(1)
+            second = await EnhancedMarketDataService(db, cache).update_asset_price(1)
+
+        assert market_data.get_current_price.await_count == 1
+        assert second["price"] == first["price"] == 100.0
+        assert cache.stats()["hits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_bulk_update_fetches_only_misses(self, db, cache):
+        cache.set("AAPL", {"asset_id": 1, "symbol": "AAPL", "price": 100.0})
+        cache.reset_stats()
+
+        with patch(
+            "app.core.services.enhanced_market_data_service.market_data_service"
+        ) as market_data:
+            market_data.get_current_price = AsyncMock(return_value=400.0)
+            market_data.get_ticker_info = AsyncMock(return_value={})
+
+            results = await EnhancedMarketDataService(db, cache).bulk_update_prices(
+                [1, 2]
+            )
+
+        assert results["updated"] == 2
+        assert results["errors"] == []
+        market_data.get_current_price.assert_awaited_once_with("MSFT")
+        assert cache.get("MSFT")["price"] == 400.0
+        assert cache.redis.mset_calls == 2
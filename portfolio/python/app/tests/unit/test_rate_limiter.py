@@ -0,0 +1,210 @@
+"""
+Unit tests for the Redis sliding-window rate limiter.
+
+Tests cover:
+- Hits allowed up to the limit, then denied with a retry-after
+- The window sliding as old hits expire
+- Failing open when Redis is unavailable, and the enabled switch
+- Per-action limits behind is_rate_limited
+- The rate_limit FastAPI dependency: headers, 429 with Retry-After, exemptions
+- Headers on routes that return their own Response
+- The Lua script itself, when a Lua runtime for fakeredis is installed
+"""
+
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+
+from app.core.auth import dependencies, rate_limiting
+from app.core.auth.dependencies import get_optional_current_user, rate_limit
+from app.core.auth.rate_limiting import RateLimiter, rate_limiter
+from app.core.auth.utils import is_rate_limited
+from app.api.v1.statistical_indicators import routers as indicator_routers
+from app.core.database.connection import get_db
+from app.core.database.redis_client import _SLIDING_WINDOW_SCRIPT
+
+
+class Clock:
+    def __init__(self, now=1_000_000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(rate_limiting, "time", SimpleNamespace(time=clock))
+    return clock
+
+
+class TestRateLimiter:
+    """RateLimiter.hit."""
+
+    def test_denies_past_the_limit_until_the_window_slides(self, clock, fake_redis):
+        limiter = RateLimiter(redis_client=fake_redis, enabled=True)
+
+        assert limiter.hit("k", 3, 60) == (True, 2, 0)
+        clock.now += 10
+        assert limiter.hit("k", 3, 60) == (True, 1, 0)
+        assert limiter.hit("k", 3, 60) == (True, 0, 0)
+        # The first hit leaves the window 50 seconds from now
+        assert limiter.hit("k", 3, 60) == (False, 0, 50)
+        assert limiter.hit("other", 3, 60)[0] is True
+
+        clock.now += 50.5
+        assert limiter.hit("k", 3, 60) == (True, 0, 0)
+        # Rounded up to whole seconds: the next hit leaves at 70s
+        assert limiter.hit("k", 3, 60) == (False, 0, 10)
+
+    def test_fails_open_without_redis(self, clock):
+        class DownRedisClient:
+            def hit_sliding_window(self, *args):
+                raise ConnectionError("redis down")
+
+        assert RateLimiter(redis_client=DownRedisClient(), enabled=True).hit("k", 1, 60) == (
+            True, 1, 0,
+        )
+
+        class NoConnection:
+            def hit_sliding_window(self, *args):
+                return None
+
+        assert RateLimiter(redis_client=NoConnection(), enabled=True).hit("k", 1, 60)[0]
+
+    def test_disabled_limiter_skips_redis(self, fake_redis):
+        limiter = RateLimiter(redis_client=fake_redis, enabled=False)
+
+        assert all(limiter.hit("k", 1, 60)[0] for _ in range(5))
+        assert fake_redis.window_calls == 0
+
+    def test_configured_limits(self):
+        limiter = RateLimiter(limits={"search": (10, 3600)}, enabled=True)
+
+        assert limiter.limit_for("search") == (10, 3600)
+        assert limiter.limit_for("search", max_attempts=2) == (2, 3600)
+        with pytest.raises(ValueError):
+            limiter.limit_for("unknown")
+
+
+class TestIsRateLimited:
+    """core.auth.utils.is_rate_limited on the shared limiter."""
+
+    def test_counts_attempts_per_identifier_and_action(self, monkeypatch, clock, fake_redis):
+        monkeypatch.setattr(rate_limiter, "_redis", fake_redis)
+        monkeypatch.setattr(rate_limiter, "enabled", True)
+        monkeypatch.setattr(rate_limiter, "limits", {"symbol_search": (2, 3600)})
+
+        assert [is_rate_limited("1.2.3.4", "symbol_search") for _ in range(3)] == [
+            False, False, True,
+        ]
+        assert is_rate_limited("5.6.7.8", "symbol_search") is False
+        assert is_rate_limited("1.2.3.4", "login", max_attempts=1, window_seconds=60) is False
+        assert set(fake_redis.windows) == {
+            "rate_limit:symbol_search:1.2.3.4",
+            "rate_limit:symbol_search:5.6.7.8",
+            "rate_limit:login:1.2.3.4",
+        }
+
+
+class TestRateLimitDependency:
+    """The rate_limit FastAPI dependency."""
+
+    @pytest.fixture
+    def app(self, monkeypatch, clock, fake_redis):
+        monkeypatch.setattr(rate_limiter, "_redis", fake_redis)
+        monkeypatch.setattr(rate_limiter, "enabled", True)
+        monkeypatch.setattr(rate_limiter, "limits", {"search": (2, 60)})
+        monkeypatch.setattr(dependencies, "get_client_ip", lambda request: "1.2.3.4")
+
+        app = FastAPI()
+
+        @app.get("/search", dependencies=[Depends(rate_limit("search"))])
+        async def search():
+            return {"ok": True}
+
+        @app.get("/strict", dependencies=[Depends(rate_limit("search", anonymous_only=False))])
+        async def strict():
+            return {"ok": True}
+
+        app.dependency_overrides[get_optional_current_user] = lambda: None
+        return app
+
+    def test_anonymous_clients_get_429_with_retry_after(self, app, clock):
+        client = TestClient(app)
+
+        response = client.get("/search")
+        assert response.status_code == 200
+        assert response.headers["X-RateLimit-Limit"] == "2"
+        assert response.headers["X-RateLimit-Remaining"] == "1"
+
+        clock.now += 15
+        assert client.get("/search").headers["X-RateLimit-Remaining"] == "0"
+        response = client.get("/search")
+        assert response.status_code == 429
+        assert response.headers["Retry-After"] == "45"
+        assert "Rate limit exceeded" in response.json()["detail"]
+
+    def test_authenticated_users_exempt_unless_strict(self, app, fake_redis):
+        class CurrentUser:
+            id = 42
+
+        app.dependency_overrides[get_optional_current_user] = lambda: CurrentUser()
+        client = TestClient(app)
+
+        assert all(client.get("/search").status_code == 200 for _ in range(5))
+        assert fake_redis.window_calls == 0
+        assert [client.get("/strict").status_code for _ in range(3)] == [200, 200, 429]
+        assert list(fake_redis.windows) == ["rate_limit:search:user:42"]
+
+    def test_headers_on_routes_returning_a_response(self, monkeypatch, clock, fake_redis):
+        monkeypatch.setattr(rate_limiter, "_redis", fake_redis)
+        monkeypatch.setattr(rate_limiter, "enabled", True)
+        monkeypatch.setattr(dependencies, "get_client_ip", lambda request: "1.2.3.4")
+        app = FastAPI()
+        app.include_router(indicator_routers.router)
+        app.dependency_overrides[get_optional_current_user] = lambda: None
+        app.dependency_overrides[get_db] = lambda: None
+        max_attempts, _ = rate_limiter.limit_for("calculate_indicators")
+
+        with patch.object(
+            indicator_routers.EnhancedStatisticalService,
+            "calculate_indicators_json",
+            AsyncMock(return_value=b'{"symbol": "AAPL"}'),
+        ):
+            response = TestClient(app).post(
+                "/statistical-indicators/calculate",
+                json={"symbol": "AAPL", "indicators": [{"indicator_name": "rsi", "parameters": {}}]},
+            )
+
+        assert response.status_code == 200
+        assert response.json() == {"symbol": "AAPL"}
+        assert response.headers["X-RateLimit-Limit"] == str(max_attempts)
+        assert response.headers["X-RateLimit-Remaining"] == str(max_attempts - 1)
+
+    def test_unknown_action_fails_at_route_definition(self):
+        with pytest.raises(ValueError):
+            rate_limit("no_such_action")
+
+
+class TestSlidingWindowScript:
+    """The Lua script on an in-memory Redis."""
+
+    def test_script_admits_limit_hits_per_window(self):
+        pytest.importorskip("lupa")
+        fakeredis = pytest.importorskip("fakeredis")
+        client = fakeredis.FakeRedis()
+
+        def hit(now_ms, member):
+            return client.eval(_SLIDING_WINDOW_SCRIPT, 1, "k", now_ms, 60_000, 2, member)
+
+        assert hit(1_000, "a") == [1, 1, 0]
+        assert hit(2_000, "b") == [1, 0, 0]
+        assert hit(3_000, "c") == [0, 0, 58_000]
+        assert hit(61_500, "d") == [1, 0, 0]
+        assert client.zcard("k") == 2
+        assert 0 < client.pttl("k") <= 60_000
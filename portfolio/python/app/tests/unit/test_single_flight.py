@@ -0,0 +1,175 @@
+"""
+Unit tests for SingleFlight request coalescing.
+
+Tests cover:
+- Concurrent identical calls sharing one upstream call
+- Distinct keys running independently
+- Error propagation and cancellation of a single waiter
+- MarketDataService coalescing history, quote and info fetches
+"""
+
+import asyncio
+import time
+from unittest.mock import Mock, patch
+
+import pandas as pd
+import pytest
+
+from app.core.services.market_data_executor import MarketDataExecutor
+from app.core.services.market_data_service import MarketDataService
+from app.core.services.ohlcv_store import OHLCVStore
+from app.core.services.single_flight import SingleFlight
+
+
+class TestSingleFlight:
+    """Test suite for SingleFlight."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_calls_share_one_upstream_call(self):
+        flight = SingleFlight()
+        calls = 0
+
+        async def upstream():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.05)
+            return 42
+
+        results = await asyncio.gather(
+            *(flight.do(("quote", "AAPL"), upstream) for _ in range(5))
+        )
+
+        assert calls == 1
+        assert results == [(42, True)] * 5
+        stats = flight.stats()
+        assert stats["calls"] == 5
+        assert stats["upstream_calls"] == 1
+        assert stats["saved_calls"] == 4
+        assert stats["by_kind"]["quote"]["saved_calls"] == 4
+        assert stats["in_flight"] == 0
+
+    @pytest.mark.asyncio
+    async def test_distinct_keys_are_not_coalesced(self):
+        flight = SingleFlight()
+
+        async def upstream(value):
+            await asyncio.sleep(0.01)
+            return value
+
+        results = await asyncio.gather(
+            flight.do(("quote", "AAPL"), lambda: upstream(1)),
+            flight.do(("quote", "MSFT"), lambda: upstream(2)),
+        )
+
+        assert results == [(1, False), (2, False)]
+        assert flight.stats()["saved_calls"] == 0
+
+    @pytest.mark.asyncio
+    async def test_sequential_calls_are_not_coalesced(self):
+        flight = SingleFlight()
+
+        async def upstream():
+            return 1
+
+        await flight.do(("quote", "AAPL"), upstream)
+        await flight.do(("quote", "AAPL"), upstream)
+
+        assert flight.stats()["upstream_calls"] == 2
+
+    @pytest.mark.asyncio
+    async def test_errors_reach_every_waiter(self):
+        flight = SingleFlight()
+
+        async def upstream():
+            await asyncio.sleep(0.01)
+            raise ValueError("upstream failed")
+
+        results = await asyncio.gather(
+            *(flight.do(("history", "AAPL"), upstream) for _ in range(3)),
+            return_exceptions=True,
+        )
+
+        assert all(isinstance(result, ValueError) for result in results)
+
+    @pytest.mark.asyncio
+    async def test_cancelled_waiter_does_not_cancel_shared_call(self):
+        flight = SingleFlight()
+
+        async def upstream():
+            await asyncio.sleep(0.05)
+            return "done"
+
+        first = asyncio.create_task(flight.do(("info", "AAPL"), upstream))
+        second = asyncio.create_task(flight.do(("info", "AAPL"), upstream))
+        await asyncio.sleep(0.01)
+        first.cancel()
+
+        assert await second == ("done", True)
+
+
+class TestCoalescedMarketDataService:
+    """MarketDataService routes upstream calls through SingleFlight."""
+
+    @pytest.fixture
+    def service(self):
+        executor = MarketDataExecutor(max_workers=4, timeout=5, max_concurrency=4)
+        yield MarketDataService(
+            executor=executor,
+            store=OHLCVStore(enabled=False),
+            single_flight=SingleFlight(),
+        )
+        executor.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_concurrent_history_fetches_download_once(self, service):
+        def history(*args, **kwargs):
+            time.sleep(0.05)
+            index = pd.date_range("2024-01-01", periods=3, freq="D", name="Date")
+            return pd.DataFrame(
+                {"Open": 1.0, "High": 1.0, "Low": 1.0, "Close": 1.0, "Volume": 1},
+                index=index,
+            )
+
+        ticker = Mock()
+        ticker.history.side_effect = history
+
+        with patch(
+            "app.core.services.market_data_service.yf.Ticker", return_value=ticker
+        ):
+            frames = await asyncio.gather(
+                *(service.fetch_ticker_data("AAPL", period="1y") for _ in range(4))
+            )
+
+        assert ticker.history.call_count == 1
+        # Each caller gets its own copy to mutate
+        frames[0]["Close"] = 0.0
+        assert frames[1]["Close"].iloc[0] == 1.0
+        assert service.get_coalescing_stats()["by_kind"]["history"]["saved_calls"] == 3
+
+    @pytest.mark.asyncio
+    async def test_concurrent_quotes_and_info_are_coalesced(self, service):
+        ticker = Mock()
+
+        def info():
+            time.sleep(0.05)
+            return {"symbol": "AAPL", "currentPrice": 190.0, "regularMarketPrice": 190.0}
+
+        type(ticker).info = property(lambda _: info())
+
+        with patch(
+            "app.core.services.market_data_service.yf.Ticker", return_value=ticker
+        ):
+            prices = await asyncio.gather(
+                *(service.get_current_price("AAPL") for _ in range(3))
+            )
+            infos = await asyncio.gather(
+                service.get_ticker_info("AAPL"),
+                service.get_symbols_info(["AAPL"]),
+            )
+
+        assert prices == [190.0] * 3
+        assert infos[0]["current_price"] == 190.0
+        assert "AAPL" in infos[1]
+        stats = service.get_coalescing_stats()["by_kind"]
+        assert stats["quote"] == {"calls": 3, "upstream_calls": 1, "saved_calls": 2}
+        assert stats["info"]["saved_calls"] == 1
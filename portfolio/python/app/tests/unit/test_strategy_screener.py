@@ -0,0 +1,320 @@
+"""
+Unit tests for the batch strategy screener.
+
+Tests cover:
+- fetch_ticker_frames downloading a chunk of symbols per upstream call
+- screen_macd and screen_gfs matching the single-symbol strategies
+- Results streamed batch by batch as they finish
+- Symbols without history and failing batches reported per symbol
+- Strategy and parameter validation
+- A 300-symbol universe screened on the process pool
+- Universe resolution from symbols, watchlists and portfolios
+"""
+
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import Mock, patch
+
+import numpy as np
+import pandas as pd
+import polars as pl
+import pytest
+from fastapi import HTTPException
+
+from app.api.v1.screener.router import _resolve_universe
+from app.core.schemas.screener import ScreenerRequest
+from app.core.services.market_data_executor import MarketDataExecutor
+from app.core.services.market_data_service import MarketDataService
+from app.core.services.single_flight import SingleFlight
+from app.core.services.strategy_screener_service import StrategyScreenerService
+from utils.trading_strategies.gfs_strategy import GfsStrategy
+from utils.trading_strategies.macd_strategy import MACDStrategy
+from utils.trading_strategies.screener import screen_gfs, screen_macd
+
+
+def _bars(seed=0, periods=600):
+    """yfinance-shaped daily history."""
+    index = pd.bdate_range(end="2024-06-28", periods=periods, name="Date")
+    close = 100 * np.cumprod(1 + np.random.default_rng(seed).normal(0, 0.02, periods))
+    return pd.DataFrame(
+        {
+            "Open": close,
+            "High": close * 1.01,
+            "Low": close * 0.99,
+            "Close": close,
+            "Volume": 1_000.0,
+            "Dividends": 0.0,
+            "Stock Splits": 0.0,
+        },
+        index=index,
+    )
+
+
+def _frame(seed=0, periods=600):
+    return MarketDataService._to_frame(_bars(seed, periods), include_index=True)
+
+
+def _download(symbols, **kwargs):
+    """yf.download(group_by="ticker") result for the symbols."""
+    return pd.concat({symbol: _bars(seed) for seed, symbol in enumerate(symbols)}, axis=1)
+
+
+class FakeMarketData:
+    """fetch_ticker_frames over generated histories."""
+
+    def __init__(self, missing=(), delays=None):
+        self.missing = set(missing)
+        self.delays = delays or {}
+        self.calls = []
+
+    async def fetch_ticker_frames(self, symbols, period="1y", interval="1d"):
+        self.calls.append((list(symbols), period, interval))
+        for symbol in symbols:
+            if symbol in self.delays:
+                await self.delays[symbol].wait()
+        return {
+            symbol: pl.DataFrame() if symbol in self.missing else _frame(int(symbol[1:]))
+            for symbol in symbols
+        }
+
+
+class TestFetchTickerFrames:
+    """MarketDataService.fetch_ticker_frames."""
+
+    @pytest.fixture
+    def service(self):
+        executor = MarketDataExecutor(max_workers=2, timeout=5, max_concurrency=2)
+        service = MarketDataService(executor=executor, single_flight=SingleFlight())
+        service.history_batch_size = 2
+        yield service
+        executor.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_one_download_per_chunk(self, service):
+        with patch(
+            "app.core.services.market_data_service.yf.download", side_effect=_download
+        ) as download:
+            frames = await service.fetch_ticker_frames(["aapl", "MSFT", "GOOG"], period="2y")
+
+        assert download.call_count == 2
+        assert sorted(call.args[0] for call in download.call_args_list) == [
+            ["AAPL", "MSFT"], ["GOOG"],
+        ]
+        assert download.call_args.kwargs["period"] == "2y"
+        assert list(frames) == ["aapl", "MSFT", "GOOG"]
+        assert frames["MSFT"].columns[:6] == ["date", "open", "high", "low", "close", "volume"]
+        assert frames["MSFT"]["close"].to_list() == pytest.approx(_bars(1)["Close"].tolist())
+
+    @pytest.mark.asyncio
+    async def test_missing_symbols_and_failed_chunks_are_empty(self, service):
+        def download(symbols, **kwargs):
+            if "BAD" in symbols:
+                raise RuntimeError("upstream down")
+            # A single symbol comes back without the ticker level
+            return _bars(0)
+
+        with patch(
+            "app.core.services.market_data_service.yf.download", side_effect=download
+        ):
+            frames = await service.fetch_ticker_frames(["AAPL", "BAD", "MSFT"])
+
+        assert frames["AAPL"].is_empty() and frames["BAD"].is_empty()
+        assert len(frames["MSFT"]) == 600
+
+
+class TestScreenerStrategies:
+    """Batch strategy functions against the single-symbol strategies."""
+
+    def test_macd_matches_single_symbol_calls(self):
+        histories = {f"S{seed}": _frame(seed) for seed in range(4)}
+
+        results = screen_macd(histories, condition_days=3)
+
+        assert [result["symbol"] for result in results] == list(histories)
+        for result in results:
+            history = histories[result["symbol"]]
+            macd = history.select(
+                pl.col("close").alias("Close"),
+                (pl.col("close").ewm_mean(span=12, min_periods=12)
+                 - pl.col("close").ewm_mean(span=26, min_periods=26)).alias("MACD"),
+            ).with_columns(
+                pl.col("MACD").ewm_mean(span=9, min_periods=9).alias("Signal"),
+                pl.lit(0.0).alias("Histogram"),
+            )
+            calls = MACDStrategy(macd).calls(condition_days=3)
+            flagged = calls.with_row_count().filter(pl.col("MACD_calls") != 0)
+            expected = {1: "Buy", -1: "Sell"}[flagged["MACD_calls"][-1]]
+            assert result["signal"] == expected
+            assert result["signal_date"] == history["date"][
+                flagged["row_nr"][-1]
+            ].strftime("%Y-%m-%d")
+            assert result["close"] == pytest.approx(history["close"][-1])
+
+    def test_gfs_matches_single_symbol_strategy(self):
+        histories = {f"S{seed}": _frame(seed, periods=1300) for seed in range(3)}
+
+        results = screen_gfs(histories)
+
+        for result in results:
+            expected = GfsStrategy(
+                result["symbol"], history=histories[result["symbol"]]
+            ).calculate_gfs()
+            assert result == {"symbol": result["symbol"], **expected}
+
+    def test_gfs_reports_errors_per_symbol(self):
+        results = screen_gfs({"S0": _frame(0), "NONE": pl.DataFrame()})
+
+        assert "error" not in results[0]
+        assert "No price data found" in results[1]["error"]
+
+
+class TestStrategyScreenerService:
+    """StrategyScreenerService.screen."""
+
+    @pytest.fixture
+    def pool(self):
+        pool = ThreadPoolExecutor(max_workers=2)
+        yield pool
+        pool.shutdown()
+
+    @staticmethod
+    async def _collect(service, *args, **kwargs):
+        return [result async for result in service.screen(*args, **kwargs)]
+
+    @pytest.mark.asyncio
+    async def test_every_symbol_gets_one_result(self, pool):
+        market_data = FakeMarketData(missing={"S3"})
+        service = StrategyScreenerService(market_data, batch_size=2, executor=pool)
+
+        results = await self._collect(
+            service, ["s0", "S1", "S2", "S3", "S1"], "macd", {"condition_days": 3}
+        )
+
+        assert sorted(result["symbol"] for result in results) == ["S0", "S1", "S2", "S3"]
+        assert all(result["strategy"] == "macd" for result in results)
+        by_symbol = {result["symbol"]: result for result in results}
+        assert by_symbol["S3"]["error"] == "No price data found"
+        assert "error" not in by_symbol["S0"]
+        # One history fetch per batch, with the strategy's history window
+        assert sorted(symbols for symbols, _, _ in market_data.calls) == [
+            ["S0", "S1"], ["S2", "S3"],
+        ]
+        assert {period for _, period, _ in market_data.calls} == {"2y"}
+
+    @pytest.mark.asyncio
+    async def test_results_stream_as_batches_finish(self, pool):
+        release = asyncio.Event()
+        market_data = FakeMarketData(delays={"S0": release})
+        service = StrategyScreenerService(market_data, batch_size=2, executor=pool)
+
+        stream = service.screen(["S0", "S1", "S2", "S3"], "gfs")
+        first = await asyncio.wait_for(stream.__anext__(), timeout=10)
+        second = await stream.__anext__()
+        release.set()
+        rest = [result async for result in stream]
+
+        # The second batch is not held back by the slow first one
+        assert {first["symbol"], second["symbol"]} == {"S2", "S3"}
+        assert {result["symbol"] for result in rest} == {"S0", "S1"}
+
+    @pytest.mark.asyncio
+    async def test_failing_batch_is_reported_per_symbol(self, pool):
+        service = StrategyScreenerService(FakeMarketData(), batch_size=2, executor=pool)
+
+        with patch.dict(
+            "utils.trading_strategies.screener.STRATEGIES",
+            {"macd": ("2y", Mock(side_effect=RuntimeError("boom")))},
+        ):
+            results = await self._collect(service, ["S0", "S1"], "macd")
+
+        assert [result["error"] for result in results] == ["boom", "boom"]
+
+    @pytest.mark.parametrize(
+        "strategy, parameters, message",
+        [
+            ("rsi", {}, "Unknown strategy"),
+            ("macd", {"window": 3}, "Unknown parameters for 'macd': window"),
+            ("gfs", {"condition_days": 3}, "Supported parameters: none"),
+        ],
+    )
+    def test_validation(self, strategy, parameters, message):
+        service = StrategyScreenerService(FakeMarketData())
+
+        with pytest.raises(ValueError, match=message):
+            service.validate(strategy, parameters)
+
+    @pytest.mark.asyncio
+    async def test_universe_on_process_pool(self):
+        service = StrategyScreenerService(FakeMarketData(), max_workers=2, batch_size=50)
+        symbols = [f"S{seed}" for seed in range(300)]
+
+        try:
+            start = time.perf_counter()
+            results = await self._collect(service, symbols, "macd")
+            elapsed = time.perf_counter() - start
+        finally:
+            service.shutdown(wait=True)
+
+        assert len(results) == 300
+        assert not [result for result in results if "error" in result]
+        # Includes starting the worker processes
+        assert elapsed < 30
+
+
+class TestResolveUniverse:
+    """Screener router universe resolution."""
+
+    @pytest.fixture
+    def user(self):
+        return Mock(id=7)
+
+    def test_explicit_symbols(self, user):
+        request = ScreenerRequest(strategy="macd", symbols=[" aapl", "MSFT", ""])
+
+        assert _resolve_universe(request, user, Mock()) == ["AAPL", "MSFT"]
+
+    @pytest.mark.parametrize(
+        "sources",
+        [{}, {"symbols": ["AAPL"], "watchlist_id": 1}],
+    )
+    def test_exactly_one_source(self, user, sources):
+        with pytest.raises(HTTPException) as error:
+            _resolve_universe(ScreenerRequest(strategy="macd", **sources), user, Mock())
+
+        assert error.value.status_code == 400
+
+    def test_watchlist_symbols(self, user):
+        watchlist = Mock(items=[Mock(symbol="AAPL"), Mock(symbol="TSLA")])
+
+        with patch(
+            "app.api.v1.screener.router.WatchlistService"
+        ) as service_cls:
+            service_cls.return_value.get_watchlist.return_value = watchlist
+            symbols = _resolve_universe(
+                ScreenerRequest(strategy="gfs", watchlist_id=3), user, Mock()
+            )
+
+        service_cls.return_value.get_watchlist.assert_called_once_with(3, 7)
+        assert symbols == ["AAPL", "TSLA"]
+
+    def test_portfolio_holdings(self, user):
+        holdings = [Mock(asset=Mock(symbol="NVDA")), Mock(asset=Mock(symbol="AMD"))]
+
+        with patch("app.api.v1.screener.router.PortfolioService") as service_cls:
+            service_cls.return_value.get_portfolio_assets.return_value = holdings
+            symbols = _resolve_universe(
+                ScreenerRequest(strategy="gfs", portfolio_id=5), user, Mock()
+            )
+
+        assert symbols == ["NVDA", "AMD"]
+
+    def test_unknown_portfolio(self, user):
+        with patch("app.api.v1.screener.router.PortfolioService") as service_cls:
+            service_cls.return_value.get_portfolio.return_value = None
+            with pytest.raises(HTTPException) as error:
+                _resolve_universe(
+                    ScreenerRequest(strategy="gfs", portfolio_id=5), user, Mock()
+                )
+
+        assert error.value.status_code == 404
@@ -0,0 +1,345 @@
+"""
+Unit tests for streaming indicators and incremental indicator calculation.
+
+Tests cover:
+- Every streaming kernel matching its vectorized indicator, with and without fillna
+- Null handling of the kernels
+- Appended bars computed without recomputing the history
+- Revised last bar rewinding one bar, adjusted or gapped history rebuilding
+- Sliding history windows, one bar series per symbol and interval, LRU eviction
+- IndicatorRegistryService.calculate_indicators_incremental end to end
+"""
+
+import math
+from unittest.mock import Mock
+
+import numpy as np
+import pandas as pd
+import polars as pl
+import pytest
+
+from app.core.schemas.statistical_indicators import IndicatorConfiguration
+from app.core.services.indicator_registry_service import IndicatorRegistryService
+from app.core.services.indicator_state_store import (
+    BarSeries,
+    IndicatorStateStore,
+    IndicatorStream,
+)
+from utils.indicators.momentum_indicators import MomentumIndicators
+from utils.indicators.streaming_indicators import (
+    STREAMING_INDICATORS,
+    StreamingMACD,
+)
+from utils.indicators.trend_indicators import TrendIndicators
+from utils.indicators.volatility_indicators import VolatilityIndicators
+from utils.indicators.volume_indicators import VolumeIndicators
+
+INDICATOR_CLASSES = [
+    MomentumIndicators,
+    TrendIndicators,
+    VolatilityIndicators,
+    VolumeIndicators,
+]
+
+SCHEMA = {
+    "open": pl.Float64,
+    "high": pl.Float64,
+    "low": pl.Float64,
+    "close": pl.Float64,
+    "volume": pl.Int64,
+}
+
+
+def _ohlcv(n_bars, seed=1, null_rows=()):
+    rng = np.random.default_rng(seed)
+    close = 100 * np.cumprod(1 + rng.normal(0, 0.02, n_bars))
+    columns = {
+        "open": (close * (1 + rng.normal(0, 0.005, n_bars))).tolist(),
+        "high": (close * (1 + rng.uniform(0, 0.02, n_bars))).tolist(),
+        "low": (close * (1 - rng.uniform(0, 0.02, n_bars))).tolist(),
+        "close": close.tolist(),
+        "volume": rng.integers(1_000, 100_000, n_bars).tolist(),
+    }
+    for values in columns.values():
+        for row in null_rows:
+            values[row] = None
+    return pl.DataFrame(columns, schema=SCHEMA)
+
+
+def _vectorized(df, method_name, **params):
+    indicator_class = next(cls for cls in INDICATOR_CLASSES if hasattr(cls, method_name))
+    return getattr(indicator_class(df.clone()), method_name)(**params)
+
+
+def _assert_same(expected, actual):
+    assert len(expected) == len(actual)
+    for row, (x, y) in enumerate(zip(expected, actual)):
+        if x is None or y is None:
+            assert x is None and y is None, f"row {row}: {x} != {y}"
+        elif isinstance(x, float) and math.isnan(x):
+            assert math.isnan(y), f"row {row}: {x} != {y}"
+        else:
+            assert y == pytest.approx(x, rel=1e-9, abs=1e-9), f"row {row}"
+
+
+def _bars(df, start="2024-01-01"):
+    dates = pd.date_range(start, periods=df.height, freq="D").to_pydatetime()
+    return df.select(pl.Series("date", list(dates)), pl.all())
+
+
+class TestStreamingKernels:
+    """Streaming kernels against the vectorized indicators."""
+
+    @pytest.mark.parametrize("fillna", [False, True])
+    @pytest.mark.parametrize("method_name", sorted(STREAMING_INDICATORS))
+    def test_matches_vectorized(self, method_name, fillna):
+        df = _ohlcv(300, null_rows=(40, 41, 150))
+        expected = _vectorized(df, method_name, fillna=fillna)
+
+        kernel = STREAMING_INDICATORS[method_name](fillna=fillna)
+        rows = [kernel.update(bar) for bar in df.rows(named=True)]
+
+        for column in kernel.output_schema:
+            _assert_same(expected[column].to_list(), [row[column] for row in rows])
+
+    def test_custom_parameters(self):
+        df = _ohlcv(120)
+        params = {"window_slow": 10, "window_fast": 4, "window_sign": 3}
+        expected = _vectorized(df, "macd_indicator", **params)
+
+        kernel = StreamingMACD(**params)
+        rows = [kernel.update(bar) for bar in df.rows(named=True)]
+
+        _assert_same(expected["histogram"].to_list(), [row["histogram"] for row in rows])
+
+
+class TestBarSeries:
+    """Resuming, rewinding and rebuilding a bar series and its streams."""
+
+    KEY = ("rsi_indicator", "{}")
+
+    @pytest.fixture
+    def history(self):
+        df = _ohlcv(250)
+        return _bars(df), df
+
+    @classmethod
+    def _update(cls, series, bars):
+        offset, added = series.sync(bars)
+        frame = series.outputs(
+            cls.KEY, STREAMING_INDICATORS["rsi_indicator"], offset, bars.height
+        )
+        return frame, added
+
+    def test_appended_bars_only_compute_new_bars(self, history):
+        bars, df = history
+        series = BarSeries()
+        self._update(series, bars.head(200))
+
+        frame, added = self._update(series, bars)
+
+        assert added == 50
+        _assert_same(_vectorized(df, "rsi_indicator")["rsi"].to_list(), frame["rsi"].to_list())
+
+    def test_only_new_rows_reach_the_kernels(self, history, monkeypatch):
+        bars, _ = history
+        series = BarSeries()
+        self._update(series, bars.head(200))
+        fed = []
+        original = IndicatorStream.extend
+        monkeypatch.setattr(
+            IndicatorStream,
+            "extend",
+            lambda stream, new_bars: fed.append(new_bars.height) or original(stream, new_bars),
+        )
+
+        self._update(series, bars.head(201))
+
+        assert fed == [1]
+
+    def test_unchanged_history_computes_nothing(self, history):
+        bars, _ = history
+        series = BarSeries()
+        first, _ = self._update(series, bars)
+
+        frame, added = self._update(series, bars)
+
+        assert added == 0
+        assert frame.equals(first)
+
+    def test_revised_last_bar_rewinds_one_bar(self, history):
+        bars, df = history
+        series = BarSeries()
+        self._update(series, bars)
+
+        revised = bars.with_columns(
+            pl.when(pl.int_range(0, pl.count()) == bars.height - 1)
+            .then(pl.col("close") * 1.05)
+            .otherwise(pl.col("close"))
+            .alias("close")
+        )
+        frame, added = self._update(series, revised)
+
+        assert added == 1
+        expected = _vectorized(revised.drop("date"), "rsi_indicator")
+        _assert_same(expected["rsi"].to_list(), frame["rsi"].to_list())
+
+    def test_adjusted_history_rebuilds(self, history):
+        bars, _ = history
+        series = BarSeries()
+        self._update(series, bars.head(200))
+
+        # A 2:1 split rewrites every historical price
+        adjusted = bars.with_columns(pl.col("close") / 2)
+        frame, added = self._update(series, adjusted)
+
+        assert added == 250
+        expected = _vectorized(adjusted.drop("date"), "rsi_indicator")
+        _assert_same(expected["rsi"].to_list(), frame["rsi"].to_list())
+
+    def test_sliding_window_reuses_state(self, history):
+        bars, _ = history
+        series = BarSeries()
+        full, _ = self._update(series, bars.head(200))
+
+        frame, added = self._update(series, bars.slice(10, 200))
+
+        assert added == 10
+        assert len(frame) == 200
+        _assert_same(full["rsi"].to_list()[10:], frame["rsi"].to_list()[:190])
+
+    def test_shorter_history_returns_prefix(self, history):
+        bars, _ = history
+        series = BarSeries()
+        full, _ = self._update(series, bars)
+
+        frame, added = self._update(series, bars.head(100))
+
+        assert added == 0
+        assert frame.equals(full.head(100))
+
+    def test_history_with_a_gap_rebuilds(self, history):
+        bars, df = history
+        series = BarSeries()
+        self._update(series, bars.head(200))
+
+        gapped = pl.concat([bars.head(150), bars.slice(151)])
+        frame, added = self._update(series, gapped)
+
+        assert added == 249
+        expected = _vectorized(gapped.drop("date"), "rsi_indicator")
+        _assert_same(expected["rsi"].to_list(), frame["rsi"].to_list())
+
+    def test_new_stream_catches_up_on_stored_bars(self, history):
+        bars, df = history
+        series = BarSeries()
+        self._update(series, bars)
+
+        offset, _ = series.sync(bars)
+        frame = series.outputs(
+            ("obv_indicator", "{}"), STREAMING_INDICATORS["obv_indicator"], offset, bars.height
+        )
+
+        _assert_same(_vectorized(df, "obv_indicator")["obv"].to_list(), frame["obv"].to_list())
+
+
+class TestIndicatorStateStore:
+    """Series lookup and eviction."""
+
+    def test_key_ignores_symbol_case_and_parameter_order(self):
+        assert IndicatorStateStore.key("aapl", "1d", "macd_indicator", {"a": 1, "b": 2}) == (
+            IndicatorStateStore.key("AAPL", "1d", "macd_indicator", {"b": 2, "a": 1})
+        )
+
+    def test_one_series_per_symbol_and_interval(self):
+        store = IndicatorStateStore()
+        bars = _bars(_ohlcv(30))
+
+        store.compute("AAPL", "1d", "obv_indicator", {}, bars)
+        store.compute("AAPL", "1d", "rsi_indicator", {"window": 5}, bars)
+
+        assert len(store) == 1
+        assert len(store._series[("AAPL", "1d")].streams) == 2
+
+    def test_evicts_least_recently_used(self):
+        store = IndicatorStateStore(max_entries=2)
+        bars = _bars(_ohlcv(30))
+
+        for symbol in ("AAA", "BBB", "AAA", "CCC"):
+            store.compute(symbol, "1d", "obv_indicator", {}, bars)
+
+        assert len(store) == 2
+        assert set(key[0] for key in store._series) == {"AAA", "CCC"}
+
+    def test_unknown_indicator(self):
+        with pytest.raises(ValueError, match="no streaming kernel"):
+            IndicatorStateStore().compute("AAPL", "1d", "foo_indicator", {}, pl.DataFrame())
+
+
+class TestIncrementalRegistry:
+    """IndicatorRegistryService.calculate_indicators_incremental."""
+
+    @pytest.fixture
+    def registry(self):
+        return IndicatorRegistryService(Mock(), state_store=IndicatorStateStore())
+
+    @staticmethod
+    def _history(n_bars):
+        # Same shape as MarketDataService.fetch_ticker_data: newest first
+        df = _ohlcv(n_bars).to_pandas()
+        df.columns = ["Open", "High", "Low", "Close", "Volume"]
+        df.insert(0, "Date", pd.date_range("2024-01-01", periods=n_bars, freq="D", tz="America/New_York"))
+        return df.iloc[::-1].reset_index(drop=True)
+
+    @staticmethod
+    def _configs():
+        return [
+            IndicatorConfiguration(id="rsi10", indicator_name="rsi_indicator", parameters={"window": 10}),
+            IndicatorConfiguration(id="bb", indicator_name="bollinger_bands_indicator", parameters={}),
+            IndicatorConfiguration(id="obv", indicator_name="obv_indicator", parameters={}, enabled=False),
+        ]
+
+    def test_matches_full_calculation_in_date_order(self, registry):
+        history = self._history(200)
+        ascending = history.iloc[::-1].reset_index(drop=True)
+
+        result, errors, metrics = registry.calculate_indicators_incremental(
+            "AAPL", "1d", history, self._configs()
+        )
+
+        assert errors == []
+        assert metrics.data_points_processed == 200
+        assert result["date"].is_sorted()
+        assert "Close" in result.columns and "close" in result.columns
+        assert not any(col.endswith("_obv") for col in result.columns)
+        for config in self._configs()[:2]:
+            expected, _, _ = registry.calculate_indicators(ascending, [config])
+            indicator_columns = [col for col in expected.columns if col.endswith(config.id)]
+            assert indicator_columns
+            for column in indicator_columns:
+                _assert_same(expected[column].to_list(), result[column].to_list())
+
+    def test_appended_bars_reuse_state(self, registry):
+        history = self._history(260)
+        registry.calculate_indicators_incremental("AAPL", "1d", history.iloc[60:], self._configs())
+        series = registry.state_store._series[("AAPL", "1d")]
+        streams = list(series.streams.values())
+
+        result, errors, _ = registry.calculate_indicators_incremental(
+            "AAPL", "1d", history, self._configs()
+        )
+
+        assert errors == []
+        assert list(series.streams.values()) == streams
+        assert len(result) == 260
+        assert series.bars.height == 260
+        assert all(len(stream) == 260 for stream in streams)
+
+    def test_missing_columns_are_reported(self, registry):
+        history = self._history(50).drop(columns=["Volume"])
+        configs = [IndicatorConfiguration(indicator_name="mfi_indicator", parameters={})]
+
+        _, errors, _ = registry.calculate_indicators_incremental("AAPL", "1d", history, configs)
+
+        assert len(errors) == 1
+        assert "Missing required columns" in errors[0].error_message
@@ -313,6 +313,36 @@ class TestTrendIndicators(unittest.TestCase):
             # Small datasets might not have enough data for indicators
             pass
 
+    def test_psar_indicator_comparison(self):
+        """Test PSAR indicator calculation and compare with ta package."""
+        # Our implementation
+        indicator = TrendIndicators(self.pl_df)
+        our_result = indicator.psar_indicator(step=0.02, max_step=0.2)
+
+        # ta package implementation
+        ta_psar = ta_trend.PSARIndicator(
+            high=self.pd_df["High"],
+            low=self.pd_df["Low"],
+            close=self.pd_df["Close"],
+            step=0.02,
+            max_step=0.2,
+            fillna=False,
+        )
+
+        # Same recursion, so the values match exactly
+        for column, expected in (
+            ("psar", ta_psar.psar()),
+            ("psar_up", ta_psar.psar_up()),
+            ("psar_down", ta_psar.psar_down()),
+            ("psar_up_indicator", ta_psar.psar_up_indicator()),
+            ("psar_down_indicator", ta_psar.psar_down_indicator()),
+        ):
+            np.testing.assert_allclose(
+                our_result[column].cast(pl.Float64).to_numpy(),
+                expected.to_numpy(dtype=float),
+                err_msg=f"{column} should match ta",
+            )
+
     def test_performance_comparison(self):
         """Test performance comparison between our implementation and ta package."""
         import time
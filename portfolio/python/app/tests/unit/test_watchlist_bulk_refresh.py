@@ -0,0 +1,170 @@
+"""
+Unit tests for the bulk watchlist price refresh.
+
+Tests cover:
+- One UPDATE ... FROM (VALUES ...) for every quoted symbol
+- Performance rows written with a single multi-row INSERT
+- Alerts evaluated once and the refresh committed once
+- None prices skipped, empty quote maps touching nothing
+- Rollback, and an alert index reload, when a statement fails
+- Per-symbol refresh delegating to the bulk path
+- Ingestion ticks refreshing watchlists with the cached prices
+"""
+
+from decimal import Decimal
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.core.services.price_ingestion_service import PriceIngestionService
+from app.core.services.watchlist_service import WatchlistService
+
+
+def _sql(statement):
+    return str(statement.compile(dialect=postgresql.dialect()))
+
+
+def _session(updated_rows):
+    db = Mock()
+    db.execute.return_value.all.return_value = updated_rows
+    return db
+
+
+@pytest.fixture
+def alert_engine():
+    return Mock(evaluate=Mock(return_value={7: Decimal("151.25")}))
+
+
+class TestBulkUpdatePrices:
+    """WatchlistService.bulk_update_prices."""
+
+    def test_refresh_costs_two_statements_and_one_commit(self, alert_engine):
+        updated = [
+            (item_id, Decimal("151.25"), Decimal("1.25"), Decimal("0.83"))
+            for item_id in range(10_000)
+        ]
+        db = _session(updated)
+        service = WatchlistService(db, alert_engine=alert_engine)
+
+        result = service.bulk_update_prices(
+            {"aapl": 151.254, "MSFT": Decimal("410.5"), "TSLA": None}
+        )
+
+        assert result == {"symbols": 2, "items": 10_000, "alerts": 1}
+        assert db.execute.call_count == 2
+        db.commit.assert_called_once()
+        db.add.assert_not_called()
+        db.query.assert_not_called()
+
+        update_statement, insert_statement = (
+            call.args[0] for call in db.execute.call_args_list
+        )
+        sql = _sql(update_statement)
+        assert sql.startswith("UPDATE watchlist_items SET current_price=quotes.price")
+        assert "FROM (VALUES" in sql
+        assert "IS DISTINCT FROM quotes.price" in sql
+        assert "RETURNING watchlist_items.id" in sql
+        # Prices are rounded to the column scale before they are compared
+        params = list(update_statement.compile(dialect=postgresql.dialect()).params.values())
+        assert params[-4:] == ["AAPL", Decimal("151.25"), "MSFT", Decimal("410.50")]
+
+        sql = _sql(insert_statement)
+        assert sql.startswith("INSERT INTO watchlist_performance")
+        assert sql.count("%(watchlist_item_id_m") == 10_000
+        params = insert_statement.compile().params
+        assert params["watchlist_item_id_m9999"] == 9_999
+        assert params["price_m0"] == Decimal("151.25")
+
+        alert_engine.evaluate.assert_called_once_with(
+            db, {"AAPL": Decimal("151.25"), "MSFT": Decimal("410.50")}
+        )
+
+    def test_unchanged_prices_insert_nothing(self, alert_engine):
+        db = _session([])
+        service = WatchlistService(db, alert_engine=alert_engine)
+
+        result = service.bulk_update_prices({"AAPL": 150})
+
+        assert result["items"] == 0
+        db.execute.assert_called_once()
+        alert_engine.evaluate.assert_called_once()
+        db.commit.assert_called_once()
+
+    def test_no_prices_touch_nothing(self, alert_engine):
+        db = _session([])
+        service = WatchlistService(db, alert_engine=alert_engine)
+
+        assert service.bulk_update_prices({"AAPL": None}) == {
+            "symbols": 0, "items": 0, "alerts": 0,
+        }
+        db.execute.assert_not_called()
+        db.commit.assert_not_called()
+        alert_engine.evaluate.assert_not_called()
+
+    def test_failure_rolls_back(self, alert_engine):
+        db = _session([(1, Decimal("1"), None, None)])
+        alert_engine.evaluate.side_effect = RuntimeError("database down")
+        service = WatchlistService(db, alert_engine=alert_engine)
+
+        with pytest.raises(RuntimeError):
+            service.bulk_update_prices({"AAPL": 1})
+
+        db.rollback.assert_called_once()
+        db.commit.assert_not_called()
+        alert_engine.invalidate.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_per_symbol_refresh_uses_bulk_path(self, alert_engine):
+        db = _session([(1, Decimal("99.50"), None, None)])
+        db.query.return_value.filter.return_value.count.return_value = 3
+        service = WatchlistService(db, alert_engine=alert_engine)
+        service.market_data_service = Mock(get_cached_price=AsyncMock(return_value=99.5))
+
+        assert await service.update_watchlist_item_prices("aapl") is True
+        service.market_data_service.get_cached_price.assert_awaited_once_with(symbol="AAPL")
+        db.commit.assert_called_once()
+
+        db.query.return_value.filter.return_value.count.return_value = 0
+        assert await service.update_watchlist_item_prices("NONE") is False
+
+
+class TestIngestionRefresh:
+    """PriceIngestionService refreshing watchlists after caching a tick."""
+
+    @pytest.mark.asyncio
+    async def test_tick_prices_refresh_watchlists(self, monkeypatch):
+        sessions = []
+        refreshed = []
+
+        def session_factory():
+            db = Mock()
+            sessions.append(db)
+            return db
+
+        def bulk_update_prices(self, prices):
+            refreshed.append(prices)
+            return {"symbols": len(prices), "items": 5, "alerts": 0}
+
+        monkeypatch.setattr(WatchlistService, "bulk_update_prices", bulk_update_prices)
+        redis_client = Mock()
+        redis_client.extend_lock.return_value = True
+        service = PriceIngestionService(
+            session_factory=session_factory,
+            market_data=Mock(
+                get_latest_quotes=AsyncMock(
+                    return_value={"AAPL": {"regularMarketPrice": 150.0}, "AMD": None}
+                )
+            ),
+            cache=Mock(),
+            redis_client=redis_client,
+            watchlist_refresh=True,
+            history=Mock(compaction_due=Mock(return_value=False)),
+        )
+        service.collect_symbols = Mock(return_value=["AAPL", "AMD"])
+
+        result = await service.ingest_once()
+
+        assert result["watchlist_items"] == 5
+        assert refreshed == [{"AAPL": 150.0}]
+        sessions[-1].close.assert_called_once()
@@ -0,0 +1,274 @@
+"""
+Unit tests for watchlist history retention and rollups.
+
+Tests cover:
+- Bucket boundaries, retention cutoffs and resolution choice
+- Compaction as two upserts and two deletes in one transaction
+- Merging buckets split across raw ticks and rollups
+- Reads at raw, hourly and daily resolution
+- Item history ownership checks
+- Compaction scheduled on the price ingestion tick
+"""
+
+import random
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.core.services.price_ingestion_service import PriceIngestionService
+from app.core.services.watchlist_history_service import (
+    DAY,
+    HOUR,
+    RAW,
+    WatchlistHistoryService,
+    bucket_floor,
+    merge_buckets,
+)
+from app.core.services.watchlist_service import WatchlistService
+
+NOW = datetime(2024, 3, 20, 15, 42, 10, tzinfo=timezone.utc)
+
+
+def _sql(statement):
+    return str(statement.compile(dialect=postgresql.dialect()))
+
+
+def _ticks(start, hours, seed=0):
+    """Random (time, price) ticks every ten minutes."""
+    rng = random.Random(seed)
+    return [
+        (start + timedelta(minutes=10 * i), Decimal(rng.randint(9000, 11000)) / 100)
+        for i in range(hours * 6)
+    ]
+
+
+def _buckets(ticks, resolution):
+    """Bucket rows as the raw bucket select returns them."""
+    rows = {}
+    for moment, price in ticks:
+        rows.setdefault(bucket_floor(moment, resolution), []).append(price)
+    return [
+        (1, resolution, start, prices[0], max(prices), min(prices), prices[-1], len(prices))
+        for start, prices in sorted(rows.items())
+    ]
+
+
+@pytest.fixture
+def service():
+    return WatchlistHistoryService(
+        raw_retention_hours=48, hourly_retention_days=30, compaction_interval=3600
+    )
+
+
+class TestResolution:
+    """Cutoffs and resolution choice."""
+
+    def test_cutoffs_fall_on_bucket_boundaries(self, service):
+        assert bucket_floor(NOW, HOUR) == datetime(2024, 3, 20, 15, tzinfo=timezone.utc)
+        assert bucket_floor(NOW, DAY) == datetime(2024, 3, 20, tzinfo=timezone.utc)
+        assert service.cutoffs(NOW) == (
+            datetime(2024, 3, 18, 15, tzinfo=timezone.utc),
+            datetime(2024, 2, 19, tzinfo=timezone.utc),
+        )
+
+    def test_finest_resolution_covering_the_range(self, service):
+        assert service.resolution_for(NOW - timedelta(hours=12), NOW) == RAW
+        assert service.resolution_for(NOW - timedelta(days=7), NOW) == HOUR
+        assert service.resolution_for(NOW - timedelta(days=365), NOW) == DAY
+
+
+class TestCompaction:
+    """WatchlistHistoryService.compact."""
+
+    def test_two_upserts_and_two_deletes_in_one_transaction(self, service):
+        db = Mock()
+        db.execute.return_value.rowcount = 3
+
+        result = service.compact(db, now=NOW)
+
+        assert result == {
+            "hourly_buckets": 3,
+            "daily_buckets": 3,
+            "ticks_deleted": 3,
+            "hourly_buckets_deleted": 3,
+        }
+        db.commit.assert_called_once()
+        hours, ticks, days, hours_deleted = (
+            _sql(call.args[0]) for call in db.execute.call_args_list
+        )
+
+        assert hours.startswith("INSERT INTO watchlist_performance_rollups")
+        assert "date_trunc('hour', watchlist_performance.date, 'UTC')" in hours
+        assert "ORDER BY watchlist_performance.date DESC" in hours
+        assert "ON CONFLICT ON CONSTRAINT uq_watchlist_rollup_item_resolution_bucket" in hours
+        assert "greatest(watchlist_performance_rollups.high, excluded.high)" in hours
+        assert ticks.startswith("DELETE FROM watchlist_performance WHERE")
+
+        assert "date_trunc('day', watchlist_performance_rollups.bucket_start, 'UTC')" in days
+        assert "sum(watchlist_performance_rollups.samples)" in days
+        assert hours_deleted.startswith("DELETE FROM watchlist_performance_rollups WHERE")
+
+        params = db.execute.call_args_list[1].args[0].compile().params
+        assert list(params.values()) == [datetime(2024, 3, 18, 15, tzinfo=timezone.utc)]
+
+    def test_failure_rolls_back(self, service):
+        db = Mock()
+        db.execute.side_effect = [Mock(), RuntimeError("database down")]
+
+        with pytest.raises(RuntimeError):
+            service.compact(db, now=NOW)
+
+        db.rollback.assert_called_once()
+        db.commit.assert_not_called()
+        assert service.compaction_due()
+
+    def test_compaction_is_due_once_per_interval(self, service):
+        assert service.compaction_due()
+        service.compact(Mock(), now=NOW)
+        assert not service.compaction_due()
+        service.compaction_interval = 0
+        assert service.compaction_due()
+
+
+class TestReads:
+    """Bucket merging and resolution-aware history reads."""
+
+    def test_buckets_split_across_sources_match_direct_rollup(self):
+        ticks = _ticks(datetime(2024, 3, 1, tzinfo=timezone.utc), hours=72, seed=3)
+        cutoff = datetime(2024, 3, 2, 13, tzinfo=timezone.utc)
+        compacted = [tick for tick in ticks if tick[0] < cutoff]
+        recent = [tick for tick in ticks if tick[0] >= cutoff]
+
+        # Days from hourly rollups of the old ticks plus on-the-fly raw buckets
+        hourly = _buckets(compacted, HOUR)
+        daily_from_hours = {}
+        for row in hourly:
+            daily_from_hours.setdefault(bucket_floor(row[2], DAY), []).append(row)
+        days = [
+            (1, DAY, start, rows[0][3], max(r[4] for r in rows), min(r[5] for r in rows),
+             rows[-1][6], sum(r[7] for r in rows))
+            for start, rows in sorted(daily_from_hours.items())
+        ]
+        merged = merge_buckets([days, _buckets(recent, DAY)])
+
+        expected = merge_buckets([_buckets(ticks, DAY)])
+        assert merged == expected
+        assert [bar["samples"] for bar in merged] == [144, 144, 144]
+
+    def test_raw_range_reads_ticks(self, service):
+        db = Mock()
+        ticks = _ticks(NOW - timedelta(hours=2), hours=1)
+        db.execute.return_value.all.return_value = ticks
+
+        resolution, bars = service.history(db, 7, NOW - timedelta(hours=2), now=NOW)
+
+        assert resolution == RAW
+        assert len(bars) == 6
+        assert bars[0] == {
+            "bucket_start": ticks[0][0],
+            "open": ticks[0][1],
+            "high": ticks[0][1],
+            "low": ticks[0][1],
+            "close": ticks[0][1],
+            "samples": 1,
+        }
+        sql = _sql(db.execute.call_args.args[0])
+        assert sql.startswith("SELECT watchlist_performance.date, watchlist_performance.price")
+
+    def test_long_range_reads_daily_hourly_and_raw_buckets(self, service):
+        db = Mock()
+        day = datetime(2024, 3, 19, tzinfo=timezone.utc)
+        db.execute.return_value.all.side_effect = [
+            [(7, DAY, day - timedelta(days=40), Decimal("90"), Decimal("95"), Decimal("85"),
+              Decimal("91"), 500)],
+            [(7, DAY, day, Decimal("100"), Decimal("110"), Decimal("99"), Decimal("105"), 40)],
+            [(7, DAY, day, Decimal("104"), Decimal("120"), Decimal("101"), Decimal("118"), 10)],
+        ]
+
+        resolution, bars = service.history(db, 7, NOW - timedelta(days=90), now=NOW)
+
+        assert resolution == DAY
+        assert db.execute.call_count == 3
+        daily, hourly, raw = (_sql(call.args[0]) for call in db.execute.call_args_list)
+        assert "FROM watchlist_performance_rollups" in daily
+        assert "date_trunc('day', watchlist_performance_rollups.bucket_start, 'UTC')" in hourly
+        assert "FROM watchlist_performance " in raw
+        assert bars[1] == {
+            "bucket_start": day,
+            "open": Decimal("100"),
+            "high": Decimal("120"),
+            "low": Decimal("99"),
+            "close": Decimal("118"),
+            "samples": 50,
+        }
+
+    def test_week_range_reads_hourly_and_raw_buckets(self, service):
+        db = Mock()
+        db.execute.return_value.all.return_value = []
+
+        resolution, bars = service.history(db, 7, NOW - timedelta(days=7), now=NOW)
+
+        assert (resolution, bars) == (HOUR, [])
+        assert db.execute.call_count == 2
+        params = db.execute.call_args_list[0].args[0].compile().params
+        # Starts at the bucket containing the start of the range
+        assert datetime(2024, 3, 13, 15, tzinfo=timezone.utc) in params.values()
+
+
+class TestItemHistory:
+    """WatchlistService.get_item_history."""
+
+    def test_only_owned_items(self):
+        db = Mock()
+        history = Mock(history=Mock(return_value=(HOUR, [])))
+        service = WatchlistService(db, history=history)
+
+        db.query.return_value.join.return_value.filter.return_value.first.return_value = None
+        assert service.get_item_history(7, 1, days=7) is None
+        history.history.assert_not_called()
+
+        db.query.return_value.join.return_value.filter.return_value.first.return_value = Mock(
+            id=7, symbol="AAPL"
+        )
+        assert service.get_item_history(7, 1, days=7) == {
+            "item_id": 7, "symbol": "AAPL", "resolution": HOUR, "bars": [],
+        }
+        assert history.history.call_args.args[:2] == (db, 7)
+
+
+class TestScheduledCompaction:
+    """Compaction on the price ingestion tick."""
+
+    @pytest.mark.asyncio
+    async def test_lock_holder_compacts_when_due(self):
+        history = Mock(compaction_due=Mock(return_value=True))
+        history.compact.side_effect = [{"ticks_deleted": 10}, RuntimeError("database down")]
+        redis_client = Mock()
+        redis_client.extend_lock.return_value = True
+        service = PriceIngestionService(
+            session_factory=Mock,
+            market_data=Mock(get_latest_quotes=AsyncMock(return_value={})),
+            cache=Mock(),
+            redis_client=redis_client,
+            watchlist_refresh=True,
+            history=history,
+        )
+        service.collect_symbols = Mock(return_value=["AAPL"])
+
+        await service.ingest_once()
+        # A failed compaction leaves the tick intact
+        assert (await service.ingest_once())["skipped"] is False
+        assert history.compact.call_count == 2
+
+        history.compaction_due.return_value = False
+        await service.ingest_once()
+        assert history.compact.call_count == 2
+
+        redis_client.extend_lock.return_value = False
+        redis_client.acquire_lock.return_value = False
+        history.compaction_due.return_value = True
+        assert await service.ingest_once() == {"skipped": True}
+        assert history.compact.call_count == 2
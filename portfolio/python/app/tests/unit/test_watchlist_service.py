@@ -45,6 +45,7 @@ class TestWatchlistService:
         """Create a mock market data service."""
         mock_service = Mock()
         mock_service.get_current_price = AsyncMock(return_value=Decimal("150.00"))
+        mock_service.get_cached_price = AsyncMock(return_value=Decimal("150.00"))
         mock_service.get_market_data = AsyncMock(
             return_value={
                 "current_price": Decimal("150.00"),
@@ -1,6 +1,17 @@
 import pandas as pd
 import polars as pl
 
+# Market data column names -> pythonic snake_case used by the indicators
+COLUMN_NAME_MAPPING = {
+    "Date": "date",
+    "Open": "open",
+    "High": "high",
+    "Low": "low",
+    "Close": "close",
+    "Volume": "volume",
+    "Adj Close": "adj_close",
+}
+
 
 class BaseIndicator:
     """Base Indicator class with pythonic column naming."""
@@ -32,21 +43,12 @@ class BaseIndicator:
             not self.df.is_empty()
         ), "The DataFrame is empty. No indicator calculation can be performed."
 
-    def _normalize_column_names(self, df: pl.DataFrame) -> pl.DataFrame:
+    @staticmethod
+    def _normalize_column_names(df: pl.DataFrame) -> pl.DataFrame:
         """Convert column names to pythonic snake_case."""
-        column_mapping = {
-            "Date": "date",
-            "Open": "open",
-            "High": "high",
-            "Low": "low",
-            "Close": "close",
-            "Volume": "volume",
-            "Adj Close": "adj_close",
-        }
-
         # Apply column name mapping
         rename_dict = {}
-        for old_name, new_name in column_mapping.items():
+        for old_name, new_name in COLUMN_NAME_MAPPING.items():
             if old_name in df.columns:
                 rename_dict[old_name] = new_name
 
@@ -54,3 +56,23 @@ class BaseIndicator:
             df = df.rename(rename_dict)
 
         return df
+
+
+def forward_fill(expr: pl.Expr, fillna: bool) -> pl.Expr:
+    """Forward-fill nulls of an indicator expression when fillna is set."""
+    return expr.fill_null(strategy="forward") if fillna else expr
+
+
+def typical_price() -> pl.Expr:
+    """Typical Price = (High + Low + Close) / 3"""
+    return (pl.col("high") + pl.col("low") + pl.col("close")) / 3
+
+
+def true_range() -> pl.Expr:
+    """True Range = max(High-Low, |High-PrevClose|, |Low-PrevClose|)"""
+    prev_close = pl.col("close").shift(1)
+    return pl.max_horizontal(
+        pl.col("high") - pl.col("low"),
+        (pl.col("high") - prev_close).abs(),
+        (pl.col("low") - prev_close).abs(),
+    )
@@ -1,6 +1,8 @@
+from typing import Dict
+
 import polars as pl
 
-from utils.indicators import BaseIndicator
+from utils.indicators.base import BaseIndicator, forward_fill
 
 
 class MomentumIndicators(BaseIndicator):
@@ -18,63 +20,21 @@ class MomentumIndicators(BaseIndicator):
         :param fillna: If True, fill NaN values.
         :return: DataFrame with RSI indicator field.
         """
-        # Calculate price changes
-        self.df = self.df.with_columns([pl.col("close").diff().alias("price_change")])
-
-        # Calculate gains and losses
-        self.df = self.df.with_columns(
-            [
-                pl.when(pl.col("price_change") > 0)
-                .then(pl.col("price_change"))
-                .otherwise(0)
-                .alias("gains"),
-                pl.when(pl.col("price_change") < 0)
-                .then(-pl.col("price_change"))
-                .otherwise(0)
-                .alias("losses"),
-            ]
-        )
-
-        # Calculate RSI using exponential moving averages
-        # This `min_periods` logic is a good way to handle fillna at the source
-        min_periods = 0 if fillna else window
-
         self.df = self.df.with_columns(
-            [
-                pl.col("gains")
-                .ewm_mean(span=window, min_periods=min_periods)
-                .alias("avg_gains"),
-                pl.col("losses")
-                .ewm_mean(span=window, min_periods=min_periods)
-                .alias("avg_losses"),
-            ]
+            list(self.rsi_expressions(window=window, fillna=fillna).values())
         )
-
-        # Calculate RSI
-        self.df = self.df.with_columns(
-            [
-                pl.when(pl.col("avg_losses") == 0)
-                .then(100.0)
-                .otherwise(
-                    100.0
-                    - (100.0 / (1.0 + (pl.col("avg_gains") / pl.col("avg_losses"))))
-                )
-                .alias("rsi")
-            ]
-        )
-
-        # Clean up temporary columns
-        self.df = self.df.drop(
-            ["price_change", "gains", "losses", "avg_gains", "avg_losses"]
-        )
-
-        if fillna:
-            self.df = self.df.with_columns(
-                [pl.col("rsi").fill_null(strategy="forward")]
-            )
-
         return self.df
 
+    @staticmethod
+    def rsi_expressions(window: int = 14, fillna: bool = False) -> Dict[str, pl.Expr]:
+        """
+        RSI as Polars expressions, see rsi_indicator.
+        :param window: N -Period.
+        :param fillna: If True, fill NaN values.
+        :return: Output column name -> expression.
+        """
+        return {"rsi": _rsi(window, fillna).alias("rsi")}
+
     def roc_indicator(self, window: int = 12, fillna: bool = False) -> pl.DataFrame:
         """
         Rate of Change (ROC)
@@ -83,25 +43,27 @@ class MomentumIndicators(BaseIndicator):
         :param fillna: If True, fill NaN values.
         :return: DataFrame with ROC indicator field.
         """
-        # Calculate ROC: ((Current Price - Price n periods ago) / Price n periods ago) * 100
         self.df = self.df.with_columns(
-            [
-                (
-                    (pl.col("close") - pl.col("close").shift(window))
-                    / pl.col("close").shift(window)
-                    * 100
-                ).alias("roc")
-            ]
+            list(self.roc_expressions(window=window, fillna=fillna).values())
         )
-
-        # ***FIXED***: Changed `if not fillna:` to `if fillna:`
-        if fillna:
-            self.df = self.df.with_columns(
-                [pl.col("roc").fill_null(strategy="forward")]
-            )
-
         return self.df
 
+    @staticmethod
+    def roc_expressions(window: int = 12, fillna: bool = False) -> Dict[str, pl.Expr]:
+        """
+        ROC as Polars expressions, see roc_indicator.
+        :param window: N -Period.
+        :param fillna: If True, fill NaN values.
+        :return: Output column name -> expression.
+        """
+        # Calculate ROC: ((Current Price - Price n periods ago) / Price n periods ago) * 100
+        roc = (
+            (pl.col("close") - pl.col("close").shift(window))
+            / pl.col("close").shift(window)
+            * 100
+        )
+        return {"roc": forward_fill(roc, fillna).alias("roc")}
+
     def stoch_rsi_indicator(
         self, window: int = 14, smooth1: int = 3, smooth2: int = 3, fillna: bool = False
     ) -> pl.DataFrame:
@@ -118,58 +80,26 @@ class MomentumIndicators(BaseIndicator):
         if "rsi" not in self.df.columns:
             self.df = self.rsi_indicator(window=window, fillna=fillna)
 
-        # Calculate Stochastic RSI
-        # %K = (RSI - RSI_min) / (RSI_max - RSI_min)
-        self.df = self.df.with_columns(
-            [
-                pl.col("rsi").rolling_min(window_size=window).alias("rsi_min"),
-                pl.col("rsi").rolling_max(window_size=window).alias("rsi_max"),
-            ]
-        )
-
-        self.df = self.df.with_columns(
-            [
-                # ***FIXED***: Added when/otherwise to handle division by zero
-                pl.when(pl.col("rsi_max") == pl.col("rsi_min"))
-                .then(0.0)  # Or 100.0 if RSI == rsi_max, but 0.0 is safer
-                .otherwise(
-                    (
-                        (pl.col("rsi") - pl.col("rsi_min"))
-                        / (pl.col("rsi_max") - pl.col("rsi_min"))
-                    )
-                    * 100
-                )
-                .alias("stoch_rsi_k")
-            ]
-        )
-
-        # %D = SMA of %K
         self.df = self.df.with_columns(
-            [
-                pl.col("stoch_rsi_k")
-                .rolling_mean(window_size=smooth1)
-                .alias("stoch_rsi_d")
-            ]
+            list(_stoch_rsi(pl.col("rsi"), window, smooth1, fillna).values())
         )
-
-        # Stochastic RSI = %D
-        self.df = self.df.with_columns([pl.col("stoch_rsi_d").alias("stoch_rsi")])
-
-        # Clean up temporary columns
-        self.df = self.df.drop(["rsi_min", "rsi_max"])
-
-        # ***FIXED***: Changed `if not fillna:` to `if fillna:`
-        if fillna:
-            self.df = self.df.with_columns(
-                [
-                    pl.col("stoch_rsi").fill_null(strategy="forward"),
-                    pl.col("stoch_rsi_d").fill_null(strategy="forward"),
-                    pl.col("stoch_rsi_k").fill_null(strategy="forward"),
-                ]
-            )
-
         return self.df
 
+    @staticmethod
+    def stoch_rsi_expressions(
+        window: int = 14, smooth1: int = 3, smooth2: int = 3, fillna: bool = False
+    ) -> Dict[str, pl.Expr]:
+        """
+        Stochastic RSI as Polars expressions, see stoch_rsi_indicator.
+        The RSI it is based on is computed inline rather than read from a column.
+        :param window: N -Period.
+        :param smooth1: Moving average of Stochastic RSI.
+        :param smooth2: Moving average of %K.
+        :param fillna: If True, fill NaN values.
+        :return: Output column name -> expression.
+        """
+        return _stoch_rsi(_rsi(window, fillna), window, smooth1, fillna)
+
     def stoch_oscillator_indicator(
         self, window: int = 14, smooth_window: int = 3, fillna: bool = False
     ) -> pl.DataFrame:
@@ -181,51 +111,42 @@ class MomentumIndicators(BaseIndicator):
         :param fillna: If True, fill NaN values.
         :return: DataFrame with Stochastic Oscillator indicator fields.
         """
-        # Calculate Stochastic Oscillator
-        # %K = (Close - Low_min) / (High_max - Low_min) * 100
         self.df = self.df.with_columns(
-            [
-                pl.col("low").rolling_min(window_size=window).alias("low_min"),
-                pl.col("high").rolling_max(window_size=window).alias("high_max"),
-            ]
+            list(
+                self.stoch_oscillator_expressions(
+                    window=window, smooth_window=smooth_window, fillna=fillna
+                ).values()
+            )
         )
+        return self.df
 
-        self.df = self.df.with_columns(
-            [
-                pl.when(pl.col("high_max") == pl.col("low_min"))
-                .then(0.0)
-                .otherwise(
-                    (
-                        (pl.col("close") - pl.col("low_min"))
-                        / (pl.col("high_max") - pl.col("low_min"))
-                    )
-                    * 100
-                )
-                .alias("stoch")
-            ]
+    @staticmethod
+    def stoch_oscillator_expressions(
+        window: int = 14, smooth_window: int = 3, fillna: bool = False
+    ) -> Dict[str, pl.Expr]:
+        """
+        Stochastic Oscillator as Polars expressions, see stoch_oscillator_indicator.
+        :param window: N -Period.
+        :param smooth_window: SMA period over stoch_k.
+        :param fillna: If True, fill NaN values.
+        :return: Output column name -> expression.
+        """
+        # %K = (Close - Low_min) / (High_max - Low_min) * 100
+        low_min = pl.col("low").rolling_min(window_size=window)
+        high_max = pl.col("high").rolling_max(window_size=window)
+        stoch = (
+            pl.when(high_max == low_min)
+            .then(0.0)
+            .otherwise((pl.col("close") - low_min) / (high_max - low_min) * 100)
         )
 
         # %D = SMA of %K
-        self.df = self.df.with_columns(
-            [
-                pl.col("stoch")
-                .rolling_mean(window_size=smooth_window)
-                .alias("stoch_signal")
-            ]
-        )
+        stoch_signal = stoch.rolling_mean(window_size=smooth_window)
 
-        # Clean up temporary columns
-        self.df = self.df.drop(["low_min", "high_max"])
-
-        if fillna:
-            self.df = self.df.with_columns(
-                [
-                    pl.col("stoch").fill_null(strategy="forward"),
-                    pl.col("stoch_signal").fill_null(strategy="forward"),
-                ]
-            )
-
-        return self.df
+        return {
+            "stoch": forward_fill(stoch, fillna).alias("stoch"),
+            "stoch_signal": forward_fill(stoch_signal, fillna).alias("stoch_signal"),
+        }
 
     def all_momentum_indicators(self) -> pl.DataFrame:
         """
@@ -239,6 +160,52 @@ class MomentumIndicators(BaseIndicator):
         return self.df
 
 
+def _rsi(window: int, fillna: bool) -> pl.Expr:
+    """RSI of the close column (unaliased)."""
+    # Calculate price changes
+    price_change = pl.col("close").diff()
+
+    # Calculate gains and losses
+    gains = pl.when(price_change > 0).then(price_change).otherwise(0)
+    losses = pl.when(price_change < 0).then(-price_change).otherwise(0)
+
+    # Calculate RSI using exponential moving averages
+    # This `min_periods` logic is a good way to handle fillna at the source
+    min_periods = 0 if fillna else window
+    avg_gains = gains.ewm_mean(span=window, min_periods=min_periods)
+    avg_losses = losses.ewm_mean(span=window, min_periods=min_periods)
+
+    rsi = (
+        pl.when(avg_losses == 0)
+        .then(100.0)
+        .otherwise(100.0 - (100.0 / (1.0 + (avg_gains / avg_losses))))
+    )
+    return forward_fill(rsi, fillna)
+
+
+def _stoch_rsi(
+    rsi: pl.Expr, window: int, smooth1: int, fillna: bool
+) -> Dict[str, pl.Expr]:
+    """Stochastic RSI outputs from an RSI expression."""
+    # %K = (RSI - RSI_min) / (RSI_max - RSI_min)
+    rsi_min = rsi.rolling_min(window_size=window)
+    rsi_max = rsi.rolling_max(window_size=window)
+    stoch_rsi_k = (
+        pl.when(rsi_max == rsi_min)
+        .then(0.0)  # Or 100.0 if RSI == rsi_max, but 0.0 is safer
+        .otherwise((rsi - rsi_min) / (rsi_max - rsi_min) * 100)
+    )
+
+    # %D = SMA of %K; Stochastic RSI = %D
+    stoch_rsi_d = stoch_rsi_k.rolling_mean(window_size=smooth1)
+
+    return {
+        "stoch_rsi_k": forward_fill(stoch_rsi_k, fillna).alias("stoch_rsi_k"),
+        "stoch_rsi_d": forward_fill(stoch_rsi_d, fillna).alias("stoch_rsi_d"),
+        "stoch_rsi": forward_fill(stoch_rsi_d, fillna).alias("stoch_rsi"),
+    }
+
+
 # Convenience functions (No changes needed, these are fine)
 def calculate_rsi(prices: pl.Series, window: int = 14) -> pl.Series:
     """Calculate RSI for a price series."""
@@ -0,0 +1,698 @@
+"""
+Streaming indicator kernels.
+
+Each kernel mirrors one of the vectorized ``*_indicator`` methods but keeps
+its running state (EMA accumulators, rolling windows, cumulative sums) so
+bars can be fed one at a time and each bar costs O(1) in the history length.
+Null handling follows the Polars expressions the vectorized methods use.
+"""
+
+import math
+from collections import deque
+from typing import Any, Dict, List, Optional, Type
+
+import polars as pl
+
+from utils.indicators.parabolic_sar import DOWN, UP, ParabolicSAR
+
+Bar = Dict[str, Any]
+
+
+def _sub(a: Optional[float], b: Optional[float]) -> Optional[float]:
+    return None if a is None or b is None else a - b
+
+
+def _add(a: Optional[float], b: Optional[float]) -> Optional[float]:
+    return None if a is None or b is None else a + b
+
+
+def _mul(a: Optional[float], b: Optional[float]) -> Optional[float]:
+    return None if a is None or b is None else a * b
+
+
+def _div(a: Optional[float], b: Optional[float]) -> Optional[float]:
+    """Float division with IEEE semantics for a zero divisor, like Polars."""
+    if a is None or b is None:
+        return None
+    if b == 0:
+        if a == 0 or math.isnan(a):
+            return math.nan
+        return math.copysign(math.inf, a) * math.copysign(1.0, b)
+    return a / b
+
+
+def _gt(a: Optional[float], b: Optional[float]) -> bool:
+    """Comparison where a null operand behaves like a false condition."""
+    return a is not None and b is not None and a > b
+
+
+def _typical_price(bar: Bar) -> Optional[float]:
+    total = _add(_add(bar.get("high"), bar.get("low")), bar.get("close"))
+    return None if total is None else total / 3
+
+
+class _Ewm:
+    """Adjusted exponential mean ignoring nulls (Polars ``ewm_mean`` defaults)."""
+
+    def __init__(self, span: int, min_periods: int) -> None:
+        self.decay = 1 - 2 / (span + 1)
+        self.min_periods = min_periods
+        self.numerator = 0.0
+        self.denominator = 0.0
+        self.count = 0
+
+    def update(self, value: Optional[float]) -> Optional[float]:
+        if value is not None:
+            self.numerator = value + self.decay * self.numerator
+            self.denominator = 1 + self.decay * self.denominator
+            self.count += 1
+        if self.count == 0 or self.count < self.min_periods:
+            return None
+        return self.numerator / self.denominator
+
+
+class _Window:
+    """Fixed-size window of the latest values, nulls included."""
+
+    def __init__(self, size: int, min_periods: Optional[int] = None) -> None:
+        self.size = size
+        self.values: deque = deque(maxlen=size)
+        # Polars needs at least one value even with min_periods=0
+        self.min_periods = max(size if min_periods is None else min_periods, 1)
+
+    def push(self, value: Optional[float]) -> None:
+        self.values.append(value)
+
+    def _present(self) -> Optional[List[float]]:
+        present = [value for value in self.values if value is not None]
+        return present if len(present) >= self.min_periods else None
+
+    def mean(self) -> Optional[float]:
+        present = self._present()
+        return None if present is None else sum(present) / len(present)
+
+    def sum(self) -> Optional[float]:
+        present = self._present()
+        return None if present is None else sum(present)
+
+    def std(self) -> Optional[float]:
+        present = self._present()
+        if present is None:
+            return None
+        if len(present) == 1:
+            return 0.0
+        mean = sum(present) / len(present)
+        return math.sqrt(
+            sum((value - mean) ** 2 for value in present) / (len(present) - 1)
+        )
+
+    def min(self) -> Optional[float]:
+        present = self._present()
+        return None if present is None else min(present)
+
+    def max(self) -> Optional[float]:
+        present = self._present()
+        return None if present is None else max(present)
+
+    def arg_extreme(self, largest: bool) -> Optional[int]:
+        """Position of the first max/min once the window is full (``rolling_map``)."""
+        if len(self.values) < self.size:
+            return None
+        best = None
+        for position, value in enumerate(self.values):
+            if value is None:
+                continue
+            if best is None or (value > self.values[best] if largest else value < self.values[best]):
+                best = position
+        return best
+
+
+class _Lag:
+    """Value ``periods`` bars back (Polars ``shift``)."""
+
+    def __init__(self, periods: int = 1) -> None:
+        self.values: deque = deque(maxlen=periods)
+        self.periods = periods
+
+    def push(self, value: Optional[float]) -> Optional[float]:
+        lagged = self.values[0] if len(self.values) == self.periods else None
+        self.values.append(value)
+        return lagged
+
+
+class _CumSum:
+    """Running sum; null inputs give a null output without resetting the sum."""
+
+    def __init__(self) -> None:
+        self.total = 0
+
+    def update(self, value: Optional[float]) -> Optional[float]:
+        if value is None:
+            return None
+        self.total += value
+        return self.total
+
+
+class _TrueRange:
+    """max(high - low, |high - prev close|, |low - prev close|), ignoring nulls."""
+
+    def __init__(self) -> None:
+        self.prev_close = _Lag()
+
+    def update(self, bar: Bar) -> Optional[float]:
+        prev_close = self.prev_close.push(bar.get("close"))
+        high, low = bar.get("high"), bar.get("low")
+        candidates = [
+            _sub(high, low),
+            None if _sub(high, prev_close) is None else abs(high - prev_close),
+            None if _sub(low, prev_close) is None else abs(low - prev_close),
+        ]
+        present = [value for value in candidates if value is not None]
+        return max(present) if present else None
+
+
+class StreamingIndicator:
+    """Base class for bar-by-bar indicator kernels."""
+
+    # Output column -> Polars dtype, matching the vectorized method
+    output_schema: Dict[str, Any] = {}
+
+    def __init__(self, fillna: bool = False) -> None:
+        self.fillna = fillna
+        self._last_values: Dict[str, Any] = {}
+
+    def update(self, bar: Bar) -> Dict[str, Any]:
+        """
+        Consume one bar.
+        :param bar: Mapping with open/high/low/close/volume values (None for null).
+        :return: Output column values for this bar.
+        """
+        values = self._step(bar)
+        if self.fillna:
+            # fill_null(strategy="forward")
+            for column, value in values.items():
+                if value is None:
+                    values[column] = self._last_values.get(column)
+                else:
+                    self._last_values[column] = value
+        return values
+
+    def _step(self, bar: Bar) -> Dict[str, Any]:
+        raise NotImplementedError
+
+
+class StreamingRSI(StreamingIndicator):
+    """Streaming ``rsi_indicator``."""
+
+    output_schema = {"rsi": pl.Float64}
+
+    def __init__(self, window: int = 14, fillna: bool = False) -> None:
+        super().__init__(fillna)
+        min_periods = 0 if fillna else window
+        self.prev_close = _Lag()
+        self.gains = _Ewm(window, min_periods)
+        self.losses = _Ewm(window, min_periods)
+
+    def _step(self, bar: Bar) -> Dict[str, Any]:
+        close = bar.get("close")
+        change = _sub(close, self.prev_close.push(close))
+        avg_gains = self.gains.update(change if _gt(change, 0) else 0.0)
+        avg_losses = self.losses.update(-change if _gt(0, change) else 0.0)
+        if avg_losses is not None and avg_losses == 0:
+            rsi = 100.0
+        else:
+            ratio = _div(avg_gains, avg_losses)
+            rsi = None if ratio is None else 100.0 - _div(100.0, 1.0 + ratio)
+        return {"rsi": rsi}
+
+
+class StreamingROC(StreamingIndicator):
+    """Streaming ``roc_indicator``."""
+
+    output_schema = {"roc": pl.Float64}
+
+    def __init__(self, window: int = 12, fillna: bool = False) -> None:
+        super().__init__(fillna)
+        self.lagged_close = _Lag(window)
+
+    def _step(self, bar: Bar) -> Dict[str, Any]:
+        close = bar.get("close")
+        lagged = self.lagged_close.push(close)
+        return {"roc": _mul(_div(_sub(close, lagged), lagged), 100)}
+
+
+class StreamingStochRSI(StreamingIndicator):
+    """Streaming ``stoch_rsi_indicator``."""
+
+    output_schema = {
+        "stoch_rsi": pl.Float64,
+        "stoch_rsi_k": pl.Float64,
+        "stoch_rsi_d": pl.Float64,
+    }
+
+    def __init__(
+        self, window: int = 14, smooth1: int = 3, smooth2: int = 3, fillna: bool = False
+    ) -> None:
+        super().__init__(fillna)
+        self.rsi = StreamingRSI(window=window, fillna=fillna)
+        self.rsi_window = _Window(window)
+        self.k_window = _Window(smooth1)
+
+    def _step(self, bar: Bar) -> Dict[str, Any]:
+        rsi = self.rsi.update(bar)["rsi"]
+        self.rsi_window.push(rsi)
+        rsi_min, rsi_max = self.rsi_window.min(), self.rsi_window.max()
+        if rsi_min is not None and rsi_max is not None and rsi_max == rsi_min:
+            stoch_rsi_k = 0.0
+        else:
+            stoch_rsi_k = _mul(
+                _div(_sub(rsi, rsi_min), _sub(rsi_max, rsi_min)), 100
+            )
+        self.k_window.push(stoch_rsi_k)
+        stoch_rsi_d = self.k_window.mean()
+        return {
+            "stoch_rsi": stoch_rsi_d,
+            "stoch_rsi_k": stoch_rsi_k,
+            "stoch_rsi_d": stoch_rsi_d,
+        }
+
+
+class StreamingStochOscillator(StreamingIndicator):
+    """Streaming ``stoch_oscillator_indicator``."""
+
+    output_schema = {"stoch": pl.Float64, "stoch_signal": pl.Float64}
+
+    def __init__(
+        self, window: int = 14, smooth_window: int = 3, fillna: bool = False
+    ) -> None:
+        super().__init__(fillna)
+        self.lows = _Window(window)
+        self.highs = _Window(window)
+        self.stochs = _Window(smooth_window)
+
+    def _step(self, bar: Bar) -> Dict[str, Any]:
+        self.lows.push(bar.get("low"))
+        self.highs.push(bar.get("high"))
+        low_min, high_max = self.lows.min(), self.highs.max()
+        if low_min is not None and high_max is not None and high_max == low_min:
+            stoch = 0.0
+        else:
+            stoch = _mul(
+                _div(_sub(bar.get("close"), low_min), _sub(high_max, low_min)), 100
+            )
+        self.stochs.push(stoch)
+        return {"stoch": stoch, "stoch_signal": self.stochs.mean()}
+
+
+class StreamingMACD(StreamingIndicator):
+    """Streaming ``macd_indicator``."""
+
+    output_schema = {"macd": pl.Float64, "signal": pl.Float64, "histogram": pl.Float64}
+
+    def __init__(
+        self,
+        window_slow: int = 26,
+        window_fast: int = 12,
+        window_sign: int = 9,
+        fillna: bool = False,
+    ) -> None:
+        super().__init__(fillna)
+        self.ema_fast = _Ewm(window_fast, 0 if fillna else window_fast)
+        self.ema_slow = _Ewm(window_slow, 0 if fillna else window_slow)
+        self.ema_signal = _Ewm(window_sign, 0 if fillna else window_sign)
+
+    def _step(self, bar: Bar) -> Dict[str, Any]:
+        close = bar.get("close")
+        macd = _sub(self.ema_fast.update(close), self.ema_slow.update(close))
+        signal = self.ema_signal.update(macd)
+        return {"macd": macd, "signal": signal, "histogram": _sub(macd, signal)}
+
+
+class StreamingADX(StreamingIndicator):
+    """Streaming ``adx_indicator``."""
+
+    output_schema = {"adx": pl.Float64, "adx_pos": pl.Float64, "adx_neg": pl.Float64}
+
+    def __init__(self, window: int = 14, fillna: bool = False) -> None:
+        super().__init__(fillna)
+        min_periods = 0 if fillna else window
+        self.true_range = _TrueRange()
+        self.prev_high = _Lag()
+        self.prev_low = _Lag()
+        self.atr = _Ewm(window, min_periods)
+        self.plus_di = _Ewm(window, min_periods)
+        self.minus_di = _Ewm(window, min_periods)
+        self.adx = _Ewm(window, min_periods)
+
+    def _step(self, bar: Bar) -> Dict[str, Any]:
+        high, low = bar.get("high"), bar.get("low")
+        true_range = self.true_range.update(bar)
+        high_diff = _sub(high, self.prev_high.push(high))
+        low_diff = _sub(self.prev_low.push(low), low)
+        plus_dm = (high_diff if high_diff > 0 else 0) if _gt(high_diff, low_diff) else 0
+        minus_dm = (low_diff if low_diff > 0 else 0) if _gt(low_diff, high_diff) else 0
+
+        atr = self.atr.update(true_range)
+        plus_di = self.plus_di.update(plus_dm)
+        minus_di = self.minus_di.update(minus_dm)
+        if atr is not None and atr == 0:
+            adx_pos = adx_neg = 0.0
+        else:
+            adx_pos = _mul(_div(plus_di, atr), 100)
+            adx_neg = _mul(_div(minus_di, atr), 100)
+
+        di_sum = _add(adx_pos, adx_neg)
+        if di_sum is not None and di_sum == 0:
+            dx = 0.0
+        else:
+            di_diff = _sub(adx_pos, adx_neg)
+            dx = _mul(_div(None if di_diff is None else abs(di_diff), di_sum), 100)
+        return {"adx": self.adx.update(dx), "adx_pos": adx_pos, "adx_neg": adx_neg}
+
+
+class StreamingAroon(StreamingIndicator):
+    """Streaming ``aroon_indicator``."""
+
+    output_schema = {
+        "aroon_up": pl.Float64,
+        "aroon_down": pl.Float64,
+        "aroon_indicator": pl.Float64,
+    }
+
+    def __init__(self, window: int = 25, fillna: bool = False) -> None:
+        super().__init__(fillna)
+        self.window = window
+        self.highs = _Window(window)
+        self.lows = _Window(window)
+
+    def _step(self, bar: Bar) -> Dict[str, Any]:
+        self.highs.push(bar.get("high"))
+        self.lows.push(bar.get("low"))
+        idx_high = self.highs.arg_extreme(largest=True)
+        idx_low = self.lows.arg_extreme(largest=False)
+        # ((N - days since extreme) / N) * 100, days since = N - 1 - idx
+        aroon_up = None if idx_high is None else (idx_high + 1) / self.window * 100
+        aroon_down = None if idx_low is None else (idx_low + 1) / self.window * 100
+        return {
+            "aroon_up": aroon_up,
+            "aroon_down": aroon_down,
+            "aroon_indicator": _sub(aroon_up, aroon_down),
+        }
+
+
+class StreamingPSAR(StreamingIndicator):
+    """Streaming ``psar_indicator``."""
+
+    output_schema = {
+        "psar": pl.Float64,
+        "psar_down": pl.Float64,
+        "psar_down_indicator": pl.Int32,
+        "psar_up": pl.Float64,
+        "psar_up_indicator": pl.Int32,
+    }
+
+    def __init__(
+        self, step: float = 0.02, max_step: float = 0.2, fillna: bool = False
+    ) -> None:
+        super().__init__(fillna)
+        self.sar = ParabolicSAR(step, max_step)
+        # Trend of the last bar that had one
+        self.previous_trend: Optional[int] = None
+
+    def _step(self, bar: Bar) -> Dict[str, Any]:
+        psar, trend = self.sar.update(bar.get("high"), bar.get("low"), bar.get("close"))
+        if psar is None:
+            return {column: None for column in self.output_schema}
+
+        started = trend is not None and trend != self.previous_trend
+        if trend is not None:
+            self.previous_trend = trend
+        return {
+            "psar": psar,
+            "psar_down": psar if trend == DOWN else None,
+            "psar_down_indicator": int(started and trend == DOWN),
+            "psar_up": psar if trend == UP else None,
+            "psar_up_indicator": int(started and trend == UP),
+        }
+
+
+class StreamingCCI(StreamingIndicator):
+    """Streaming ``cci_indicator``."""
+
+    output_schema = {"cci": pl.Float64}
+
+    def __init__(
+        self, window: int = 20, constant: float = 0.015, fillna: bool = False
+    ) -> None:
+        super().__init__(fillna)
+        min_periods = 0 if fillna else window
+        self.constant = constant
+        self.typical_prices = _Window(window, min_periods)
+        self.deviations = _Window(window, min_periods)
+
+    def _step(self, bar: Bar) -> Dict[str, Any]:
+        typical_price = _typical_price(bar)
+        self.typical_prices.push(typical_price)
+        sma_tp = self.typical_prices.mean()
+        deviation = _sub(typical_price, sma_tp)
+        self.deviations.push(None if deviation is None else abs(deviation))
+        mean_deviation = self.deviations.mean()
+        if mean_deviation is not None and mean_deviation == 0:
+            cci = 0.0
+        else:
+            cci = _div(deviation, _mul(self.constant, mean_deviation))
+        return {"cci": cci}
+
+
+class StreamingBollingerBands(StreamingIndicator):
+    """Streaming ``bollinger_bands_indicator``."""
+
+    output_schema = {
+        "bb_bbm": pl.Float64,
+        "bb_bbh": pl.Float64,
+        "bb_bbl": pl.Float64,
+        "bb_bbhi": pl.Int32,
+        "bb_bbli": pl.Int32,
+    }
+
+    def __init__(
+        self, window: int = 20, window_dev: float = 2.0, fillna: bool = False
+    ) -> None:
+        super().__init__(fillna)
+        self.window_dev = window_dev
+        self.closes = _Window(window, 0 if fillna else window)
+
+    def _step(self, bar: Bar) -> Dict[str, Any]:
+        close = bar.get("close")
+        self.closes.push(close)
+        bb_bbm = self.closes.mean()
+        band = _mul(self.closes.std(), self.window_dev)
+        bb_bbh = _add(bb_bbm, band)
+        bb_bbl = _sub(bb_bbm, band)
+        return {
+            "bb_bbm": bb_bbm,
+            "bb_bbh": bb_bbh,
+            "bb_bbl": bb_bbl,
+            "bb_bbhi": 1 if _gt(close, bb_bbh) else 0,
+            "bb_bbli": 1 if _gt(bb_bbl, close) else 0,
+        }
+
+
+class StreamingAverageTrueRange(StreamingIndicator):
+    """Streaming ``average_true_range_indicator``."""
+
+    output_schema = {"average_true_range": pl.Float64}
+
+    def __init__(self, window: int = 14, fillna: bool = False) -> None:
+        super().__init__(fillna)
+        self.true_range = _TrueRange()
+        self.true_ranges = _Window(window, 0 if fillna else window)
+
+    def _step(self, bar: Bar) -> Dict[str, Any]:
+        self.true_ranges.push(self.true_range.update(bar))
+        return {"average_true_range": self.true_ranges.mean()}
+
+
+class StreamingKeltnerChannel(StreamingIndicator):
+    """Streaming ``keltner_channel_indicator``."""
+
+    output_schema = {
+        "keltner_channel_mband": pl.Float64,
+        "keltner_channel_hband": pl.Float64,
+        "keltner_channel_lband": pl.Float64,
+        "keltner_channel_pband": pl.Float64,
+        "keltner_channel_wband": pl.Float64,
+        "keltner_channel_hband_indicator": pl.Int32,
+        "keltner_channel_lband_indicator": pl.Int32,
+    }
+
+    def __init__(
+        self,
+        window: int = 20,
+        window_atr: int = 10,
+        fillna: bool = False,
+        original_version: bool = True,
+        multiplier: float = 2.0,
+    ) -> None:
+        super().__init__(fillna)
+        min_periods = 0 if fillna else window
+        atr_window = window if original_version else window_atr
+        self.original_version = original_version
+        self.multiplier = multiplier
+        self.typical_prices = _Window(window, min_periods)
+        self.ema_close = _Ewm(window, min_periods)
+        self.true_range = _TrueRange()
+        self.true_ranges = _Window(atr_window, 0 if fillna else atr_window)
+
+    def _step(self, bar: Bar) -> Dict[str, Any]:
+        close = bar.get("close")
+        typical_price = _typical_price(bar)
+        if self.original_version:
+            self.typical_prices.push(typical_price)
+            mband = self.typical_prices.mean()
+        else:
+            mband = self.ema_close.update(close)
+        self.true_ranges.push(self.true_range.update(bar))
+        band = _mul(self.true_ranges.mean(), self.multiplier)
+        hband = _add(mband, band)
+        lband = _sub(mband, band)
+        return {
+            "keltner_channel_mband": mband,
+            "keltner_channel_hband": hband,
+            "keltner_channel_lband": lband,
+            "keltner_channel_pband": typical_price,
+            "keltner_channel_wband": _sub(hband, lband),
+            "keltner_channel_hband_indicator": 1 if _gt(close, hband) else 0,
+            "keltner_channel_lband_indicator": 1 if _gt(lband, close) else 0,
+        }
+
+
+class StreamingMFI(StreamingIndicator):
+    """Streaming ``mfi_indicator``."""
+
+    output_schema = {"mfi": pl.Float64}
+
+    def __init__(self, window: int = 14, fillna: bool = False) -> None:
+        super().__init__(fillna)
+        min_periods = 0 if fillna else window
+        self.prev_typical_price = _Lag()
+        self.positive_flows = _Window(window, min_periods)
+        self.negative_flows = _Window(window, min_periods)
+
+    def _step(self, bar: Bar) -> Dict[str, Any]:
+        typical_price = _typical_price(bar)
+        prev_typical_price = self.prev_typical_price.push(typical_price)
+        money_flow = _mul(typical_price, bar.get("volume"))
+        self.positive_flows.push(money_flow if _gt(typical_price, prev_typical_price) else 0)
+        self.negative_flows.push(money_flow if _gt(prev_typical_price, typical_price) else 0)
+        pos_flow_sum = self.positive_flows.sum()
+        neg_flow_sum = self.negative_flows.sum()
+        if neg_flow_sum is not None and neg_flow_sum == 0:
+            mfi = 100.0
+        else:
+            ratio = _div(pos_flow_sum, neg_flow_sum)
+            mfi = None if ratio is None else 100.0 - _div(100.0, 1.0 + ratio)
+        return {"mfi": mfi}
+
+
+class StreamingVPT(StreamingIndicator):
+    """Streaming ``vpt_indicator``."""
+
+    output_schema = {"vpt_cumulative": pl.Float64}
+
+    def __init__(self, fillna: bool = False) -> None:
+        super().__init__(fillna)
+        self.prev_close = _Lag()
+        self.cumulative = _CumSum()
+
+    def _step(self, bar: Bar) -> Dict[str, Any]:
+        close = bar.get("close")
+        prev_close = self.prev_close.push(close)
+        if prev_close is not None and prev_close == 0:
+            price_change_pct = None
+        else:
+            price_change_pct = _mul(_div(_sub(close, prev_close), prev_close), 100)
+        vpt = _mul(price_change_pct, bar.get("volume"))
+        if vpt is None and self.fillna:
+            vpt = 0.0
+        return {"vpt_cumulative": self.cumulative.update(vpt)}
+
+
+class StreamingVWAP(StreamingIndicator):
+    """Streaming ``vwap_indicator``."""
+
+    output_schema = {"vwap": pl.Float64}
+
+    def __init__(self, fillna: bool = False) -> None:
+        super().__init__(fillna)
+        self.price_volume = _CumSum()
+        self.volume = _CumSum()
+
+    def _step(self, bar: Bar) -> Dict[str, Any]:
+        volume = bar.get("volume")
+        cum_price_volume = self.price_volume.update(_mul(_typical_price(bar), volume))
+        cum_volume = self.volume.update(volume)
+        if cum_volume is None or cum_volume == 0:
+            return {"vwap": None}
+        return {"vwap": _div(cum_price_volume, cum_volume)}
+
+
+class StreamingOBV(StreamingIndicator):
+    """Streaming ``obv_indicator``."""
+
+    output_schema = {"obv": pl.Float64}
+
+    def __init__(self, fillna: bool = False) -> None:
+        super().__init__(fillna)
+        self.prev_close = _Lag()
+        self.cumulative = _CumSum()
+
+    def _step(self, bar: Bar) -> Dict[str, Any]:
+        close, volume = bar.get("close"), bar.get("volume")
+        prev_close = self.prev_close.push(close)
+        if _gt(close, prev_close):
+            obv_change = volume
+        elif _gt(prev_close, close):
+            obv_change = None if volume is None else -volume
+        else:
+            obv_change = 0
+        return {"obv": self.cumulative.update(obv_change)}
+
+
+class StreamingForceIndex(StreamingIndicator):
+    """Streaming ``force_index_indicator``."""
+
+    output_schema = {"force_index_smoothed": pl.Float64}
+
+    def __init__(self, window: int = 13, fillna: bool = False) -> None:
+        super().__init__(fillna)
+        self.prev_close = _Lag()
+        self.smoothed = _Ewm(window, 0 if fillna else window)
+
+    def _step(self, bar: Bar) -> Dict[str, Any]:
+        close = bar.get("close")
+        price_change = _sub(close, self.prev_close.push(close))
+        force_index = _mul(price_change, bar.get("volume"))
+        return {"force_index_smoothed": self.smoothed.update(force_index)}
+
+
+# Vectorized method name -> streaming kernel taking the same parameters
+STREAMING_INDICATORS: Dict[str, Type[StreamingIndicator]] = {
+    "rsi_indicator": StreamingRSI,
+    "roc_indicator": StreamingROC,
+    "stoch_rsi_indicator": StreamingStochRSI,
+    "stoch_oscillator_indicator": StreamingStochOscillator,
+    "macd_indicator": StreamingMACD,
+    "adx_indicator": StreamingADX,
+    "aroon_indicator": StreamingAroon,
+    "psar_indicator": StreamingPSAR,
+    "cci_indicator": StreamingCCI,
+    "bollinger_bands_indicator": StreamingBollingerBands,
+    "average_true_range_indicator": StreamingAverageTrueRange,
+    "keltner_channel_indicator": StreamingKeltnerChannel,
+    "mfi_indicator": StreamingMFI,
+    "vpt_indicator": StreamingVPT,
+    "vwap_indicator": StreamingVWAP,
+    "obv_indicator": StreamingOBV,
+    "force_index_indicator": StreamingForceIndex,
+}
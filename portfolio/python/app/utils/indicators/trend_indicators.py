@@ -1,6 +1,14 @@
+from typing import Dict
+
 import polars as pl
 
-from utils.indicators.base import BaseIndicator
+from utils.indicators.base import (
+    BaseIndicator,
+    forward_fill,
+    true_range,
+    typical_price,
+)
+from utils.indicators.parabolic_sar import DOWN, UP, ParabolicSARKernel
 
 
 class TrendIndicators(BaseIndicator):
@@ -22,54 +30,53 @@ class TrendIndicators(BaseIndicator):
         :param fillna: if True, fill NaN values.
         :return: DataFrame with the MACD indicator fields.
         """
+        self.df = self.df.with_columns(
+            list(
+                self.macd_expressions(
+                    window_slow=window_slow,
+                    window_fast=window_fast,
+                    window_sign=window_sign,
+                    fillna=fillna,
+                ).values()
+            )
+        )
+        return self.df
+
+    @staticmethod
+    def macd_expressions(
+        window_slow: int = 26,
+        window_fast: int = 12,
+        window_sign: int = 9,
+        fillna: bool = False,
+    ) -> Dict[str, pl.Expr]:
+        """
+        MACD as Polars expressions, see macd_indicator.
+        :param window_slow: N -Period long term.
+        :param window_fast: N -Period short term.
+        :param window_sign: N -Period to signal.
+        :param fillna: if True, fill NaN values.
+        :return: Output column name -> expression.
+        """
         min_periods_fast = 0 if fillna else window_fast
         min_periods_slow = 0 if fillna else window_slow
         min_periods_sign = 0 if fillna else window_sign
 
-        # Calculate MACD using polars operations
         # MACD = EMA(fast) - EMA(slow)
-        self.df = self.df.with_columns(
-            [
-                pl.col("close")
-                .ewm_mean(span=window_fast, min_periods=min_periods_fast)
-                .alias("ema_fast"),
-                pl.col("close")
-                .ewm_mean(span=window_slow, min_periods=min_periods_slow)
-                .alias("ema_slow"),
-            ]
-        )
-
-        self.df = self.df.with_columns(
-            [(pl.col("ema_fast") - pl.col("ema_slow")).alias("macd")]
-        )
+        ema_fast = pl.col("close").ewm_mean(span=window_fast, min_periods=min_periods_fast)
+        ema_slow = pl.col("close").ewm_mean(span=window_slow, min_periods=min_periods_slow)
+        macd = ema_fast - ema_slow
 
         # Signal line = EMA of MACD
-        self.df = self.df.with_columns(
-            [
-                pl.col("macd")
-                .ewm_mean(span=window_sign, min_periods=min_periods_sign)
-                .alias("signal")
-            ]
-        )
+        signal = macd.ewm_mean(span=window_sign, min_periods=min_periods_sign)
 
         # Histogram = MACD - Signal
-        self.df = self.df.with_columns(
-            [(pl.col("macd") - pl.col("signal")).alias("histogram")]
-        )
-
-        # Clean up temporary columns
-        self.df = self.df.drop(["ema_fast", "ema_slow"])
+        histogram = macd - signal
 
-        if fillna:
-            self.df = self.df.with_columns(
-                [
-                    pl.col("macd").fill_null(strategy="forward"),
-                    pl.col("signal").fill_null(strategy="forward"),
-                    pl.col("histogram").fill_null(strategy="forward"),
-                ]
-            )
-
-        return self.df
+        return {
+            "macd": forward_fill(macd, fillna).alias("macd"),
+            "signal": forward_fill(signal, fillna).alias("signal"),
+            "histogram": forward_fill(histogram, fillna).alias("histogram"),
+        }
 
     def adx_indicator(self, window: int = 14, fillna: bool = False) -> pl.DataFrame:
         """
@@ -79,128 +86,57 @@ class TrendIndicators(BaseIndicator):
         :param fillna: if True, fill NaN values.
         :return: DataFrame with ADX indicator fields.
         """
-        min_periods = 0 if fillna else window
-
-        # Calculate ADX using polars operations
-        # True Range = max(High-Low, |High-PrevClose|, |Low-PrevClose|)
         self.df = self.df.with_columns(
-            [
-                pl.col("close").shift(1).alias("prev_close"),
-            ]
+            list(self.adx_expressions(window=window, fillna=fillna).values())
         )
+        return self.df
 
-        self.df = self.df.with_columns(
-            [
-                pl.max_horizontal(
-                    pl.col("high") - pl.col("low"),
-                    (pl.col("high") - pl.col("prev_close")).abs(),
-                    (pl.col("low") - pl.col("prev_close")).abs(),
-                ).alias("true_range")
-            ]
-        )
+    @staticmethod
+    def adx_expressions(window: int = 14, fillna: bool = False) -> Dict[str, pl.Expr]:
+        """
+        ADX as Polars expressions, see adx_indicator.
+        :param window: N -Period.
+        :param fillna: if True, fill NaN values.
+        :return: Output column name -> expression.
+        """
+        min_periods = 0 if fillna else window
 
         # Directional Movement
-        self.df = self.df.with_columns(
-            [
-                (pl.col("high") - pl.col("high").shift(1)).alias("high_diff"),
-                (pl.col("low").shift(1) - pl.col("low")).alias("low_diff"),
-            ]
+        high_diff = pl.col("high") - pl.col("high").shift(1)
+        low_diff = pl.col("low").shift(1) - pl.col("low")
+        plus_dm = (
+            pl.when(high_diff > low_diff)
+            .then(pl.when(high_diff > 0).then(high_diff).otherwise(0))
+            .otherwise(0)
         )
-
-        self.df = self.df.with_columns(
-            [
-                pl.when(pl.col("high_diff") > pl.col("low_diff"))
-                .then(
-                    pl.when(pl.col("high_diff") > 0)
-                    .then(pl.col("high_diff"))
-                    .otherwise(0)
-                )
-                .otherwise(0)
-                .alias("plus_dm"),
-                pl.when(pl.col("low_diff") > pl.col("high_diff"))
-                .then(
-                    pl.when(pl.col("low_diff") > 0)
-                    .then(pl.col("low_diff"))
-                    .otherwise(0)
-                )
-                .otherwise(0)
-                .alias("minus_dm"),
-            ]
+        minus_dm = (
+            pl.when(low_diff > high_diff)
+            .then(pl.when(low_diff > 0).then(low_diff).otherwise(0))
+            .otherwise(0)
         )
 
         # Smooth the values using EMA
-        self.df = self.df.with_columns(
-            [
-                pl.col("true_range")
-                .ewm_mean(span=window, min_periods=min_periods)
-                .alias("atr"),
-                pl.col("plus_dm")
-                .ewm_mean(span=window, min_periods=min_periods)
-                .alias("plus_di"),
-                pl.col("minus_dm")
-                .ewm_mean(span=window, min_periods=min_periods)
-                .alias("minus_di"),
-            ]
-        )
+        atr = true_range().ewm_mean(span=window, min_periods=min_periods)
+        plus_di = plus_dm.ewm_mean(span=window, min_periods=min_periods)
+        minus_di = minus_dm.ewm_mean(span=window, min_periods=min_periods)
 
         # Calculate DI+ and DI-
-        self.df = self.df.with_columns(
-            [
-                pl.when(pl.col("atr") == 0)
-                .then(0.0)
-                .otherwise(pl.col("plus_di") / pl.col("atr") * 100)
-                .alias("adx_pos"),
-                pl.when(pl.col("atr") == 0)
-                .then(0.0)
-                .otherwise(pl.col("minus_di") / pl.col("atr") * 100)
-                .alias("adx_neg"),
-            ]
-        )
+        adx_pos = pl.when(atr == 0).then(0.0).otherwise(plus_di / atr * 100)
+        adx_neg = pl.when(atr == 0).then(0.0).otherwise(minus_di / atr * 100)
 
         # Calculate DX and ADX
-        self.df = self.df.with_columns(
-            [
-                pl.when((pl.col("adx_pos") + pl.col("adx_neg")) == 0)
-                .then(0.0)
-                .otherwise(
-                    (pl.col("adx_pos") - pl.col("adx_neg")).abs()
-                    / (pl.col("adx_pos") + pl.col("adx_neg"))
-                    * 100
-                )
-                .alias("dx")
-            ]
+        dx = (
+            pl.when((adx_pos + adx_neg) == 0)
+            .then(0.0)
+            .otherwise((adx_pos - adx_neg).abs() / (adx_pos + adx_neg) * 100)
         )
+        adx = dx.ewm_mean(span=window, min_periods=min_periods)
 
-        self.df = self.df.with_columns(
-            [pl.col("dx").ewm_mean(span=window, min_periods=min_periods).alias("adx")]
-        )
-
-        # Clean up temporary columns
-        self.df = self.df.drop(
-            [
-                "prev_close",
-                "true_range",
-                "high_diff",
-                "low_diff",
-                "plus_dm",
-                "minus_dm",
-                "atr",
-                "plus_di",
-                "minus_di",
-                "dx",
-            ]
-        )
-
-        if fillna:
-            self.df = self.df.with_columns(
-                [
-                    pl.col("adx").fill_null(strategy="forward"),
-                    pl.col("adx_neg").fill_null(strategy="forward"),
-                    pl.col("adx_pos").fill_null(strategy="forward"),
-                ]
-            )
-
-        return self.df
+        return {
+            "adx_pos": forward_fill(adx_pos, fillna).alias("adx_pos"),
+            "adx_neg": forward_fill(adx_neg, fillna).alias("adx_neg"),
+            "adx": forward_fill(adx, fillna).alias("adx"),
+        }
 
     def aroon_indicator(self, window: int = 25, fillna: bool = False) -> pl.DataFrame:
         """
@@ -210,64 +146,48 @@ class TrendIndicators(BaseIndicator):
         :param fillna: if True, fill NaN values.
         :return: DataFrame with Aroon indicator fields.
         """
+        self.df = self.df.with_columns(
+            list(self.aroon_expressions(window=window, fillna=fillna).values())
+        )
+        return self.df
+
+    @staticmethod
+    def aroon_expressions(window: int = 25, fillna: bool = False) -> Dict[str, pl.Expr]:
+        """
+        Aroon as Polars expressions, see aroon_indicator.
+        :param window: N -Period.
+        :param fillna: if True, fill NaN values.
+        :return: Output column name -> expression.
+        """
         # This version correctly calculates the index of the high/low
         # in the rolling window and then calculates the Aroon values.
 
         # Note: rolling_apply with a lambda is slow in Polars.
         # Newer Polars versions (>= 0.20.10) have `rolling_argmax`
         # and `rolling_argmin` which are much faster.
-        self.df = self.df.with_columns(
-            [
-                pl.col("high")
-                .rolling_apply(lambda s: s.arg_max(), window_size=window)
-                .alias("idx_high"),
-                pl.col("low")
-                .rolling_apply(lambda s: s.arg_min(), window_size=window)
-                .alias("idx_low"),
-            ]
-        )
+        idx_high = pl.col("high").rolling_apply(lambda s: s.arg_max(), window_size=window)
+        idx_low = pl.col("low").rolling_apply(lambda s: s.arg_min(), window_size=window)
 
         # Calculate days since high/low.
         # idx_high is the 0-based index in the window.
         # "Days Since High" = (window - 1) - idx_high
-        self.df = self.df.with_columns(
-            [
-                (window - 1 - pl.col("idx_high")).alias("days_since_high"),
-                (window - 1 - pl.col("idx_low")).alias("days_since_low"),
-            ]
-        )
+        days_since_high = window - 1 - idx_high
+        days_since_low = window - 1 - idx_low
 
-        # Calculate Aroon values
         # Aroon Up = ((N - Days Since High) / N) x 100
-        self.df = self.df.with_columns(
-            [
-                ((window - pl.col("days_since_high")) / window * 100).alias("aroon_up"),
-                ((window - pl.col("days_since_low")) / window * 100).alias(
-                    "aroon_down"
-                ),
-            ]
-        )
+        aroon_up = (window - days_since_high) / window * 100
+        aroon_down = (window - days_since_low) / window * 100
 
         # Aroon indicator = Aroon Up - Aroon Down
-        self.df = self.df.with_columns(
-            [(pl.col("aroon_up") - pl.col("aroon_down")).alias("aroon_indicator")]
-        )
+        aroon_indicator = aroon_up - aroon_down
 
-        # Clean up temporary columns
-        self.df = self.df.drop(
-            ["idx_high", "idx_low", "days_since_high", "days_since_low"]
-        )
-
-        if fillna:
-            self.df = self.df.with_columns(
-                [
-                    pl.col("aroon_up").fill_null(strategy="forward"),
-                    pl.col("aroon_down").fill_null(strategy="forward"),
-                    pl.col("aroon_indicator").fill_null(strategy="forward"),
-                ]
-            )
-
-        return self.df
+        return {
+            "aroon_up": forward_fill(aroon_up, fillna).alias("aroon_up"),
+            "aroon_down": forward_fill(aroon_down, fillna).alias("aroon_down"),
+            "aroon_indicator": forward_fill(aroon_indicator, fillna).alias(
+                "aroon_indicator"
+            ),
+        }
 
     def psar_indicator(
         self, step: float = 0.02, max_step: float = 0.2, fillna: bool = False
@@ -276,40 +196,63 @@ class TrendIndicators(BaseIndicator):
         Parabolic Stop and Reverse (Parabolic SAR)
         https://school.stockcharts.com/doku.php?id=technical_indicators:parabolic_sar
 
-        NOTE: This is a placeholder/stubbed implementation as noted
-        in the original code. A real PSAR is an iterative (non-vectorizable)
-        calculation that is very complex to implement.
+        The SAR is recursive, so it is computed by a loop over the price
+        arrays (see utils.indicators.parabolic_sar) run once for all outputs.
+        Bars with a missing high, low or close get null outputs and are
+        skipped by the recursion.
 
         :param step: Acceleration Factor used to compute the SAR.
         :param max_step: Maximum value allowed for the Acceleration Factor.
         :param fillna:  If True, fill nan values.
         :return: DataFrame with the PSAR indicator fields.
         """
-
-        # Initialize PSAR values
         self.df = self.df.with_columns(
-            [
-                pl.lit(None, dtype=pl.Float64).alias("psar"),
-                pl.lit(None, dtype=pl.Boolean).alias("psar_down"),
-                pl.lit(None, dtype=pl.Boolean).alias("psar_down_indicator"),
-                pl.lit(None, dtype=pl.Boolean).alias("psar_up"),
-                pl.lit(None, dtype=pl.Boolean).alias("psar_up_indicator"),
-            ]
+            list(
+                self.psar_expressions(step=step, max_step=max_step, fillna=fillna).values()
+            )
         )
+        return self.df
 
-        # Since this is a stub, fillna will just forward-fill the nulls
-        if fillna:
-            self.df = self.df.with_columns(
-                [
-                    pl.col("psar").fill_null(strategy="forward"),
-                    pl.col("psar_down").fill_null(strategy="forward"),
-                    pl.col("psar_down_indicator").fill_null(strategy="forward"),
-                    pl.col("psar_up").fill_null(strategy="forward"),
-                    pl.col("psar_up_indicator").fill_null(strategy="forward"),
-                ]
+    @staticmethod
+    def psar_expressions(
+        step: float = 0.02, max_step: float = 0.2, fillna: bool = False
+    ) -> Dict[str, pl.Expr]:
+        """
+        PSAR as Polars expressions, see psar_indicator.
+        :param step: Acceleration Factor used to compute the SAR.
+        :param max_step: Maximum value allowed for the Acceleration Factor.
+        :param fillna:  If True, fill nan values.
+        :return: Output column name -> expression.
+        """
+        kernel = ParabolicSARKernel(step=step, max_step=max_step)
+        sar_struct = pl.struct("high", "low", "close").map_batches(
+            kernel, return_dtype=kernel.return_dtype
+        )
+        psar = sar_struct.struct.field("sar")
+        # UP or DOWN, null for the seed bars and bars with missing prices
+        trend = sar_struct.struct.field("trend")
+        previous_trend = trend.forward_fill().shift(1)
+
+        def trend_values(direction: int) -> pl.Expr:
+            return pl.when(trend == direction).then(psar)
+
+        def trend_starts(direction: int) -> pl.Expr:
+            starts = (trend == direction) & (previous_trend != direction).fill_null(True)
+            return pl.when(psar.is_not_null()).then(
+                starts.fill_null(False).cast(pl.Int32)
             )
 
-        return self.df
+        return {
+            "psar": forward_fill(psar, fillna).alias("psar"),
+            "psar_down": forward_fill(trend_values(DOWN), fillna).alias("psar_down"),
+            "psar_down_indicator": forward_fill(trend_starts(DOWN), fillna).alias(
+                "psar_down_indicator"
+            ),
+            "psar_up": forward_fill(trend_values(UP), fillna).alias("psar_up"),
+            "psar_up_indicator": forward_fill(trend_starts(UP), fillna).alias(
+                "psar_up_indicator"
+            ),
+        }
 
     def all_trend_indicators(self) -> pl.DataFrame:
         """
@@ -335,58 +278,45 @@ class TrendIndicators(BaseIndicator):
         :param fillna:
         :return:
         """
-        min_periods = 0 if fillna else window
-
-        # Typical Price = (High + Low + Close) / 3
         self.df = self.df.with_columns(
-            [
-                ((pl.col("high") + pl.col("low") + pl.col("close")) / 3).alias(
-                    "typical_price"
-                )
-            ]
+            list(
+                self.cci_expressions(
+                    window=window, constant=constant, fillna=fillna
+                ).values()
+            )
         )
+        return self.df
+
+    @staticmethod
+    def cci_expressions(
+        window: int = 20, constant: float = 0.015, fillna: bool = False
+    ) -> Dict[str, pl.Expr]:
+        """
+        CCI as Polars expressions, see cci_indicator.
+        :param window:
+        :param constant:
+        :param fillna:
+        :return: Output column name -> expression.
+        """
+        min_periods = 0 if fillna else window
 
         # Calculate SMA of typical price
-        self.df = self.df.with_columns(
-            [
-                pl.col("typical_price")
-                .rolling_mean(window_size=window, min_periods=min_periods)
-                .alias("sma_tp")
-            ]
-        )
+        sma_tp = typical_price().rolling_mean(window_size=window, min_periods=min_periods)
 
         # Calculate mean deviation
-        self.df = self.df.with_columns(
-            [
-                (pl.col("typical_price") - pl.col("sma_tp"))
-                .abs()
-                .rolling_mean(window_size=window, min_periods=min_periods)
-                .alias("mean_deviation")
-            ]
+        mean_deviation = (
+            (typical_price() - sma_tp)
+            .abs()
+            .rolling_mean(window_size=window, min_periods=min_periods)
         )
 
         # Calculate CCI
-        self.df = self.df.with_columns(
-            [
-                pl.when(pl.col("mean_deviation") == 0)
-                .then(0.0)
-                .otherwise(
-                    (pl.col("typical_price") - pl.col("sma_tp"))
-                    / (constant * pl.col("mean_deviation"))
-                )
-                .alias("cci")
-            ]
+        cci = (
+            pl.when(mean_deviation == 0)
+            .then(0.0)
+            .otherwise((typical_price() - sma_tp) / (constant * mean_deviation))
         )
-
-        # Clean up temporary columns
-        self.df = self.df.drop(["typical_price", "sma_tp", "mean_deviation"])
-
-        if fillna:
-            self.df = self.df.with_columns(
-                [pl.col("cci").fill_null(strategy="forward")]
-            )
-
-        return self.df
+        return {"cci": forward_fill(cci, fillna).alias("cci")}
 
 
 # Convenience functions (These were already correct and needed no changes)
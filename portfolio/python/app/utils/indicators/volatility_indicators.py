@@ -1,6 +1,8 @@
+from typing import Dict
+
 import polars as pl
 
-from .base import BaseIndicator
+from .base import BaseIndicator, forward_fill, true_range, typical_price
 
 
 class VolatilityIndicators(BaseIndicator):
@@ -17,65 +19,48 @@ class VolatilityIndicators(BaseIndicator):
         :param fillna: If True, fil NaN values.
         :return: DataFrame with bollinger bands indicator fields.
         """
-        min_periods = 0 if fillna else window
-
-        # Calculate Bollinger Bands using polars operations
-        # Middle band = SMA of close prices
         self.df = self.df.with_columns(
-            [
-                pl.col("close")
-                .rolling_mean(window_size=window, min_periods=min_periods)
-                .alias("bb_bbm")
-            ]
+            list(
+                self.bollinger_bands_expressions(
+                    window=window, window_dev=window_dev, fillna=fillna
+                ).values()
+            )
         )
+        return self.df
 
-        # Calculate standard deviation
-        self.df = self.df.with_columns(
-            [
-                pl.col("close")
-                .rolling_std(window_size=window, min_periods=min_periods)
-                .alias("bb_std")
-            ]
-        )
+    @staticmethod
+    def bollinger_bands_expressions(
+            window: int = 20, window_dev: float = 2.0, fillna: bool = False
+    ) -> Dict[str, pl.Expr]:
+        """
+        Bollinger Bands as Polars expressions, see bollinger_bands_indicator.
+        :param window: N -period.
+        :param window_dev: N -factor standard deviation
+        :param fillna: If True, fil NaN values.
+        :return: Output column name -> expression.
+        """
+        min_periods = 0 if fillna else window
+
+        # Middle band = SMA of close prices
+        bb_bbm = pl.col("close").rolling_mean(window_size=window, min_periods=min_periods)
+        bb_std = pl.col("close").rolling_std(window_size=window, min_periods=min_periods)
 
         # Upper band = Middle band + (std * multiplier)
         # Lower band = Middle band - (std * multiplier)
-        self.df = self.df.with_columns(
-            [
-                (pl.col("bb_bbm") + (pl.col("bb_std") * window_dev)).alias("bb_bbh"),
-                (pl.col("bb_bbm") - (pl.col("bb_std") * window_dev)).alias("bb_bbl"),
-            ]
-        )
+        bb_bbh = bb_bbm + (bb_std * window_dev)
+        bb_bbl = bb_bbm - (bb_std * window_dev)
 
         # Bollinger Band indicators
-        self.df = self.df.with_columns(
-            [
-                pl.when(pl.col("close") > pl.col("bb_bbh"))
-                .then(1)
-                .otherwise(0)
-                .alias("bb_bbhi"),
-                pl.when(pl.col("close") < pl.col("bb_bbl"))
-                .then(1)
-                .otherwise(0)
-                .alias("bb_bbli"),
-            ]
-        )
-
-        # Clean up temporary columns
-        self.df = self.df.drop(["bb_std"])
-
-        if fillna:
-            self.df = self.df.with_columns(
-                [
-                    pl.col("bb_bbm").fill_null(strategy="forward"),
-                    pl.col("bb_bbh").fill_null(strategy="forward"),
-                    pl.col("bb_bbl").fill_null(strategy="forward"),
-                    pl.col("bb_bbhi").fill_null(strategy="forward"),
-                    pl.col("bb_bbli").fill_null(strategy="forward"),
-                ]
-            )
+        bb_bbhi = pl.when(pl.col("close") > bb_bbh).then(1).otherwise(0)
+        bb_bbli = pl.when(pl.col("close") < bb_bbl).then(1).otherwise(0)
 
-        return self.df
+        return {
+            "bb_bbm": forward_fill(bb_bbm, fillna).alias("bb_bbm"),
+            "bb_bbh": forward_fill(bb_bbh, fillna).alias("bb_bbh"),
+            "bb_bbl": forward_fill(bb_bbl, fillna).alias("bb_bbl"),
+            "bb_bbhi": forward_fill(bb_bbhi, fillna).alias("bb_bbhi"),
+            "bb_bbli": forward_fill(bb_bbli, fillna).alias("bb_bbli"),
+        }
 
     def average_true_range_indicator(
             self, window: int = 14, fillna: bool = False
@@ -86,44 +71,28 @@ class VolatilityIndicators(BaseIndicator):
         :param fillna: If True, fill NaN values.
         :return: DataFrame with Average True Range indicator fields.
         """
-        min_periods = 0 if fillna else window
-
-        # Calculate ATR using polars operations
-        # True Range = max(High-Low, |High-PrevClose|, |Low-PrevClose|)
         self.df = self.df.with_columns(
-            [
-                pl.col("close").shift(1).alias("prev_close"),
-            ]
+            list(
+                self.average_true_range_expressions(window=window, fillna=fillna).values()
+            )
         )
+        return self.df
 
-        self.df = self.df.with_columns(
-            [
-                pl.max_horizontal(
-                    pl.col("high") - pl.col("low"),
-                    (pl.col("high") - pl.col("prev_close")).abs(),
-                    (pl.col("low") - pl.col("prev_close")).abs(),
-                ).alias("true_range")
-            ]
-        )
+    @staticmethod
+    def average_true_range_expressions(
+            window: int = 14, fillna: bool = False
+    ) -> Dict[str, pl.Expr]:
+        """
+        ATR as Polars expressions, see average_true_range_indicator.
+        :param window: N -Period.
+        :param fillna: If True, fill NaN values.
+        :return: Output column name -> expression.
+        """
+        min_periods = 0 if fillna else window
 
         # Calculate ATR as rolling mean of true range
-        self.df = self.df.with_columns(
-            [
-                pl.col("true_range")
-                .rolling_mean(window_size=window, min_periods=min_periods)
-                .alias("average_true_range")
-            ]
-        )
-
-        # Clean up temporary columns
-        self.df = self.df.drop(["prev_close", "true_range"])
-
-        if fillna:
-            self.df = self.df.with_columns(
-                [pl.col("average_true_range").fill_null(strategy="forward")]
-            )
-
-        return self.df
+        atr = true_range().rolling_mean(window_size=window, min_periods=min_periods)
+        return {"average_true_range": forward_fill(atr, fillna).alias("average_true_range")}
 
     def keltner_channel_indicator(
             self,
@@ -144,130 +113,72 @@ class VolatilityIndicators(BaseIndicator):
         :param multiplier: The multiplier has the most effect on the channel width. default is 2
         :return: DataFrame with Keltner channel indicator fields.
         """
+        self.df = self.df.with_columns(
+            list(
+                self.keltner_channel_expressions(
+                    window=window,
+                    window_atr=window_atr,
+                    fillna=fillna,
+                    original_version=original_version,
+                    multiplier=multiplier,
+                ).values()
+            )
+        )
+        return self.df
+
+    @staticmethod
+    def keltner_channel_expressions(
+            window: int = 20,
+            window_atr: int = 10,
+            fillna: bool = False,
+            original_version: bool = True,
+            multiplier: float = 2.0,
+    ) -> Dict[str, pl.Expr]:
+        """
+        Keltner Channels as Polars expressions, see keltner_channel_indicator.
+        :param window: N -Period.
+        :param window_atr: N atr period. Only valid if original_version param is False.
+        :param fillna: If True, fill NaN values.
+        :param original_version: If True, use original version as the centerline (SMA of typical price) if False,
+        use EMA of close as the centerline.
+        :param multiplier: The multiplier has the most effect on the channel width. default is 2
+        :return: Output column name -> expression.
+        """
         min_periods = 0 if fillna else window
         atr_window = window_atr if not original_version else window
         min_periods_atr = 0 if fillna else atr_window
 
-        # Calculate Keltner Channel using polars operations
-        # Typical Price = (High + Low + Close) / 3
-        self.df = self.df.with_columns(
-            [
-                ((pl.col("high") + pl.col("low") + pl.col("close")) / 3).alias(
-                    "typical_price"
-                )
-            ]
-        )
-
         # Calculate middle band
         if original_version:
             # Original version: SMA of typical price
-            self.df = self.df.with_columns(
-                [
-                    pl.col("typical_price")
-                    .rolling_mean(window_size=window, min_periods=min_periods)
-                    .alias("keltner_channel_mband")
-                ]
-            )
+            mband = typical_price().rolling_mean(window_size=window, min_periods=min_periods)
         else:
             # Alternative version: EMA of close
-            self.df = self.df.with_columns(
-                [
-                    pl.col("close")
-                    .ewm_mean(span=window, min_periods=min_periods)
-                    .alias("keltner_channel_mband")
-                ]
-            )
+            mband = pl.col("close").ewm_mean(span=window, min_periods=min_periods)
 
         # Calculate ATR for the specified window
-        self.df = self.df.with_columns(
-            [
-                pl.col("close").shift(1).alias("prev_close"),
-            ]
-        )
-
-        self.df = self.df.with_columns(
-            [
-                pl.max_horizontal(
-                    pl.col("high") - pl.col("low"),
-                    (pl.col("high") - pl.col("prev_close")).abs(),
-                    (pl.col("low") - pl.col("prev_close")).abs(),
-                ).alias("true_range")
-            ]
-        )
-
-        # Calculate ATR
-        self.df = self.df.with_columns(
-            [
-                pl.col("true_range")
-                .rolling_mean(window_size=atr_window, min_periods=min_periods_atr)
-                .alias("atr")
-            ]
-        )
+        atr = true_range().rolling_mean(window_size=atr_window, min_periods=min_periods_atr)
 
         # Calculate upper and lower bands
-        self.df = self.df.with_columns(
-            [
-                (pl.col("keltner_channel_mband") + (pl.col("atr") * multiplier)).alias(
-                    "keltner_channel_hband"
-                ),
-                (pl.col("keltner_channel_mband") - (pl.col("atr") * multiplier)).alias(
-                    "keltner_channel_lband"
-                ),
-            ]
-        )
-
-        # Calculate indicators
-        self.df = self.df.with_columns(
-            [
-                pl.when(pl.col("close") > pl.col("keltner_channel_hband"))
-                .then(1)
-                .otherwise(0)
-                .alias("keltner_channel_hband_indicator"),
-                pl.when(pl.col("close") < pl.col("keltner_channel_lband"))
-                .then(1)
-                .otherwise(0)
-                .alias("keltner_channel_lband_indicator"),
-            ]
-        )
-
-        # Calculate additional bands
-        self.df = self.df.with_columns(
-            [
-                pl.col("typical_price").alias("keltner_channel_pband"),
-                (
-                        pl.col("keltner_channel_hband") - pl.col("keltner_channel_lband")
-                ).alias("keltner_channel_wband"),
-            ]
-        )
-
-        # Clean up temporary columns
-        self.df = self.df.drop(
-            [
-                "typical_price",
-                "prev_close",
-                "true_range",
-                "atr",
-            ]
-        )
-
-        if fillna:
-            self.df = self.df.with_columns(
-                [
-                    pl.col("keltner_channel_hband").fill_null(strategy="forward"),
-                    pl.col("keltner_channel_hband_indicator").fill_null(
-                        strategy="forward"
-                    ),
-                    pl.col("keltner_channel_lband").fill_null(strategy="forward"),
-                    pl.col("keltner_channel_lband_indicator").fill_null(
-                        strategy="forward"
-                    ),
-                    pl.col("keltner_channel_mband").fill_null(strategy="forward"),
-                    pl.col("keltner_channel_pband").fill_null(strategy="forward"),
-                    pl.col("keltner_channel_wband").fill_null(strategy="forward"),
-                ]
-            )
-
-        return self.df
+        hband = mband + (atr * multiplier)
+        lband = mband - (atr * multiplier)
+
+        outputs = {
+            "keltner_channel_mband": mband,
+            "keltner_channel_hband": hband,
+            "keltner_channel_lband": lband,
+            "keltner_channel_hband_indicator": pl.when(pl.col("close") > hband)
+            .then(1)
+            .otherwise(0),
+            "keltner_channel_lband_indicator": pl.when(pl.col("close") < lband)
+            .then(1)
+            .otherwise(0),
+            "keltner_channel_pband": typical_price(),
+            "keltner_channel_wband": hband - lband,
+        }
+        return {
+            name: forward_fill(expr, fillna).alias(name) for name, expr in outputs.items()
+        }
 
     def all_volatility_indicators(self) -> pl.DataFrame:
         """
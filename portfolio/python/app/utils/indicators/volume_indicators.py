@@ -1,6 +1,8 @@
+from typing import Dict
+
 import polars as pl
 
-from .base import BaseIndicator
+from .base import BaseIndicator, forward_fill, typical_price
 
 
 class VolumeIndicators(BaseIndicator):
@@ -14,83 +16,51 @@ class VolumeIndicators(BaseIndicator):
         :param fillna: If True, fill NaN values.
         :return: DataFrame with MFI indicator field.
         """
-        min_periods = 0 if fillna else window
-
-        # Calculate typical price
         self.df = self.df.with_columns(
-            [
-                ((pl.col("high") + pl.col("low") + pl.col("close")) / 3).alias(
-                    "typical_price"
-                )
-            ]
+            list(self.mfi_expressions(window=window, fillna=fillna).values())
         )
+        return self.df
+
+    @staticmethod
+    def mfi_expressions(window: int = 14, fillna: bool = False) -> Dict[str, pl.Expr]:
+        """
+        MFI as Polars expressions, see mfi_indicator.
+        :param window: N -Period.
+        :param fillna: If True, fill NaN values.
+        :return: Output column name -> expression.
+        """
+        min_periods = 0 if fillna else window
 
         # Calculate money flow
-        self.df = self.df.with_columns(
-            [(pl.col("typical_price") * pl.col("volume")).alias("money_flow")]
-        )
+        money_flow = typical_price() * pl.col("volume")
 
         # Calculate positive and negative money flow
-        self.df = self.df.with_columns(
-            [
-                pl.when(pl.col("typical_price") > pl.col("typical_price").shift(1))
-                .then(pl.col("money_flow"))
-                .otherwise(0)
-                .alias("positive_money_flow"),
-                pl.when(pl.col("typical_price") < pl.col("typical_price").shift(1))
-                .then(pl.col("money_flow"))
-                .otherwise(0)
-                .alias("negative_money_flow"),
-            ]
+        positive_money_flow = (
+            pl.when(typical_price() > typical_price().shift(1))
+            .then(money_flow)
+            .otherwise(0)
+        )
+        negative_money_flow = (
+            pl.when(typical_price() < typical_price().shift(1))
+            .then(money_flow)
+            .otherwise(0)
         )
 
         # Calculate positive and negative money flow sums
-        self.df = self.df.with_columns(
-            [
-                pl.col("positive_money_flow")
-                .rolling_sum(window_size=window, min_periods=min_periods)
-                .alias("pos_flow_sum"),
-                pl.col("negative_money_flow")
-                .rolling_sum(window_size=window, min_periods=min_periods)
-                .alias("neg_flow_sum"),
-            ]
+        pos_flow_sum = positive_money_flow.rolling_sum(
+            window_size=window, min_periods=min_periods
         )
-
-        # Calculate MFI
-        self.df = self.df.with_columns(
-            [
-                # If neg_flow_sum is 0, MFI is 100.
-                pl.when(pl.col("neg_flow_sum") == 0)
-                .then(100.0)
-                .otherwise(
-                    100.0
-                    - (
-                        100.0
-                        / (1.0 + (pl.col("pos_flow_sum") / pl.col("neg_flow_sum")))
-                    )
-                )
-                .alias("mfi")
-            ]
+        neg_flow_sum = negative_money_flow.rolling_sum(
+            window_size=window, min_periods=min_periods
         )
 
-        # Clean up temporary columns
-        self.df = self.df.drop(
-            [
-                "typical_price",
-                "money_flow",
-                "positive_money_flow",
-                "negative_money_flow",
-                "pos_flow_sum",
-                "neg_flow_sum",
-            ]
+        # If neg_flow_sum is 0, MFI is 100.
+        mfi = (
+            pl.when(neg_flow_sum == 0)
+            .then(100.0)
+            .otherwise(100.0 - (100.0 / (1.0 + (pos_flow_sum / neg_flow_sum))))
         )
-
-        if fillna:
-            self.df = self.df.with_columns(
-                [pl.col("mfi").fill_null(strategy="forward")]
-            )
-
-        return self.df
+        return {"mfi": forward_fill(mfi, fillna).alias("mfi")}
 
     def vpt_indicator(self, fillna: bool = False) -> pl.DataFrame:
         """
@@ -99,6 +69,18 @@ class VolumeIndicators(BaseIndicator):
         :param fillna: If True, fill NaN values.
         :return: DataFrame with VPT indicator field.
         """
+        self.df = self.df.with_columns(
+            list(self.vpt_expressions(fillna=fillna).values())
+        )
+        return self.df
+
+    @staticmethod
+    def vpt_expressions(fillna: bool = False) -> Dict[str, pl.Expr]:
+        """
+        VPT as Polars expressions, see vpt_indicator.
+        :param fillna: If True, fill NaN values.
+        :return: Output column name -> expression.
+        """
         # Calculate price change percentage
         prev_close = pl.col("close").shift(1)
 
@@ -114,23 +96,10 @@ class VolumeIndicators(BaseIndicator):
         if fillna:
             vpt = vpt.fill_null(0.0)
 
-        self.df = self.df.with_columns(vpt.alias("vpt"))
-
-        # Calculate cumulative VPT
-        self.df = self.df.with_columns(
-            [pl.col("vpt").cum_sum().alias("vpt_cumulative")]
-        )
-
-        # Clean up temporary columns
-        self.df = self.df.drop(["vpt"])
-
-        # Kept for consistency if any other nulls appear
-        if fillna:
-            self.df = self.df.with_columns(
-                [pl.col("vpt_cumulative").fill_null(strategy="forward")]
-            )
-
-        return self.df
+        # Calculate cumulative VPT; fillna is kept for consistency if any
+        # other nulls appear
+        vpt_cumulative = forward_fill(vpt.cum_sum(), fillna)
+        return {"vpt_cumulative": vpt_cumulative.alias("vpt_cumulative")}
 
     def vwap_indicator(self, fillna: bool = False) -> pl.DataFrame:
         """
@@ -139,49 +108,28 @@ class VolumeIndicators(BaseIndicator):
         :param fillna: If True, fill NaN values.
         :return: DataFrame with VWAP indicator field.
         """
-        # Calculate typical price
         self.df = self.df.with_columns(
-            [
-                ((pl.col("high") + pl.col("low") + pl.col("close")) / 3).alias(
-                    "typical_price"
-                )
-            ]
-        )
-
-        # Calculate price * volume
-        self.df = self.df.with_columns(
-            [(pl.col("typical_price") * pl.col("volume")).alias("price_volume")]
+            list(self.vwap_expressions(fillna=fillna).values())
         )
+        return self.df
 
+    @staticmethod
+    def vwap_expressions(fillna: bool = False) -> Dict[str, pl.Expr]:
+        """
+        VWAP as Polars expressions, see vwap_indicator.
+        :param fillna: If True, fill NaN values.
+        :return: Output column name -> expression.
+        """
         # Calculate cumulative price * volume and cumulative volume
-        self.df = self.df.with_columns(
-            [
-                pl.col("price_volume").cum_sum().alias("cum_price_volume"),
-                pl.col("volume").cum_sum().alias("cum_volume"),
-            ]
-        )
+        cum_price_volume = (typical_price() * pl.col("volume")).cum_sum()
+        cum_volume = pl.col("volume").cum_sum()
 
-        # Calculate VWAP
-        self.df = self.df.with_columns(
-            [
-                pl.when(pl.col("cum_volume") == 0)
-                .then(None)  # VWAP is undefined if volume is 0
-                .otherwise(pl.col("cum_price_volume") / pl.col("cum_volume"))
-                .alias("vwap")
-            ]
+        vwap = (
+            pl.when(cum_volume == 0)
+            .then(None)  # VWAP is undefined if volume is 0
+            .otherwise(cum_price_volume / cum_volume)
         )
-
-        # Clean up temporary columns
-        self.df = self.df.drop(
-            ["typical_price", "price_volume", "cum_price_volume", "cum_volume"]
-        )
-
-        if fillna:
-            self.df = self.df.with_columns(
-                [pl.col("vwap").fill_null(strategy="forward")]
-            )
-
-        return self.df
+        return {"vwap": forward_fill(vwap, fillna).alias("vwap")}
 
     def obv_indicator(self, fillna: bool = False) -> pl.DataFrame:
         """
@@ -190,30 +138,28 @@ class VolumeIndicators(BaseIndicator):
         :param fillna: If True, fill NaN values.
         :return: DataFrame with OBV indicator field.
         """
-        # Calculate OBV
         self.df = self.df.with_columns(
-            [
-                pl.when(pl.col("close") > pl.col("close").shift(1))
-                .then(pl.col("volume"))
-                .when(pl.col("close") < pl.col("close").shift(1))
-                .then(-pl.col("volume"))
-                .otherwise(0)
-                .alias("obv_change")
-            ]
+            list(self.obv_expressions(fillna=fillna).values())
         )
+        return self.df
 
-        # Calculate cumulative OBV
-        self.df = self.df.with_columns([pl.col("obv_change").cum_sum().alias("obv")])
-
-        # Clean up temporary columns
-        self.df = self.df.drop(["obv_change"])
-
-        if fillna:
-            self.df = self.df.with_columns(
-                [pl.col("obv").fill_null(strategy="forward")]
-            )
+    @staticmethod
+    def obv_expressions(fillna: bool = False) -> Dict[str, pl.Expr]:
+        """
+        OBV as Polars expressions, see obv_indicator.
+        :param fillna: If True, fill NaN values.
+        :return: Output column name -> expression.
+        """
+        obv_change = (
+            pl.when(pl.col("close") > pl.col("close").shift(1))
+            .then(pl.col("volume"))
+            .when(pl.col("close") < pl.col("close").shift(1))
+            .then(-pl.col("volume"))
+            .otherwise(0)
+        )
 
-        return self.df
+        # Calculate cumulative OBV
+        return {"obv": forward_fill(obv_change.cum_sum(), fillna).alias("obv")}
 
     def force_index_indicator(
         self, window: int = 13, fillna: bool = False
@@ -225,36 +171,34 @@ class VolumeIndicators(BaseIndicator):
         :param fillna: If True, fill NaN values.
         :return: DataFrame with Force Index indicator field.
         """
-        min_periods = 0 if fillna else window
-
-        # Calculate price change
         self.df = self.df.with_columns(
-            [(pl.col("close") - pl.col("close").shift(1)).alias("price_change")]
-        )
-
-        # Calculate Force Index
-        self.df = self.df.with_columns(
-            [(pl.col("price_change") * pl.col("volume")).alias("force_index")]
+            list(self.force_index_expressions(window=window, fillna=fillna).values())
         )
+        return self.df
 
-        # Calculate smoothed Force Index
-        self.df = self.df.with_columns(
-            [
-                pl.col("force_index")
-                .ewm_mean(span=window, min_periods=min_periods)
-                .alias("force_index_smoothed")
-            ]
-        )
+    @staticmethod
+    def force_index_expressions(
+        window: int = 13, fillna: bool = False
+    ) -> Dict[str, pl.Expr]:
+        """
+        Force Index as Polars expressions, see force_index_indicator.
+        :param window: N -Period.
+        :param fillna: If True, fill NaN values.
+        :return: Output column name -> expression.
+        """
+        min_periods = 0 if fillna else window
 
-        # Clean up temporary columns
-        self.df = self.df.drop(["price_change", "force_index"])
+        # Force Index = price change * volume
+        price_change = pl.col("close") - pl.col("close").shift(1)
+        force_index = price_change * pl.col("volume")
 
-        if fillna:
-            self.df = self.df.with_columns(
-                [pl.col("force_index_smoothed").fill_null(strategy="forward")]
+        # Calculate smoothed Force Index
+        force_index_smoothed = force_index.ewm_mean(span=window, min_periods=min_periods)
+        return {
+            "force_index_smoothed": forward_fill(force_index_smoothed, fillna).alias(
+                "force_index_smoothed"
             )
-
-        return self.df
+        }
 
     def all_volume_indicators(self) -> pl.DataFrame:
         """
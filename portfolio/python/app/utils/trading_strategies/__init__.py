@@ -1,5 +1,7 @@
 # Trading Strategies Package
+from .backtest import *
 from .gfs_strategy import *
 from .macd_strategy import *
+from .screener import *
 
-__all__ = ["gfs_strategy", "macd_strategy"]
+__all__ = ["backtest", "gfs_strategy", "macd_strategy", "screener"]
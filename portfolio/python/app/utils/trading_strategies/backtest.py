@@ -0,0 +1,237 @@
+"""
+Vectorized strategy backtests.
+
+Strategy signals become target positions, positions become an equity curve
+and a trade list. Several parameter combinations of one strategy are stacked
+in a single frame, keyed by a `combo` column, so a whole sweep chunk runs as
+one set of Polars window expressions.
+"""
+
+from itertools import groupby
+from typing import Any, Callable, Dict, List, Tuple
+
+import polars as pl
+
+from utils.indicators.momentum_indicators import MomentumIndicators
+from utils.indicators.trend_indicators import TrendIndicators
+from utils.trading_strategies.macd_strategy import MACDStrategy
+
+
+def macd_signals(history: pl.DataFrame, combos: List[Dict[str, Any]]) -> pl.LazyFrame:
+    """
+    MACD strategy calls per parameter combination.
+    :param history: Daily bars (date, close, ...), oldest first.
+    :param combos: Complete MACD parameters per combination.
+    :return: combo, date, close and signal (1 Buy, -1 Sell, null otherwise).
+    """
+    def stacked(ids: List[int]) -> pl.DataFrame:
+        frames = []
+        for combo in ids:
+            macd = TrendIndicators.macd_expressions(
+                window_slow=combos[combo]["window_slow"],
+                window_fast=combos[combo]["window_fast"],
+                window_sign=combos[combo]["window_sign"],
+            )
+            frames.append(
+                history.lazy().select(
+                    pl.lit(combo, dtype=pl.UInt32).alias("combo"),
+                    pl.col("date"),
+                    pl.col("close").cast(pl.Float64).alias("Close"),
+                    macd["macd"].alias("MACD"),
+                    macd["signal"].alias("Signal"),
+                    macd["histogram"].alias("Histogram"),
+                )
+            )
+        return pl.concat(frames).collect()
+
+    # condition_days and moving_average_days are scalars of the call logic,
+    # so combinations sharing them are evaluated together
+    def call_parameters(combo: int) -> Tuple[int, int]:
+        return combos[combo]["condition_days"], combos[combo]["moving_average_days"]
+
+    parts = []
+    ordered = sorted(range(len(combos)), key=call_parameters)
+    for (condition_days, moving_average_days), ids in groupby(ordered, key=call_parameters):
+        calls = MACDStrategy(stacked(list(ids))).calls(
+            condition_days=condition_days,
+            moving_average_days=moving_average_days,
+            by="combo",
+        )
+        parts.append(
+            calls.lazy().select(
+                "combo",
+                "date",
+                pl.col("Close").alias("close"),
+                pl.when(pl.col("MACD_calls") != 0).then(pl.col("MACD_calls")).alias("signal"),
+            )
+        )
+    return pl.concat(parts).sort("combo", maintain_order=True)
+
+
+def gfs_signals(history: pl.DataFrame, combos: List[Dict[str, Any]]) -> pl.LazyFrame:
+    """
+    GFS calls per parameter combination, evaluated every day.
+    Daily, weekly and monthly RSI are all below `oversold` for a Buy and all
+    above `overbought` for a Sell. Weekly and monthly RSI only use bars that
+    have closed, so the signal never looks ahead.
+    :param history: Daily bars (date, close, ...), oldest first.
+    :param combos: Complete GFS parameters per combination.
+    :return: combo, date, close and signal (1 Buy, -1 Sell, null otherwise).
+    """
+    daily = history.lazy().select(
+        pl.col("date").set_sorted(), pl.col("close").cast(pl.Float64)
+    )
+
+    def resampled(every: str) -> pl.LazyFrame:
+        # A bar is known on the date of its last close
+        return daily.group_by_dynamic("date", every=every).agg(
+            pl.col("date").last().alias("closed"), pl.col("close").last()
+        ).select(pl.col("closed").set_sorted().alias("date"), "close")
+
+    weekly, monthly = resampled("1w"), resampled("1mo")
+
+    frames = []
+    for combo, parameters in enumerate(combos):
+        rsi = MomentumIndicators.rsi_expressions(window=parameters["window"])["rsi"]
+        frame = (
+            daily.with_columns(rsi.alias("rsi_son"))
+            .join_asof(weekly.select("date", rsi.alias("rsi_father")), on="date")
+            .join_asof(monthly.select("date", rsi.alias("rsi_grandfather")), on="date")
+        )
+        horizons = [pl.col("rsi_son"), pl.col("rsi_father"), pl.col("rsi_grandfather")]
+        buy = pl.all_horizontal([rsi < parameters["oversold"] for rsi in horizons])
+        sell = pl.all_horizontal([rsi > parameters["overbought"] for rsi in horizons])
+        frames.append(
+            frame.select(
+                pl.lit(combo, dtype=pl.UInt32).alias("combo"),
+                "date",
+                "close",
+                pl.when(buy).then(1).when(sell).then(-1).cast(pl.Int64).alias("signal"),
+            )
+        )
+    return pl.concat(frames)
+
+
+# Strategy name -> (signal function, default parameters)
+STRATEGIES: Dict[str, Tuple[Callable[..., pl.LazyFrame], Dict[str, Any]]] = {
+    "macd": (
+        macd_signals,
+        {
+            "window_fast": 12,
+            "window_slow": 26,
+            "window_sign": 9,
+            "condition_days": 10,
+            "moving_average_days": 200,
+        },
+    ),
+    "gfs": (gfs_signals, {"window": 14, "oversold": 30, "overbought": 70}),
+}
+
+
+def simulate(
+    signals: pl.LazyFrame,
+    commission: float = 0.0,
+    slippage: float = 0.0,
+    initial_capital: float = 10_000.0,
+    allow_short: bool = False,
+) -> pl.DataFrame:
+    """
+    Positions and equity curves from strategy signals.
+    A Buy goes long and a Sell goes flat (or short) at the signal day's close,
+    and the position is held until the next opposite signal.
+    :param signals: combo, date, close and signal (1 Buy, -1 Sell, null otherwise).
+    :param commission: Fraction of the traded value paid per trade.
+    :param slippage: Fraction of the traded value lost to the spread per trade.
+    :param initial_capital: Equity before the first bar.
+    :param allow_short: Go short on a Sell instead of flat.
+    :return: signals plus target (position decided at the close), position
+        (held into the bar), returns and equity per combo.
+    """
+    exit_position = -1 if allow_short else 0
+    cost = commission + slippage
+    return (
+        signals.with_columns(
+            pl.when(pl.col("signal") == 1)
+            .then(1)
+            .when(pl.col("signal") == -1)
+            .then(exit_position)
+            .forward_fill()
+            .over("combo")
+            .fill_null(0)
+            .cast(pl.Int64)
+            .alias("target"),
+            pl.col("close").pct_change().over("combo").fill_null(0).alias("returns"),
+        )
+        .with_columns(
+            pl.col("target").shift(1).over("combo").fill_null(0).alias("position")
+        )
+        .with_columns(
+            # Trading costs are paid on the value that changes hands
+            (
+                (1 - (pl.col("position") - pl.col("position").shift(1).over("combo"))
+                 .fill_null(0).abs() * cost)
+                * (1 + pl.col("position") * pl.col("returns"))
+            ).alias("growth")
+        )
+        .with_columns(
+            (initial_capital * pl.col("growth").cum_prod().over("combo")).alias("equity")
+        )
+        .drop("growth")
+        .collect()
+    )
+
+
+def trades(simulated: pl.DataFrame, commission: float = 0.0, slippage: float = 0.0) -> pl.DataFrame:
+    """
+    Round trips of simulated positions.
+    :param simulated: Result of simulate.
+    :param commission: Fraction of the traded value paid per trade.
+    :param slippage: Fraction of the traded value lost to the spread per trade.
+    :return: combo, side (1 long, -1 short), entry_date, entry_price, exit_date,
+        exit_price, return (after costs) and is_open per trade.
+    """
+    cost = commission + slippage
+    runs = (
+        simulated.lazy()
+        .with_columns(
+            (pl.col("target") != pl.col("target").shift(1))
+            .over("combo")
+            .fill_null(True)
+            .alias("changed")
+        )
+        .with_columns(pl.col("changed").cum_sum().over("combo").alias("run"))
+        .group_by("combo", "run", maintain_order=True)
+        .agg(
+            pl.col("target").first().alias("side"),
+            pl.col("date").first().alias("entry_date"),
+            pl.col("close").first().alias("entry_price"),
+            pl.col("close").last().alias("last_close"),
+        )
+        .with_columns(
+            pl.col("entry_date").shift(-1).over("combo").alias("exit_date"),
+            pl.col("entry_price").shift(-1).over("combo").alias("exit_price"),
+        )
+        .filter(pl.col("side") != 0)
+        .with_columns(
+            pl.col("exit_date").is_null().alias("is_open"),
+            # Open trades are marked to the last close
+            pl.col("exit_price").fill_null(pl.col("last_close")),
+        )
+    )
+    gross = pl.col("side") * (pl.col("exit_price") / pl.col("entry_price") - 1)
+    return runs.select(
+        "combo",
+        "side",
+        "entry_date",
+        "entry_price",
+        "exit_date",
+        "exit_price",
+        (
+            pl.when(pl.col("is_open"))
+            .then(1 - cost)
+            .otherwise((1 - cost) ** 2)
+            * (1 + gross)
+            - 1
+        ).alias("return"),
+        "is_open",
+    ).collect()
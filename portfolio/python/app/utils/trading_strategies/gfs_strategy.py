@@ -1,3 +1,6 @@
+from datetime import date, timedelta
+from typing import Optional
+
 import polars as pl
 import yfinance as yf
 
@@ -16,9 +19,13 @@ class GfsStrategy:
     Methods:
     --------
 
-    __init__(self, symbol)
-        Initializes an instance of the GfsStrategy class with the given stock symbol.
-        If the symbol is not provided, raises a ValueError.
+    __init__(self, symbol, history=None)
+        Initializes an instance of the GfsStrategy class with the given stock symbol and, optionally, its daily
+        price history. If the symbol is not provided, raises a ValueError.
+
+    from_market_data(cls, symbol, market_data=None)
+        Fetches the longest horizon (5 years of daily bars) once through the shared market data service and
+        returns a GfsStrategy over it. All three horizons are derived from that single download.
 
     calculater_rsi(self, df: pl.DataFrame) -> pl.DataFrame
         Calculates the Relative Strength Index (RSI) indicator for each data point in the given DataFrame.
@@ -32,32 +39,32 @@ class GfsStrategy:
           The DataFrame with an additional column representing the RSI indicator.
 
     grandfather_rsi(self)
-        Calculates the relative strength index (RSI) using the historical stock data.
+        Calculates the latest relative strength index (RSI) of monthly bars over 5 years.
 
         Parameters:
         - self.symbol : str
           The symbol of the stock.
 
         Returns:
-        - float
-          The calculated RSI value.
+        - pl.DataFrame
+          Single row with the latest RSI value.
 
     father_rsi(self)
-        Calculates the relative strength index (RSI) using historical stock data.
+        Calculates the latest relative strength index (RSI) of weekly bars over 1 year.
 
         Parameters:
         - self : instance of the GfsStrategy class
 
         Returns:
-        - float
-          The RSI value.
+        - pl.DataFrame
+          Single row with the latest RSI value.
 
     son_rsi(self)
-        Calculate the RSI (Relative Strength Index) for the given stock symbol.
+        Calculates the latest RSI (Relative Strength Index) of daily bars over 1 month.
 
         Returns:
-        - float
-          The RSI value.
+        - pl.DataFrame
+          Single row with the latest RSI value.
 
     calculate_gfs(self) -> dict
         Calculates GFS (Grandfather-Father-Son) strategy.
@@ -78,10 +85,68 @@ class GfsStrategy:
 
     """
 
-    def __init__(self, symbol):
+    # Longest horizon downloaded; the others are sliced out of it
+    HISTORY_YEARS = 5
+
+    def __init__(self, symbol, history: Optional[pl.DataFrame] = None):
         self.symbol = symbol
         if not symbol:
             raise ValueError("Symbol is not present. ")
+        self._history = history
+
+    @classmethod
+    async def from_market_data(cls, symbol, market_data=None) -> "GfsStrategy":
+        """
+        Creates a GfsStrategy over daily bars fetched through the shared market data service, so concurrent
+        requests share one download and stored history is reused.
+
+        Parameters:
+        - symbol : str
+          The symbol of the stock.
+        - market_data : MarketDataService, optional
+          Service to fetch from, the global instance by default.
+
+        Returns:
+        - GfsStrategy
+          Strategy with its price history loaded.
+
+        """
+        if market_data is None:
+            from app.core.services.market_data_service import market_data_service
+
+            market_data = market_data_service
+
+        start_date, end_date = cls._history_range()
+        history = await market_data.fetch_ticker_frame(
+            symbol, interval="1d", start_date=start_date, end_date=end_date
+        )
+        return cls(symbol, history=history)
+
+    @classmethod
+    def _history_range(cls):
+        today = date.today()
+        # A little over HISTORY_YEARS, the horizons are sliced off the latest bar anyway
+        start = today - timedelta(days=366 * cls.HISTORY_YEARS)
+        # The end date is exclusive upstream
+        return start.isoformat(), (today + timedelta(days=1)).isoformat()
+
+    @property
+    def history(self) -> pl.DataFrame:
+        """
+        Daily bars (date, close, ...) oldest first, downloaded once when they were not provided.
+        """
+        if self._history is None:
+            from app.core.services.market_data_service import MarketDataService
+
+            df = yf.Ticker(self.symbol).history(
+                period=f"{self.HISTORY_YEARS}y", interval="1d"
+            )
+            self._history = MarketDataService._to_frame(df, include_index=True)
+        if self._history.is_empty():
+            raise ValueError(
+                f"{self.symbol}: No price data found, symbol may be delisted (period={self.HISTORY_YEARS}y)"
+            )
+        return self._history
 
     def calculater_rsi(self, df: pl.DataFrame) -> pl.DataFrame:
         """
@@ -98,30 +163,38 @@ class GfsStrategy:
         """
         return MomentumIndicators(df=df).rsi_indicator()
 
+    @staticmethod
+    def _latest_rsi(bars: pl.LazyFrame) -> pl.DataFrame:
+        # RSI is recursive, so the whole series is scanned but only the last value is kept
+        rsi = MomentumIndicators.rsi_expressions()["rsi"]
+        return bars.select(rsi.last()).collect()
+
+    def _horizon(self, period: str, every: Optional[str] = None) -> pl.LazyFrame:
+        """Daily bars of the last `period`, resampled to the closing bar of every `every` when given."""
+        bars = (
+            self.history.lazy()
+            .with_columns(pl.col("date").set_sorted())
+            .filter(pl.col("date") > pl.col("date").max().dt.offset_by(f"-{period}"))
+        )
+        if every is None:
+            return bars.select("date", "close")
+        return bars.group_by_dynamic("date", every=every).agg(pl.col("close").last())
+
     def grandfather_rsi(self):
         """
-        Calculates the relative strength index (RSI) using the historical stock data.
+        Calculates the latest relative strength index (RSI) of monthly bars over 5 years.
 
         Parameters:
         - self.symbol : str
           The symbol of the stock.
 
         Returns:
-        - float
-          The calculated RSI value.
+        - pl.DataFrame
+          Single row with the latest RSI value.
 
         """
         try:
-            ticker = yf.Ticker(self.symbol)
-            df = ticker.history(period="5y", interval="1d")
-            if df.empty:
-                raise ValueError(
-                    f"{self.symbol}: No price data found, symbol may be delisted (period=5y)"
-                )
-
-            # Convert to polars DataFrame
-            pl_df = pl.from_pandas(df)
-            return self.calculater_rsi(df=pl_df)
+            return self._latest_rsi(self._horizon(f"{self.HISTORY_YEARS}y", every="1mo"))
         except Exception:
             raise ValueError(
                 f"{self.symbol}: No price data found, symbol may be delisted (period=5y)"
@@ -129,27 +202,18 @@ class GfsStrategy:
 
     def father_rsi(self):
         """
-        Calculates the relative strength index (RSI) using historical stock data.
+        Calculates the latest relative strength index (RSI) of weekly bars over 1 year.
 
         Parameters:
         - self : instance of the GfsStrategy class
 
         Returns:
-        - float
-          The RSI value.
+        - pl.DataFrame
+          Single row with the latest RSI value.
 
         """
         try:
-            ticker = yf.Ticker(self.symbol)
-            df = ticker.history(period="1y", interval="1d")
-            if df.empty:
-                raise ValueError(
-                    f"{self.symbol}: No price data found, symbol may be delisted (period=1y)"
-                )
-
-            # Convert to polars DataFrame
-            pl_df = pl.from_pandas(df)
-            return self.calculater_rsi(df=pl_df)
+            return self._latest_rsi(self._horizon("1y", every="1w"))
         except Exception:
             raise ValueError(
                 f"{self.symbol}: No price data found, symbol may be delisted (period=1y)"
@@ -157,24 +221,15 @@ class GfsStrategy:
 
     def son_rsi(self):
         """
-        Calculate the RSI (Relative Strength Index) for the given stock symbol.
+        Calculates the latest RSI (Relative Strength Index) of daily bars over 1 month.
 
         Returns:
-        - float
-          The RSI value.
+        - pl.DataFrame
+          Single row with the latest RSI value.
 
         """
         try:
-            ticker = yf.Ticker(self.symbol)
-            df = ticker.history(period="1mo", interval="1d")
-            if df.empty:
-                raise ValueError(
-                    f"{self.symbol}: No price data found, symbol may be delisted (period=1mo)"
-                )
-
-            # Convert to polars DataFrame
-            pl_df = pl.from_pandas(df)
-            return self.calculater_rsi(df=pl_df)
+            return self._latest_rsi(self._horizon("1mo"))
         except Exception:
             raise ValueError(
                 f"{self.symbol}: No price data found, symbol may be delisted (period=1mo)"
@@ -1,4 +1,5 @@
-import numpy as np
+from typing import Callable, Optional
+
 import polars as pl
 
 
@@ -29,158 +30,189 @@ class MACDStrategy:
             "MACD trend calculated fields are not present in DataFrame."
         )
 
-    def _find_intersection(self, x: float, y: float, digits: int = 0) -> int:
+    @staticmethod
+    def _find_intersection(x: pl.Expr, y: pl.Expr, digits: int = 0) -> pl.Expr:
         """
-        Calculates tentative intersection point for the lines.
-        :param x: Point on first line/series.
-        :param y: Point on second line/series.
+        Flags tentative intersection points of two lines.
+        :param x: First line/series.
+        :param y: Second line/series.
         :param digits: Round number for calculating intersection.
+        :return: 1 where both lines round to the same value, 0 otherwise (also for nulls).
         """
-        try:
-            if round(x, digits) == round(y, digits):
-                return 1
-            else:
-                return 0
-        except ValueError:
-            return 0
-
-    def _get_closing_price_difference(self, df: pl.DataFrame) -> pl.DataFrame:
-        """
-        Calculates closing price difference between buy and sell indicators, to get better idea about the price
-        movement.
-        :param df: DataFrame with the buy/sell indicators.
-        :returns: Returns the DataFrame with the closing price difference.
-        """
-        # Convert to pandas for easier manipulation, then back to polars
-        pd_df = df.to_pandas()
-        ith_row = None
-
-        for i in pd_df.index:
-            if pd_df.loc[i, "MACD_intersection"] == 1:
-                if not ith_row:
-                    ith_row = i
-                    pd_df.loc[i, "MACD_price_difference"] = np.nan
-                else:
-                    pd_df.loc[i, "MACD_price_difference"] = (
-                        pd_df.loc[i, "Close"] - pd_df.loc[ith_row, "Close"]
-                    )
-                    ith_row = i
-            else:
-                pd_df.loc[i, "MACD_price_difference"] = np.nan
-
-        return pl.from_pandas(pd_df)
+        return (
+            (_round_half_even(x, digits) == _round_half_even(y, digits))
+            .fill_null(False)
+            .cast(pl.Int64)
+        )
 
+    @staticmethod
     def _get_buy_sell_calls(
-        self, df: pl.DataFrame, condition_days: int = 10
-    ) -> pl.DataFrame:
+        intersection: pl.Expr,
+        row: pl.Expr,
+        per_group: Callable[[pl.Expr], pl.Expr],
+        condition_days: int = 10,
+    ) -> pl.Expr:
         """
-        Calculates Buy/Sell signals.
-        :param df: DataFrame with the MACD intersection column.
+        Turns intersections into Buy (1) and Sell (-1) calls.
+        :param intersection: 1 where MACD and Signal intersect, 0 otherwise.
+        :param row: Row number within the symbol.
+        :param per_group: Applies window expressions per symbol.
         :param condition_days: Number of days the condition for the buy or sell should be satisfied.
-        :return: Returns the DataFrame with the Buy and Sell calls.
+        :return: Expression with 1 for Buy calls, -1 for Sell calls and 0 otherwise.
         """
-        # Convert to pandas for easier manipulation, then back to polars
-        pd_df = df.to_pandas()
-
-        # We will use 1 as Buy call and -1 as Sell call. From intersection logic we received 1 wherever intersection
-        # happened and in this method we will replace them appropriately by 1 or -1 depending on strategy and
-        # conditions.
-        for i in range(pd_df.shape[0]):
-            # 26 as initial 26 value of Signal will be `Null` because of the 26-day moving average calculation.
-            if i > 26:
-                if pd_df["MACD_intersection"][i] == 1:
-                    # getting last number of condition days values (days) of MACD and Signal for comparison.
-                    macd = pd_df["MACD"][i - condition_days : i].tolist()
-                    signal = pd_df["Signal"][i - condition_days : i].tolist()
-                    states = []
-                    for m, s in zip(macd, signal):
-                        # for last condition_days values if MACD value is less than the Signal value and also both
-                        # values are less than the zero value we append `True` to track how many times it happened for
-                        # past condition_days days.
-                        if m < s and m < 0 and s < 0:
-                            states.append(True)
-                        # for last condition_days values if MACD value is greater than the Signal value and also both
-                        # values are greater than the zero value we append `True` to track how many times it happened
-                        # for past condition_days.
-                        elif m > s and m > 0 and s > 0:
-                            states.append(False)
-                        # if above condition is not matched we skip appending `True` or `False` value as we need to be
-                        # sure about the trend.
-                        # all past days should have either `True` or `False` values.
-                    c = all(state is True for state in states) or all(
-                        state is False for state in states
-                    )
-                    # We are not interested if we did not receive condition_days states.
-                    if len(states) == condition_days:
-                        if (
-                            c
-                            and (pd_df["MACD"][i] <= pd_df["Signal"][i] < 0)
-                            and pd_df["Close"][i] >= pd_df["MACD_EMA"][i]
-                        ):
-                            # Keeping the value 1 as it's a Buy call.
-                            continue
-                        elif (
-                            c
-                            and (pd_df["MACD"][i] >= pd_df["Signal"][i] > 0)
-                            and pd_df["Close"][i] <= pd_df["MACD_EMA"][i]
-                        ):
-                            # Changing the value to -1 as it's a Sell call.
-                            pd_df["MACD_intersection"].iloc[i] = -1
-                    else:
-                        # If states are less than condition_days we should change the intersection value 1 to 0 else it
-                        # will be considered as a Buy signal.
-                        pd_df["MACD_intersection"].iloc[i] = 0
-
-        # Convert back to polars
-        result_df = pl.from_pandas(pd_df)
-        result_df = self._get_closing_price_difference(df=result_df)
-
-        # Apply final transformations
-        result_df = result_df.with_columns(
-            [
-                (pl.col("MACD_intersection").abs() * pl.col("MACD")).alias(
-                    "MACD_intersection"
-                )
-            ]
+        macd, signal = pl.col("MACD"), pl.col("Signal")
+        # For each of the past condition_days days MACD has to be below the Signal
+        # with both below zero (bearish), or above it with both above zero
+        # (bullish). Days matching neither leave the trend unclear.
+        bearish = ((macd < signal) & (macd < 0) & (signal < 0)).fill_null(False)
+        bullish = ((macd > signal) & (macd > 0) & (signal > 0)).fill_null(False)
+        if condition_days > 0:
+            bearish_days = per_group(
+                bearish.cast(pl.Int32).rolling_sum(condition_days).shift(1)
+            )
+            bullish_days = per_group(
+                bullish.cast(pl.Int32).rolling_sum(condition_days).shift(1)
+            )
+        else:
+            bearish_days = bullish_days = pl.lit(0)
+        clear_trend = (bearish_days == condition_days) | (bullish_days == condition_days)
+
+        # 26 as initial 26 value of Signal will be `Null` because of the 26-day moving average calculation.
+        return (
+            pl.when((intersection != 1) | (row <= 26))
+            .then(intersection)
+            # We are not interested if we did not receive condition_days states.
+            .when((bearish_days + bullish_days).fill_null(0) != condition_days)
+            .then(0)
+            .when(
+                clear_trend
+                & (macd <= signal)
+                & (signal < 0)
+                & (pl.col("Close") >= pl.col("MACD_EMA"))
+            )
+            .then(1)
+            .when(
+                clear_trend
+                & (macd >= signal)
+                & (signal > 0)
+                & (pl.col("Close") <= pl.col("MACD_EMA"))
+            )
+            .then(-1)
+            # Anything else keeps the intersection value and counts as a Buy call
+            .otherwise(intersection)
         )
 
-        # Replace 0 with NaN
-        result_df = result_df.with_columns(
-            [
-                pl.when(pl.col("MACD_intersection") == 0)
-                .then(None)
-                .otherwise(pl.col("MACD_intersection"))
-                .alias("MACD_intersection")
-            ]
+    @staticmethod
+    def _get_closing_price_difference(
+        calls: pl.Expr, row: pl.Expr, per_group: Callable[[pl.Expr], pl.Expr]
+    ) -> pl.Expr:
+        """
+        Calculates closing price difference between consecutive Buy calls, to get better idea about the price
+        movement.
+        :param calls: Buy (1) / Sell (-1) calls.
+        :param row: Row number within the symbol.
+        :param per_group: Applies window expressions per symbol.
+        :return: Close minus the Close of the previous Buy call, on Buy calls only.
+        """
+        buy = calls == 1
+        # A Buy call on the very first row never serves as the reference price
+        reference_close = pl.when(buy & (row > 0)).then(pl.col("Close"))
+        previous_close = per_group(reference_close.forward_fill().shift(1))
+        return pl.when(buy).then(pl.col("Close") - previous_close).cast(pl.Float64)
+
+    def _with_calls(
+        self, condition_days: int, moving_average_days: int, by: Optional[str]
+    ) -> pl.LazyFrame:
+        def per_group(expr: pl.Expr) -> pl.Expr:
+            return expr.over(by) if by else expr
+
+        return (
+            self.df.lazy()
+            .with_columns(
+                per_group(pl.col("Close").ewm_mean(span=moving_average_days)).alias(
+                    "MACD_EMA"
+                ),
+                self._find_intersection(pl.col("MACD"), pl.col("Signal")).alias(
+                    "MACD_intersection"
+                ),
+                # Window expressions cannot be nested, so the row number is a column
+                per_group(pl.int_range(0, pl.count())).alias("MACD_row"),
+            )
+            .with_columns(
+                self._get_buy_sell_calls(
+                    pl.col("MACD_intersection"),
+                    pl.col("MACD_row"),
+                    per_group,
+                    condition_days=condition_days,
+                ).alias("MACD_calls")
+            )
+            .with_columns(
+                self._get_closing_price_difference(
+                    pl.col("MACD_calls"), pl.col("MACD_row"), per_group
+                ).alias("MACD_price_difference"),
+            )
+            .drop("MACD_row", "MACD_intersection")
         )
 
-        return result_df
+    def calls(
+        self,
+        condition_days: int = 10,
+        moving_average_days: int = 200,
+        by: Optional[str] = None,
+    ) -> pl.DataFrame:
+        """
+        Buy and Sell calls without folding them into the MACD value, see buy_sell_strategy.
+        :param condition_days: Number of days the condition for the buy or sell should be satisfied.
+        :param moving_average_days: Span of the trend EMA of the Close.
+        :param by: Column identifying the symbol when the DataFrame stacks several symbols.
+        :return: DataFrame with MACD_EMA, MACD_calls (1 Buy, -1 Sell, 0 otherwise) and
+            MACD_price_difference columns.
+        """
+        return self._with_calls(condition_days, moving_average_days, by).collect()
 
     def buy_sell_strategy(
-        self, condition_days: int = 10, moving_average_days: int = 200
+        self,
+        condition_days: int = 10,
+        moving_average_days: int = 200,
+        by: Optional[str] = None,
     ):
         """
+        :param condition_days: Number of days the condition for the buy or sell should be satisfied.
+        :param moving_average_days: Span of the trend EMA of the Close.
+        :param by: Column identifying the symbol when the DataFrame stacks several
+            symbols (each in date order); signals are then computed per symbol.
         :return: DataFrame with the MACD Buy and Sell signals.
         """
-        # Calculate EMA using polars
-        self.df = self.df.with_columns(
-            [pl.col("Close").ewm_mean(span=moving_average_days).alias("MACD_EMA")]
-        )
-
-        # Calculate intersections
-        self.df = self.df.with_columns(
-            [
-                pl.map_rows(
-                    [pl.col("MACD"), pl.col("Signal")],
-                    lambda row: self._find_intersection(row[0], row[1]),
-                ).alias("MACD_intersection")
-            ]
+        calls = pl.col("MACD_calls")
+        self.df = (
+            self._with_calls(condition_days, moving_average_days, by)
+            .select(
+                pl.exclude("MACD_calls", "MACD_price_difference"),
+                # Keep the MACD value on the calls, null elsewhere
+                pl.when((calls != 0) & (pl.col("MACD") != 0))
+                .then(calls.abs() * pl.col("MACD"))
+                .alias("MACD_buy_or_sell"),
+                pl.col("MACD_price_difference"),
+            )
+            .collect()
         )
 
-        # Get buy/sell calls
-        self.df = self._get_buy_sell_calls(df=self.df, condition_days=condition_days)
+        return self.df
 
-        # Rename column
-        self.df = self.df.rename({"MACD_intersection": "MACD_buy_or_sell"})
 
-        return self.df
+def _round_half_even(expr: pl.Expr, digits: int = 0) -> pl.Expr:
+    """Round like Python's round(), which rounds halves to the even neighbour."""
+    scale = 10.0 ** digits
+    scaled = expr * scale
+    floor = scaled.floor()
+    remainder = scaled - floor
+    rounded = (
+        pl.when(remainder > 0.5)
+        .then(floor + 1)
+        .when(remainder < 0.5)
+        .then(floor)
+        .when(floor % 2 == 0)
+        .then(floor)
+        .otherwise(floor + 1)
+    )
+    return rounded / scale
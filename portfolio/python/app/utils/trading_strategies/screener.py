@@ -0,0 +1,111 @@
+"""
+Strategy screening over many symbols.
+
+Plain functions from {symbol: daily bars} to one JSON-ready result per
+symbol, so batches of symbols can be screened in worker processes.
+"""
+
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import polars as pl
+
+from utils.indicators.trend_indicators import TrendIndicators
+from utils.trading_strategies.gfs_strategy import GfsStrategy
+from utils.trading_strategies.macd_strategy import MACDStrategy
+
+
+def screen_gfs(histories: Dict[str, pl.DataFrame]) -> List[Dict[str, Any]]:
+    """
+    GFS recommendation per symbol.
+    :param histories: Daily bars (date, close, ...) per symbol, oldest first.
+    :return: calculate_gfs result per symbol, or its error.
+    """
+    results = []
+    for symbol, history in histories.items():
+        try:
+            result = GfsStrategy(symbol, history=history).calculate_gfs()
+        except ValueError as e:
+            result = {"error": str(e)}
+        results.append({"symbol": symbol, **result})
+    return results
+
+
+def screen_macd(
+    histories: Dict[str, pl.DataFrame],
+    condition_days: int = 10,
+    moving_average_days: int = 200,
+) -> List[Dict[str, Any]]:
+    """
+    Latest MACD strategy call per symbol, all symbols in one pass.
+    :param histories: Daily bars (date, close, ...) per symbol, oldest first.
+    :param condition_days: Number of days the condition for the buy or sell should be satisfied.
+    :param moving_average_days: Span of the trend EMA of the Close.
+    :return: Last close and MACD, and the latest Buy/Sell call with its date per symbol.
+    """
+    macd = TrendIndicators.macd_expressions()
+    stacked = pl.concat(
+        [
+            history.lazy().select(
+                pl.lit(symbol).alias("symbol"),
+                pl.col("date"),
+                pl.col("close").cast(pl.Float64).alias("Close"),
+                macd["macd"].alias("MACD"),
+                macd["signal"].alias("Signal"),
+                macd["histogram"].alias("Histogram"),
+            )
+            for symbol, history in histories.items()
+        ]
+    ).collect()
+
+    calls = MACDStrategy(stacked).calls(
+        condition_days=condition_days,
+        moving_average_days=moving_average_days,
+        by="symbol",
+    )
+    call = pl.col("MACD_calls")
+    latest = calls.group_by("symbol", maintain_order=True).agg(
+        pl.col("date").last(),
+        pl.col("Close").last().alias("close"),
+        pl.col("MACD").last().alias("macd"),
+        pl.col("Signal").last().alias("macd_signal"),
+        call.filter(call != 0).last().alias("call"),
+        pl.col("date").filter(call != 0).last().alias("signal_date"),
+        pl.col("MACD_price_difference").drop_nulls().last().alias("price_difference"),
+    )
+    return latest.select(
+        "symbol",
+        pl.col("date").dt.strftime("%Y-%m-%d"),
+        "close",
+        "macd",
+        "macd_signal",
+        pl.when(pl.col("call") == 1)
+        .then(pl.lit("Buy"))
+        .when(pl.col("call") == -1)
+        .then(pl.lit("Sell"))
+        .alias("signal"),
+        pl.col("signal_date").dt.strftime("%Y-%m-%d"),
+        "price_difference",
+    ).to_dicts()
+
+
+# Strategy name -> (daily history period it needs, screening function)
+STRATEGIES: Dict[str, Tuple[str, Callable[..., List[Dict[str, Any]]]]] = {
+    "gfs": (f"{GfsStrategy.HISTORY_YEARS}y", screen_gfs),
+    "macd": ("2y", screen_macd),
+}
+
+
+def screen(
+    strategy: str,
+    histories: Dict[str, pl.DataFrame],
+    parameters: Optional[Dict[str, Any]] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Run a screening strategy over a batch of symbols.
+    :param strategy: Name in STRATEGIES.
+    :param histories: Non-empty daily bars per symbol, oldest first.
+    :param parameters: Keyword arguments of the strategy.
+    :return: One result per symbol.
+    """
+    _, function = STRATEGIES[strategy]
+    return function(histories, **(parameters or {}))